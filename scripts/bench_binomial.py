@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark: binomial trees (stockreco.options.binomial) vs Black-Scholes on a bundled chain.
+Stock options only (indices are cash-settled Europeans); every row is priced at its own
+Black-Scholes IV, so the European tree should reproduce the market premium and the American
+tree shows the early-exercise premium.
+
+  python scripts/bench_binomial.py --date 2025-12-16 --steps 101
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+from stockreco.agents.option_reco_agent import _is_index
+from stockreco.features.derivatives.iv_surface import chain_forwards
+from stockreco.ingest.derivatives.bhav_cache import load_chain, load_futures
+from stockreco.options.binomial import tree_price_vec
+from stockreco.options.greeks import bs_price_vec
+from stockreco.options.iv_solver import OK, implied_vol_vec
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--date", default="2025-12-16")
+    ap.add_argument("--steps", type=int, default=101)
+    ap.add_argument("--r", type=float, default=0.07)
+    args = ap.parse_args()
+
+    repo = Path(__file__).resolve().parent.parent
+    folder = repo / "data" / "derivatives" / args.date
+    as_of = date.fromisoformat(args.date).toordinal()
+    chain = load_chain(folder)
+    chain = chain[(chain["expiry_ord"] > as_of) & (chain["ltp"] > 0)]
+    chain = chain[~chain["underlying"].map(_is_index)].reset_index(drop=True)
+    T = (chain["expiry_ord"].to_numpy() - as_of) / 365.0
+    F = chain_forwards(chain, load_futures(folder), T, args.r)
+    P, K, is_call = chain["ltp"].to_numpy(), chain["strike"].to_numpy(), chain["is_call"].to_numpy()
+    S = F * np.exp(-args.r * T)
+    res = implied_vol_vec(P, S, K, T, args.r, is_call)
+    ok = np.isfinite(F) & (res.status == OK)
+    S, K, T, P, is_call, iv = S[ok], K[ok], T[ok], P[ok], is_call[ok], res.iv[ok]
+    print(f"{args.date}: {ok.sum()} stock option rows, {args.steps} steps")
+
+    t0 = time.perf_counter()
+    bs = bs_price_vec(S, K, T, args.r, iv, is_call)
+    t_bs = time.perf_counter() - t0
+    print(f"{'engine':<16} {'time':>10} {'max |diff|':>11} {'mean |diff|':>12} {'max rel':>9}")
+    print(f"{'black-scholes':<16} {t_bs * 1000:7.1f} ms")
+    for method in ("crr", "lr"):
+        for american in (False, True):
+            t0 = time.perf_counter()
+            px = tree_price_vec(S, K, T, args.r, iv, is_call, steps=args.steps, method=method, american=american)
+            dt = time.perf_counter() - t0
+            diff = px - bs
+            rel = np.abs(diff) / np.maximum(bs, 0.05)
+            name = f"{method}-{'american' if american else 'european'}"
+            print(f"{name:<16} {dt * 1000:7.1f} ms {np.abs(diff).max():11.4f} {np.abs(diff).mean():12.5f} {rel.max():9.2%}")
+    puts = ~is_call
+    am = tree_price_vec(S[puts], K[puts], T[puts], args.r, iv[puts], False, steps=args.steps)
+    eu = tree_price_vec(S[puts], K[puts], T[puts], args.r, iv[puts], False, steps=args.steps, american=False)
+    print(f"puts: early-exercise premium mean {np.mean(am - eu):.4f}, max {np.max(am - eu):.4f} "
+          f"({np.mean((am - eu) / np.maximum(eu, 0.05)):.2%} of premium on average)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: full-chain IV + Greeks solve (every underlying/expiry/strike of one day)
+with the exact and the lookup-table N(x) backends of stockreco.options.greeks.
+
+  python scripts/bench_greeks.py --date 2025-12-16 --repeat 5
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import date
+from pathlib import Path
+from statistics import median
+
+import numpy as np
+
+from stockreco.features.derivatives.iv_surface import chain_forwards
+from stockreco.ingest.derivatives.bhav_cache import load_chain, load_futures
+from stockreco.options import greeks
+from stockreco.options.iv_solver import OK, implied_vol_vec
+
+
+def _time(fn, repeat: int) -> float:
+    ts = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        ts.append(time.perf_counter() - t0)
+    return median(ts)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--date", default="2025-12-16")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--r", type=float, default=0.07)
+    args = ap.parse_args()
+
+    repo = Path(__file__).resolve().parent.parent
+    folder = repo / "data" / "derivatives" / args.date
+    as_of = date.fromisoformat(args.date).toordinal()
+    chain = load_chain(folder)
+    chain = chain[(chain["expiry_ord"] > as_of) & (chain["ltp"] > 0)].reset_index(drop=True)
+    T = (chain["expiry_ord"].to_numpy() - as_of) / 365.0
+    F = chain_forwards(chain, load_futures(folder), T, args.r)
+    ok = np.isfinite(F)
+    P, K, T, is_call = chain["ltp"].to_numpy()[ok], chain["strike"].to_numpy()[ok], T[ok], chain["is_call"].to_numpy()[ok]
+    S = F[ok] * np.exp(-args.r * T)
+    print(f"{args.date}: {len(P)} option rows, {chain['underlying'].nunique()} underlyings")
+
+    def solve():
+        res = implied_vol_vec(P, S, K, T, args.r, is_call)
+        sig = np.where(res.status == OK, res.iv, np.nan)
+        return res, greeks.bs_greeks_vec(S, K, T, args.r, sig, is_call)
+
+    out = {}
+    print(f"{'backend':<8} {'iv':>10} {'iv+greeks':>12} {'iterations':>11}")
+    for backend in greeks.NORM_BACKENDS:
+        greeks.set_norm_backend(backend)
+        solve()  # warm-up (builds the table)
+        t_iv = _time(lambda: implied_vol_vec(P, S, K, T, args.r, is_call), args.repeat)
+        t_all = _time(solve, args.repeat)
+        out[backend] = solve()
+        print(f"{backend:<8} {t_iv * 1000:7.1f} ms {t_all * 1000:9.1f} ms {out[backend][0].iterations.mean():11.2f}")
+    greeks.set_norm_backend("exact")
+
+    (r0, g0), (r1, g1) = out["exact"], out["lut"]
+    both = (r0.status == OK) & (r1.status == OK)
+    print(f"max |iv diff| {np.max(np.abs(r0.iv[both] - r1.iv[both])):.2e}, "
+          f"max |delta diff| {np.nanmax(np.abs(g0.delta - g1.delta)):.2e}, "
+          f"status mismatches {int((r0.status != r1.status).sum())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Monte Carlo target-before-stop odds (stockreco.options.montecarlo) for a batch of
+synthetic NIFTY-50-sized EOD candidates, at a few path counts.
+
+  python scripts/bench_montecarlo.py --underlyings 52 --paths 1000,5000,20000 --horizon 5
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from stockreco.options.greeks import bs_price_vec
+from stockreco.options.montecarlo import simulate_hits
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--underlyings", type=int, default=52)
+    ap.add_argument("--paths", default="1000,5000,20000")
+    ap.add_argument("--horizon", type=int, default=5, help="max days to sell_by")
+    ap.add_argument("--steps-per-day", type=int, default=1)
+    ap.add_argument("--r", type=float, default=0.07)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(42)
+    n = args.underlyings
+    spot = rng.uniform(200, 30000, n)
+    strike = spot * rng.uniform(0.97, 1.03, n)
+    T = rng.integers(4, 35, n) / 365.0
+    iv = rng.uniform(0.12, 0.45, n)
+    is_call = rng.random(n) < 0.5
+    entry = bs_price_vec(spot, strike, T, args.r, iv, is_call)
+    horizon = rng.integers(0, args.horizon + 1, n)
+
+    print(f"{n} candidates, horizon <= {args.horizon}d, {args.steps_per_day} step(s)/day")
+    print(f"{'paths':>7} {'time':>10} {'mean se':>9} {'mean P(T1)':>11}")
+    for n_paths in (int(p) for p in args.paths.split(",")):
+        t0 = time.perf_counter()
+        res = simulate_hits(spot, strike, T, args.r, iv, is_call, entry, 1.5 * entry, 2.0 * entry, 0.65 * entry, horizon,
+                            n_paths=n_paths, steps_per_day=args.steps_per_day, seed=7)
+        dt = time.perf_counter() - t0
+        print(f"{n_paths:>7} {dt * 1000:7.0f} ms {res.se.mean():9.4f} {res.p_t1.mean():11.3f}")
+
+
+if __name__ == "__main__":
+    main()
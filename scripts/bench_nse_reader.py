@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: generic _read_csv_any vs the fixed-schema read_bhavcopy (pyarrow and pandas
+engines) on one day's bhavcopies, both for the raw read and for read + ChainIndex build.
+
+  python scripts/bench_nse_reader.py --date 2025-12-16 --repeat 5
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from statistics import median
+
+from stockreco.ingest.derivatives.bhav_cache import _read_csv_any, day_sources
+from stockreco.ingest.derivatives.chain_index import ChainIndex
+from stockreco.ingest.derivatives.nse_reader import HAS_ARROW, read_bhavcopy
+
+
+def _time(fn, repeat: int) -> float:
+    ts = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        ts.append(time.perf_counter() - t0)
+    return median(ts)
+
+
+def _chain(read, path) -> int:
+    try:
+        return len(ChainIndex.from_frame(read(path)).cols)
+    except RuntimeError:
+        return 0  # futures-only file
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--date", default="2025-12-16")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    repo = Path(__file__).resolve().parent.parent
+    folder = repo / "data" / "derivatives" / args.date
+    files = {str(p.name): p for p in day_sources(folder).values()}
+    if not files:
+        print(f"No bhavcopies in {folder}")
+        return
+
+    engines = (["pyarrow"] if HAS_ARROW else []) + ["pandas"]
+    print(f"{'file':<22} {'step':<12} {'_read_csv_any':>14}" + "".join(f" {e:>14} {'speedup':>8}" for e in engines))
+    for name, path in sorted(files.items()):
+        for step in ("read", "read+index"):
+            def run(read):
+                return (lambda: read(path)) if step == "read" else (lambda: _chain(read, path))
+
+            t_old = _time(run(_read_csv_any), args.repeat)
+            line = f"{name:<22} {step:<12} {t_old * 1000:11.1f} ms"
+            for e in engines:
+                t_new = _time(run(lambda p, e=e: read_bhavcopy(p, engine=e)), args.repeat)
+                line += f" {t_new * 1000:11.1f} ms {t_old / t_new:7.1f}x"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,7 @@ from pathlib import Path
 from datetime import datetime
 
 # ----------------- Data Loading -----------------
-from stockreco.ingest.derivatives.option_chain_loader import get_provider
+from stockreco.ingest.derivatives.warehouse import DerivativesWarehouse
 
 def _normalize_expiry(d_str: str) -> str:
     # d_str could be '2025-12-23', '23/12/2025', '23-Dec-2025'
@@ -32,6 +32,10 @@ def _key(r):
     ex = _normalize_expiry(r.get("expiry") or "")
     return f"{s}|{st}|{sd}|{ex}"
 
+def _val(v):
+    # warehouse cells are NaN when the bhavcopy had no value
+    return None if v is None or v != v else float(v)
+
 def load_json(p: Path):
     if not p.exists(): return {}
     with p.open("r") as f:
@@ -86,12 +90,16 @@ def evaluate(reco_file: Path, outcome_date: str):
         for r in rev_data.get("rejected", []):
             reviewer_status[_key(r)] = {"status": "REJECTED", "reason": r.get("reason", "")}
 
-    # Load Market Data for Outcome Date
-    print(f"Loading market data for {outcome_date}...")
+    # Market data for every date up to the outcome date comes from the warehouse
+    # (one partition per date, only new/changed folders are re-ingested)
+    print(f"Loading market data up to {outcome_date}...")
     try:
-        provider = get_provider("local_csv", repo_root=repo_root, as_of=outcome_date)
+        wh = DerivativesWarehouse(repo_root)
+        built = wh.sync()
+        if built:
+            print(f"Warehouse: ingested {len(built)} date(s)")
     except Exception as e:
-        print(f"Failed to load provider for {outcome_date}: {e}")
+        print(f"Failed to load derivatives warehouse: {e}")
         return
     
     results = []
@@ -161,97 +169,73 @@ def evaluate(reco_file: Path, outcome_date: str):
             results.append(res)
             continue
             
-        # Optional: If already terminated, we skip heavy processing, BUT we still might want to update history if we want to see post-exit moves.
-        # Actually, if SL Hit, trade is over. If T2 Hit, trade is over.
-        # We will assume "Trade Active" check.
-        # is_terminated = res["outcome"] in ["FAILURE", "SUCCESS_T2", "EXPIRED"]
-        
-        # Fetch Data for Today
-        chain = []
+        # Premium path of this contract after the reco date up to the outcome date, capped at
+        # sell_by (moves after the exit don't count). The outcome is replayed from the whole path
+        # every run, a day at a time in date order, so running only on the latest date gives the
+        # same state as running on every day.
+        mysellby = res.get("sell_by")
+        path_end = min(outcome_date, mysellby) if mysellby else outcome_date
+        path = None
         try:
-             chain = provider.get_option_chain(symbol, expiry)
-        except:
-             pass
-             
-        contract = None
-        for c in chain:
-            if abs(c.strike - float(strike or 0)) < 0.1 and c.option_type == side:
-                contract = c
-                break
-        
-        day_high = None
-        day_low = None
-        day_close = None
-        
-        if contract:
-            day_high = contract.high
-            day_low = contract.low
-            day_close = contract.ltp
-            
+            path = wh.premium_path(symbol, expiry, float(strike or 0), side or "", end=path_end)
+            if reco_date != "unknown":
+                path = path[path["date"] > reco_date]
+            path = path.sort_values("date")
+        except Exception:
+            path = None
+
+        if path is not None and len(path):
+            res["outcome"] = "PENDING"
+            res["details"] = ""
+            res["t1_hit_date"] = res["t2_hit_date"] = res["failure_date"] = None
+            res["day_high"], res["day_low"], res["day_close"] = 0, 999999, 0
+
+        t1 = res.get("target1")
+        t2 = res.get("target2")
+        sl = res.get("sl")
+
+        for row in ([] if path is None else path.itertuples(index=False)):
+            day_high = _val(row.high)
+            day_low = _val(row.low)
+            day_close = _val(row.ltp)
+
             # Update State
             if day_high is not None:
                 res["day_high"] = max(res["day_high"] or 0, day_high)
             if day_low is not None:
-                # If simplified 999999 init
-                curr_min = res["day_low"] if res["day_low"] != 999999 else day_low
-                res["day_low"] = min(curr_min, day_low)
+                res["day_low"] = min(res["day_low"], day_low)
             if day_close is not None:
                 res["day_close"] = day_close
-                
+
             # Log History
             if day_high is not None and day_low is not None:
-                hist_entry = { "date": outcome_date, "h": day_high, "l": day_low, "c": day_close }
+                hist_entry = { "date": row.date, "h": day_high, "l": day_low, "c": day_close }
                 # Remove existing entry for same date if re-running
-                clean_hist = [h for h in res.get("history", []) if h["date"] != outcome_date]
+                clean_hist = [h for h in res.get("history", []) if h["date"] != row.date]
                 clean_hist.append(hist_entry)
                 clean_hist.sort(key=lambda x: x["date"])
                 res["history"] = clean_hist
-        
-        # --- Evaluate New Outcome ---
-        
-        # Check Targets (High >= Tx)
-        t1 = res.get("target1")
-        t2 = res.get("target2")
-        h = res.get("day_high", 0)
-        
-        if t2 and h >= t2:
-            res["outcome"] = "SUCCESS_T2"
-            if not res.get("t2_hit_date"):
-                res["t2_hit_date"] = outcome_date
-            # Implicitly T1 is also hit if T2 is hit
-            if not res.get("t1_hit_date"):
-                res["t1_hit_date"] = outcome_date
 
-        elif t1 and h >= t1:
-            # Only update outcome if it wasn't already SUCCESS_T2
-            if res["outcome"] != "SUCCESS_T2":
+            # --- Evaluate this day ---
+            # stop evaluating at the first terminal event
+            if res["outcome"] in ("SUCCESS_T2", "FAILURE"):
+                continue
+
+            # Targets first (High >= Tx); which of SL / target came first inside one day is unknown
+            if t2 and day_high is not None and day_high >= t2:
+                res["outcome"] = "SUCCESS_T2"
+                res["t2_hit_date"] = row.date
+                # Implicitly T1 is also hit if T2 is hit
+                res["t1_hit_date"] = res["t1_hit_date"] or row.date
+            elif t1 and day_high is not None and day_high >= t1 and res["outcome"] != "SUCCESS_T1":
                 res["outcome"] = "SUCCESS_T1"
-            
-            if not res.get("t1_hit_date"):
-                res["t1_hit_date"] = outcome_date
-        
-        # Determine if we are "safe" (Target Hit)
-        is_safe = res["outcome"] in ["SUCCESS_T1", "SUCCESS_T2"]
-        
-        # Check SL (Low <= SL) - ONLY if not safe and not already failed
-        # Note: We check against TODAY's low.
-        if not is_safe and res["outcome"] != "FAILURE" and res["outcome"] != "EXPIRED":
-             # We check specifically if TODAY's low hit the SL, or if the overall low hit SL?
-             # Since we are re-evaluating incrementally, we should check if *cumulative* low hit SL *before* target was hit?
-             # BUT, if we run purely incrementally, we know "previously it wasn't safe".
-             # So if we are not safe now, we check if we failed NOW.
-             
-             # If we just use res["day_low"], that is the all-time low.
-             # If the all-time low is below SL, it failed at SOME point.
-             # However, if it hit target yesterday, and drops today, we are SAFE.
-             # So we must rely on `is_safe` flag which comes from `res["outcome"]`.
-             # If `res["outcome"]` was already SUCCESS_*, `is_safe` is True.
-             
-             if res.get("sl") and res["day_low"] <= res["sl"]:
-                 res["outcome"] = "FAILURE"
-                 res["details"] = f"SL Hit ({res['day_low']} <= {res['sl']})"
-                 if not res.get("failure_date"):
-                     res["failure_date"] = outcome_date
+                res["t1_hit_date"] = row.date
+
+            # SL (Low <= SL) only fails a trade that hasn't banked a target yet
+            elif res["outcome"] == "PENDING" and sl and day_low is not None and day_low <= sl:
+                res["outcome"] = "FAILURE"
+                res["details"] = f"SL Hit ({day_low} <= {sl})"
+                res["failure_date"] = row.date
 
         # Update Details for Success
         details = []
@@ -259,10 +243,10 @@ def evaluate(reco_file: Path, outcome_date: str):
         if res.get("t2_hit_date"): details.append(f"T2 Hit")
         if res["outcome"] in ["SUCCESS_T1", "SUCCESS_T2"]:
              res["details"] = ", ".join(details)
-        
+
         # Check Expiry/SellBy
         is_expired = False
-        if mysellby := res.get("sell_by"):
+        if mysellby:
             try:
                 sb_dt = datetime.strptime(mysellby, "%Y-%m-%d")
                 if outcome_dt and outcome_dt > sb_dt:
@@ -270,15 +254,11 @@ def evaluate(reco_file: Path, outcome_date: str):
             except: pass
 
         # Still pending? check expiry
-        if res["outcome"] == "PENDING":
-            if is_expired:
-                res["outcome"] = "EXPIRED" # Treated as Failure usually
-                res["details"] = f"Time Expired (Sell By {mysellby})"
-                if not res.get("failure_date"):
-                    res["failure_date"] = outcome_date # Expired is a form of failure date
-            else:
-                res["outcome"] = "PENDING"
-        
+        if res["outcome"] == "PENDING" and is_expired:
+            res["outcome"] = "EXPIRED" # Treated as Failure usually
+            res["details"] = f"Time Expired (Sell By {mysellby})"
+            res["failure_date"] = mysellby # Expired is a form of failure date
+
         results.append(res)
 
     # Save
@@ -8,6 +8,7 @@ import subprocess
 
 from stockreco.pipeline.generate_signals_csv import generate_signals_csv, SignalConfig
 from stockreco.ingest.derivatives.option_chain_loader import get_provider
+from stockreco.ingest.derivatives.provider_base import chain_size
 from stockreco.universe.nifty50_static import nifty50_ns
 
 
@@ -37,9 +38,9 @@ def _auto_universe(repo: Path, as_of: str | None, provider_name: str) -> list[st
     for sym in candidates:
         sym_provider = sym.replace(".NS", "")
         try:
-            chain = provider.get_option_chain(sym_provider)
+            n = chain_size(provider, sym_provider)
             # Sanity threshold so we don't include garbage/partial chains
-            if chain and len(chain) > 50:
+            if n > 50:
                 ok.append(sym)
         except Exception:
             pass
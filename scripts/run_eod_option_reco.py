@@ -4,7 +4,10 @@ from __future__ import annotations
 import argparse
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
 import json
+import multiprocessing as mp
+import time
 from typing import List, Dict, Any, Optional
 import csv
 from stockreco.universe.nifty50_static import nifty50_ns
@@ -12,10 +15,14 @@ from stockreco.universe.nifty50_static import nifty50_ns
 
 from stockreco.config.derivatives_config import load_derivatives_config
 from stockreco.ingest.derivatives.option_chain_loader import get_provider
+from stockreco.ingest.derivatives.provider_base import chain_size
 from stockreco.agents.option_reco_agent import OptionRecoAgent, OptionReco
 from stockreco.report.option_reco_report import write_option_recos
-from stockreco.ingest.derivatives.market_stats_loader import load_fovolt_volatility, load_fii_sentiment
 from stockreco.ingest.derivatives.store import DerivativesDataStore
+from stockreco.features.derivatives.iv_surface import IVSurfaceStore
+from stockreco.options.engine import ENGINES, set_engine
+from stockreco.options.montecarlo import simulate_recos
+from stockreco.options.portfolio import betas_from_ohlcv
 
 def _default_universe_from_local_derivs(provider, as_of: str) -> list[str]:
     """
@@ -33,8 +40,8 @@ def _default_universe_from_local_derivs(provider, as_of: str) -> list[str]:
     for sym in candidates:
         sym_provider = sym.replace(".NS", "").replace(".BO", "")
         try:
-            chain = provider.get_option_chain(sym_provider)
-            if chain and len(chain) > 50:  # sanity threshold: avoid tiny/partial
+            n = chain_size(provider, sym_provider)
+            if n > 50:  # sanity threshold: avoid tiny/partial
                 ok.append(sym)
         except Exception:
             pass
@@ -42,6 +49,109 @@ def _default_universe_from_local_derivs(provider, as_of: str) -> list[str]:
     # Keep deterministic order
     return base + sorted(ok)
 
+# Day-level inputs of the proposer step (provider + parsed chain index, signals, aux context).
+# Set once in main() before the --workers pool forks, so children read them copy-on-write.
+_SHARED: Dict[str, Any] = {}
+
+
+def _failed_reco(as_of: str, sym: str, e: Exception) -> OptionReco:
+    return OptionReco(as_of=as_of, symbol=sym, bias="NEUTRAL", instrument="NONE", action="HOLD",
+                      confidence=0.0, rationale=[f"Failed to load derivatives/provider data: {e}"])
+
+
+def _propose(symbols: List[str]) -> List[OptionReco]:
+    """
+    Load inputs for `symbols`, then one recommend_batch call picks contracts for all of them
+    (filters/scoring vectorized over the stacked chains). One reco per symbol, in order.
+    """
+    sh = _SHARED
+    as_of, provider, agent = sh["as_of"], sh["provider"], sh["agent"]
+    signal_map, vol_map, fii_sent = sh["signal_map"], sh["vol_map"], sh["fii_sent"]
+    participant_data, bhav_stats, iv_store = sh["participant_data"], sh["bhav_stats"], sh["iv_store"]
+
+    signals: Dict[str, Dict[str, Any]] = {}
+    underlyings: Dict[str, Any] = {}
+    chains: Dict[str, Any] = {}
+    load_errors: Dict[str, Exception] = {}
+
+    for sym_out in symbols:
+        sym_provider = sym_out.replace(".NS","").replace(".BO","")
+        # Try exact match, then with .NS suffix (common in signal files)
+        signal_row = signal_map.get(sym_out) or signal_map.get(sym_out + ".NS") or signal_map.get(sym_provider)
+        
+        if not signal_row:
+             signal_row = _default_signal(sym_out, mode=sh["signal_mode"])
+        signal_row = dict(signal_row)
+
+        # Inject Aux Data
+        signal_row["volatility_annualized"] = vol_map.get(sym_provider, 0.0)
+        signal_row["fii_sentiment"] = fii_sent
+        
+        # Inject NEW Context
+        signal_row["smart_money_score"] = participant_data.get("smart_money_score", 0.0)
+        signal_row["pcr"] = bhav_stats.get("pcr", {}).get(sym_out, bhav_stats.get("pcr", {}).get(sym_provider, 0.0))
+
+        iv_stats = iv_store.stats(as_of, sym_provider)
+        if iv_stats:
+            signal_row["atm_iv"] = iv_stats.atm_iv
+            signal_row["iv_percentile"] = iv_stats.iv_percentile
+            signal_row["iv_rank"] = iv_stats.iv_rank
+            signal_row["skew_25d"] = iv_stats.skew_25d
+
+        signals[sym_out] = signal_row
+        try:
+            underlyings[sym_out] = provider.get_underlying(sym_provider)
+            chains[sym_out] = provider.get_option_chain(sym_provider)
+        except Exception as e:
+            load_errors[sym_out] = e
+
+    ok_signals = {s: r for s, r in signals.items() if s not in load_errors}
+    on_error = lambda sym, e: _failed_reco(as_of, sym, e)
+    batch = dict(zip(ok_signals, agent.recommend_batch(as_of, ok_signals, underlyings, chains, on_error=on_error)))
+
+    recos = []
+    for sym_out in symbols:
+        reco = _failed_reco(as_of, sym_out, load_errors[sym_out]) if sym_out in load_errors else batch[sym_out]
+        if reco is None:
+            reco = OptionReco(as_of=as_of, symbol=sym_out, bias="NEUTRAL", instrument="NONE", action="HOLD",
+                              confidence=0.0, rationale=["No actionable signal for next session."])
+        recos.append(reco)
+    return recos
+
+
+def _propose_parallel(universe: List[str], workers: int) -> List[OptionReco]:
+    """_propose over contiguous chunks in a forked pool; results come back in universe order."""
+    if workers <= 1 or len(universe) < 2:
+        return _propose(universe)
+    if "fork" not in mp.get_all_start_methods():
+        print("  > --workers needs fork(); running serially.")
+        return _propose(universe)
+    n = min(workers * 4, len(universe))  # a few chunks per worker evens out slow symbols
+    chunks = [universe[i * len(universe) // n:(i + 1) * len(universe) // n] for i in range(n)]
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("fork")) as ex:
+        return [r for part in ex.map(_propose, chunks) for r in part]
+
+
+class _StageClock:
+    """Wall-clock per stage: lap(name) closes the stage that began at the previous lap."""
+
+    def __init__(self):
+        self.start = self.last = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+
+    def lap(self, name: str) -> None:
+        now = time.perf_counter()
+        self.stages[name] = now - self.last
+        self.last = now
+        print(f"[time] {name}: {self.stages[name]:.2f}s")
+
+    def summary(self) -> None:
+        total = time.perf_counter() - self.start
+        print(f"\nStage timings (total {total:.2f}s):")
+        for name, sec in self.stages.items():
+            print(f"  {name:<28} {sec:7.2f}s  {sec / total:6.1%}")
+
+
 def _repo_root() -> Path:
     return Path(__file__).resolve().parent.parent
 
@@ -137,8 +247,18 @@ def main():
     ap.add_argument("--out-dir", default="reports")
     ap.add_argument("--mode", default="strict", choices=["strict", "opportunistic", "speculative"])
     ap.add_argument("--use-llm", action="store_true", help="Enable LLM-based qualitative review and analysis (requires OPENAI_API_KEY)")
+    ap.add_argument("--mc-paths", type=int, default=2000, help="Monte Carlo paths per BUY candidate for T1/T2-before-SL odds (0 = off)")
+    ap.add_argument("--mc-seed", type=int, default=7)
+    ap.add_argument("--pricing-engine", default=None, help=f"Pricing backend for IV/Greeks/scenarios: {', '.join(ENGINES)} (default numpy)")
+    ap.add_argument("--max-net-theta", type=float, default=None, help="Optional cap on the approved book's net theta per day (rupees)")
+    ap.add_argument("--max-net-vega", type=float, default=None, help="Optional cap on the approved book's net vega per vol point (rupees)")
+    ap.add_argument("--max-net-beta-delta", type=float, default=None, help="Optional cap on the approved book's NIFTY beta-delta notional")
+    ap.add_argument("--workers", type=int, default=1, help="Processes for the per-symbol proposer step (fork; 1 = serial)")
 
     args = ap.parse_args()
+    clock = _StageClock()
+    if args.pricing_engine:
+        set_engine(args.pricing_engine)
 
     repo = _repo_root()
     cfg = load_derivatives_config(repo)
@@ -150,13 +270,22 @@ def main():
     signal_map = _load_signals(models_dir)
 
     # NEW: Fetch Derivatives Context (Smart Money, PCR, VIX)
-    store = DerivativesDataStore()
+    # one DerivativesContext per as_of: FOVOLT / participant OI / PCR are parsed once and shared
+    store = DerivativesDataStore(str(repo / "data" / "derivatives"), persist=True)
+    deriv_ctx = store.context(as_of)
     participant_data = store.get_participant_oi(as_of)
     bhav_stats = store.get_bhavcopy_stats(as_of)
     vol_data_new = store.get_market_volatility(as_of)
     
+    # Daily IV surfaces (only new/changed dates are fitted); percentile/rank/skew per underlying
+    iv_store = IVSurfaceStore(repo)
+    built = iv_store.sync()
+    if built:
+        print(f"IV surface: fitted {len(built)} date(s) ({built[0]} .. {built[-1]})")
+
     # Global VIX Proxy (NIFTY annualized vol)
     global_vix = vol_data_new.get("NIFTY", 0.0)
+    clock.lap("signals + derivatives context")
     print(f"Derivatives Context ({as_of}): SmartMoneyScore={participant_data.get('smart_money_score', 0.0):.2f}, VIX(Nifty)={global_vix:.2f}, PCR Coverage={len(bhav_stats.get('pcr', {}))}")
 
     if not args.universe:
@@ -184,6 +313,7 @@ def main():
         # Ensure default universe is also clean
         universe = sorted(list(set([u.replace(".NS","").replace(".BO","") for u in universe])))
 
+    clock.lap("provider + universe")
     from stockreco.agents.option_reco_agent import OptionRecoAgent, OptionRecoConfig
     from stockreco.agents.option_reviewer import review_option_recommendations
     
@@ -196,8 +326,8 @@ def main():
     
     if deriv_date_dir.exists():
         print(f"Loading auxiliary derivatives data from {deriv_date_dir}...")
-        vol_map = load_fovolt_volatility(deriv_date_dir, as_of)
-        fii_sent = load_fii_sentiment(deriv_date_dir, as_of)
+        vol_map = dict(deriv_ctx.fovolt)
+        fii_sent = deriv_ctx.fii_sentiment()
         
         if vol_map:
             print(f"  > Loaded {len(vol_map)} stocks with volatility data.")
@@ -213,58 +343,56 @@ def main():
         print(f"Warning: Derivatives data folder {deriv_date_dir} not found. Skipping auxiliary stats.")
 
     # 1. Proposer Step: Generate candidates
-    recos: List[OptionReco] = []
+    # Make sure the provider's day index and the IV stats are built before forking so workers share them.
+    if hasattr(provider, "underlyings"):
+        provider.underlyings()
+    iv_store.load_stats()
+    _SHARED.update(
+        as_of=as_of, provider=provider, agent=agent, signal_map=signal_map, vol_map=vol_map, fii_sent=fii_sent,
+        participant_data=participant_data, bhav_stats=bhav_stats, iv_store=iv_store,
+        signal_mode=getattr(cfg, "mode", "aggressive"),
+    )
+    recos: List[OptionReco] = _propose_parallel(universe, args.workers)
+    clock.lap(f"proposer x{max(1, args.workers)} ({len(universe)} symbols)")
     candidates_for_llm = []
-    
-    for sym_out in universe:
-        sym_provider = sym_out.replace(".NS","").replace(".BO","")
-        # Try exact match, then with .NS suffix (common in signal files)
-        signal_row = signal_map.get(sym_out) or signal_map.get(sym_out + ".NS") or signal_map.get(sym_provider)
-        
-        if not signal_row:
-             signal_row = _default_signal(sym_out, mode=getattr(cfg, "mode", "aggressive"))
-
-        # Inject Aux Data
-        signal_row["volatility_annualized"] = vol_map.get(sym_provider, 0.0)
-        signal_row["fii_sentiment"] = fii_sent
-        
-        # Inject NEW Context
-        signal_row["smart_money_score"] = participant_data.get("smart_money_score", 0.0)
-        signal_row["pcr"] = bhav_stats.get("pcr", {}).get(sym_out, bhav_stats.get("pcr", {}).get(sym_provider, 0.0))
 
-        try:
-            underlying = provider.get_underlying(sym_provider)
-            chain = provider.get_option_chain(sym_provider)
-            reco = agent.recommend(as_of=as_of, symbol=sym_out, signal_row=signal_row, underlying=underlying, chain=chain)
-            
-            if reco is None:
-                reco = OptionReco(as_of=as_of, symbol=sym_out, bias="NEUTRAL", instrument="NONE", action="HOLD",
-                                  confidence=0.0, rationale=["No actionable signal for next session."])
-            
-            recos.append(reco)
-            
-            # Prepare for LLM (only actionable calls/puts)
-            if reco.instrument == "OPTION" and reco.action == "BUY" and args.use_llm:
-                candidates_for_llm.append({
-                    "symbol": reco.symbol,
-                    "action": reco.action,
-                    "side": reco.side,
-                    "strike": reco.strike,
-                    "expiry": reco.expiry,
-                    "confidence": reco.confidence,
-                    "entry": reco.entry_price,
-                    "iv": reco.iv,
-                    "theta_per_day": reco.theta_per_day,
-                    "rationale": reco.rationale,
-                    "diagnostics": reco.diagnostics
-                })
-                
-        except Exception as e:
-            recos.append(OptionReco(as_of=as_of, symbol=sym_out, bias="NEUTRAL", instrument="NONE", action="HOLD",
-                                   confidence=0.0, rationale=[f"Failed to load derivatives/provider data: {e}"]))
-
-    # 2. Rule-Based Reviewer
-    reviewed = review_option_recommendations(recos, mode=args.mode, vix=global_vix)
+    for reco in recos:
+        # Prepare for LLM (only actionable calls/puts)
+        if reco.instrument == "OPTION" and reco.action == "BUY" and args.use_llm:
+            candidates_for_llm.append({
+                "symbol": reco.symbol,
+                "action": reco.action,
+                "side": reco.side,
+                "strike": reco.strike,
+                "expiry": reco.expiry,
+                "confidence": reco.confidence,
+                "entry": reco.entry_price,
+                "iv": reco.iv,
+                "theta_per_day": reco.theta_per_day,
+                "rationale": reco.rationale,
+                "diagnostics": reco.diagnostics
+            })
+
+    # 1b. Monte Carlo T1/T2-before-SL odds + holding time, all BUY candidates in one batch
+    if args.mc_paths > 0:
+        mc = simulate_recos(recos, r=agent.cfg.r_rate, n_paths=args.mc_paths, seed=args.mc_seed)
+        n_mc = 0
+        for reco, m in zip(recos, mc):
+            if m is not None:
+                reco.diagnostics = dict(reco.diagnostics or {}, mc=m)
+                n_mc += 1
+        print(f"Monte Carlo: {n_mc} candidate(s) x {args.mc_paths} paths")
+        clock.lap("monte carlo")
+
+    # 2. Rule-Based Reviewer (+ portfolio Greeks caps, stock deltas mapped to NIFTY by beta)
+    betas = betas_from_ohlcv(repo / "data" / "ohlcv.parquet")
+    reviewed = review_option_recommendations(
+        recos, mode=args.mode, vix=global_vix, betas=betas,
+        max_net_beta_delta=args.max_net_beta_delta, max_net_vega=args.max_net_vega, max_net_theta=args.max_net_theta,
+    )
+    pf = reviewed["portfolio"]["total"]
+    clock.lap("reviewer + portfolio")
+    print(f"Portfolio: beta-delta {pf['beta_delta']:,.0f}  vega/pt {pf['vega_1pt']:,.0f}  theta/day {pf['theta_day']:,.0f}")
     
     # SORT: Sort BOTH lists by confidence descending
     # This ensures the 'recommender' list in JSON (used by UI for rejected items) is also sorted
@@ -313,6 +441,7 @@ def main():
     with open(analyst_json_path, "w") as f:
         json.dump(analyst_report, f, indent=2)
     print(f"Wrote Analyst Report: {analyst_json_path}")
+    clock.lap("analyst")
     
     # Legacy LLM logic (embedded in script) - REMOVED/REPLACED by Analyst Agent above
     # The Analyst Agent now encapsulates the LLM analysis logic logic.
@@ -332,6 +461,7 @@ def main():
     paths = write_option_recos(out, as_of, reviewed)
     print(f"Wrote: {paths['json']}")
     print(f"Wrote: {paths['csv']}")
+    clock.lap("write reports")
     
     # Print summary
     total = len(recos)
@@ -349,6 +479,8 @@ def main():
             prefix = "🤖 " if "[LLM]" in reason else "  - "
             print(f"{prefix}{r.get('symbol')} ({r.get('side', 'N/A')} {r.get('strike', 'N/A')}): {reason}")
 
+    clock.summary()
+
 
 if __name__ == "__main__":
     main()
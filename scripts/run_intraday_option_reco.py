@@ -8,6 +8,7 @@ import json
 
 from stockreco.config.derivatives_config import load_derivatives_config
 from stockreco.ingest.derivatives.option_chain_loader import get_provider
+from stockreco.ingest.derivatives.provider_base import chain_size
 from stockreco.agents.intraday_option_agent import IntradayOptionAgent
 from stockreco.universe.nifty50_static import nifty50_ns
 
@@ -19,8 +20,8 @@ def _default_universe_from_local_derivs(provider, as_of: str) -> list[str]:
     for sym in candidates:
         sym_provider = sym.replace(".NS", "").replace(".BO", "")
         try:
-            chain = provider.get_option_chain(sym_provider)
-            if chain and len(chain) > 50:
+            n = chain_size(provider, sym_provider)
+            if n > 50:
                 ok.append(sym)
         except Exception:
             pass
@@ -6,29 +6,16 @@ from datetime import datetime, timedelta
 import math
 
 from stockreco.ingest.derivatives.provider_base import OptionChainRow, UnderlyingSnapshot, normalize_to_nse_symbol
-from stockreco.options.greeks import implied_vol, bs_greeks, intrinsic_extrinsic
+from stockreco.features.derivatives.oi_profile import oi_profile
+from stockreco.options.engine import greeks_one, implied_vol_one
+from stockreco.options.greeks import intrinsic_extrinsic
 from stockreco.options.risk import delta_based_sl
 
-# Re-use some helpers from the main agent if possible, or redefine for independence
-# To keep independence, we redefine essentials here.
+from stockreco.utils.market_calendar import dte_table
 
-def _parse_expiry(exp: str) -> Optional[datetime]:
-    if not exp:
-        return None
-    try:
-        return datetime.strptime(str(exp).strip(), "%d-%b-%Y")
-    except Exception:
-        try:
-            return datetime.strptime(str(exp).strip(), "%Y-%m-%d")
-        except Exception:
-            return None
 
 def _days_to_expiry(as_of: str, expiry: str) -> Optional[int]:
-    a = datetime.strptime(as_of, "%Y-%m-%d")
-    e = _parse_expiry(expiry)
-    if not e:
-        return None
-    return max(0, (e.date() - a.date()).days)
+    return dte_table(as_of).calendar(expiry)
 
 def _round2(x: Optional[float]) -> Optional[float]:
     if x is None: return None
@@ -197,8 +184,8 @@ class IntradayOptionAgent:
         
         # Greeks for diagnostics
         T = max(1e-6, best_dte / 365.0)
-        iv = implied_vol(entry, spot, strike, T, 0.07, side)
-        g = bs_greeks(spot, strike, T, 0.07, iv, side) if iv else None
+        iv = implied_vol_one(entry, spot, strike, T, 0.07, side)
+        g = greeks_one(spot, strike, T, 0.07, iv, side) if iv else None
         
         # Confidence Tuning
         # Base: 0.4. Max 0.9.
@@ -207,6 +194,18 @@ class IntradayOptionAgent:
         conf = 0.4 + abs(direction_score)
         if best_score < 10: conf -= 0.1
         if best_dte < 5: conf -= 0.1 # Theta risk
+
+        # OI structure of the picked expiry: a same-side OI peak at the picked strike, or the
+        # nearest one within 1 ATR of spot, is where writers will defend -> caps the move
+        prof = oi_profile(as_of, s, chain, best_row.expiry)
+        walls = prof.walls_above(spot, side) if side == "CE" else prof.walls_below(spot, side)
+        oi_note = None
+        if prof.is_peak(strike, side):
+            conf -= 0.1
+            oi_note = f"OI wall: {side} OI peaks at the picked strike {strike}"
+        elif len(walls) and abs(float(walls[0]) - spot) <= atr_points:
+            conf -= 0.05
+            oi_note = f"OI wall: {side} OI peak at {float(walls[0])} within 1 ATR of spot"
         
         conf = min(0.90, max(0.1, conf))
         
@@ -229,12 +228,15 @@ class IntradayOptionAgent:
             f"Stop Loss: {stop_loss:.2f} ({sl_pct*100:.1f}%)",
             f"Sell-By: {sell_by} (Strict T+1 Exit)"
         ]
+        if oi_note:
+            rationale.append(oi_note)
         
         diagnostics = {
                 "direction_score": direction_score,
                 "moneyness_score": best_score,
                 "iv": iv,
-                "rr_ratio": float(f"{rr_ratio:.2f}")
+                "rr_ratio": float(f"{rr_ratio:.2f}"),
+                "oi_profile": prof.to_dict(),
         }
         
         return IntradayOptionReco(
@@ -91,6 +91,24 @@ class OptionAnalystAgent:
                 elif pcr < 0.6:
                     summary += f" PCR({pcr:.2f}) is low (Oversold risk)."
 
+            # --- Rule: OI Structure (profile computed once per expiry by the reco agent) ---
+            prof = (reco.diagnostics or {}).get("oi_profile") or {}
+            spot = reco.spot or 0.0
+            if prof and spot > 0:
+                if reco.side == "CE":
+                    wall = min((k for k in prof.get("ce_peaks") or [] if k > spot), default=None)
+                    against = prof.get("max_pain") is not None and prof["max_pain"] < spot
+                else:
+                    wall = max((k for k in prof.get("pe_peaks") or [] if k < spot), default=None)
+                    against = prof.get("max_pain") is not None and prof["max_pain"] > spot
+                if wall is not None:
+                    summary += f" Nearest {reco.side} OI wall at {wall:g} ({abs(wall - spot) / spot:.1%} from spot)."
+                if against:
+                    summary += f" Max pain {prof['max_pain']:g} pulls against the trade into expiry."
+                    if verdict == "STRONG_BUY" and wall is not None:
+                        verdict = "BUY"
+                        summary += " Downgraded from Strong Buy (OI wall + max pain against)."
+
             # --- Rule: Volatility Extremes ---
             # Agent handles this, but Analyst confirms.
             # If iv is very high (>50%) and we are buying, downgrade to WATCH
@@ -1,18 +1,24 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Optional, Dict, Any, Tuple, Literal
+from typing import Callable, List, Optional, Dict, Any, Tuple, Literal, Union
 from datetime import datetime, timedelta
-import math
+
+import numpy as np
+import pandas as pd
 
 from stockreco.ingest.derivatives.provider_base import OptionChainRow, UnderlyingSnapshot, normalize_to_nse_symbol
-from stockreco.options.greeks import implied_vol, bs_greeks, intrinsic_extrinsic
+from stockreco.ingest.derivatives.option_chain import OptionChain
+from stockreco.features.derivatives.oi_profile import oi_profile
+from stockreco.options.greeks import intrinsic_extrinsic
+from stockreco.options.engine import get_engine, greeks_one, implied_vol_one
 from stockreco.options.risk import delta_based_sl
+from stockreco.options.reco_inputs import horizon_days
+from stockreco.options.scenarios import analyze as analyze_scenarios, build_grid
+from stockreco.utils.market_calendar import dte_table, expiry_date
 
 Mode = Literal["strict", "opportunistic", "speculative"]
 
-_EXP_FMT = "%d-%b-%Y"
-
 # Known cash-settled indices (no physical delivery risk)
 _INDICES = {"NIFTY", "BANKNIFTY", "FINNIFTY", "MIDCPNIFTY", "SENSEX", "BANKEX"}
 
@@ -35,8 +41,6 @@ def _ensure_sell_by(row: dict) -> dict:
 
     # if you have expiry + as_of, set conservative fallback sell_by = as_of + 2 days (cap at expiry-1)
     try:
-        from datetime import datetime, timedelta
-        from stockreco.options.option_reco_agent import _parse_expiry  # if available in that module
         a = datetime.strptime(row["as_of"], "%Y-%m-%d")
         e = _parse_expiry(row.get("expiry"))
         if e:
@@ -53,36 +57,13 @@ def _ensure_sell_by(row: dict) -> dict:
     return row
 
 def _parse_expiry(exp: str) -> Optional[datetime]:
-    if not exp:
-        return None
-    exp = str(exp).strip()
-    # Format: DD-MMM-YYYY (e.g. 16-DEC-2025)
-    try:
-        return datetime.strptime(exp, _EXP_FMT)
-    except Exception:
-        pass
-        
-    # Format: ISO YYYY-MM-DD
-    try:
-        return datetime.strptime(exp, "%Y-%m-%d")
-    except Exception:
-        pass
-
-    # Format: DD/MM/YYYY (e.g. 16/12/2025)
-    try:
-        return datetime.strptime(exp, "%d/%m/%Y")
-    except Exception:
-        pass
-        
-    return None
+    """DD-MMM-YYYY / YYYY-MM-DD / DD/MM/YYYY expiry -> datetime (memoized in utils.market_calendar)."""
+    e = expiry_date(exp) if exp else None
+    return datetime.combine(e, datetime.min.time()) if e else None
 
 
 def _days_to_expiry(as_of: str, expiry: str) -> Optional[int]:
-    a = datetime.strptime(as_of, "%Y-%m-%d")
-    e = _parse_expiry(expiry)
-    if not e:
-        return None
-    return max(0, (e.date() - a.date()).days)
+    return dte_table(as_of).calendar(expiry)
 
 
 def _round2(x: Optional[float]) -> Optional[float]:
@@ -94,23 +75,105 @@ def _round2(x: Optional[float]) -> Optional[float]:
         return None
 
 
-def _median_step(strikes: List[float]) -> float:
-    s = sorted({float(x) for x in strikes if x is not None})
-    if len(s) < 2:
-        return 1.0
-    diffs = [abs(s[i + 1] - s[i]) for i in range(len(s) - 1) if abs(s[i + 1] - s[i]) > 0]
-    if not diffs:
-        return 1.0
-    diffs.sort()
-    return diffs[len(diffs) // 2]
-
-
 def _round_to_step(x: float, step: float) -> float:
     if step <= 0:
         return x
     return round(x / step) * step
 
 
+@dataclass
+class _Setup:
+    """Per-symbol inputs of the contract pick (OptionRecoAgent._setup -> _select_contracts -> _finish)."""
+    symbol: str
+    spot: float
+    side: str
+    bias: str
+    edge: float
+    atr_points: float
+    direction_score: float
+    buy_win: int
+    sell_win: int
+    buy_soft: float
+    sell_soft: float
+    vol_annual: float
+    fii_sent: float
+    has_bulk: int
+    diag_base: Dict[str, Any]
+    is_index: bool
+    min_strike: float
+    max_strike: float
+
+
+def _score_contracts(strike, oi, volume, dte, spot, atr_points) -> np.ndarray:
+    """
+    score: near ATM + high OI + moderate premium (avoid deep ITM/OTM), per row.
+    atm distance in ATR units (0.0 = exact spot); liquidity is log-scaled so the biggest OI wall
+    (100k OI -> 0.5, 1M -> 0.6) can't override a 0.5 ATR distance; mild preference for ~14 DTE.
+    """
+    atm = np.abs(strike - spot) / np.maximum(1.0, atr_points)
+    oi = np.nan_to_num(oi, nan=0.0)
+    vol = np.nan_to_num(volume, nan=0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        liq_score = np.where(oi > 0, 0.1 * np.log10(oi), 0.0) + np.where(vol > 0, 0.05 * np.log10(vol), 0.0)
+    dte_pref = np.abs(dte - 14) / 14.0
+    return -atm + liq_score - 0.002 * dte_pref
+
+
+def _group_any(mask: np.ndarray, gid: np.ndarray, n_groups: int) -> np.ndarray:
+    return np.bincount(gid[mask], minlength=n_groups) > 0
+
+
+def _select_contracts(
+    cfg: "OptionRecoConfig",
+    min_dte: int,
+    dte: np.ndarray,
+    oc: OptionChain,
+    gid: np.ndarray,
+    setups: List[_Setup],
+) -> List[Optional[Tuple[int, int]]]:
+    """
+    Best contract per group of rows (gid = index into setups; one group per symbol): side + DTE
+    window + moneyness band + liquidity, stocks preferring expiries outside the margin window,
+    else the relaxed fallback (nearest expiry, half the liquidity). Returns (row index, dte) per
+    group, None when nothing qualifies. Ties go to the first row in chain order.
+    """
+    G = len(setups)
+    n = len(oc)
+    col = lambda f: np.array([f(st) for st in setups])[gid] if n else np.zeros(0)
+    side_m = oc.is_call == col(lambda st: st.side == "CE").astype(bool)
+    is_index = col(lambda st: st.is_index).astype(bool)
+
+    cand = (
+        side_m
+        & (dte >= min_dte)
+        & (dte <= cfg.max_dte)
+        & (oc.strike >= col(lambda st: st.min_strike))
+        & (oc.strike <= col(lambda st: st.max_strike))
+        & oc.min_liquidity(cfg.min_oi, cfg.min_volume)
+    )
+    # Expiry Week Logic: for stocks use 'safe' expiries (>= margin_period_days) exclusively when
+    # there are any; else keep the danger-zone ones (sell_by gets capped later)
+    safe = cand & ~is_index & (dte >= cfg.margin_period_days)
+    cand = np.where(_group_any(safe, gid, G)[gid], safe, cand)
+    # relax DTE as fallback: nearest expiry (but still avoid 0DTE)
+    fallback = side_m & (dte >= 1) & oc.min_liquidity(cfg.min_oi * 0.5, cfg.min_volume * 0.5)
+    cand = np.where(_group_any(cand, gid, G)[gid], cand, fallback)
+
+    score = _score_contracts(
+        oc.strike, oc.oi, oc.volume, dte, col(lambda st: st.spot), col(lambda st: st.atr_points)
+    )
+    score = np.where(cand, score, -np.inf)
+    order = np.lexsort((np.arange(n), -score, gid))
+    first = np.ones(n, dtype=bool)
+    first[1:] = gid[order][1:] != gid[order][:-1]
+
+    out: List[Optional[Tuple[int, int]]] = [None] * G
+    for i in order[first]:
+        if cand[i]:
+            out[int(gid[i])] = (int(i), int(dte[i]))
+    return out
+
+
 @dataclass
 class OptionReco:
     as_of: str
@@ -199,8 +262,16 @@ class OptionRecoConfig:
 
     # IV/theta heuristics
     r_rate: float = 0.07
+    # options/engine.py registry name ("numpy", "lut", "tree"/"binomial", ...); None = process default.
+    # Early-exercise engines (tree) only price stock options; cash-settled indices stay European.
+    pricing_engine: Optional[str] = None
+    max_iv_percentile: float = 90.0  # confidence haircut at/above this IV percentile
+    max_skew_25d: float = 0.05  # 5 vol points of 25-delta skew against the chosen side
     theta_sell_by_budget_frac: float = 0.45  # max allowed theta burn vs extrinsic
 
+    # spot x IV x days scenario grid per trade (options/scenarios.py) -> diagnostics["scenario"]
+    scenario_grid: bool = True
+
     # NEW: directional thresholds (per mode; defaults tuned for NSE options)
     strict_min_dir: float = 0.15
     opp_min_dir: float = 0.08
@@ -303,8 +374,7 @@ class OptionRecoAgent:
             best_exp = expiries[0]
             best_dte = _days_to_expiry(as_of, best_exp) or None
 
-        strikes = [float(r.strike) for r in chain if r.expiry == best_exp and r.strike is not None]
-        step = _median_step(strikes)
+        step = OptionChain.from_rows(chain).ladder(best_exp).step
         atm = _round_to_step(spot, step)
         wing = max(step, _round_to_step(0.5 * atr_points, step))
         low_k = atm - wing
@@ -347,13 +417,87 @@ class OptionRecoAgent:
         in the DTE window, and attaches IV/theta + sell_by to manage time decay.
         Also supports range-trade suggestion in opportunistic/speculative when direction is unclear.
         """
+        st = self._setup(as_of, symbol, signal_row, underlying, chain)
+        if isinstance(st, OptionReco):
+            return st
+        oc = OptionChain.from_rows(chain)
+        pick = _select_contracts(self.cfg, self._min_dte(), oc.days_to_expiry(as_of), oc, np.zeros(len(oc), dtype=np.intp), [st])[0]
+        if pick is None:
+            return self._no_candidates(as_of, st)
+        return self._finish(as_of, st, signal_row, oc, *pick)
+
+    def recommend_batch(
+        self,
+        as_of: str,
+        signals: Any,
+        underlyings: Dict[str, UnderlyingSnapshot],
+        chains: Dict[str, List[OptionChainRow]],
+        on_error: Optional[Callable[[str, Exception], OptionReco]] = None,
+    ) -> List[OptionReco]:
+        """
+        recommend() for a whole universe: signals is a DataFrame (one row per symbol, "symbol"
+        column or index) or a {symbol: signal_row} dict; underlyings / chains are keyed the same way.
+        The DTE / moneyness / liquidity filters and contract scoring run once over all chains
+        stacked together (best contract per symbol by a group-wise argmax). Returns the same
+        OptionReco objects as calling recommend() per symbol, in signals order.
+        A symbol that fails (bad spot, missing chain) raises, or goes to on_error(symbol, exc)
+        whose reco is used instead.
+        """
+        if isinstance(signals, pd.DataFrame):
+            df = signals if "symbol" in signals.columns else signals.rename_axis("symbol").reset_index()
+            rows = [(str(r.pop("symbol")), r) for r in df.to_dict("records")]
+        else:
+            rows = [(sym, dict(r)) for sym, r in signals.items()]
+
+        out: List[Optional[OptionReco]] = [None] * len(rows)
+        todo = []  # (position, signal_row, setup, chain)
+        for i, (sym, signal_row) in enumerate(rows):
+            try:
+                chain = chains[sym]
+                st = self._setup(as_of, sym, signal_row, underlyings[sym], chain)
+            except Exception as e:
+                if on_error is None:
+                    raise
+                out[i] = on_error(sym, e)
+                continue
+            if isinstance(st, OptionReco):
+                out[i] = st
+            else:
+                todo.append((i, signal_row, st, OptionChain.from_rows(chain)))
+
+        if todo:
+            ocs = [t[3] for t in todo]
+            stacked = OptionChain.concat(ocs)
+            gid = np.repeat(np.arange(len(ocs)), [len(oc) for oc in ocs])
+            picks = _select_contracts(self.cfg, self._min_dte(), stacked.days_to_expiry(as_of), stacked, gid, [t[2] for t in todo])
+            offsets = np.concatenate([[0], np.cumsum([len(oc) for oc in ocs])])
+            for (i, signal_row, st, oc), pick, off in zip(todo, picks, offsets):
+                try:
+                    if pick is None:
+                        out[i] = self._no_candidates(as_of, st)
+                    else:
+                        idx, dte = pick
+                        out[i] = self._finish(as_of, st, signal_row, oc, idx - int(off), dte)
+                except Exception as e:
+                    if on_error is None:
+                        raise
+                    out[i] = on_error(st.symbol, e)
+        return out
+
+    def _setup(
+        self,
+        as_of: str,
+        symbol: str,
+        signal_row: Dict[str, Any],
+        underlying: UnderlyingSnapshot,
+        chain: List[OptionChainRow],
+    ) -> Union[OptionReco, "_Setup"]:
+        """Direction / side for one symbol: a finished HOLD reco (no edge, range regime) or the _Setup to pick a contract for."""
         s = normalize_to_nse_symbol(symbol)
         spot = float(getattr(underlying, "spot", None) or 0.0)
         if spot <= 0:
             raise RuntimeError("Underlying spot missing/invalid")
             
-        rationale: List[str] = []
-
         # Direction decision from signals.csv (buy_win/sell_win + soft scores)
         buy_win = int(signal_row.get("buy_win", 0) or 0)
         sell_win = int(signal_row.get("sell_win", 0) or 0)
@@ -471,100 +615,62 @@ class OptionRecoAgent:
                 spot=_round2(spot),
             )
 
-        # choose expiry window and near-the-money strike (liquid)
-        min_strike = spot - self.cfg.max_moneyness_atr * atr_points
-        max_strike = spot + self.cfg.max_moneyness_atr * atr_points
-
-        # filter chain by side + DTE window + moneyness band
-        candidates: List[Tuple[OptionChainRow, int]] = []
-        min_dte = self._min_dte()
-        
-        is_index = _is_index(s)
-
-        for r in chain:
-            if (r.option_type or "").upper() != side:
-                continue
-            dte = _days_to_expiry(as_of, r.expiry)
-            if dte is None:
-                continue
-            if dte < min_dte or dte > self.cfg.max_dte:
-                continue
-            if r.strike < min_strike or r.strike > max_strike:
-                continue
-            if self.cfg.min_oi and (r.oi or 0) < self.cfg.min_oi:
-                continue
-            if self.cfg.min_volume and (r.volume or 0) < self.cfg.min_volume:
-                continue
-            candidates.append((r, dte))
-
-        # Expiry Week Logic: For Stocks, prefer 'safe' expiries (>= margin_period_days)
-        if candidates and not is_index:
-            safe = [c for c in candidates if c[1] >= self.cfg.margin_period_days]
-            if safe:
-                # We have options outside the danger zone, use them exclusively
-                candidates = safe
-            # Else: we only have danger zone options. Use them, but we'll cap sell_by later.
-
-        if not candidates:
-            # relax DTE as fallback: pick nearest expiry (but still avoid 0DTE)
-            for r in chain:
-                if (r.option_type or "").upper() != side:
-                    continue
-                dte = _days_to_expiry(as_of, r.expiry)
-                if dte is None or dte < 1:
-                    continue
-                if self.cfg.min_oi and (r.oi or 0) < (self.cfg.min_oi * 0.5):
-                    continue
-                if self.cfg.min_volume and (r.volume or 0) < (self.cfg.min_volume * 0.5):
-                    continue
-                candidates.append((r, dte))
-
-        if not candidates:
-            conf = max(self.cfg.conf_floor_hold, 0.12)
-            explain = f"No suitable {side} options found after expiry/liquidity filters (min_oi={self.cfg.min_oi})."
-            diagnostics = dict(diag_base)
-
-            diagnostics["confidence_explain"] = explain
-            return OptionReco(
-                as_of=as_of,
-                symbol=s,
-                bias="NEUTRAL",
-                instrument="NONE",
-                action="HOLD",
-                confidence=float(f"{conf:.2f}"),
-                rationale=[explain],
-                diagnostics=diagnostics,
-                spot=_round2(spot),
-            )
+        return _Setup(
+            symbol=s,
+            spot=spot,
+            side=side,
+            bias=bias,
+            edge=edge,
+            atr_points=atr_points,
+            direction_score=direction_score,
+            buy_win=buy_win,
+            sell_win=sell_win,
+            buy_soft=buy_soft,
+            sell_soft=sell_soft,
+            vol_annual=vol_annual,
+            fii_sent=fii_sent,
+            has_bulk=has_bulk,
+            diag_base=diag_base,
+            is_index=_is_index(s),
+            min_strike=spot - self.cfg.max_moneyness_atr * atr_points,
+            max_strike=spot + self.cfg.max_moneyness_atr * atr_points,
+        )
 
-        # score: near ATM + high OI + moderate premium (avoid deep ITM/OTM)
-        def score_row(row: OptionChainRow, dte: int) -> float:
-            # atm distance in ATR units
-            # we prefer being slightly ITM or ATM, rather than OTM
-            # normalized: 0.0 = exact spot
-            atm = abs(row.strike - spot) / max(1.0, atr_points)
-            
-            oi = float(row.oi or 0.0)
-            vol = float(row.volume or 0.0)
-            
-            # Use log scaling for liquidity to avoid "buying the wall" (highest OI = resistance)
-            # 100k OI -> 5.0, 1M OI -> 6.0. 
-            # This ensures we pick liquid strikes but don't let 2M OI override 0.5 ATR distance.
-            liq_score = 0.0
-            if oi > 0:
-                liq_score += 0.1 * math.log10(oi)
-            if vol > 0:
-                liq_score += 0.05 * math.log10(vol)
-
-            # prefer 7-21 DTE (approx 2 weeks)
-            dte_pref = abs(dte - 14) / 14.0
-            
-            # small penalty for high premium to improve RR, but not primary driver
-            # prem_penalty = 0.0001 * float(row.ltp or 0)
+    def _no_candidates(self, as_of: str, st: "_Setup") -> OptionReco:
+        conf = max(self.cfg.conf_floor_hold, 0.12)
+        explain = f"No suitable {st.side} options found after expiry/liquidity filters (min_oi={self.cfg.min_oi})."
+        diagnostics = dict(st.diag_base)
 
-            return -atm + liq_score - 0.002 * dte_pref
+        diagnostics["confidence_explain"] = explain
+        return OptionReco(
+            as_of=as_of,
+            symbol=st.symbol,
+            bias="NEUTRAL",
+            instrument="NONE",
+            action="HOLD",
+            confidence=float(f"{conf:.2f}"),
+            rationale=[explain],
+            diagnostics=diagnostics,
+            spot=_round2(st.spot),
+        )
 
-        best, best_dte = max(candidates, key=lambda x: score_row(x[0], x[1]))
+    def _finish(
+        self,
+        as_of: str,
+        st: "_Setup",
+        signal_row: Dict[str, Any],
+        oc: OptionChain,
+        idx: int,
+        best_dte: int,
+    ) -> OptionReco:
+        """Entry / SL / targets, Greeks, confidence adjustments and rationale for the picked contract oc[idx]."""
+        s, spot, side, bias, edge, atr_points = st.symbol, st.spot, st.side, st.bias, st.edge, st.atr_points
+        direction_score, buy_win, sell_win = st.direction_score, st.buy_win, st.sell_win
+        buy_soft, sell_soft = st.buy_soft, st.sell_soft
+        vol_annual, fii_sent, has_bulk = st.vol_annual, st.fii_sent, st.has_bulk
+        diag_base, is_index = st.diag_base, st.is_index
+        best = oc.take([idx]).rows()[0]
+        rationale: List[str] = []
 
         ltp = float(best.ltp)
         strike = float(best.strike)
@@ -572,8 +678,11 @@ class OptionRecoAgent:
         T = max(1e-6, dte / 365.0)
 
         # IV + greeks
-        iv = implied_vol(ltp, spot, strike, T, self.cfg.r_rate, side)
-        g = bs_greeks(spot, strike, T, self.cfg.r_rate, iv, side) if iv else None
+        eng = get_engine(self.cfg.pricing_engine)
+        if is_index and not eng.european:
+            eng = get_engine("numpy")
+        iv = implied_vol_one(ltp, spot, strike, T, self.cfg.r_rate, side, engine=eng)
+        g = greeks_one(spot, strike, T, self.cfg.r_rate, iv, side, engine=eng) if iv else None
         intrinsic, extrinsic = intrinsic_extrinsic(spot, strike, ltp, side)
 
         # Entry, SL, Targets on premium
@@ -696,6 +805,18 @@ class OptionRecoAgent:
                 conf *= 0.85
                 rationale.append(f"Low PCR ({pcr:.2f}): Market potentially oversold. Limit downside.")
 
+        # 6. IV regime vs the underlying's own history (features/derivatives/iv_surface.py)
+        iv_pctl = signal_row.get("iv_percentile")
+        skew_25d = signal_row.get("skew_25d")
+        if iv_pctl is not None and float(iv_pctl) >= self.cfg.max_iv_percentile:
+            conf *= 0.90
+            rationale.append(f"IV percentile {float(iv_pctl):.0f}: options rich vs history (IV crush risk).")
+        if skew_25d is not None:
+            # paying up for the expensive wing
+            if (side == "PE" and float(skew_25d) > self.cfg.max_skew_25d) or (side == "CE" and float(skew_25d) < -self.cfg.max_skew_25d):
+                conf *= 0.95
+                rationale.append(f"25-delta skew {float(skew_25d) * 100:+.1f} vol pts: buying the rich wing.")
+
 
         # floors
         if self.cfg.mode == "strict":
@@ -725,34 +846,10 @@ class OptionRecoAgent:
         # "Resistance" = Call Writing (Positive OI Change on CE side > PE side)
         # "Support" = Put Writing (Positive OI Change on PE side > CE side)
         
-        resistance_strike = None
-        support_strike = None
-        max_ce_change = 0.0
-        max_pe_change = 0.0
-        
-        # Build map of strikes to OI Change
-        ce_changes = {}
-        pe_changes = {}
-        
-        for r in chain:
-            strike_val = float(r.strike)
-            # consider only near-term expiries (e.g. current selected best expiry or nearby)
-            # strict matching might be too narrow if liquidity is split, but let's stick to best.expiry for relevance
-            if r.expiry != best.expiry:
-                continue
-                
-            chg = float(r.oi_change or 0.0)
-            if chg > 0:
-                if r.option_type == "CE":
-                    ce_changes[strike_val] = chg
-                    if chg > max_ce_change:
-                        max_ce_change = chg
-                        resistance_strike = strike_val
-                elif r.option_type == "PE":
-                    pe_changes[strike_val] = chg
-                    if chg > max_pe_change:
-                        max_pe_change = chg
-                        support_strike = strike_val
+        # consider only the selected expiry (liquidity split across expiries makes others noisy)
+        prof = oi_profile(as_of, s, oc, best.expiry)
+        max_ce_change, resistance_strike = prof.max_ce_chg, prof.call_chg_wall
+        max_pe_change, support_strike = prof.max_pe_chg, prof.put_chg_wall
 
         # Logic: If we are buying CE, check for Resistance (Call Writing) ahead
         # If Resistance strike is strictly above Spot (OTM) and below/at Target 2, it's a blocker.
@@ -761,7 +858,7 @@ class OptionRecoAgent:
                 # Is this a "significant" wall? compare to max_pe_change or absolute threshold?
                 # For now, just existence of local max Call Writing overhead is bad.
                 # Heuristic: If Call Writing > 1.5x Put Writing at this strike (net bearish flow)
-                pe_chg_at_res = pe_changes.get(resistance_strike, 0.0)
+                pe_chg_at_res = prof.chg_at(resistance_strike, "PE")
                 if max_ce_change > 0 and (max_ce_change > 1.5 * pe_chg_at_res):
                     conf *= 0.75
                     rationale.append(f"Resistance Warning: Heavy Call Writing at {resistance_strike} (OI Chg +{int(max_ce_change)}).")
@@ -769,36 +866,32 @@ class OptionRecoAgent:
         # Logic: If we are buying PE, check for Support (Put Writing) below
         if side == "PE":
             if support_strike and support_strike < spot and support_strike >= t2_u:
-                ce_chg_at_sup = ce_changes.get(support_strike, 0.0)
+                ce_chg_at_sup = prof.chg_at(support_strike, "CE")
                 if max_pe_change > 0 and (max_pe_change > 1.5 * ce_chg_at_sup):
                     conf *= 0.75
                     rationale.append(f"Support Warning: Heavy Put Writing at {support_strike} (OI Chg +{int(max_pe_change)}).")
 
         # 4. OI-Based Support & Resistance (Total OI Walls)
         # Fallback since CHG_IN_OI might be missing: use Total OI Profile
-        # If the selected strike (or immediate target) is a glowing hot OI peak, it's resistance/support.
-        
-        # Check if we are buying into the "Wall" (Total Open Interest)
-        max_oi = max([float(c[0].oi or 0) for c in candidates]) if candidates else 0
+        # If the selected strike is a local OI peak on its side (vs the strikes around it in this
+        # expiry), it's resistance/support for the contract we're buying.
         current_oi = float(best.oi or 0)
-        
-        # Threshold: 80% of Max OI is significant enough (was 95%)
-        # Also check local peak: is it > 2x the neighbor?
-        # (Neighbors logic requires sorted access, simplified here to just global stats)
-        
+
         is_oi_wall = False
         wall_reason = ""
-        
-        if max_oi > 0:
-            if current_oi >= max_oi * 0.80:
-                is_oi_wall = True
-                wall_reason = f"High Total OI ({int(current_oi)}) relative to chain max ({int(max_oi)})."
-        
+
+        if prof.is_peak(strike, side):
+            is_oi_wall = True
+            wall_reason = (
+                f"Local {side} OI peak at {strike} ({int(current_oi)} vs ~{int(prof.neighbors_mean(strike, side))} "
+                f"on neighbouring strikes)."
+            )
+
         # Check OI Change if available (defensive)
         change_wall = False
         if side == "CE":
              # Check for massive Call Writing
-             # We use the map built above: ce_changes
+             # We use the profile built above: call_chg_wall
              # Resistance is dangerous if it's AT the strike or slightly OTM
              res_level = resistance_strike if (resistance_strike and max_ce_change > 50000) else None 
              if res_level:
@@ -818,6 +911,17 @@ class OptionRecoAgent:
         if sell_by:
             rationale.append(f"Sell-by {sell_by} (time-boxed to manage theta/IV risk).")
 
+        # Scenario grid: expected P&L and T1/T2-before-SL odds up to sell_by
+        scenario = None
+        if self.cfg.scenario_grid and iv:
+            horizon = horizon_days(as_of, sell_by)
+            grid = build_grid(spot, strike, T, self.cfg.r_rate, iv, side, entry, atr_points, min(horizon, dte), engine=eng)
+            scenario = analyze_scenarios(grid, t1=t1, t2=t2, sl=sl).to_dict()
+            rationale.append(
+                f"Scenarios to sell-by: P(T1 before SL) ~ {scenario['p_t1']:.0%}, P(SL first) ~ {scenario['p_sl']:.0%}, "
+                f"E[P&L] ~ {scenario['expected_pnl']:+.2f}/unit."
+            )
+
         explain = (
             f"mode={self.cfg.mode}; side={side}; "
             f"direction_score={direction_score:.2f}; buy_soft={buy_soft:.2f}; sell_soft={sell_soft:.2f}; "
@@ -827,6 +931,7 @@ class OptionRecoAgent:
         diagnostics.update(
             {
                 "ltp": ltp,
+                "trading_dte": dte_table(as_of).trading(best.expiry),
                 "intrinsic": intrinsic,
                 "extrinsic": extrinsic,
                 "iv": iv,
@@ -835,7 +940,13 @@ class OptionRecoAgent:
                 "confidence_explain": explain,
                 "sell_by": sell_by,
                 "pcr": pcr if pcr > 0 else None,
-                "smart_money_score": sm_score
+                "smart_money_score": sm_score,
+                "atm_iv": signal_row.get("atm_iv"),
+                "iv_percentile": iv_pctl,
+                "iv_rank": signal_row.get("iv_rank"),
+                "skew_25d": skew_25d,
+                "scenario": scenario,
+                "oi_profile": prof.to_dict(),
             }
         )
         return OptionReco(
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from typing import List, Dict, Any, Tuple, Literal
+from typing import List, Dict, Any, Tuple, Literal, Optional
 from dataclasses import dataclass
 
+from stockreco.options.portfolio import aggregate
+
 Mode = Literal["strict", "opportunistic", "speculative"]
 
 
@@ -15,6 +17,11 @@ class ReviewerConfig:
     strict_max_iv: float = 60.0
     opp_max_iv: float = 80.0
     spec_max_iv: float = 100.0
+
+    # IV percentile vs the underlying's own history (diagnostics["iv_percentile"], 0-100)
+    strict_max_iv_percentile: float = 95.0
+    opp_max_iv_percentile: float = 98.0
+    spec_max_iv_percentile: float = 100.0
     
     # Confidence floors
     strict_min_confidence: float = 0.35
@@ -38,6 +45,13 @@ class ReviewerConfig:
     # Risk/reward check: entry should be reasonable vs strike distance
     max_entry_strike_ratio: float = 0.15  # entry < 15% of strike for OTM
 
+    # Optional portfolio caps on the net Greeks of everything approved (options/portfolio.py, rupees).
+    # Each reco counts as portfolio_budget_per_trade of premium; None (the default) disables a cap.
+    portfolio_budget_per_trade: float = 100000.0
+    max_net_beta_delta: Optional[float] = None   # NIFTY-equivalent delta notional
+    max_net_vega: Optional[float] = None         # P&L per +1 vol point
+    max_net_theta: Optional[float] = None        # decay per day (absolute)
+
 
 class OptionReviewer:
     """
@@ -85,11 +99,22 @@ class OptionReviewer:
             return self.cfg.spec_max_theta_pct
         return self.cfg.strict_max_theta_pct
     
-    def review(self, recommendations: List[Any], vix: Optional[float] = None) -> Tuple[List[Any], List[Dict[str, str]]]:
+    def review(
+        self,
+        recommendations: List[Any],
+        vix: Optional[float] = None,
+        betas: Optional[Dict[str, float]] = None,
+    ) -> Tuple[List[Any], List[Dict[str, str]]]:
         """
         Review a list of option recommendations.
         NEW: Accepts 'vix' to dynamically adjust strictness.
+        Approved picks then go through the portfolio caps, when any is set (betas: symbol -> beta to NIFTY).
         """
+        approved, rejected, _ = self._review(recommendations, vix, betas)
+        return approved, rejected
+
+    def _review(self, recommendations: List[Any], vix: Optional[float], betas: Optional[Dict[str, float]]):
+        """review() plus the PortfolioGreeks of the approved list (None when no caps priced it)."""
         approved = []
         rejected = []
         
@@ -153,7 +178,61 @@ class OptionReviewer:
                         existing.append(regime_note.strip())
                 approved.append(reco)
         
-        return approved, rejected
+        approved, capped, pf = self._apply_portfolio_caps(approved, betas)
+        rejected.extend(capped)
+        return approved, rejected, pf
+
+    def _apply_portfolio_caps(self, approved: List[Any], betas: Optional[Dict[str, float]] = None):
+        """
+        Price every approved pick in one aggregate() pass, then admit them by confidence and drop
+        the ones that would push net beta-delta / vega / theta past the caps. Picks that can't be
+        priced (no spot/iv) are left alone. Also returns the PortfolioGreeks of the kept picks
+        (None when there are no caps to check, so nothing was priced).
+        """
+        caps = {
+            "beta_delta": self.cfg.max_net_beta_delta,
+            "vega_1pt": self.cfg.max_net_vega,
+            "theta_day": self.cfg.max_net_theta,
+        }
+        caps = {k: v for k, v in caps.items() if v is not None}
+        if not caps or not approved:
+            return approved, [], None
+
+        dicts = [r.to_dict() if hasattr(r, "to_dict") else r for r in approved]
+        pf = aggregate(dicts, betas=betas, budget_per_trade=self.cfg.portfolio_budget_per_trade)
+        if not len(pf):
+            return approved, [], pf
+
+        pos = pf.positions
+        conf = [float(dicts[i].get("confidence") or 0.0) for i in pos["idx"]]
+        order = sorted(range(len(pos)), key=lambda j: -conf[j])
+        net = {k: 0.0 for k in caps}
+        drop = {}
+        for j in order:
+            row = pos.iloc[j]
+            for k, cap in caps.items():
+                after = net[k] + float(row[k])
+                # only reject a pick that makes the breach worse (hedges always get in)
+                if abs(after) > cap and abs(after) > abs(net[k]):
+                    drop[int(row["idx"])] = f"Portfolio cap: net {k} would reach {after:,.0f} (cap {cap:,.0f})"
+                    break
+            else:
+                for k in caps:
+                    net[k] += float(row[k])
+
+        kept, rejected = [], []
+        for i, (reco, d) in enumerate(zip(approved, dicts)):
+            if i not in drop:
+                kept.append(reco)
+                continue
+            rejected.append({
+                "symbol": d.get("symbol", "UNKNOWN"),
+                "side": d.get("side"),
+                "strike": d.get("strike"),
+                "expiry": d.get("expiry"),
+                "reason": drop[i],
+            })
+        return kept, rejected, pf.without(drop)
     
     def _check_recommendation(self, reco: Dict[str, Any], mode_override: Optional[str] = None) -> str:
         """
@@ -202,6 +281,17 @@ class OptionReviewer:
             
             if iv > max_iv:
                 return f"IV {iv:.1f}% exceeds {max_iv:.1f}% threshold (high premium/IV crush risk)"
+
+        iv_pctl = (reco.get("diagnostics") or {}).get("iv_percentile")
+        if iv_pctl is not None:
+            max_pctl = {
+                "strict": self.cfg.strict_max_iv_percentile,
+                "opportunistic": self.cfg.opp_max_iv_percentile,
+                "speculative": self.cfg.spec_max_iv_percentile,
+            }.get(mode, self.cfg.strict_max_iv_percentile)
+
+            if iv_pctl > max_pctl:
+                return f"IV percentile {iv_pctl:.0f} above {max_pctl:.0f} (IV near its historical high)"
         
         # 4. Theta decay check
         theta_per_day = reco.get("theta_per_day")
@@ -240,7 +330,11 @@ class OptionReviewer:
 def review_option_recommendations(
     recommendations: List[Any],
     mode: Mode = "strict",
-    vix: Optional[float] = None
+    vix: Optional[float] = None,
+    betas: Optional[Dict[str, float]] = None,
+    max_net_beta_delta: Optional[float] = None,
+    max_net_vega: Optional[float] = None,
+    max_net_theta: Optional[float] = None,
 ) -> Dict[str, Any]:
     """
     Convenience function to review option recommendations.
@@ -248,17 +342,24 @@ def review_option_recommendations(
     Args:
         recommendations: List of OptionReco objects or dicts
         mode: Review mode (strict/opportunistic/speculative)
+        max_net_*: opt-in portfolio caps (see ReviewerConfig); None leaves the list as the rules approved it
         
     Returns:
         Dict with keys:
         - recommender: original recommendations
         - reviewer: {approved: [...], rejected: [{symbol, reason}, ...]}
         - final: approved recommendations only
+        - portfolio: net Greeks of the final list (PortfolioGreeks.to_dict())
     """
-    cfg = ReviewerConfig(mode=mode)
+    cfg = ReviewerConfig(
+        mode=mode, max_net_beta_delta=max_net_beta_delta, max_net_vega=max_net_vega, max_net_theta=max_net_theta,
+    )
     reviewer = OptionReviewer(cfg)
     
-    approved, rejected = reviewer.review(recommendations, vix=vix)
+    approved, rejected, pf = reviewer._review(recommendations, vix, betas)
+    if pf is None:
+        dicts = [r.to_dict() if hasattr(r, "to_dict") else r for r in approved]
+        pf = aggregate(dicts, betas=betas, budget_per_trade=cfg.portfolio_budget_per_trade)
     
     return {
         "recommender": recommendations,
@@ -266,5 +367,6 @@ def review_option_recommendations(
             "approved": approved,
             "rejected": rejected
         },
-        "final": approved
+        "final": approved,
+        "portfolio": pf.to_dict(),
     }
@@ -121,7 +121,22 @@ def create_app(repo_root: Optional[Path] = None) -> FastAPI:
         if not path.exists():
             raise HTTPException(status_code=404, detail=f"Missing {path}")
         return _read_json(path)
-        
+
+    @app.get("/api/options/portfolio/{as_of}")
+    def option_portfolio(as_of: str):
+        folder = repo / "reports" / "options"
+        path = folder / f"option_reco_{as_of}.json"
+        if not path.exists():
+            raise HTTPException(status_code=404, detail=f"Missing {path}")
+        data = _read_json(path)
+        if not isinstance(data, dict):
+            raise HTTPException(status_code=404, detail=f"No reviewed recos in {path.name}")
+        if data.get("portfolio") is not None:
+            return data["portfolio"]
+        # older reports: aggregate the approved list on the fly
+        from stockreco.options.portfolio import aggregate, betas_from_ohlcv
+        return aggregate(data.get("final", []), betas=betas_from_ohlcv(repo / "data" / "ohlcv.parquet")).to_dict()
+
     # --- Analyst Options Reco ---
     @app.get("/api/options/analyst/dates")
     def analyst_option_dates():
@@ -8,6 +8,16 @@ from typing import Dict, List, Optional, Any
 
 from fastapi import APIRouter, Query, HTTPException
 
+import numpy as np
+import pandas as pd
+
+from stockreco.ingest.derivatives.bhav_cache import load_chain, load_futures
+from stockreco.ingest.derivatives.chain_index import canonical_underlying
+from stockreco.features.derivatives.iv_surface import chain_forwards
+from stockreco.ingest.equity_index import spot_index
+from stockreco.options.greeks_cache import GreeksCache
+from stockreco.utils.market_calendar import expiry_date
+
 router = APIRouter(prefix="/api/options", tags=["options"])
 
 # 15s cache (matches UI polling)
@@ -15,6 +25,8 @@ _CACHE_TTL_SEC = 15
 _CACHE_TS: float = 0.0
 _CACHE: Dict[str, Dict[str, Any]] = {}
 _REPO_ROOT: Optional[Path] = None
+# per-contract Greeks, re-solved only when a contract's spot/ltp/date changes between polls
+_GREEKS = GreeksCache()
 
 
 def set_repo_root(repo_root: Path) -> None:
@@ -23,7 +35,12 @@ def set_repo_root(repo_root: Path) -> None:
     _REPO_ROOT = repo_root
 
 
-def _normalize_symbol(s: str) -> str:
+def get_repo_root() -> Optional[Path]:
+    """Repository root set by set_repo_root (None until the app configures it)."""
+    return _REPO_ROOT
+
+
+def normalize_symbol(s: str) -> str:
     # Your UI sends ADANIENT.NS24FEB262280CE, but exchange symbols often don't include .NS
     return s.strip().upper().replace(".NS", "")
 
@@ -74,7 +91,7 @@ def _read_op_csv(path: Path) -> Dict[str, Dict[str, Any]]:
                 if not sym:
                     continue
 
-                sym = _normalize_symbol(sym)
+                sym = normalize_symbol(sym)
 
                 out[sym] = {
                     "ok": True,
@@ -94,6 +111,101 @@ def _read_op_csv(path: Path) -> Dict[str, Dict[str, Any]]:
     return out
 
 
+def _strike_key(k: float) -> str:
+    return str(int(k)) if float(k).is_integer() else f"{k:g}"
+
+
+def _underlying_spots(day_dir: Path, chain) -> Dict[str, float]:
+    """Spot per chain underlying: the chain's own spot, else the equity bhavcopy close."""
+    spots = chain.groupby("underlying")["spot"].first().dropna().to_dict()
+    missing = [u for u in chain["underlying"].unique() if u not in spots]
+    if not missing:
+        return spots
+    eq = spot_index(day_dir.parents[1] / "stocks", day_dir.name)
+    for u in missing:
+        px = eq.close(canonical_underlying(u))
+        if px:
+            spots[u] = px
+    return spots
+
+
+def _row_spots(day_dir: Path, chain, T: np.ndarray, r: float) -> np.ndarray:
+    """
+    Spot per chain row. Underlyings without one (indices: no chain spot, no equity close) are
+    priced off each expiry's own forward discounted back, S = F e^(-rT), F from the matching
+    future or put-call parity - never the front future as spot.
+    """
+    S = chain["underlying"].map(_underlying_spots(day_dir, chain)).to_numpy(np.float64, copy=True)
+    miss = np.isnan(S)
+    if miss.any():
+        try:
+            fut = load_futures(day_dir)
+        except Exception:
+            fut = pd.DataFrame()
+        sub = chain[miss].assign(underlying=chain["underlying"][miss].astype(str).map(canonical_underlying))
+        S[miss] = chain_forwards(sub, fut, T[miss], r) * np.exp(-r * T[miss])
+    return S
+
+
+def _quotes_from_chain(day_dir: Path) -> Dict[str, Dict[str, Any]]:
+    """
+    Quotes keyed like the UI builds them: SYMBOL + DDMMMYY + STRIKE + CE/PE (NIFTY06JAN2626100CE),
+    from the day's normalized chain cache (chain.parquet) instead of re-reading the op CSV.
+    iv/delta/gamma/theta/vega come from _GREEKS (only contracts whose inputs changed are re-solved).
+    """
+    chain = load_chain(day_dir)
+    out: Dict[str, Dict[str, Any]] = {}
+    if chain.empty:
+        return out
+
+    exp_tag = {}
+    for e in chain["expiry"].unique():
+        d = expiry_date(e)
+        exp_tag[e] = d.strftime("%d%b%y").upper() if d else ""
+
+    def opt(v: float, nd: int) -> Optional[float]:
+        return None if v != v else round(float(v), nd)
+
+    keys = []
+    for und, exp, k, is_call, ltp, oi, vol, hi, lo in zip(
+        chain["underlying"], chain["expiry"], chain["strike"], chain["is_call"],
+        chain["ltp"], chain["oi"], chain["volume"], chain["high"], chain["low"],
+    ):
+        tag = exp_tag[exp]
+        key = f"{canonical_underlying(und)}{tag}{_strike_key(k)}{'CE' if is_call else 'PE'}" if tag else ""
+        keys.append(key)
+        if not tag:
+            continue
+        out[key] = {
+            "ok": True,
+            "ltp": round(float(ltp), 2),
+            "oi": opt(oi, 0),
+            "volume": opt(vol, 0),
+            "high": opt(hi, 2),
+            "low": opt(lo, 2),
+        }
+
+    try:
+        as_of = datetime.strptime(day_dir.name, "%Y-%m-%d")
+    except ValueError:
+        return out
+    keep = np.array([bool(k) for k in keys])
+    dte = chain["expiry_ord"].to_numpy(np.float64) - as_of.toordinal()
+    T = np.maximum(dte / 365.0, 1e-6)
+    greeks = _GREEKS.update(
+        [k for k in keys if k],
+        _row_spots(day_dir, chain, T, _GREEKS.r)[keep],
+        chain["strike"].to_numpy(np.float64)[keep],
+        T[keep],
+        chain["is_call"].to_numpy(bool)[keep],
+        chain["ltp"].to_numpy(np.float64)[keep],
+        as_of=day_dir.name,
+    )
+    for key, g in greeks.items():
+        out[key].update(g)
+    return out
+
+
 def _refresh_cache_if_needed() -> None:
     global _CACHE_TS, _CACHE
     now = time.time()
@@ -106,16 +218,30 @@ def _refresh_cache_if_needed() -> None:
         _CACHE_TS = now
         return
 
-    files = list(base_dir.glob("op*.csv"))
-    if not files:
+    try:
+        _CACHE = _quotes_from_chain(base_dir)
+    except Exception as e:
+        print(f"[WARN] options ltp: chain cache unavailable for {base_dir}: {e}")
         _CACHE = {}
-        _CACHE_TS = now
-        return
 
-    _CACHE = _read_op_csv(files[0])
+    if not _CACHE:
+        # vendor op csv with tradingsymbol/ltp columns
+        files = list(base_dir.glob("op*.csv"))
+        if files:
+            _CACHE = _read_op_csv(files[0])
     _CACHE_TS = now
 
 
+def lookup(options: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Latest cached quote (with Greeks when the chain cache has them) per UI option symbol."""
+    _refresh_cache_if_needed()
+    out: Dict[str, Dict[str, Any]] = {}
+    for raw in options:
+        k = normalize_symbol(raw)
+        out[k] = _CACHE.get(k) or {"ok": False, "ltp": None}
+    return out
+
+
 @router.get("/ltp")
 def get_ltp(options: List[str] = Query(..., description="Repeated: ?options=SYM&options=SYM2")):
     try:
@@ -125,18 +251,7 @@ def get_ltp(options: List[str] = Query(..., description="Repeated: ?options=SYM&
                 detail="Repository root not initialized. Server configuration error."
             )
         
-        _refresh_cache_if_needed()
-
-        out: Dict[str, Dict[str, Any]] = {}
-        for raw in options:
-            k = _normalize_symbol(raw)
-            row = _CACHE.get(k)
-            if not row:
-                out[k] = {"ok": False, "ltp": None}
-            else:
-                out[k] = row
-
-        return {"as_of": "live", "data": out}
+        return {"as_of": "live", "data": lookup(options)}
     except HTTPException:
         raise
     except Exception as e:
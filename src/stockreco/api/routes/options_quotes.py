@@ -2,6 +2,7 @@ from __future__ import annotations
 from typing import Dict, List, Any, Optional
 from fastapi import APIRouter, Query
 
+from stockreco.api.routes import options_ltp
 from stockreco.ingest.derivatives.provider_base import OptionChainRow
 
 router = APIRouter(prefix="/api/options", tags=["options"])
@@ -13,14 +14,25 @@ def get_latest_chain_row(option_symbol: str) -> Optional[OptionChainRow]:
     """
     return None
 
+GREEKS = ("iv", "delta", "gamma", "theta", "vega")
+
+
 @router.get("/quotes")
 def get_option_quotes(symbols: List[str] = Query(...)) -> Dict[str, Any]:
     out: Dict[str, Any] = {}
+    # Greeks from the day's chain snapshot (incrementally recomputed by options_ltp)
+    snap = options_ltp.lookup(symbols) if options_ltp.get_repo_root() else {}
     for s in symbols:
         sym = s.strip().upper()
         row = get_latest_chain_row(sym)
+        cached = snap.get(options_ltp.normalize_symbol(sym)) or {}
         if not row:
-            out[sym] = {"ok": False}
+            if cached.get("ok"):
+                out[sym] = {"ok": True, "bid": 0.0, "ask": 0.0, **cached}
+                for k in GREEKS:
+                    out[sym][k] = float(out[sym].get(k) or 0.0)
+            else:
+                out[sym] = {"ok": False}
             continue
 
         out[sym] = {
@@ -28,11 +40,9 @@ def get_option_quotes(symbols: List[str] = Query(...)) -> Dict[str, Any]:
             "ltp": float(getattr(row, "ltp", 0.0) or 0.0),
             "bid": float(getattr(row, "bid", 0.0) or 0.0),
             "ask": float(getattr(row, "ask", 0.0) or 0.0),
-            "iv": float(getattr(row, "iv", 0.0) or 0.0),
-            "delta": float(getattr(row, "delta", 0.0) or 0.0),
-            "gamma": float(getattr(row, "gamma", 0.0) or 0.0),
-            "theta": float(getattr(row, "theta", 0.0) or 0.0),
-            "vega": float(getattr(row, "vega", 0.0) or 0.0),
         }
+        for k in GREEKS:
+            # rows rarely carry Greeks; fall back to the computed ones
+            out[sym][k] = float(getattr(row, k, 0.0) or cached.get(k) or 0.0)
 
     return {"data": out}
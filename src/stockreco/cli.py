@@ -176,5 +176,55 @@ def recommend_both(
     _run_one(target_date, mode="aggressive", max_trades=aggressive_max_trades, no_trade_pup=no_trade_pup, no_trade_spread=no_trade_spread)
     print("[bold]Done (both reports).[/bold]")
 
+@app.command()
+def ingest(
+    source: list[str] = typer.Option(["derivatives", "stocks", "mcx"], "--source", help="derivatives / stocks / mcx (repeatable)"),
+    start: Optional[str] = typer.Option(None, "--start", help="First date folder (YYYY-MM-DD)"),
+    end: Optional[str] = typer.Option(None, "--end", help="Last date folder (YYYY-MM-DD)"),
+    full: bool = typer.Option(False, "--full", help="Re-ingest every folder, not just new/changed ones"),
+    workers: int = typer.Option(0, "--workers", help="Worker processes (0 = one per CPU, 1 = serial)"),
+):
+    """Normalize the daily data folders into their columnar caches in parallel."""
+    from stockreco.ingest.ingest_job import run_ingest
+
+    t0 = dt.datetime.now()
+    results = run_ingest(settings.root, sources=source, start=start, end=end, incremental=not full, workers=workers)
+    if not results:
+        print("[green]Nothing to ingest[/green] (all folders up to date)")
+        return
+    for r in results:
+        name = Path(r.path).name
+        if r.error:
+            print(f"[red]FAIL[/red] {r.source}/{r.date} {r.kind:<7} {name}  {r.error}")
+        else:
+            print(f"{r.source}/{r.date} {r.kind:<7} {name:<40} rows={r.rows:<7} {r.seconds * 1000:8.1f} ms")
+    failed = sum(1 for r in results if r.error)
+    took = (dt.datetime.now() - t0).total_seconds()
+    print(f"[bold]Done.[/bold] {len(results)} task(s), {failed} failed, {took:.1f}s wall")
+
+@app.command("iv-surface")
+def iv_surface(
+    full: bool = typer.Option(False, "--full", help="Refit every date, not just new/changed ones"),
+    as_of: Optional[str] = typer.Option(None, "--as-of", help="Print the IV stats for this date (YYYY-MM-DD)"),
+    symbol: list[str] = typer.Option(["NIFTY", "BANKNIFTY"], "--symbol", help="Underlyings to print (repeatable)"),
+):
+    """Fit and store the daily IV surfaces (ATM IV, skew, term structure) under data/warehouse/iv_surface."""
+    from stockreco.features.derivatives.iv_surface import IVSurfaceStore
+
+    t0 = dt.datetime.now()
+    store = IVSurfaceStore(settings.root)
+    built = store.sync(force=full)
+    took = (dt.datetime.now() - t0).total_seconds()
+    print(f"[bold]IV surface:[/bold] fitted {len(built)} date(s) in {took:.1f}s")
+    d = as_of or (store.dates()[-1] if store.dates() else None)
+    for sym in symbol if d else []:
+        st = store.stats(d, sym)
+        if st is None:
+            print(f"{d} {sym}: no surface")
+            continue
+        pct = "n/a" if st.iv_percentile is None else f"{st.iv_percentile:.0f}"
+        skew = "n/a" if st.skew_25d is None else f"{st.skew_25d * 100:+.1f}"
+        print(f"{d} {sym:<10} atm_iv={st.atm_iv * 100:.1f}% ({st.expiry}, {st.dte}d) pctl={pct} skew25={skew} vol pts")
+
 if __name__ == "__main__":
     app()
@@ -4,6 +4,8 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
+from stockreco.ingest.derivatives.strike_ladder import StrikeLadder
+
 
 def _clean(x: Any) -> str:
     # handles BOM, quotes, weird whitespace
@@ -205,16 +207,7 @@ class CommodityRecoAgent:
             # Future Price is reference
             fut_price = close
             
-            best_k = None
-            min_dist = float("inf")
-            
-            available_strikes = sorted(straddle_map.keys())
-            
-            for k in available_strikes:
-                dist = abs(k - fut_price)
-                if dist < min_dist:
-                    min_dist = dist
-                    best_k = k
+            best_k = StrikeLadder.from_strikes(straddle_map.keys()).atm(fut_price)
             
             if best_k is None:
                  self._add_entry(out, as_of, sym, fut_row, trend, "FUTCOM", fut_exp, 0.0, "")
@@ -0,0 +1,379 @@
+"""
+Daily IV surface per underlying, persisted next to the option warehouse.
+
+For every data/derivatives/<date>/ folder the whole chain goes through iv_solver in one call
+(OTM strikes only, priced off the expiry's forward: the matching future's close, else put-call
+parity at the strike where |C - P| is smallest). Each expiry's smile is then sampled on a fixed
+grid of standardized moneyness z = ln(K/F) / (atm_iv * sqrt(T)), so a weekly NIFTY and a
+three-month stock smile line up bucket for bucket:
+
+  <root>/date=YYYY-MM-DD/surface.parquet   one row per underlying/expiry/bucket (iv, forward delta)
+  <root>/date=YYYY-MM-DD/summary.parquet   one row per underlying: headline ATM IV, 30d ATM IV,
+                                           25-delta skew, term slope
+
+IV percentile / rank come from the summary history and are precomputed for every
+(date, underlying), so the agents and reviewer get O(1) lookups:
+
+    ivs = IVSurfaceStore(repo_root)
+    ivs.sync()
+    st = ivs.stats("2025-12-16", "NIFTY")   # IvStats(atm_iv=0.104, iv_percentile=..., skew_25d=...)
+    compute_iv_summary(st.atm_iv, ivs.iv_history("NIFTY", end="2025-12-16"))
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+import json
+import math
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from ...ingest.derivatives.bhav_cache import HAS_PARQUET, load_chain, load_futures
+from ...ingest.derivatives.chain_index import canonical_underlying
+from ...ingest.derivatives.provider_base import normalize_to_nse_symbol
+from ...ingest.derivatives.warehouse import _fingerprint, _is_date
+from ...options.greeks import norm_cdf_vec
+from ...options.iv_solver import OK, implied_vol_vec
+
+SURFACE_VERSION = 1
+MANIFEST_FILE = "_manifest.json"
+SURFACE_FILE = "surface.parquet"
+SUMMARY_FILE = "summary.parquet"
+
+Z_GRID = np.arange(-3.0, 3.01, 0.5)  # standardized moneyness buckets
+SURFACE_COLUMNS = ["date", "underlying", "expiry", "dte", "forward", "bucket", "z", "strike", "iv", "delta", "n_quotes"]
+SUMMARY_COLUMNS = [
+    "date", "underlying", "expiry", "dte", "forward", "atm_iv", "atm_iv_30d", "skew_25d", "term_slope", "n_expiries",
+]
+
+
+@dataclass
+class IvStats:
+    date: str
+    underlying: str
+    atm_iv: Optional[float] = None          # decimal, nearest expiry with dte >= min_dte
+    atm_iv_30d: Optional[float] = None      # constant-maturity, interpolated in total variance
+    skew_25d: Optional[float] = None        # iv(25d put) - iv(25d call); > 0 = puts richer
+    term_slope: Optional[float] = None      # next expiry's ATM IV - headline ATM IV
+    iv_percentile: Optional[float] = None   # 0..100 vs trailing history (percentile_of_score)
+    iv_rank: Optional[float] = None         # 0..100, (iv - min) / (max - min) over the same window
+    n_history: int = 0
+    expiry: Optional[str] = None
+    dte: Optional[int] = None
+
+
+def _opt(v) -> Optional[float]:
+    return None if v is None or v != v else float(v)
+
+
+# ----------------------------
+# Fitting
+# ----------------------------
+
+def chain_forwards(chain: pd.DataFrame, fut: pd.DataFrame, T: np.ndarray, r: float) -> np.ndarray:
+    """
+    Forward per chain row (chain underlyings canonical, T aligned): the future close of the same
+    expiry, else put-call parity at the strike where |C - P| is smallest, else NaN.
+    """
+    key = chain["underlying"].astype(str) + "|" + chain["expiry_ord"].astype(str)
+    fwd = pd.Series(np.nan, index=chain.index)
+
+    if not fut.empty:
+        f = fut.assign(underlying=fut["underlying"].astype(str).map(canonical_underlying))
+        px = f["close"].where(f["close"] > 0, f["settle"])
+        fmap = pd.Series(px.to_numpy(), index=f["underlying"] + "|" + f["expiry_ord"].astype(str))
+        fmap = fmap[fmap > 0]
+        fmap = fmap[~fmap.index.duplicated()]
+        fwd = key.map(fmap).astype(np.float64)
+
+    # put-call parity where there's no future for the expiry
+    need = fwd.isna().to_numpy()
+    if need.any():
+        c = chain[need & chain["is_call"].to_numpy()]
+        p = chain[need & ~chain["is_call"].to_numpy()]
+        both = c.merge(p, on=["underlying", "expiry_ord", "strike"], suffixes=("_c", "_p"))
+        both = both[(both["ltp_c"] > 0) & (both["ltp_p"] > 0)]
+        if not both.empty:
+            both = both.assign(gap=(both["ltp_c"] - both["ltp_p"]).abs())
+            best = both.loc[both.groupby(["underlying", "expiry_ord"])["gap"].idxmin()]
+            # F = K + (C - P) * e^(rT); T is per chain row, so map K and C - P separately
+            idx = best["underlying"].astype(str) + "|" + best["expiry_ord"].astype(str)
+            k_at = key.map(pd.Series(best["strike"].to_numpy(), index=idx)).astype(np.float64).to_numpy()
+            gap = key.map(pd.Series((best["ltp_c"] - best["ltp_p"]).to_numpy(), index=idx)).astype(np.float64).to_numpy()
+            par = k_at + gap * np.exp(r * T)
+            fwd = pd.Series(np.where(need, par, fwd.to_numpy()), index=chain.index)
+    return fwd.to_numpy(dtype=np.float64)
+
+
+def _smile_grid(x: np.ndarray, iv: np.ndarray, T: float) -> Optional[Tuple[float, np.ndarray, np.ndarray]]:
+    """(atm_iv, z-grid ivs (NaN outside the quoted range), forward call deltas) for one expiry."""
+    if x.size < 2:
+        return None
+    o = np.argsort(x)
+    x, iv = x[o], iv[o]
+    if x[0] > 0.02 or x[-1] < -0.02:
+        return None  # no strikes near the money
+    atm = float(np.interp(0.0, x, iv))
+    if not atm > 0:
+        return None
+    sd = atm * math.sqrt(T)
+    gx = Z_GRID * sd
+    inside = (gx >= x[0]) & (gx <= x[-1])
+    giv = np.where(inside, np.interp(gx, x, iv), np.nan)
+    with np.errstate(invalid="ignore"):
+        d1 = (-gx + 0.5 * giv * giv * T) / (giv * math.sqrt(T))
+    return atm, giv, np.where(inside, norm_cdf_vec(np.nan_to_num(d1)), np.nan)
+
+
+def _skew_25d(iv: np.ndarray, delta: np.ndarray) -> Optional[float]:
+    ok = ~np.isnan(iv)
+    if ok.sum() < 2:
+        return None
+    d, v = delta[ok][::-1], iv[ok][::-1]  # call delta rises as z falls
+    if not (d[0] <= 0.25 and d[-1] >= 0.75):
+        return None
+    return float(np.interp(0.75, d, v) - np.interp(0.25, d, v))
+
+
+def fit_day(day_dir: Union[str, Path], r: float = 0.07, min_dte: int = 1) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """(surface rows, per-underlying summary rows) for one date folder."""
+    day_dir = Path(day_dir)
+    d = day_dir.name
+    as_of = date.fromisoformat(d).toordinal()
+
+    chain = load_chain(day_dir)
+    chain = chain[(chain["expiry_ord"] - as_of >= min_dte) & (chain["ltp"] > 0)].reset_index(drop=True)
+    if chain.empty:
+        return pd.DataFrame(columns=SURFACE_COLUMNS), pd.DataFrame(columns=SUMMARY_COLUMNS)
+    chain["underlying"] = chain["underlying"].astype(str).map(canonical_underlying)
+
+    dte = (chain["expiry_ord"].to_numpy() - as_of).astype(np.float64)
+    T = dte / 365.0
+    F = chain_forwards(chain, load_futures(day_dir), T, r)
+    K = chain["strike"].to_numpy(dtype=np.float64)
+    is_call = chain["is_call"].to_numpy(dtype=bool)
+
+    # OTM side only: calls at/above the forward, puts below
+    otm = np.isfinite(F) & (F > 0) & (is_call == (K >= F))
+    res = implied_vol_vec(chain["ltp"].to_numpy()[otm], F[otm] * np.exp(-r * T[otm]), K[otm], T[otm], r, is_call[otm])
+    good = res.status == OK
+
+    pts = pd.DataFrame({
+        "underlying": chain["underlying"].to_numpy()[otm][good],
+        "expiry_ord": chain["expiry_ord"].to_numpy()[otm][good],
+        "F": F[otm][good],
+        "x": np.log(K[otm][good] / F[otm][good]),
+        "iv": res.iv[good],
+    })
+
+    surf_rows: List[Dict[str, object]] = []
+    per_exp: Dict[str, List[Tuple[int, float, Optional[float], float, str]]] = {}
+    for (und, eo), g in pts.groupby(["underlying", "expiry_ord"], sort=True):
+        n_dte = int(eo) - as_of
+        fit = _smile_grid(g["x"].to_numpy(), g["iv"].to_numpy(), n_dte / 365.0)
+        if fit is None:
+            continue
+        atm, giv, gdelta = fit
+        fwd = float(g["F"].iloc[0])
+        exp = date.fromordinal(int(eo)).isoformat()
+        for b, (z, v, dl) in enumerate(zip(Z_GRID, giv, gdelta)):
+            if v == v:
+                surf_rows.append({
+                    "date": d, "underlying": und, "expiry": exp, "dte": n_dte, "forward": fwd,
+                    "bucket": b - len(Z_GRID) // 2, "z": float(z),
+                    "strike": fwd * math.exp(z * atm * math.sqrt(n_dte / 365.0)),
+                    "iv": float(v), "delta": float(dl), "n_quotes": int(len(g)),
+                })
+        per_exp.setdefault(und, []).append((n_dte, atm, _skew_25d(giv, gdelta), fwd, exp))
+
+    summ_rows = []
+    for und, exps in per_exp.items():
+        exps.sort()
+        head = next((e for e in exps if e[0] >= 3), exps[-1])  # skip expiry-week noise when we can
+        i = exps.index(head)
+        nxt = exps[i + 1] if i + 1 < len(exps) else None
+        summ_rows.append({
+            "date": d, "underlying": und, "expiry": head[4], "dte": head[0], "forward": head[3],
+            "atm_iv": head[1], "atm_iv_30d": _constant_maturity([(e[0], e[1]) for e in exps], 30),
+            "skew_25d": head[2], "term_slope": (nxt[1] - head[1]) if nxt else None, "n_expiries": len(exps),
+        })
+
+    surface = pd.DataFrame(surf_rows, columns=SURFACE_COLUMNS)
+    summary = pd.DataFrame(summ_rows, columns=SUMMARY_COLUMNS).sort_values("underlying").reset_index(drop=True)
+    return surface, summary
+
+
+def _constant_maturity(term: List[Tuple[int, float]], days: int) -> Optional[float]:
+    """ATM IV at `days`, linear in total variance between the bracketing expiries (no extrapolation)."""
+    for (d0, v0), (d1, v1) in zip(term, term[1:]):
+        if d0 <= days <= d1 and d1 > d0:
+            w = (days - d0) / (d1 - d0)
+            var = (1 - w) * v0 * v0 * d0 + w * v1 * v1 * d1
+            return math.sqrt(var / days)
+    return next((v for d, v in term if d == days), None)
+
+
+# ----------------------------
+# Store
+# ----------------------------
+
+class IVSurfaceStore:
+    def __init__(
+        self,
+        repo_root: Union[str, Path] = ".",
+        derivatives_subdir: str = "data/derivatives",
+        store_subdir: str = "data/warehouse/iv_surface",
+        r: float = 0.07,
+        lookback: int = 252,
+        min_history: int = 20,
+    ):
+        self.repo_root = Path(repo_root)
+        self.source_dir = self.repo_root / derivatives_subdir
+        self.root = self.repo_root / store_subdir
+        self.r = r
+        self.lookback = lookback
+        self.min_history = min_history
+        self._fits: Dict[str, Tuple[pd.DataFrame, pd.DataFrame]] = {}
+        self._stats: Optional[Dict[Tuple[str, str], IvStats]] = None
+        self._history: Dict[str, Tuple[List[str], np.ndarray]] = {}
+
+    def dates(self) -> List[str]:
+        if not self.source_dir.exists():
+            return []
+        return sorted(d.name for d in self.source_dir.iterdir() if d.is_dir() and _is_date(d.name))
+
+    def _dir(self, d: str) -> Path:
+        return self.root / f"date={d}"
+
+    def _read_manifest(self) -> Dict[str, object]:
+        try:
+            m = json.loads((self.root / MANIFEST_FILE).read_text(encoding="utf-8"))
+            if m.get("version") == SURFACE_VERSION and m.get("r") == self.r:
+                return m
+        except Exception:
+            pass
+        return {"version": SURFACE_VERSION, "r": self.r, "days": {}}
+
+    def sync(self, force: bool = False) -> List[str]:
+        """Fits and writes new/changed dates (no-op without pyarrow). Returns the dates (re)built."""
+        if not HAS_PARQUET:
+            return []
+        man = self._read_manifest()
+        days: Dict[str, object] = man["days"]  # type: ignore[assignment]
+        built: List[str] = []
+        for d in self.dates():
+            fp = _fingerprint(self.source_dir / d)
+            if not fp:
+                continue
+            if not force and days.get(d) == fp and (self._dir(d) / SUMMARY_FILE).exists():
+                continue
+            surface, summary = fit_day(self.source_dir / d, r=self.r)
+            self._dir(d).mkdir(parents=True, exist_ok=True)
+            surface.drop(columns=["date"]).to_parquet(self._dir(d) / SURFACE_FILE, index=False)
+            summary.drop(columns=["date"]).to_parquet(self._dir(d) / SUMMARY_FILE, index=False)
+            days[d] = fp
+            self._fits[d] = (surface, summary)
+            built.append(d)
+
+        for d in [d for d in days if not (self.source_dir / d).exists()]:
+            shutil.rmtree(self._dir(d), ignore_errors=True)
+            days.pop(d)
+            self._fits.pop(d, None)
+
+        if built or not (self.root / MANIFEST_FILE).exists():
+            self.root.mkdir(parents=True, exist_ok=True)
+            (self.root / MANIFEST_FILE).write_text(json.dumps(man, indent=2), encoding="utf-8")
+        if built:
+            self._stats = None
+            self._history = {}
+        return built
+
+    def _fit(self, d: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        fit = self._fits.get(d)
+        if fit is not None:
+            return fit
+        p = self._dir(d)
+        if HAS_PARQUET and (p / SUMMARY_FILE).exists():
+            surface = pd.read_parquet(p / SURFACE_FILE)
+            summary = pd.read_parquet(p / SUMMARY_FILE)
+            surface.insert(0, "date", d)
+            summary.insert(0, "date", d)
+            fit = (surface, summary)
+        elif (self.source_dir / d).is_dir():
+            fit = fit_day(self.source_dir / d, r=self.r)
+        else:
+            fit = (pd.DataFrame(columns=SURFACE_COLUMNS), pd.DataFrame(columns=SUMMARY_COLUMNS))
+        self._fits[d] = fit
+        return fit
+
+    # ----------------------------
+    # Queries
+    # ----------------------------
+
+    def surface(self, d: str, underlying: Optional[str] = None) -> pd.DataFrame:
+        """Grid rows for one date (optionally one underlying)."""
+        df = self._fit(d)[0]
+        if underlying:
+            df = df[df["underlying"] == canonical_underlying(normalize_to_nse_symbol(underlying))]
+        return df.reset_index(drop=True)
+
+    def smile(self, d: str, underlying: str, expiry=None) -> pd.DataFrame:
+        """One expiry's bucket rows (nearest expiry when none is given)."""
+        df = self.surface(d, underlying)
+        if df.empty:
+            return df
+        exp = str(expiry) if expiry is not None else df["expiry"].min()
+        return df[df["expiry"] == exp].reset_index(drop=True)
+
+    def summary(self, d: str) -> pd.DataFrame:
+        return self._fit(d)[1]
+
+    def _build_stats(self) -> Dict[Tuple[str, str], IvStats]:
+        frames = [self.summary(d) for d in self.dates()]
+        frames = [f for f in frames if not f.empty]
+        out: Dict[Tuple[str, str], IvStats] = {}
+        if not frames:
+            return out
+        all_rows = pd.concat(frames, ignore_index=True).sort_values(["underlying", "date"], kind="stable")
+        for und, g in all_rows.groupby("underlying", sort=False):
+            ds = g["date"].tolist()
+            ivs = g["atm_iv"].to_numpy(dtype=np.float64)
+            self._history[und] = (ds, ivs)
+            for i, row in enumerate(g.itertuples(index=False)):
+                win = ivs[max(0, i + 1 - self.lookback): i + 1]
+                win = win[win > 0]
+                x = ivs[i]
+                pct = rank = None
+                if len(win) >= self.min_history and x > 0:
+                    pct = 100.0 * float((win <= x).sum()) / len(win)
+                    lo, hi = float(win.min()), float(win.max())
+                    rank = 100.0 * (x - lo) / (hi - lo) if hi > lo else 50.0
+                out[(row.date, und)] = IvStats(
+                    date=row.date, underlying=und, atm_iv=_opt(row.atm_iv), atm_iv_30d=_opt(row.atm_iv_30d),
+                    skew_25d=_opt(row.skew_25d), term_slope=_opt(row.term_slope), iv_percentile=pct, iv_rank=rank,
+                    n_history=int(len(win)), expiry=row.expiry, dte=int(row.dte),
+                )
+        return out
+
+    def load_stats(self) -> Dict[Tuple[str, str], IvStats]:
+        """(date, underlying) -> IvStats over every stored date; built once, reused until the next sync adds dates."""
+        if self._stats is None:
+            self._stats = self._build_stats()
+        return self._stats
+
+    def stats(self, d: str, underlying: str) -> Optional[IvStats]:
+        """IV level/percentile/rank/skew for one underlying on one date (dict lookup after the first call)."""
+        return self.load_stats().get((d, canonical_underlying(normalize_to_nse_symbol(underlying))))
+
+    def iv_history(self, underlying: str, end: Optional[str] = None) -> List[float]:
+        """Headline ATM IVs up to end (inclusive), oldest first - the iv_history compute_iv_summary wants."""
+        self.load_stats()
+        ds, ivs = self._history.get(canonical_underlying(normalize_to_nse_symbol(underlying)), ([], np.array([])))
+        n = len(ds) if end is None else bisect_right(ds, end)
+        return [float(v) for v in ivs[:n]]
@@ -2,7 +2,9 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import List, Optional
 from .. import math_utils
+import numpy as np
 from ...ingest.derivatives.provider_base import OptionChainRow
+from ...ingest.derivatives.option_chain import OptionChain
 
 @dataclass
 class OiSummary:
@@ -12,10 +14,12 @@ class OiSummary:
     put_oi: Optional[float] = None
 
 def compute_oi_summary(chain: List[OptionChainRow]) -> OiSummary:
-    call_oi = sum([r.oi or 0.0 for r in chain if r.option_type == "CE"])
-    put_oi = sum([r.oi or 0.0 for r in chain if r.option_type == "PE"])
-    call_vol = sum([r.volume or 0.0 for r in chain if r.option_type == "CE"])
-    put_vol = sum([r.volume or 0.0 for r in chain if r.option_type == "PE"])
+    oc = OptionChain.from_rows(chain)
+    ce, pe = oc.by_side("CE"), oc.by_side("PE")
+    call_oi = float(np.nansum(oc.oi[ce]))
+    put_oi = float(np.nansum(oc.oi[pe]))
+    call_vol = float(np.nansum(oc.volume[ce]))
+    put_vol = float(np.nansum(oc.volume[pe]))
     pcr_oi = (put_oi / call_oi) if call_oi > 0 else None
     pcr_vol = (put_vol / call_vol) if call_vol > 0 else None
     return OiSummary(pcr_oi=pcr_oi, pcr_vol=pcr_vol, call_oi=call_oi, put_oi=put_oi)
@@ -0,0 +1,184 @@
+"""
+Per-expiry OI profile over the sorted strike ladder: local OI peaks per side, call / put walls,
+fresh-writing (OI change) walls and max pain.
+
+    prof = oi_profile(as_of, "RELIANCE", chain, "30-Dec-2025")   # cached per (date, underlying, expiry)
+    prof.max_pain, prof.call_wall, prof.put_wall
+    prof.is_peak(1560.0, "CE")       # is the CE OI at that strike a local peak?
+    prof.walls_above(spot, "CE")     # CE peak strikes above spot, nearest first
+    prof.to_dict()                   # compact summary for reco diagnostics
+
+A strike is a local peak when its OI is the max of the +/- `window` rungs around it and at least
+`peak_ratio` x the mean OI of those listed neighbours. Walls are the strikes with the largest
+OI / positive OI change on each side (lowest strike on a tie). Max pain is the listed strike that
+minimises the intrinsic value paid out to option holders at expiry.
+
+The cache re-computes when the chain it is handed differs (row count / total OI / total OI
+change), so intraday polls of the same day don't serve a stale profile.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from ...ingest.derivatives.option_chain import OptionChain
+from ...ingest.derivatives.strike_ladder import StrikeLadder
+
+
+@dataclass
+class OiProfile:
+    expiry: str
+    strikes: np.ndarray
+    ce_oi: np.ndarray         # per rung, 0 where not listed / missing
+    pe_oi: np.ndarray
+    ce_chg: np.ndarray        # positive OI change per rung (fresh writing), else 0
+    pe_chg: np.ndarray
+    ce_peak: np.ndarray       # bool per rung
+    pe_peak: np.ndarray
+    ce_nb_mean: np.ndarray    # mean OI of the listed neighbours within the window
+    pe_nb_mean: np.ndarray
+    max_pain: Optional[float] = None
+    call_wall: Optional[float] = None
+    put_wall: Optional[float] = None
+    call_chg_wall: Optional[float] = None
+    put_chg_wall: Optional[float] = None
+    max_ce_chg: float = 0.0
+    max_pe_chg: float = 0.0
+    ladder: Optional[StrikeLadder] = field(default=None, repr=False)
+
+    def _side(self, side: str, ce, pe):
+        return ce if (side or "").upper() == "CE" else pe
+
+    def _at(self, arr: np.ndarray, strike: Optional[float], default=0.0):
+        i = self.ladder.index(strike) if self.ladder is not None else None
+        return default if i is None else arr[i]
+
+    def oi_at(self, strike: float, side: str) -> float:
+        return float(self._at(self._side(side, self.ce_oi, self.pe_oi), strike))
+
+    def chg_at(self, strike: Optional[float], side: str) -> float:
+        return float(self._at(self._side(side, self.ce_chg, self.pe_chg), strike))
+
+    def neighbors_mean(self, strike: float, side: str) -> float:
+        return float(self._at(self._side(side, self.ce_nb_mean, self.pe_nb_mean), strike))
+
+    def is_peak(self, strike: float, side: str) -> bool:
+        return bool(self._at(self._side(side, self.ce_peak, self.pe_peak), strike, False))
+
+    def peaks(self, side: str) -> np.ndarray:
+        return self.strikes[self._side(side, self.ce_peak, self.pe_peak)]
+
+    def walls_above(self, level: float, side: str) -> np.ndarray:
+        """Local-peak strikes of one side strictly above level, nearest first."""
+        p = self.peaks(side)
+        return p[p > level]
+
+    def walls_below(self, level: float, side: str) -> np.ndarray:
+        """Local-peak strikes of one side strictly below level, nearest first."""
+        p = self.peaks(side)
+        return p[p < level][::-1]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "expiry": self.expiry,
+            "max_pain": self.max_pain,
+            "call_wall": self.call_wall,
+            "put_wall": self.put_wall,
+            "call_chg_wall": self.call_chg_wall,
+            "put_chg_wall": self.put_chg_wall,
+            "ce_peaks": self.peaks("CE").tolist(),
+            "pe_peaks": self.peaks("PE").tolist(),
+        }
+
+
+def _local_peaks(oi: np.ndarray, listed: np.ndarray, window: int, peak_ratio: float) -> Tuple[np.ndarray, np.ndarray]:
+    """(is_peak, neighbour mean) per rung via centred rolling windows of 2*window + 1 rungs."""
+    w = max(1, int(window))
+    win = sliding_window_view(np.pad(oi, w), 2 * w + 1)
+    cnt = sliding_window_view(np.pad(listed.astype(np.float64), w), 2 * w + 1).sum(axis=1) - listed
+    nb_mean = (win.sum(axis=1) - oi) / np.maximum(cnt, 1.0)
+    peak = listed & (oi > 0) & (oi >= win.max(axis=1)) & (oi >= peak_ratio * nb_mean)
+    return peak, nb_mean
+
+
+def _max_pain(strikes: np.ndarray, ce_oi: np.ndarray, pe_oi: np.ndarray) -> Optional[float]:
+    if not len(strikes) or (ce_oi.sum() + pe_oi.sum()) <= 0:
+        return None
+    # payout[j] = sum_i ce_i * max(K_j - k_i, 0) + pe_i * max(k_i - K_j, 0)
+    d = strikes[:, None] - strikes[None, :]
+    payout = np.maximum(d, 0.0) @ ce_oi + np.maximum(-d, 0.0) @ pe_oi
+    return float(strikes[int(np.argmin(payout))])
+
+
+def _argmax_strike(strikes: np.ndarray, v: np.ndarray) -> Tuple[float, Optional[float]]:
+    if not len(v) or v.max() <= 0:
+        return 0.0, None
+    i = int(np.argmax(v))
+    return float(v[i]), float(strikes[i])
+
+
+def compute_oi_profile(chain, expiry: str, window: int = 2, peak_ratio: float = 1.5) -> OiProfile:
+    oc = OptionChain.from_rows(chain)
+    lad = oc.ladder(expiry)
+    k = lad.strikes
+    cols = {}
+    for side in ("CE", "PE"):
+        listed = (lad.ce if side == "CE" else lad.pe) >= 0
+        oi = np.nan_to_num(lad.column(oc.oi, side), nan=0.0)
+        chg = np.maximum(np.nan_to_num(lad.column(oc.oi_change, side), nan=0.0), 0.0)
+        peak, nb = _local_peaks(oi, listed, window, peak_ratio) if len(k) else (np.zeros(0, bool), np.zeros(0))
+        cols[side] = (oi, chg, peak, nb)
+
+    ce_oi, ce_chg, ce_peak, ce_nb = cols["CE"]
+    pe_oi, pe_chg, pe_peak, pe_nb = cols["PE"]
+    max_ce_chg, call_chg_wall = _argmax_strike(k, ce_chg)
+    max_pe_chg, put_chg_wall = _argmax_strike(k, pe_chg)
+    return OiProfile(
+        expiry=expiry,
+        strikes=k,
+        ce_oi=ce_oi,
+        pe_oi=pe_oi,
+        ce_chg=ce_chg,
+        pe_chg=pe_chg,
+        ce_peak=ce_peak,
+        pe_peak=pe_peak,
+        ce_nb_mean=ce_nb,
+        pe_nb_mean=pe_nb,
+        max_pain=_max_pain(k, ce_oi, pe_oi),
+        call_wall=_argmax_strike(k, ce_oi)[1],
+        put_wall=_argmax_strike(k, pe_oi)[1],
+        call_chg_wall=call_chg_wall,
+        put_chg_wall=put_chg_wall,
+        max_ce_chg=max_ce_chg,
+        max_pe_chg=max_pe_chg,
+        ladder=lad,
+    )
+
+
+_CACHE: "OrderedDict[tuple, Tuple[tuple, OiProfile]]" = OrderedDict()
+_CACHE_MAX = 4096
+
+
+def oi_profile(as_of: str, underlying: str, chain, expiry: str, window: int = 2, peak_ratio: float = 1.5) -> OiProfile:
+    """compute_oi_profile, cached per (as_of, underlying, expiry, window, peak_ratio)."""
+    oc = OptionChain.from_rows(chain)
+    key = (as_of, underlying, expiry, window, peak_ratio)
+    sig = (len(oc), float(np.nansum(oc.oi)), float(np.nansum(oc.oi_change)))
+    hit = _CACHE.get(key)
+    if hit is not None and hit[0] == sig:
+        _CACHE.move_to_end(key)
+        return hit[1]
+    prof = compute_oi_profile(oc, expiry, window, peak_ratio)
+    _CACHE[key] = (sig, prof)
+    while len(_CACHE) > _CACHE_MAX:
+        _CACHE.popitem(last=False)
+    return prof
+
+
+def clear_cache() -> None:
+    _CACHE.clear()
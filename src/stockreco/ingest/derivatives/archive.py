@@ -0,0 +1,145 @@
+"""
+CSV sources that may live inside the daily NSE zips (fo<ddmmyyyy>.zip, combineoi_*.zip, ncloi_*.zip).
+
+list_sources(folder) returns the folder's extracted *.csv files plus every CSV member of its
+*.zip archives that isn't also present extracted, so the loaders work the same whether or not
+the archives were unpacked. Members are read straight out of the archive:
+
+    with src.open("rb") as f:
+        df = pd.read_csv(f)
+
+ZipMember mimics the bits of Path the loaders use (name, stem, parent, stat, open), so a
+source is either a Path or a ZipMember.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from pathlib import Path
+from types import SimpleNamespace
+from typing import IO, List, Union
+import io
+import zipfile
+
+
+@dataclass(frozen=True)
+class ZipMember:
+    archive: Path
+    member: str
+
+    @property
+    def name(self) -> str:
+        return self.member.rsplit("/", 1)[-1]
+
+    @property
+    def stem(self) -> str:
+        return Path(self.name).stem
+
+    @property
+    def parent(self) -> Path:
+        return self.archive.parent
+
+    def stat(self):
+        """Member size, archive mtime (enough for size/mtime fingerprints)."""
+        with zipfile.ZipFile(self.archive) as zf:
+            size = zf.getinfo(self.member).file_size
+        return SimpleNamespace(st_size=size, st_mtime_ns=self.archive.stat().st_mtime_ns)
+
+    def open(self, mode: str = "rb") -> IO[bytes]:
+        if mode != "rb":
+            raise ValueError("zip members can only be opened with mode='rb'")
+        zf = zipfile.ZipFile(self.archive)
+        try:
+            return _MemberFile(zf, zf.open(self.member))
+        except BaseException:
+            zf.close()
+            raise
+
+    def __str__(self) -> str:
+        return f"{self.archive}!{self.member}"
+
+
+class _MemberFile(io.BufferedIOBase):
+    """A zip member's read handle that also closes its ZipFile (and the archive's fd) on close."""
+
+    def __init__(self, zf: zipfile.ZipFile, fh: IO[bytes]):
+        self._zf = zf
+        self._fh = fh
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        return self._fh.read(size)
+
+    def read1(self, size: int = -1) -> bytes:
+        return self._fh.read1(size)
+
+    def readinto(self, b) -> int:
+        return self._fh.readinto(b)
+
+    def readline(self, size: int = -1) -> bytes:
+        return self._fh.readline(size)
+
+    def peek(self, size: int = 0) -> bytes:
+        return self._fh.peek(size)
+
+    def seekable(self) -> bool:
+        return self._fh.seekable()
+
+    def seek(self, pos: int, whence: int = io.SEEK_SET) -> int:
+        return self._fh.seek(pos, whence)
+
+    def tell(self) -> int:
+        return self._fh.tell()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            self._fh.close()
+        finally:
+            self._zf.close()
+            super().close()
+
+
+Source = Union[Path, ZipMember]
+
+
+def zip_members(archive: Path) -> List[ZipMember]:
+    try:
+        with zipfile.ZipFile(archive) as zf:
+            names = [i.filename for i in zf.infolist() if not i.is_dir() and i.filename.lower().endswith(".csv")]
+    except (OSError, zipfile.BadZipFile) as e:
+        print(f"[WARN] unreadable archive {archive}: {e}")
+        return []
+    return [ZipMember(archive, n) for n in names]
+
+
+def list_sources(folder: Union[str, Path]) -> List[Source]:
+    """Extracted CSVs first, then zip members whose file name isn't already extracted; sorted by name."""
+    folder = Path(folder)
+    if not folder.is_dir():
+        return []
+    files = [p for p in folder.iterdir() if p.is_file()]
+    out: List[Source] = [p for p in files if p.suffix.lower() == ".csv"]
+    have = {p.name.lower() for p in out}
+    for z in sorted(p for p in files if p.suffix.lower() == ".zip"):
+        for m in zip_members(z):
+            if m.name.lower() not in have:
+                have.add(m.name.lower())
+                out.append(m)
+    return sorted(out, key=lambda s: s.name)
+
+
+def find_sources(folder: Union[str, Path], pattern: str, case_sensitive: bool = False) -> List[Source]:
+    """Sources whose file name matches a glob pattern (e.g. "combineoi_*.csv")."""
+    if case_sensitive:
+        return [s for s in list_sources(folder) if fnmatchcase(s.name, pattern)]
+    pat = pattern.lower()
+    return [s for s in list_sources(folder) if fnmatchcase(s.name.lower(), pat)]
+
+
+def open_text(src: Source, encoding: str = "utf-8") -> IO[str]:
+    return io.TextIOWrapper(src.open("rb"), encoding=encoding, newline="")
@@ -0,0 +1,310 @@
+"""
+Normalized columnar cache of the daily NSE F&O bhavcopies.
+
+On first touch of data/derivatives/<date>/ the raw op/fo CSVs are parsed once and written
+next to them as:
+
+  chain.parquet    option rows (ChainColumns + spot), sorted by underlying/expiry/strike/side
+  futures.parquet  futures rows from every fo*.csv layout
+  manifest.json    size / mtime_ns / sha256 of the source files the parquet was built from
+
+Later loads check the manifest (size+mtime first, content hash only when those moved) and
+memory-map the parquet instead of re-parsing CSV. Without pyarrow, or on a read-only data
+dir, everything still works - the frames are just rebuilt in memory on each load.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import hashlib
+import json
+import re
+
+import numpy as np
+import pandas as pd
+
+from .archive import Source, list_sources
+from .chain_index import ChainIndex, canonical_underlying, _num, _pick_cols, _text
+from .nse_reader import read_bhavcopy
+from .option_chain import _expiry_ordinal
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+CACHE_VERSION = 2
+CHAIN_FILE = "chain.parquet"
+FUTURES_FILE = "futures.parquet"
+MANIFEST_FILE = "manifest.json"
+
+# CONTRACT_D futures: FUTSTKBHARTIARTL30-DEC-2025, FUTIDXNIFTY30-DEC-2025
+_FUT_RE = re.compile(
+    r"^(?P<inst>FUTIDX|FUTSTK|FUTIVX)"
+    r"(?P<und>[A-Z0-9&_-]+?)"
+    r"(?P<exp>\d{1,2}-[A-Z]{3}-\d{4})$"
+)
+
+FUTURES_COLUMNS = ["underlying", "instrument", "expiry", "expiry_ord", "open", "high", "low", "close", "settle", "oi", "volume"]
+
+
+def _read_csv_any(path: Source) -> pd.DataFrame:
+    with path.open("rb") as f:
+        df = pd.read_csv(f)
+    df.columns = [str(c).strip().upper() for c in df.columns]
+    return df
+
+
+def _read_bhav(path: Source) -> pd.DataFrame:
+    # typed fixed-schema read; generic inference only for layouts the schema doesn't know
+    df = read_bhavcopy(path)
+    return df if len(df.columns) else _read_csv_any(path)
+
+
+def _find_best_bulk_file(folder: Path, prefixes: Tuple[str, ...]) -> Optional[Source]:
+    cands = []
+    for p in list_sources(folder):
+        name = p.name.lower()
+        if any(name.startswith(px) for px in prefixes):
+            cands.append(p)
+    if not cands:
+        return None
+    return sorted(cands, key=lambda x: x.stat().st_size, reverse=True)[0]
+
+
+def day_sources(folder: Path) -> Dict[str, Source]:
+    """
+    Raw files the cache is built from, keyed by role.
+    op/fo follow LocalCsvProvider's pick (largest op*.csv / fo*.csv); fut:* are all fo bhavcopies
+    (fo_<date>.csv is a summary, not a bhavcopy). Files only present inside fo<date>.zip are
+    read from the archive (see archive.list_sources).
+    """
+    folder = Path(folder)
+    out: Dict[str, Source] = {}
+    op = _find_best_bulk_file(folder, ("op",))
+    fo = _find_best_bulk_file(folder, ("fo",))
+    if op:
+        out["op"] = op
+    if fo:
+        out["fo"] = fo
+    for p in list_sources(folder):
+        name = p.name.lower()
+        if name.startswith("fo") and name.endswith(".csv") and not name.startswith("fo_"):
+            out[f"fut:{p.name}"] = p
+    return out
+
+
+# ----------------------------
+# Manifest
+# ----------------------------
+
+def _sha256(path: Source) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _fingerprint(path: Source, with_hash: bool = True) -> Dict[str, object]:
+    st = path.stat()
+    fp: Dict[str, object] = {"name": path.name, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    if with_hash:
+        fp["sha256"] = _sha256(path)
+    return fp
+
+
+def _read_manifest(folder: Path) -> Optional[dict]:
+    p = folder / MANIFEST_FILE
+    if not p.exists():
+        return None
+    try:
+        return json.loads(p.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+
+
+def _is_fresh(folder: Path, sources: Dict[str, Source]) -> bool:
+    """
+    True if chain/futures parquet were built from exactly these source files.
+    A touched-but-identical file (same size, new mtime) is accepted after a hash check and
+    the manifest is refreshed so the next load is a plain stat again.
+    """
+    man = _read_manifest(folder)
+    if not man or man.get("version") != CACHE_VERSION:
+        return False
+    if not (folder / CHAIN_FILE).exists() or not (folder / FUTURES_FILE).exists():
+        return False
+    recorded = man.get("sources") or {}
+    if set(recorded) != set(sources):
+        return False
+
+    touched = False
+    for role, path in sources.items():
+        rec = recorded[role]
+        cur = _fingerprint(path, with_hash=False)
+        if rec.get("name") != cur["name"] or rec.get("size") != cur["size"]:
+            return False
+        if rec.get("mtime_ns") != cur["mtime_ns"]:
+            if rec.get("sha256") != _sha256(path):
+                return False
+            rec["mtime_ns"] = cur["mtime_ns"]
+            touched = True
+
+    if touched:
+        try:
+            (folder / MANIFEST_FILE).write_text(json.dumps(man, indent=2), encoding="utf-8")
+        except OSError:
+            pass
+    return True
+
+
+# ----------------------------
+# Normalization
+# ----------------------------
+
+def _chain_index_or_empty(path: Optional[Source]) -> ChainIndex:
+    if path is None:
+        return ChainIndex.empty()
+    try:
+        return ChainIndex.from_frame(_read_bhav(path))
+    except RuntimeError as e:
+        # e.g. futures-only fo<ddmmyyyy>.csv: no option rows to index
+        print(f"[WARN] {path}: {e}")
+        return ChainIndex.empty()
+
+
+def build_chain_frame(sources: Dict[str, Source]) -> pd.DataFrame:
+    """
+    op rows, plus fo rows for underlyings the op file doesn't carry (same precedence the
+    provider always used: op first, fo only as a fallback per underlying). The spot follows
+    the same order: an op row without UNDRLNG_ST takes the fo spot of its underlying.
+    """
+    op_idx = _chain_index_or_empty(sources.get("op"))
+    fo_idx = _chain_index_or_empty(sources.get("fo"))
+    op, fo = op_idx.to_frame(), fo_idx.to_frame()
+
+    if len(op) and fo_idx.spots:
+        fo_spot: Dict[str, float] = {}
+        for u, v in fo_idx.spots.items():
+            fo_spot.setdefault(canonical_underlying(u), v)
+        op["spot"] = op["spot"].fillna(op["underlying"].map(canonical_underlying).map(fo_spot))
+
+    if len(fo):
+        have = {canonical_underlying(u) for u in op["underlying"].unique()}
+        fo = fo[~fo["underlying"].map(canonical_underlying).isin(have)]
+
+    frames = [f for f in (op, fo) if len(f)]
+    if not frames:
+        return ChainIndex.empty().to_frame()
+    df = pd.concat(frames, ignore_index=True)
+    # one sort for the whole day; ChainIndex.from_normalized relies on it being cheap to re-sort
+    return df.sort_values(
+        ["underlying", "expiry_ord", "strike", "is_call"], ascending=[True, True, True, False], kind="stable"
+    ).reset_index(drop=True)
+
+
+def _futures_from_frame(df: pd.DataFrame) -> pd.DataFrame:
+    m = _pick_cols(df)
+    if m["contract"]:
+        parts = _text(df[m["contract"]], upper=True).str.extract(_FUT_RE)
+        und, inst, exp = parts["und"], parts["inst"], parts["exp"]
+    elif all(c in df.columns for c in ("INSTRUMENT", "SYMBOL", "EXP_DATE")):
+        inst = _text(df["INSTRUMENT"], upper=True)
+        und = _text(df["SYMBOL"], upper=True)
+        exp = _text(df["EXP_DATE"])
+    else:
+        return pd.DataFrame(columns=FUTURES_COLUMNS)
+
+    keep = (inst.fillna("").str.startswith("FUT") & und.notna()).to_numpy(dtype=bool)
+    if not keep.any():
+        return pd.DataFrame(columns=FUTURES_COLUMNS)
+
+    exp = exp[keep]
+    ords = {e: _expiry_ordinal(e) for e in pd.unique(exp)}
+    return pd.DataFrame({
+        "underlying": und[keep].to_numpy(dtype=object),
+        "instrument": inst[keep].to_numpy(dtype=object),
+        "expiry": exp.to_numpy(dtype=object),
+        "expiry_ord": np.array([ords[e] for e in exp], dtype=np.int32),
+        "open": _num(df, m["open"])[keep],
+        "high": _num(df, m["high"])[keep],
+        "low": _num(df, m["low"])[keep],
+        "close": _num(df, m["close"])[keep],
+        "settle": _num(df, m["settle"])[keep],
+        "oi": _num(df, m["oi"])[keep],
+        "volume": _num(df, m["vol"])[keep],
+    })
+
+
+def build_futures_frame(sources: Dict[str, Source]) -> pd.DataFrame:
+    frames: List[Tuple[int, pd.DataFrame]] = []
+    for role, path in sources.items():
+        if not role.startswith("fut:"):
+            continue
+        try:
+            raw = _read_bhav(path)
+            f = _futures_from_frame(raw)
+        except Exception as e:
+            print(f"[WARN] futures parse failed for {path}: {e}")
+            continue
+        if len(f):
+            frames.append((1 if "CONTRACT_D" in raw.columns else 0, f))
+    if not frames:
+        return pd.DataFrame(columns=FUTURES_COLUMNS)
+    # the same contract can appear in both fo layouts; keep one row, split layout first
+    frames.sort(key=lambda t: t[0])
+    df = pd.concat([f for _, f in frames], ignore_index=True).drop_duplicates(["underlying", "expiry_ord"], keep="first")
+    return df.sort_values(["underlying", "expiry_ord"], kind="stable").reset_index(drop=True)
+
+
+def normalize_day(folder: Path, force: bool = False) -> bool:
+    """
+    Writes chain.parquet / futures.parquet / manifest.json for one date folder.
+    Returns True if the files were (re)written, False if already fresh or parquet is unavailable.
+    """
+    folder = Path(folder)
+    sources = day_sources(folder)
+    if not HAS_PARQUET or not sources:
+        return False
+    if not force and _is_fresh(folder, sources):
+        return False
+
+    chain = build_chain_frame(sources)
+    futures = build_futures_frame(sources)
+    manifest = {
+        "version": CACHE_VERSION,
+        "sources": {role: _fingerprint(p) for role, p in sources.items()},
+        "rows": {"chain": int(len(chain)), "futures": int(len(futures))},
+    }
+    try:
+        # manifest last: a crash mid-write leaves no manifest, so the next load rebuilds
+        (folder / MANIFEST_FILE).unlink(missing_ok=True)
+        chain.to_parquet(folder / CHAIN_FILE, index=False)
+        futures.to_parquet(folder / FUTURES_FILE, index=False)
+        (folder / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    except OSError as e:
+        print(f"[WARN] could not write bhav cache in {folder}: {e}")
+        return False
+    return True
+
+
+def _load(folder: Path, fname: str, build) -> pd.DataFrame:
+    folder = Path(folder)
+    sources = day_sources(folder)
+    if HAS_PARQUET and sources:
+        if _is_fresh(folder, sources) or normalize_day(folder, force=True):
+            return pd.read_parquet(folder / fname, memory_map=True)
+    return build(sources)
+
+
+def load_chain(folder: Path) -> pd.DataFrame:
+    """Normalized option rows for one date folder (see build_chain_frame)."""
+    return _load(folder, CHAIN_FILE, build_chain_frame)
+
+
+def load_futures(folder: Path) -> pd.DataFrame:
+    """Normalized futures rows for one date folder (see build_futures_frame)."""
+    return _load(folder, FUTURES_FILE, build_futures_frame)
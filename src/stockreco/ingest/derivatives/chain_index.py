@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+import re
+
+import numpy as np
+import pandas as pd
+
+from .option_chain import OptionChain, _expiry_ordinal
+
+# CONTRACT_D examples:
+#   OPTIDXNIFTY16-DEC-2025CE24100
+#   OPTIDXBANKNIFTY30-DEC-2025PE54100
+#   OPTSTKBHEL30-DEC-2025PE272.5
+
+_CONTRACT_RE = re.compile(
+    r"^(?P<inst>OPTIDX|OPTSTK)"
+    r"(?P<und>[A-Z0-9&_-]+?)"
+    r"(?P<exp>\d{1,2}-[A-Z]{3}-\d{4})"
+    r"(?P<cp>CE|PE)"
+    r"(?P<strike>\d+(?:\.\d+)?)$"
+)
+
+def _pick_cols(df: pd.DataFrame) -> Dict[str, str]:
+    cols = {c: c for c in df.columns}
+    def has(*names):
+        for n in names:
+            if n in cols:
+                return n
+        return ""
+    return {
+        "contract": has("CONTRACT_D"),
+        "spot": has("UNDRLNG_ST"),
+        "close": has("CLOSE_PRIC", "CLOSE_PRICE", "CLOSE"),
+        "settle": has("SETTLEMENT", "SETTLE_PR", "SETTLEPRICE"),
+        "open": has("OPEN_PRICE", "OPEN"),
+        "high": has("HIGH_PRICE", "HI_PRICE", "HIGH"),
+        "low": has("LOW_PRICE", "LO_PRICE", "LOW"),
+        "oi": has("OI_NO_CON", "OPEN_INT", "OPENINTEREST", "OI", "OI_LAKHS", "OPEN_INT*"),
+        "vol": has("TRADED_QUA", "TOTTRDQTY", "VOLUME", "CONTRACTS"),
+        "oi_ch": has("CHG_IN_OI", "CHANGE_IN_OI"),
+    }
+
+
+def _aliases(nse_sym: str) -> List[str]:
+    if nse_sym == "NIFTY":
+        return ["NIFTY", "NIFTY 50", "NIFTY50"]
+    if nse_sym == "BANKNIFTY":
+        return ["BANKNIFTY", "NIFTY BANK", "BANK NIFTY"]
+    return [nse_sym]
+
+
+def canonical_underlying(name: str) -> str:
+    """Inverse of _aliases: file spelling -> NSE symbol (NIFTY 50 -> NIFTY)."""
+    for nse_sym in ("NIFTY", "BANKNIFTY"):
+        if name in _aliases(nse_sym):
+            return nse_sym
+    return name
+
+
+def _text(s: pd.Series, upper: bool = False) -> pd.Series:
+    """
+    s.astype(str).str.strip() (.str.upper()), done per distinct value when s is a category
+    column (nse_reader.read_bhavcopy output). Missing values come out as "nan" like astype(str).
+    """
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        cats = s.cat.categories.astype(str).str.strip()
+        if upper:
+            cats = cats.str.upper()
+        lut = np.append(cats.to_numpy(dtype=object), "NAN" if upper else "nan")
+        return pd.Series(lut[s.cat.codes.to_numpy()], index=s.index, dtype=object)
+    out = s.astype(str).str.strip()
+    return out.str.upper() if upper else out
+
+
+def _num(df: pd.DataFrame, col: str) -> np.ndarray:
+    if not col:
+        return np.full(len(df), np.nan)
+    return np.array(pd.to_numeric(df[col], errors="coerce"), dtype=np.float64)
+
+
+@dataclass
+class ChainColumns:
+    """
+    Struct-of-arrays view of option contracts. Missing numeric values are NaN.
+    """
+    underlying: np.ndarray   # object (file spelling of the underlying)
+    strike: np.ndarray       # float64
+    expiry: np.ndarray       # object (raw expiry string as in the file)
+    expiry_ord: np.ndarray   # int32 date ordinal, -1 when unparseable
+    is_call: np.ndarray      # bool
+    ltp: np.ndarray
+    volume: np.ndarray
+    oi: np.ndarray
+    oi_change: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.strike.shape[0])
+
+    def take(self, idx) -> "ChainColumns":
+        return ChainColumns(**{f: getattr(self, f)[idx] for f in self.__dataclass_fields__})
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({f: getattr(self, f) for f in self.__dataclass_fields__})
+
+    def to_chain(self) -> OptionChain:
+        return OptionChain(
+            strike=self.strike, expiry=self.expiry, is_call=self.is_call, expiry_ord=self.expiry_ord,
+            ltp=self.ltp, volume=self.volume, oi=self.oi, oi_change=self.oi_change, high=self.high, low=self.low,
+        )
+
+
+def _parse_frame(df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, str]]:
+    """
+    Normalizes either op/fo layout into one frame with underlying/expiry/cp/strike columns.
+    """
+    m = _pick_cols(df)
+
+    # Format 1: CONTRACT_D (fo<ddmmyy>.csv)
+    if m["contract"]:
+        parts = _text(df[m["contract"]], upper=True).str.extract(_CONTRACT_RE)
+        out = pd.DataFrame({
+            "underlying": parts["und"],
+            "expiry": parts["exp"],
+            "cp": parts["cp"],
+            "strike": pd.to_numeric(parts["strike"], errors="coerce"),
+        })
+        return out, m
+
+    # Format 2: split columns (INSTRUMENT, SYMBOL, EXP_DATE, STR_PRICE, OPT_TYPE)
+    req = ["SYMBOL", "EXP_DATE", "STR_PRICE", "OPT_TYPE"]
+    if all(c in df.columns for c in req):
+        out = pd.DataFrame({
+            "underlying": _text(df["SYMBOL"], upper=True),
+            "expiry": _text(df["EXP_DATE"]),
+            "cp": _text(df["OPT_TYPE"], upper=True),
+            "strike": pd.to_numeric(df["STR_PRICE"], errors="coerce"),
+        })
+        return out, m
+
+    raise RuntimeError(f"Unsupported op/fo format: missing CONTRACT_D or split cols. Have: {list(df.columns)[:25]}")
+
+
+class ChainIndex:
+    """
+    One-pass index over a bulk op/fo bhavcopy.
+
+    All option rows are parsed once, sorted by (underlying, expiry, strike, side) and kept as
+    typed NumPy columns; each underlying owns a contiguous [start, stop) range, so a chain
+    lookup is a dict hit plus a slice instead of a regex scan over the whole file.
+    """
+
+    def __init__(self, cols: ChainColumns, bounds: Dict[str, Tuple[int, int]], spots: Dict[str, float]):
+        self.cols = cols
+        self.bounds = bounds
+        self.spots = spots
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "ChainIndex":
+        parsed, m = _parse_frame(df)
+
+        # spot comes from every row of the underlying (even ones without a usable premium)
+        spots: Dict[str, float] = {}
+        if m["spot"]:
+            s = pd.Series(_num(df, m["spot"])).groupby(parsed["underlying"].to_numpy()).median().dropna()
+            spots = {str(k): float(v) for k, v in s.items()}
+
+        ltp = _num(df, m["close"])
+        if m["settle"]:
+            settle = _num(df, m["settle"])
+            bad = ~(ltp > 0)
+            ltp[bad] = settle[bad]
+
+        keep = (
+            parsed["underlying"].notna().to_numpy()
+            & parsed["cp"].isin(["CE", "PE"]).to_numpy()
+            & parsed["strike"].notna().to_numpy()
+            & (ltp > 0)
+        )
+        idx = np.flatnonzero(keep)
+
+        und = parsed["underlying"].to_numpy(dtype=object)[idx]
+        expiry = parsed["expiry"].to_numpy(dtype=object)[idx]
+        exp_ord_map = {e: _expiry_ordinal(e) for e in pd.unique(expiry)}
+        cols = ChainColumns(
+            underlying=und,
+            strike=parsed["strike"].to_numpy(dtype=np.float64)[idx],
+            expiry=expiry,
+            expiry_ord=np.array([exp_ord_map[e] for e in expiry], dtype=np.int32),
+            is_call=(parsed["cp"].to_numpy(dtype=object)[idx] == "CE"),
+            ltp=ltp[idx],
+            volume=_num(df, m["vol"])[idx],
+            oi=_num(df, m["oi"])[idx],
+            oi_change=_num(df, m["oi_ch"])[idx],
+            high=_num(df, m["high"])[idx],
+            low=_num(df, m["low"])[idx],
+        )
+        return cls.from_columns(cols, spots)
+
+    @classmethod
+    def from_normalized(cls, df: pd.DataFrame) -> "ChainIndex":
+        """Builds the index from a frame written by bhav_cache (ChainColumns fields + spot)."""
+        cols = ChainColumns(**{
+            f: df[f].to_numpy(dtype=object if f in ("underlying", "expiry") else None)
+            for f in ChainColumns.__dataclass_fields__
+        })
+        spots: Dict[str, float] = {}
+        if "spot" in df.columns:
+            s = df.groupby("underlying", sort=False)["spot"].first().dropna()
+            spots = {str(k): float(v) for k, v in s.items()}
+        return cls.from_columns(cols, spots)
+
+    @classmethod
+    def from_columns(cls, cols: ChainColumns, spots: Optional[Dict[str, float]] = None) -> "ChainIndex":
+        codes, names = pd.factorize(cols.underlying, sort=True)
+        order = np.lexsort((~cols.is_call, cols.strike, cols.expiry_ord, codes))
+        cols = cols.take(order)
+        codes = codes[order]
+
+        starts = np.searchsorted(codes, np.arange(len(names)), side="left")
+        stops = np.searchsorted(codes, np.arange(len(names)), side="right")
+        bounds = {str(n): (int(a), int(b)) for n, a, b in zip(names, starts, stops)}
+        return cls(cols, bounds, dict(spots or {}))
+
+    @classmethod
+    def empty(cls) -> "ChainIndex":
+        obj = np.array([], dtype=object)
+        nan = np.array([], dtype=np.float64)
+        cols = ChainColumns(
+            underlying=obj, strike=nan, expiry=obj, expiry_ord=np.array([], dtype=np.int32),
+            is_call=np.array([], dtype=bool), ltp=nan, volume=nan, oi=nan, oi_change=nan, high=nan, low=nan,
+        )
+        return cls(cols, {}, {})
+
+    def to_frame(self) -> pd.DataFrame:
+        df = self.cols.to_frame()
+        df["spot"] = df["underlying"].map(self.spots).astype("float64")
+        return df
+
+    def symbols(self) -> List[str]:
+        return sorted(self.bounds)
+
+    def _keys(self, nse_sym: str) -> List[str]:
+        return [a for a in _aliases(nse_sym.upper()) if a in self.bounds]
+
+    def size(self, nse_sym: str) -> int:
+        return sum(self.bounds[k][1] - self.bounds[k][0] for k in self._keys(nse_sym))
+
+    def columns(self, nse_sym: str) -> Optional[ChainColumns]:
+        keys = self._keys(nse_sym)
+        if not keys:
+            return None
+        if len(keys) == 1:
+            a, b = self.bounds[keys[0]]
+            return self.cols.take(slice(a, b))
+        # same underlying under several spellings (e.g. NIFTY / NIFTY 50): merge and keep the sort order
+        cols = self.cols.take(np.concatenate([np.arange(*self.bounds[k]) for k in keys]))
+        return cols.take(np.lexsort((~cols.is_call, cols.strike, cols.expiry_ord)))
+
+    def chain(self, nse_sym: str) -> OptionChain:
+        cols = self.columns(nse_sym)
+        return cols.to_chain() if cols is not None else OptionChain.empty()
+
+    def spot(self, nse_sym: str) -> Optional[float]:
+        for k in _aliases(nse_sym.upper()):
+            if k in self.spots:
+                return self.spots[k]
+        return None
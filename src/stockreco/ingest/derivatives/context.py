@@ -0,0 +1,400 @@
+"""
+One bundle of the day's derivatives context (FOVOLT vols, participant OI, PCR, combined OI /
+MWPL, client limits), built once per date folder and shared by DerivativesDataStore,
+market_stats_loader and MarketContextLoader. CSVs are read straight out of the day's zips
+when they weren't extracted (see archive.list_sources).
+
+Contexts are memoized in-process per folder (LRU; a hit is re-checked with one scandir of the
+folder's raw .csv / .zip / .lst files, so a re-downloaded file rebuilds it); with persist=True
+they're also written to data/derivatives/<date>/context.json and reused while the source files
+are unchanged.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+import csv
+import json
+import logging
+import os
+
+from .archive import Source, find_sources, open_text
+from .bhav_cache import day_sources
+from .pcr import day_pcr
+
+logger = logging.getLogger(__name__)
+
+CONTEXT_FILE = "context.json"
+CONTEXT_VERSION = 3
+
+_CONTEXTS: "OrderedDict[Tuple[str, str], Tuple[tuple, DerivativesContext]]" = OrderedDict()
+_CONTEXTS_MAX = 64
+_RAW_SUFFIXES = (".csv", ".zip", ".lst")  # every source role lives in one of these
+
+
+@dataclass
+class DerivativesContext:
+    as_of: str
+    fovolt: Dict[str, float] = field(default_factory=dict)  # symbol -> applicable annualised vol (0.43 = 43%)
+    participant: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # client type -> raw row
+    pcr: Dict[str, float] = field(default_factory=dict)  # underlying -> put OI / call OI
+    pcr_by_expiry: Dict[str, Dict[str, float]] = field(default_factory=dict)  # underlying -> {expiry ISO: pcr}
+    combined_oi: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # NSE symbol -> MWPL / OI / NCL OI
+    client_limits: Dict[str, int] = field(default_factory=dict)  # NSE symbol -> client-level OI limit (NSE row)
+    sources: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # role -> file fingerprint
+
+    def market_volatility(self) -> Dict[str, float]:
+        """FOVOLT vols in percent (43.5 = 43.5%)."""
+        return {k: v * 100.0 for k, v in self.fovolt.items()}
+
+    def fii_sentiment(self) -> float:
+        """(Longs - Shorts) / (Longs + Shorts) of FII index futures, -1..1; 0.0 if unknown."""
+        row = next((r for k, r in self.participant.items() if "FII" in k.upper()), None)
+        if not row:
+            return 0.0
+        try:
+            longs = float(row["Future Index Long"])
+            shorts = float(row["Future Index Short"])
+        except (KeyError, TypeError, ValueError):
+            return 0.0
+        total = longs + shorts
+        return (longs - shorts) / total if total else 0.0
+
+    def participant_oi(self) -> Dict[str, Any]:
+        """
+        Per client type futures/options legs plus a crude smart money score:
+        FII net long is good, Client (retail) net long is contrarian-bad.
+        """
+        if not self.participant:
+            return {}
+
+        data: Dict[str, Any] = {}
+        for c_type, r in self.participant.items():
+            def val(k):
+                return int(r.get(k, 0) or 0)
+
+            data[c_type] = {
+                "Future Index Long": val("Future Index Long"),
+                "Future Index Short": val("Future Index Short"),
+                "Future Stock Long": val("Future Stock Long"),
+                "Future Stock Short": val("Future Stock Short"),
+                "Option Index Call Long": val("Option Index Call Long"),
+                "Option Index Put Long": val("Option Index Put Long"),
+                "Option Index Call Short": val("Option Index Call Short"),
+                "Option Index Put Short": val("Option Index Put Short"),
+            }
+
+            if c_type in ("FII", "Client"):
+                # Futures are high conviction, options are noisier/hedging -> 0.1 weight
+                net = val("Future Index Long") - val("Future Index Short")
+                opt_bias = (val("Option Index Call Long") - val("Option Index Call Short")) - \
+                           (val("Option Index Put Long") - val("Option Index Put Short"))
+                data[c_type]["net_sentiment"] = net + 0.1 * opt_bias
+
+        fii_sent = data.get("FII", {}).get("net_sentiment", 0)
+        client_sent = data.get("Client", {}).get("net_sentiment", 0)
+
+        score = 0.0
+        if fii_sent > 0: score += 0.5
+        if fii_sent < 0: score -= 0.5
+        # Contra retail
+        if client_sent > 0: score -= 0.3
+        if client_sent < 0: score += 0.3
+
+        data["smart_money_score"] = max(-1.0, min(1.0, score))
+        data["fii_net"] = fii_sent
+        data["client_net"] = client_sent
+        return data
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = asdict(self)
+        d["version"] = CONTEXT_VERSION
+        return d
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "DerivativesContext":
+        return cls(
+            as_of=d["as_of"],
+            fovolt=d.get("fovolt") or {},
+            participant=d.get("participant") or {},
+            pcr=d.get("pcr") or {},
+            pcr_by_expiry=d.get("pcr_by_expiry") or {},
+            combined_oi=d.get("combined_oi") or {},
+            client_limits=d.get("client_limits") or {},
+            sources=d.get("sources") or {},
+        )
+
+
+# ----------------------------
+# Parsing (each file read once per date)
+# ----------------------------
+
+def normalize_as_of(as_of: str) -> Optional[str]:
+    """YYYY-MM-DD or DD-MM-YYYY -> YYYY-MM-DD (None if neither)."""
+    for fmt in ("%Y-%m-%d", "%d-%m-%Y"):
+        try:
+            return datetime.strptime(as_of, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            pass
+    return None
+
+
+def _find(day_dir: Path, prefix: str, as_of: str) -> Optional[Source]:
+    """Extracted CSV or zip member; the as_of-stamped name wins over any other match."""
+    ddmmyyyy = datetime.strptime(as_of, "%Y-%m-%d").strftime("%d%m%Y")
+    for pat in (f"{prefix}{ddmmyyyy}.csv", f"{prefix}{ddmmyyyy}.CSV", f"{prefix}*.csv"):
+        files = find_sources(day_dir, pat, case_sensitive=True)
+        if files:
+            return files[-1]
+    return None
+
+
+def _find_client_limits(day_dir: Path) -> Optional[Path]:
+    # oi_cli_limit_16-DEC-2025.lst (plain CSV despite the extension)
+    files = sorted(day_dir.glob("oi_cli_limit_*.lst"))
+    return files[-1] if files else None
+
+
+def _fingerprint(path: Source) -> Dict[str, Any]:
+    st = path.stat()
+    return {"name": path.name, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _cell(v: str) -> Any:
+    v = v.strip()
+    try:
+        return int(v.replace(",", ""))
+    except ValueError:
+        try:
+            return float(v.replace(",", ""))
+        except ValueError:
+            return v
+
+
+def _parse_fovolt(path: Source) -> Dict[str, float]:
+    out: Dict[str, float] = {}
+    with open_text(path) as f:
+        reader = csv.DictReader(f)
+        vol_col = next((c for c in (reader.fieldnames or []) if "Applicable Annualised Volatility" in c), None)
+        if not vol_col:
+            return out
+        sym_col = next((c for c in reader.fieldnames if c.strip() == "Symbol"), None)
+        for row in reader:
+            sym = str(row.get(sym_col) or "").strip().upper()
+            if not sym:
+                continue
+            try:
+                out[sym] = float(row[vol_col])
+            except (TypeError, ValueError):
+                pass
+    return out
+
+
+def _parse_participant(path: Source) -> Dict[str, Dict[str, Any]]:
+    # first line is a title ("Participant wise Open Interest ... as on ..."), header follows
+    out: Dict[str, Dict[str, Any]] = {}
+    header = None
+    with open_text(path) as f:
+        for row in csv.reader(f):
+            if not row:
+                continue
+            if "Client Type" in [h.strip() for h in row]:
+                header = [h.strip() for h in row]
+                continue
+            if header and len(row) == len(header):
+                rec = {h: _cell(v) for h, v in zip(header, row)}
+                c_type = str(rec.get("Client Type", "")).strip()
+                if c_type:
+                    rec["Client Type"] = c_type
+                    out[c_type] = rec
+    return out
+
+
+def _rows(path: Source):
+    """Rows as dicts keyed by the stripped header names (cells stripped too)."""
+    with open_text(path) as f:
+        reader = csv.reader(f)
+        header = [h.strip() for h in next(reader, [])]
+        for row in reader:
+            if len(row) == len(header):
+                yield dict(zip(header, (v.strip() for v in row)))
+
+
+def _parse_combined_oi(path: Source, ncl: Optional[Source] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    combineoi_<date>.csv: MWPL, OI and futures-equivalent OI per stock, plus the exchange's limit
+    for next day ("No Fresh Positions" once the stock is in the ban period). ncloi_<date>.csv adds
+    the clearing corporation's (NCL) OI for the same symbols.
+    """
+    out: Dict[str, Dict[str, Any]] = {}
+    for r in _rows(path):
+        sym = r.get("NSE Symbol", "").upper()
+        if not sym:
+            continue
+        mwpl = _cell(r.get("MWPL", ""))
+        fut_eq = _cell(r.get("Future Equivalent Open Interest", ""))
+        limit = _cell(r.get("Limit for Next Day", ""))
+        rec: Dict[str, Any] = {
+            "mwpl": mwpl,
+            "oi": _cell(r.get("Open Interest", "")),
+            "fut_eq_oi": fut_eq,
+            "limit_next_day": limit if isinstance(limit, (int, float)) else None,
+            "no_fresh_positions": isinstance(limit, str) and "NO FRESH" in limit.upper(),
+        }
+        if isinstance(mwpl, (int, float)) and isinstance(fut_eq, (int, float)) and mwpl > 0:
+            rec["mwpl_used_pct"] = round(fut_eq / mwpl * 100.0, 2)
+        out[sym] = rec
+
+    if ncl is not None:
+        for r in _rows(ncl):
+            rec = out.get(r.get("NSE Symbol", "").upper())
+            if rec is not None:
+                rec["ncl_oi"] = _cell(r.get("NCL Open Interest", ""))
+                rec["ncl_fut_eq_oi"] = _cell(r.get("NCL FutEq OI", ""))
+    return out
+
+
+def _parse_client_limits(path: Path) -> Dict[str, int]:
+    # SYMBOL,CLIENT_LIMIT,EXCHANGE with one row per exchange; the NSE row wins
+    out: Dict[str, int] = {}
+    for r in _rows(path):
+        sym, lim = r.get("SYMBOL", "").upper(), _cell(r.get("CLIENT_LIMIT", ""))
+        if not sym or not isinstance(lim, int):
+            continue
+        if r.get("EXCHANGE", "").upper() == "NSE" or sym not in out:
+            out[sym] = lim
+    return out
+
+
+def _source_files(day_dir: Path, as_of: str) -> Dict[str, Source]:
+    src: Dict[str, Source] = {}
+    for role, prefix in (
+        ("fovolt", "FOVOLT_"),
+        ("participant", "fao_participant_oi_"),
+        ("combineoi", "combineoi_"),
+        ("ncloi", "ncloi_"),
+    ):
+        p = _find(day_dir, prefix, as_of)
+        if p:
+            src[role] = p
+    cli = _find_client_limits(day_dir)
+    if cli:
+        src["client_limits"] = cli
+    for role, p in day_sources(day_dir).items():
+        src[f"bhav:{role}"] = p
+    return src
+
+
+def build_context(day_dir: Path, as_of: str) -> DerivativesContext:
+    day_dir = Path(day_dir)
+    ctx = DerivativesContext(as_of=as_of)
+    if not day_dir.exists():
+        return ctx
+
+    src = _source_files(day_dir, as_of)
+    ctx.sources = {role: _fingerprint(p) for role, p in src.items()}
+
+    if "fovolt" in src:
+        try:
+            ctx.fovolt = _parse_fovolt(src["fovolt"])
+        except Exception as e:
+            logger.error(f"Error parsing FOVOLT {src['fovolt']}: {e}")
+    if "participant" in src:
+        try:
+            ctx.participant = _parse_participant(src["participant"])
+        except Exception as e:
+            logger.error(f"Error parsing Participant OI {src['participant']}: {e}")
+    if "combineoi" in src:
+        try:
+            ctx.combined_oi = _parse_combined_oi(src["combineoi"], src.get("ncloi"))
+        except Exception as e:
+            logger.error(f"Error parsing combined OI {src['combineoi']}: {e}")
+    if "client_limits" in src:
+        try:
+            ctx.client_limits = _parse_client_limits(src["client_limits"])
+        except Exception as e:
+            logger.error(f"Error parsing client limits {src['client_limits']}: {e}")
+    try:
+        st = day_pcr(day_dir)
+        ctx.pcr = st.pcr()
+        ctx.pcr_by_expiry = st.pcr_by_expiry()
+    except Exception as e:
+        logger.error(f"Error calculating PCR for {as_of}: {e}")
+    return ctx
+
+
+def _load_persisted(day_dir: Path, as_of: str) -> Optional[DerivativesContext]:
+    p = day_dir / CONTEXT_FILE
+    if not p.exists():
+        return None
+    try:
+        d = json.loads(p.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    if d.get("version") != CONTEXT_VERSION or d.get("as_of") != as_of:
+        return None
+    if _current_sources(day_dir, as_of) != d.get("sources"):
+        return None
+    return DerivativesContext.from_dict(d)
+
+
+def _current_sources(day_dir: Path, as_of: str) -> Dict[str, Dict[str, Any]]:
+    return {role: _fingerprint(f) for role, f in _source_files(day_dir, as_of).items()}
+
+
+def _dir_stamp(day_dir: Path) -> tuple:
+    """
+    (name, size, mtime_ns) of the folder's raw input files: a superset of the source
+    fingerprints without resolving roles or opening zips. Our own outputs (context.json,
+    the parquet cache) don't count, so writing them doesn't invalidate the memo.
+    """
+    try:
+        with os.scandir(day_dir) as it:
+            entries = [e for e in it if e.name.lower().endswith(_RAW_SUFFIXES) and e.is_file()]
+            return tuple(sorted((e.name, e.stat().st_size, e.stat().st_mtime_ns) for e in entries))
+    except OSError:
+        return ()
+
+
+def context_for_dir(day_dir: Union[str, Path], as_of: str, persist: bool = False) -> DerivativesContext:
+    """Memoized DerivativesContext for one data/derivatives/<date>/ folder (rebuilt when its files change)."""
+    day_dir = Path(day_dir)
+    as_of = normalize_as_of(as_of) or as_of
+    key = (str(day_dir.resolve()), as_of)
+    stamp = _dir_stamp(day_dir)
+    hit = _CONTEXTS.get(key)
+    if hit is not None and hit[0] == stamp:
+        _CONTEXTS.move_to_end(key)
+        return hit[1]
+
+    ctx = _load_persisted(day_dir, as_of) if persist else None
+    if ctx is None:
+        ctx = build_context(day_dir, as_of)
+        if persist and day_dir.exists():
+            try:
+                (day_dir / CONTEXT_FILE).write_text(json.dumps(ctx.to_dict(), indent=2), encoding="utf-8")
+            except OSError as e:
+                logger.warning(f"Could not persist derivatives context to {day_dir}: {e}")
+
+    _CONTEXTS[key] = (stamp, ctx)
+    _CONTEXTS.move_to_end(key)
+    while len(_CONTEXTS) > _CONTEXTS_MAX:
+        _CONTEXTS.popitem(last=False)
+    return ctx
+
+
+def get_context(as_of: str, base_dir: Union[str, Path] = "data/derivatives", persist: bool = False) -> DerivativesContext:
+    """Context for as_of (YYYY-MM-DD or DD-MM-YYYY) under base_dir/<YYYY-MM-DD>/."""
+    ymd = normalize_as_of(as_of)
+    if not ymd:
+        logger.error(f"Invalid date format: {as_of}")
+        return DerivativesContext(as_of=str(as_of))
+    return context_for_dir(Path(base_dir) / ymd, ymd, persist=persist)
+
+
+def clear_context_cache() -> None:
+    _CONTEXTS.clear()
@@ -6,6 +6,7 @@ from typing import List, Optional
 import requests
 import yfinance as yf
 
+from .option_chain import OptionChain
 from .provider_base import DerivativesProvider, OptionChainRow, UnderlyingSnapshot, normalize_symbol, guess_index_vs_equity
 
 class NseFallbackProvider:
@@ -95,7 +96,7 @@ class NseFallbackProvider:
         except Exception:
             return None
 
-    def get_option_chain(self, symbol: str, expiry: Optional[str] = None) -> List[OptionChainRow]:
+    def get_option_chain(self, symbol: str, expiry: Optional[str] = None) -> OptionChain:
         sym = normalize_symbol(symbol)
         kind = guess_index_vs_equity(sym)
         if kind != "index":
@@ -107,7 +108,7 @@ class NseFallbackProvider:
         records = js.get("records", {})
         exp = expiry or (records.get("expiryDates") or [None])[0]
         if not exp:
-            return []
+            return OptionChain.empty()
 
         if not records.get("data"):
             raise RuntimeError("NSE option chain has no records.data (blocked/empty).")
@@ -148,4 +149,4 @@ class NseFallbackProvider:
                     iv=(float(pe.get("impliedVolatility"))/100.0) if pe.get("impliedVolatility") is not None else None,
                 ))
 
-        return out
+        return OptionChain.from_rows(out)
@@ -0,0 +1,150 @@
+"""
+Fixed-schema reader for the NSE F&O bhavcopies (op<ddmmyyyy>.csv, fo<ddmmyyyy>.csv, fo<ddmmyy>.csv).
+
+The split layout pads everything: headers (`SYMBOL    `), strings (`NIFTY     `) and numbers
+(`00043500.00`, `000000000020450`), and ends with a "* - OPEN_INT ..." footer line. Instead of
+letting pandas infer object columns and converting cell by cell afterwards, the header is read
+once, mapped to canonical names, and only the schema columns are parsed (usecols), with
+explicit dtypes:
+
+  numbers  float64 straight from the parser (leading zeros are fine)
+  strings  trimmed/upper-cased once and handed back as category columns
+
+With pyarrow installed the body goes through pyarrow.csv (typed columns, trimming in Arrow
+compute, the footer skipped as an invalid row); otherwise pandas' C parser with the same schema.
+A numeric cell Arrow cannot parse sends the file through the pandas path, which reads it as NaN.
+scripts/bench_nse_reader.py compares both against the generic bhav_cache._read_csv_any.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional, Union
+from pathlib import Path
+import csv
+
+import numpy as np
+import pandas as pd
+
+from .archive import Source, open_text
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+    HAS_ARROW = True
+except ImportError:
+    HAS_ARROW = False
+
+# canonical (stripped, upper-cased) name -> kind
+STRING_COLUMNS = ("INSTRUMENT", "SYMBOL", "EXP_DATE", "OPT_TYPE", "CONTRACT_D")
+UPPER_COLUMNS = ("INSTRUMENT", "SYMBOL", "OPT_TYPE", "CONTRACT_D")
+NUMERIC_COLUMNS = (
+    # split layout (op/fo<ddmmyyyy>.csv)
+    "STR_PRICE", "OPEN_PRICE", "HI_PRICE", "LO_PRICE", "CLOSE_PRICE", "OPEN_INT*", "TRD_QTY",
+    "NO_OF_CONT", "NO_OF_TRADE",
+    # CONTRACT_D layout (fo<ddmmyy>.csv)
+    "PREVIOUS_S", "HIGH_PRICE", "LOW_PRICE", "CLOSE_PRIC", "SETTLEMENT", "NET_CHANGE", "OI_NO_CON",
+    "TRADED_QUA", "TRD_NO_CON",
+    # other spellings _pick_cols understands
+    "UNDRLNG_ST", "SETTLE_PR", "SETTLEPRICE", "CHG_IN_OI", "CHANGE_IN_OI", "OPEN_INT", "OPENINTEREST",
+    "OI", "OI_LAKHS", "OPEN", "HIGH", "LOW", "CLOSE", "VOLUME", "CONTRACTS", "TOTTRDQTY",
+)
+SCHEMA = {**{c: "string" for c in STRING_COLUMNS}, **{c: "float64" for c in NUMERIC_COLUMNS}}
+
+
+def read_header(src: Source) -> Dict[str, str]:
+    """Canonical name -> raw header as written in the file (padding included)."""
+    with open_text(src) as f:
+        cols = next(csv.reader(f), [])
+    cols = [c.lstrip("\ufeff") for c in cols]  # pandas drops a UTF-8 BOM from the first name too
+    return {c.strip().upper(): c for c in cols}
+
+
+def _clean_strings(s: pd.Series, upper: bool) -> pd.Categorical:
+    """Strips (and upper-cases) the categories; values that collapse together share one category."""
+    cats = s.cat.categories.str.strip()
+    if upper:
+        cats = cats.str.upper()
+    remap, uniq = pd.factorize(cats)
+    codes = s.cat.codes.to_numpy()
+    codes = np.where(codes >= 0, remap[codes], -1)
+    return pd.Categorical.from_codes(codes, categories=uniq)
+
+
+def _read_arrow(src: Source, hdr: Dict[str, str], wanted: List[str]) -> pd.DataFrame:
+    types = {hdr[c]: (pa.string() if SCHEMA[c] == "string" else pa.float64()) for c in wanted}
+    with src.open("rb") as f:
+        tbl = pacsv.read_csv(
+            f,
+            read_options=pacsv.ReadOptions(use_threads=False),
+            # the footer is a one-field line -> column count mismatch -> skipped
+            parse_options=pacsv.ParseOptions(invalid_row_handler=lambda row: "skip"),
+            convert_options=pacsv.ConvertOptions(include_columns=[hdr[c] for c in wanted], column_types=types),
+        )
+    cols = {}
+    for c in wanted:
+        a = tbl.column(hdr[c])
+        if SCHEMA[c] == "string":
+            a = pc.utf8_trim_whitespace(a)
+            if c in UPPER_COLUMNS:
+                a = pc.utf8_upper(a)
+            a = a.dictionary_encode()
+        cols[c] = a
+    return pa.table(cols).to_pandas()
+
+
+def _read_pandas(src: Source, hdr: Dict[str, str], wanted: List[str]) -> pd.DataFrame:
+    raw_cols = [hdr[c] for c in wanted]
+    dtype = {hdr[c]: ("category" if SCHEMA[c] == "string" else "float64") for c in wanted}
+    with src.open("rb") as f:
+        try:
+            df = pd.read_csv(f, usecols=raw_cols, dtype=dtype, engine="c")
+        except ValueError:
+            # a numeric column with junk in it (not the footer - that only fills the first column)
+            f.seek(0)
+            df = pd.read_csv(f, usecols=raw_cols, dtype={k: v for k, v in dtype.items() if v == "category"}, engine="c")
+            for c in wanted:
+                if SCHEMA[c] == "float64":
+                    df[hdr[c]] = pd.to_numeric(df[hdr[c]], errors="coerce")
+
+    out = pd.DataFrame({
+        c: _clean_strings(df[hdr[c]], upper=c in UPPER_COLUMNS) if SCHEMA[c] == "string" else df[hdr[c]].to_numpy(dtype=np.float64)
+        for c in wanted
+    }, columns=wanted)
+
+    # "* - OPEN_INT as available ..." notes at the end of the split layout
+    first = wanted[0]
+    if SCHEMA[first] == "string":
+        col = out[first].cat
+        note_codes = np.flatnonzero(col.categories.str.startswith("*"))
+        if len(note_codes):
+            notes = np.isin(col.codes.to_numpy(), note_codes)
+            out = out[~notes].reset_index(drop=True)
+            out[first] = out[first].cat.remove_unused_categories()
+    return out
+
+
+def read_bhavcopy(
+    src: Union[str, Path, Source],
+    columns: Optional[Iterable[str]] = None,
+    engine: str = "auto",
+) -> pd.DataFrame:
+    """
+    Schema columns of one bhavcopy, with canonical column names, float64 numbers and stripped
+    category strings (INSTRUMENT/SYMBOL/OPT_TYPE/CONTRACT_D upper-cased). Footer lines are dropped.
+    columns narrows the read further (canonical names; unknown/missing ones are ignored).
+    engine: "auto" (pyarrow when installed), "pyarrow" or "pandas".
+    Files without any schema column come back empty.
+    """
+    src = Path(src) if isinstance(src, str) else src
+    hdr = read_header(src)
+    wanted: List[str] = [c for c in (columns if columns is not None else SCHEMA) if c in SCHEMA and c in hdr]
+    if not wanted:
+        return pd.DataFrame()
+    if engine == "pyarrow" or (engine == "auto" and HAS_ARROW):
+        try:
+            return _read_arrow(src, hdr, wanted)
+        except pa.ArrowInvalid:
+            # junk in a numeric column ("-" in OPEN_INT*): pandas coerces it to NaN
+            pass
+    return _read_pandas(src, hdr, wanted)
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from stockreco.utils.market_calendar import expiry_date, nse_calendar
+
+from .provider_base import OptionChainRow
+from .strike_ladder import StrikeLadder
+
+# numeric OptionChainRow fields, NaN when missing
+_NUM_FIELDS = ("ltp", "bid", "ask", "volume", "oi", "oi_change", "iv", "high", "low")
+
+
+def _expiry_ordinal(exp: str) -> int:
+    e = expiry_date(exp)
+    return e.toordinal() if e else -1
+
+
+def _opt(v: float) -> Optional[float]:
+    return None if v != v else v
+
+
+class OptionChain:
+    """
+    Struct-of-arrays option chain: one NumPy column per OptionChainRow field.
+
+    Behaves like the List[OptionChainRow] providers used to return (len, iteration,
+    indexing, truthiness, == against a list), so existing `for r in chain` code keeps working.
+    Row objects are only built when something iterates; agents that can work on whole
+    columns use the masks instead:
+
+        m = chain.by_side("CE") & chain.strike_band(lo, hi) & chain.min_liquidity(min_oi=1000)
+        sub = chain[m]
+
+    Strike-wise lookups (ATM, neighbours, CE/PE at a strike) go through `chain.ladder(expiry)`.
+    """
+
+    def __init__(
+        self,
+        strike,
+        expiry,
+        is_call,
+        ltp,
+        expiry_ord=None,
+        **num: Optional[Sequence[float]],
+    ):
+        self.strike = np.asarray(strike, dtype=np.float64)
+        n = self.strike.shape[0]
+        self.expiry = np.asarray(expiry, dtype=object)
+        self.is_call = np.asarray(is_call, dtype=bool)
+        if expiry_ord is None:
+            ords = {e: _expiry_ordinal(e) for e in pd.unique(self.expiry)} if n else {}
+            expiry_ord = [ords[e] for e in self.expiry]
+        self.expiry_ord = np.asarray(expiry_ord, dtype=np.int32)
+
+        num["ltp"] = ltp
+        unknown = set(num) - set(_NUM_FIELDS)
+        if unknown:
+            raise TypeError(f"OptionChain: unknown columns {sorted(unknown)}")
+        for f in _NUM_FIELDS:
+            v = num.get(f)
+            setattr(self, f, np.full(n, np.nan) if v is None else np.asarray(v, dtype=np.float64))
+
+        self._rows: Optional[List[OptionChainRow]] = None
+        self._ladders: Dict[str, StrikeLadder] = {}
+
+    # ----------------------------
+    # Construction
+    # ----------------------------
+
+    @classmethod
+    def empty(cls) -> "OptionChain":
+        return cls(strike=[], expiry=[], is_call=[], ltp=[], expiry_ord=[])
+
+    @classmethod
+    def from_rows(cls, rows: Union["OptionChain", Iterable[OptionChainRow]]) -> "OptionChain":
+        """Adapter for code that still has a plain list (e.g. NSE fallback / tests)."""
+        if isinstance(rows, OptionChain):
+            return rows
+        rows = list(rows or [])
+        num: Dict[str, List[float]] = {
+            f: [np.nan if getattr(r, f) is None else float(getattr(r, f)) for r in rows]
+            for f in _NUM_FIELDS
+        }
+        return cls(
+            strike=[float(r.strike) for r in rows],
+            expiry=[r.expiry for r in rows],
+            is_call=[(r.option_type or "").upper() == "CE" for r in rows],
+            **num,
+        )
+
+    @classmethod
+    def concat(cls, chains: Sequence["OptionChain"]) -> "OptionChain":
+        """Rows of several chains stacked in order (e.g. a whole universe for one vectorized pass)."""
+        if not chains:
+            return cls.empty()
+        cat = lambda f: np.concatenate([getattr(c, f) for c in chains])
+        return cls(
+            strike=cat("strike"),
+            expiry=cat("expiry"),
+            is_call=cat("is_call"),
+            expiry_ord=cat("expiry_ord"),
+            **{f: cat(f) for f in _NUM_FIELDS},
+        )
+
+    def take(self, idx) -> "OptionChain":
+        return OptionChain(
+            strike=self.strike[idx],
+            expiry=self.expiry[idx],
+            is_call=self.is_call[idx],
+            expiry_ord=self.expiry_ord[idx],
+            **{f: getattr(self, f)[idx] for f in _NUM_FIELDS},
+        )
+
+    # ----------------------------
+    # List compatibility
+    # ----------------------------
+
+    def __len__(self) -> int:
+        return int(self.strike.shape[0])
+
+    def __iter__(self) -> Iterator[OptionChainRow]:
+        return iter(self.rows())
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            return self.rows()[key]
+        return self.take(key)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (OptionChain, list, tuple)):
+            return self.rows() == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"OptionChain(rows={len(self)}, expiries={len(np.unique(self.expiry_ord))})"
+
+    @property
+    def option_type(self) -> np.ndarray:
+        return np.where(self.is_call, "CE", "PE").astype(object)
+
+    def rows(self) -> List[OptionChainRow]:
+        """Materialized OptionChainRow list (built once, NaN -> None)."""
+        if self._rows is None:
+            cols = {f: [_opt(v) for v in getattr(self, f).tolist()] for f in _NUM_FIELDS}
+            self._rows = [
+                OptionChainRow(
+                    strike=k,
+                    expiry=e,
+                    option_type="CE" if c else "PE",
+                    **{f: cols[f][i] for f in _NUM_FIELDS},
+                )
+                for i, (k, e, c) in enumerate(zip(self.strike.tolist(), self.expiry.tolist(), self.is_call.tolist()))
+            ]
+        return self._rows
+
+    def to_frame(self) -> pd.DataFrame:
+        df = pd.DataFrame({"strike": self.strike, "expiry": self.expiry, "option_type": self.option_type})
+        for f in _NUM_FIELDS:
+            df[f] = getattr(self, f)
+        return df
+
+    # ----------------------------
+    # Vectorized masks
+    # ----------------------------
+
+    def by_side(self, side: str) -> np.ndarray:
+        side = (side or "").upper()
+        if side == "CE":
+            return self.is_call.copy()
+        if side == "PE":
+            return ~self.is_call
+        return np.zeros(len(self), dtype=bool)
+
+    def by_expiry(self, expiry: Union[str, Iterable[str]]) -> np.ndarray:
+        """Raw expiry string match (case-insensitive), one value or several."""
+        wanted = [expiry] if isinstance(expiry, str) else list(expiry)
+        wanted_u = {str(e).upper() for e in wanted}
+        hit = [e for e in pd.unique(self.expiry) if str(e).upper() in wanted_u]
+        return pd.Series(self.expiry, dtype=object).isin(hit).to_numpy()
+
+    def strike_band(self, lo: float, hi: float) -> np.ndarray:
+        return (self.strike >= lo) & (self.strike <= hi)
+
+    def min_liquidity(self, min_oi: float = 0.0, min_volume: float = 0.0) -> np.ndarray:
+        """Missing OI/volume counts as 0; a threshold of 0 disables that check."""
+        m = np.ones(len(self), dtype=bool)
+        if min_oi:
+            m &= np.nan_to_num(self.oi, nan=0.0) >= min_oi
+        if min_volume:
+            m &= np.nan_to_num(self.volume, nan=0.0) >= min_volume
+        return m
+
+    def days_to_expiry(self, as_of: str) -> np.ndarray:
+        """Calendar DTE per row (clipped at 0), NaN where the expiry can't be parsed."""
+        a = datetime.strptime(as_of, "%Y-%m-%d").date().toordinal()
+        dte = np.maximum(self.expiry_ord.astype(np.float64) - a, 0.0)
+        dte[self.expiry_ord < 0] = np.nan
+        return dte
+
+    def trading_days_to_expiry(self, as_of: str) -> np.ndarray:
+        """NSE sessions after as_of up to and including expiry, per row (NaN where unparseable)."""
+        return nse_calendar().sessions_between_ord(as_of, self.expiry_ord)
+
+    def ladder(self, expiry: str) -> StrikeLadder:
+        """Sorted strike ladder of one expiry (built once per expiry; row indices into this chain)."""
+        lad = self._ladders.get(expiry)
+        if lad is None:
+            rows = np.flatnonzero(self.expiry == expiry)
+            lad = self._ladders[expiry] = StrikeLadder.build(self.strike[rows], self.is_call[rows], rows)
+        return lad
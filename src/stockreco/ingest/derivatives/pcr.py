@@ -0,0 +1,219 @@
+"""
+Streaming put/call OI aggregation over raw op/fo bhavcopies.
+
+Files are read in fixed-size chunks with only the columns PCR needs; each chunk's
+(underlying, expiry) pairs are mapped to global integer codes and call/put OI is accumulated
+with np.bincount. Memory stays bounded by the number of distinct pairs, not the file size,
+so a backfill over years of date folders runs in flat memory.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .archive import Source
+from .bhav_cache import day_sources
+from .chain_index import _CONTRACT_RE, canonical_underlying
+from .nse_reader import read_header
+from .option_chain import _expiry_ordinal
+
+DEFAULT_CHUNKSIZE = 100_000
+
+_OI_NAMES = ("OPEN_INT*", "OPEN_INT", "OI_NO_CON", "OPENINTEREST", "OI")
+_CLOSE_NAMES = ("CLOSE_PRIC", "CLOSE_PRICE", "CLOSE")
+_SETTLE_NAMES = ("SETTLEMENT", "SETTLE_PR", "SETTLEPRICE")
+
+
+class _OiAccumulator:
+    """Call/put OI sums per (underlying, expiry) with codes stable across chunks."""
+
+    def __init__(self):
+        self.codes: Dict[Tuple[str, str], int] = {}
+        self.call = np.zeros(0)
+        self.put = np.zeros(0)
+
+    def add(self, und: np.ndarray, exp: np.ndarray, is_call: np.ndarray, oi: np.ndarray) -> None:
+        if not len(und):
+            return
+        local, uniq = pd.factorize(pd.MultiIndex.from_arrays([und, exp]))
+        lut = np.empty(len(uniq), dtype=np.int64)
+        for i, key in enumerate(uniq):
+            code = self.codes.get(key)
+            if code is None:
+                code = self.codes[key] = len(self.codes)
+            lut[i] = code
+        g = lut[local]
+
+        n = len(self.codes)
+        if n > self.call.shape[0]:
+            self.call = np.concatenate([self.call, np.zeros(n - self.call.shape[0])])
+            self.put = np.concatenate([self.put, np.zeros(n - self.put.shape[0])])
+        self.call += np.bincount(g[is_call], weights=oi[is_call], minlength=n)
+        self.put += np.bincount(g[~is_call], weights=oi[~is_call], minlength=n)
+
+    def underlyings(self) -> set:
+        return {u for u, _ in self.codes}
+
+
+@dataclass
+class PcrStats:
+    # (underlying, expiry ISO or raw string) -> OI sums
+    call_oi: Dict[Tuple[str, str], float] = field(default_factory=dict)
+    put_oi: Dict[Tuple[str, str], float] = field(default_factory=dict)
+
+    @staticmethod
+    def _ratio(p: float, c: float) -> float:
+        return round(p / c, 2) if c > 0 else 0.0
+
+    def totals(self) -> Tuple[Dict[str, float], Dict[str, float]]:
+        """(call OI, put OI) per underlying across expiries."""
+        calls: Dict[str, float] = {}
+        puts: Dict[str, float] = {}
+        for (u, _), v in self.call_oi.items():
+            calls[u] = calls.get(u, 0.0) + v
+        for (u, _), v in self.put_oi.items():
+            puts[u] = puts.get(u, 0.0) + v
+        return calls, puts
+
+    def pcr(self) -> Dict[str, float]:
+        """Put OI / Call OI per underlying (all expiries)."""
+        calls, puts = self.totals()
+        return {u: self._ratio(puts.get(u, 0.0), c) for u, c in sorted(calls.items())}
+
+    def pcr_by_expiry(self) -> Dict[str, Dict[str, float]]:
+        out: Dict[str, Dict[str, float]] = {}
+        for (u, e), c in sorted(self.call_oi.items()):
+            out.setdefault(u, {})[e] = self._ratio(self.put_oi.get((u, e), 0.0), c)
+        return out
+
+
+def _iso(exp: str) -> str:
+    o = _expiry_ordinal(exp)
+    return date.fromordinal(o).isoformat() if o > 0 else str(exp)
+
+
+def _priced(chunk: pd.DataFrame, close_col: Optional[str], settle_col: Optional[str]) -> np.ndarray:
+    """Rows ChainIndex keeps: a positive close, or a positive settle where the close isn't."""
+    def num(col):
+        if col is None:
+            return np.full(len(chunk), np.nan)
+        return pd.to_numeric(chunk[col], errors="coerce").to_numpy(dtype=np.float64)
+
+    ltp = num(close_col)
+    return np.where(ltp > 0, ltp, num(settle_col)) > 0
+
+
+def _iter_chunks(path: Source, chunksize: int) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    (underlying, expiry, is_call, oi) per chunk of option rows; nothing for futures-only files.
+    Only rows the option chain keeps count (strike set, close or settle > 0), so the PCR is
+    over the same contracts as the chain.
+    """
+    hdr = read_header(path)  # stripped/upper-cased name -> raw (padded) header for usecols
+    oi_col = next((hdr[n] for n in _OI_NAMES if n in hdr), None)
+    if oi_col is None:
+        return
+    close_col = next((hdr[n] for n in _CLOSE_NAMES if n in hdr), None)
+    settle_col = next((hdr[n] for n in _SETTLE_NAMES if n in hdr), None)
+    px_cols = [c for c in (close_col, settle_col) if c is not None]
+
+    if "CONTRACT_D" in hdr:
+        usecols = [hdr["CONTRACT_D"], oi_col] + px_cols
+        with path.open("rb") as f:
+            for chunk in pd.read_csv(f, usecols=usecols, dtype={hdr["CONTRACT_D"]: str}, chunksize=chunksize):
+                parts = chunk[hdr["CONTRACT_D"]].str.strip().str.upper().str.extract(_CONTRACT_RE)
+                ok = parts["cp"].notna().to_numpy() & _priced(chunk, close_col, settle_col)
+                yield (
+                    parts["und"].to_numpy(dtype=object)[ok],
+                    parts["exp"].to_numpy(dtype=object)[ok],
+                    (parts["cp"].to_numpy(dtype=object)[ok] == "CE"),
+                    np.nan_to_num(pd.to_numeric(chunk[oi_col], errors="coerce").to_numpy(dtype=np.float64)[ok]),
+                )
+        return
+
+    if not all(c in hdr for c in ("SYMBOL", "EXP_DATE", "STR_PRICE", "OPT_TYPE")):
+        return
+    sym, exp, k, cp = hdr["SYMBOL"], hdr["EXP_DATE"], hdr["STR_PRICE"], hdr["OPT_TYPE"]
+    usecols = [sym, exp, k, cp, oi_col] + px_cols
+    with path.open("rb") as f:
+        for chunk in pd.read_csv(f, usecols=usecols, dtype={sym: str, exp: str, cp: str}, chunksize=chunksize):
+            side = chunk[cp].str.strip().str.upper().to_numpy(dtype=object)
+            ok = (side == "CE") | (side == "PE")  # also drops the "* - OPEN_INT ..." footer
+            ok &= pd.to_numeric(chunk[k], errors="coerce").notna().to_numpy()
+            ok &= _priced(chunk, close_col, settle_col)
+            yield (
+                chunk[sym].str.strip().str.upper().to_numpy(dtype=object)[ok],
+                chunk[exp].str.strip().to_numpy(dtype=object)[ok],
+                side[ok] == "CE",
+                np.nan_to_num(pd.to_numeric(chunk[oi_col], errors="coerce").to_numpy(dtype=np.float64)[ok]),
+            )
+
+
+def _accumulate(path: Optional[Source], chunksize: int) -> _OiAccumulator:
+    acc = _OiAccumulator()
+    if path is None:
+        return acc
+    for und, exp, is_call, oi in _iter_chunks(path, chunksize):
+        acc.add(und, exp, is_call, oi)
+    return acc
+
+
+def stream_pcr(
+    op_file: Optional[Source] = None,
+    fo_file: Optional[Source] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> PcrStats:
+    """
+    PCR inputs for one day. Same precedence as the option chain: the op file wins per
+    underlying, fo rows only count for underlyings op doesn't carry. Index spellings
+    (NIFTY 50, NIFTY BANK) are folded into their NSE symbol.
+    """
+    op = _accumulate(op_file, chunksize)
+    fo = _accumulate(fo_file, chunksize)
+    have = {canonical_underlying(u) for u in op.underlyings()}
+
+    stats = PcrStats()
+    for acc, skip in ((op, set()), (fo, have)):
+        iso = {e: _iso(e) for e in {e for _, e in acc.codes}}
+        for (u, e), code in acc.codes.items():
+            cu = canonical_underlying(u)
+            if cu in skip:
+                continue
+            key = (cu, iso[e])
+            stats.call_oi[key] = stats.call_oi.get(key, 0.0) + float(acc.call[code])
+            stats.put_oi[key] = stats.put_oi.get(key, 0.0) + float(acc.put[code])
+    return stats
+
+
+def day_pcr(day_dir: Union[str, Path], chunksize: int = DEFAULT_CHUNKSIZE) -> PcrStats:
+    src = day_sources(Path(day_dir))
+    return stream_pcr(src.get("op"), src.get("fo"), chunksize=chunksize)
+
+
+def pcr_history(
+    base_dir: Union[str, Path] = "data/derivatives",
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> pd.DataFrame:
+    """
+    Backfill: one row per (date, underlying) with call/put OI and PCR for every
+    data/derivatives/YYYY-MM-DD/ folder in [start, end]. Folders are processed one at a time.
+    """
+    rows: List[Dict[str, object]] = []
+    for d in sorted(Path(base_dir).iterdir()):
+        if not d.is_dir() or _expiry_ordinal(d.name) < 0:
+            continue
+        if (start and d.name < start) or (end and d.name > end):
+            continue
+        st = day_pcr(d, chunksize=chunksize)
+        calls, puts = st.totals()
+        for u, p in st.pcr().items():
+            rows.append({"date": d.name, "underlying": u, "call_oi": calls[u], "put_oi": puts.get(u, 0.0), "pcr": p})
+    return pd.DataFrame(rows, columns=["date", "underlying", "call_oi", "put_oi", "pcr"])
@@ -1,6 +1,9 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List, Optional, Literal, Protocol
+from typing import Optional, Literal, Protocol, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .option_chain import OptionChain
 
 OptionType = Literal["CE", "PE"]
 
@@ -28,7 +31,16 @@ class UnderlyingSnapshot:
 class DerivativesProvider(Protocol):
     name: str
     def get_underlying(self, symbol: str) -> UnderlyingSnapshot: ...
-    def get_option_chain(self, symbol: str, expiry: Optional[str] = None) -> List[OptionChainRow]: ...
+    # OptionChain is list-like (iterates OptionChainRow); a plain list is still accepted by the agents
+    def get_option_chain(self, symbol: str, expiry: Optional[str] = None) -> "OptionChain": ...
+
+def chain_size(provider: DerivativesProvider, symbol: str) -> int:
+    """Number of option rows in provider's chain for symbol."""
+    # LocalCsvProvider answers from its per-day index without building row objects
+    if hasattr(provider, "chain_size"):
+        return provider.chain_size(symbol)
+    chain = provider.get_option_chain(symbol)
+    return len(chain) if chain else 0
 
 def normalize_symbol(sym: str) -> str:
     return sym.strip().upper()
@@ -0,0 +1,122 @@
+"""
+Sorted strike ladder for one (underlying, expiry): unique strikes, the median strike step and
+the chain row of the CE / PE at each rung.
+
+    lad = chain.ladder("30-Dec-2025")    # built once per expiry, cached on the OptionChain
+    lad.step                             # median gap between listed strikes (1.0 if < 2 strikes)
+    lad.atm(spot)                        # nearest listed strike (bisect; lower strike on a tie)
+    lad.neighbors(k, 2)                  # the 2 strikes either side of k
+    lad.row(k, "PE")                     # chain row index of that contract, or None
+    lad.column(chain.oi, "CE")           # per-rung values of a chain column (NaN where unlisted)
+
+Strike lookups tolerate float noise up to `tol` (bhavcopies carry 2-decimal strikes), so callers
+don't need their own `abs(a - b) < 0.1` loops.
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class StrikeLadder:
+    def __init__(self, strikes: np.ndarray, ce: np.ndarray, pe: np.ndarray, tol: float = 1e-6):
+        self.strikes = strikes
+        self.ce = ce  # chain row index of the CE at each strike, -1 when not listed
+        self.pe = pe
+        self.tol = tol
+        if len(strikes) < 2:
+            self.step = 1.0
+        else:
+            d = np.sort(np.diff(strikes))
+            self.step = float(d[len(d) // 2])
+
+    @classmethod
+    def build(cls, strike, is_call=None, rows=None, tol: float = 1e-6) -> "StrikeLadder":
+        """
+        Ladder over `strike` (aligned with `is_call` and the chain `rows` they came from). A strike
+        listed twice on one side keeps its first row.
+        """
+        strike = np.asarray(strike, dtype=np.float64)
+        rows = np.arange(len(strike)) if rows is None else np.asarray(rows, dtype=np.int64)
+        ok = np.isfinite(strike)
+        strike, rows = strike[ok], rows[ok]
+        ks, pos = np.unique(strike, return_inverse=True)
+        ce = np.full(len(ks), -1, dtype=np.int64)
+        pe = np.full(len(ks), -1, dtype=np.int64)
+        if is_call is not None:
+            is_call = np.asarray(is_call, dtype=bool)[ok]
+            for side, out in ((is_call, ce), (~is_call, pe)):
+                # reversed assignment so the first occurrence wins
+                out[pos[side][::-1]] = rows[side][::-1]
+        return cls(ks, ce, pe, tol=tol)
+
+    @classmethod
+    def from_strikes(cls, strikes: Sequence[float], tol: float = 1e-6) -> "StrikeLadder":
+        """Ladder over bare strike values (no CE/PE rows)."""
+        return cls.build([float(k) for k in strikes if k is not None], tol=tol)
+
+    def __len__(self) -> int:
+        return int(self.strikes.shape[0])
+
+    def __repr__(self) -> str:
+        if not len(self):
+            return "StrikeLadder(empty)"
+        return f"StrikeLadder({self.strikes[0]:g}..{self.strikes[-1]:g}, n={len(self)}, step={self.step:g})"
+
+    # ----------------------------
+    # Lookups
+    # ----------------------------
+
+    def index(self, strike: Optional[float]) -> Optional[int]:
+        """Rung of a listed strike (within tol), else None."""
+        if strike is None or not len(self):
+            return None
+        k = float(strike)
+        i = int(np.searchsorted(self.strikes, k - self.tol, side="left"))
+        if i < len(self) and abs(self.strikes[i] - k) <= self.tol:
+            return i
+        return None
+
+    def atm_index(self, spot: float) -> Optional[int]:
+        """Rung nearest spot; the lower strike wins a tie."""
+        n = len(self)
+        if not n or spot is None or spot != spot:
+            return None
+        i = int(np.searchsorted(self.strikes, spot, side="left"))
+        if i == 0:
+            return 0
+        if i == n:
+            return n - 1
+        return i - 1 if spot - self.strikes[i - 1] <= self.strikes[i] - spot else i
+
+    def atm(self, spot: float) -> Optional[float]:
+        i = self.atm_index(spot)
+        return None if i is None else float(self.strikes[i])
+
+    def neighbors(self, strike: float, n: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """Up to n listed strikes strictly below and strictly above `strike` (nearest last / first)."""
+        lo = int(np.searchsorted(self.strikes, strike - self.tol, side="left"))
+        hi = int(np.searchsorted(self.strikes, strike + self.tol, side="right"))
+        return self.strikes[max(0, lo - n):lo], self.strikes[hi:hi + n]
+
+    def row(self, strike: float, side: str) -> Optional[int]:
+        """Chain row index of the CE / PE at `strike`, or None."""
+        i = self.index(strike)
+        if i is None:
+            return None
+        j = int((self.ce if (side or "").upper() == "CE" else self.pe)[i])
+        return j if j >= 0 else None
+
+    def pair(self, strike: float) -> Tuple[Optional[int], Optional[int]]:
+        """(CE row, PE row) at `strike`."""
+        return self.row(strike, "CE"), self.row(strike, "PE")
+
+    def column(self, values: np.ndarray, side: str) -> np.ndarray:
+        """values[row] per rung for one side (values aligned with the chain), NaN where unlisted."""
+        idx = self.ce if (side or "").upper() == "CE" else self.pe
+        out = np.full(len(self), np.nan)
+        have = idx >= 0
+        out[have] = np.asarray(values, dtype=np.float64)[idx[have]]
+        return out
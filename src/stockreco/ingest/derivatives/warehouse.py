@@ -0,0 +1,232 @@
+"""
+Multi-date option warehouse over every data/derivatives/YYYY-MM-DD/ folder.
+
+Each date becomes one partition (<root>/date=YYYY-MM-DD/part-0.parquet) of rows keyed by
+(date, underlying, expiry, strike, side), built from the day's normalized chain cache
+(bhav_cache). Partitions are only rebuilt when that day's source files change, and queries
+pick partitions by date range instead of re-opening CSVs per day:
+
+    wh = DerivativesWarehouse(repo_root)
+    wh.sync()
+    wh.premium_path("NIFTY", "2025-12-30", 26000, "CE", start="2025-12-16", end="2025-12-23")
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+import json
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from .bhav_cache import HAS_PARQUET, day_sources, load_chain
+from .chain_index import canonical_underlying
+from .option_chain import _expiry_ordinal
+from .provider_base import normalize_to_nse_symbol
+
+WAREHOUSE_VERSION = 1
+MANIFEST_FILE = "_manifest.json"
+
+COLUMNS = ["date", "underlying", "expiry", "strike", "side", "ltp", "high", "low", "oi", "oi_change", "volume"]
+
+
+def _is_date(name: str) -> bool:
+    try:
+        datetime.strptime(name, "%Y-%m-%d")
+        return True
+    except ValueError:
+        return False
+
+
+def _iso(exp) -> Optional[str]:
+    """Any expiry spelling (30-DEC-2025, 30/12/2025, 2025-12-30, date) -> 2025-12-30."""
+    if isinstance(exp, (date, datetime)):
+        return exp.strftime("%Y-%m-%d")
+    o = _expiry_ordinal(str(exp))
+    return date.fromordinal(o).isoformat() if o > 0 else None
+
+
+def _fingerprint(day_dir: Path) -> Dict[str, Dict[str, int]]:
+    out = {}
+    for role, p in day_sources(day_dir).items():
+        st = p.stat()
+        out[role] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    return out
+
+
+def day_frame(day_dir: Path) -> pd.DataFrame:
+    """One date's warehouse rows, sorted by (underlying, expiry, strike, side)."""
+    chain = load_chain(day_dir)
+    ok = chain["expiry_ord"].to_numpy() > 0
+    chain = chain[ok]
+    df = pd.DataFrame({
+        "date": Path(day_dir).name,
+        "underlying": chain["underlying"].map(canonical_underlying).to_numpy(dtype=object),
+        "expiry": [date.fromordinal(int(o)).isoformat() for o in chain["expiry_ord"]],
+        "strike": chain["strike"].to_numpy(dtype=np.float64),
+        "side": np.where(chain["is_call"].to_numpy(dtype=bool), "CE", "PE"),
+        "ltp": chain["ltp"].to_numpy(dtype=np.float64),
+        "high": chain["high"].to_numpy(dtype=np.float64),
+        "low": chain["low"].to_numpy(dtype=np.float64),
+        "oi": chain["oi"].to_numpy(dtype=np.float64),
+        "oi_change": chain["oi_change"].to_numpy(dtype=np.float64),
+        "volume": chain["volume"].to_numpy(dtype=np.float64),
+    }, columns=COLUMNS)
+    return df.sort_values(["underlying", "expiry", "strike", "side"], kind="stable").reset_index(drop=True)
+
+
+class DerivativesWarehouse:
+    def __init__(
+        self,
+        repo_root: Union[str, Path] = ".",
+        derivatives_subdir: str = "data/derivatives",
+        warehouse_subdir: str = "data/warehouse/options",
+        max_cached_days: int = 64,
+    ):
+        self.repo_root = Path(repo_root)
+        self.source_dir = self.repo_root / derivatives_subdir
+        self.root = self.repo_root / warehouse_subdir
+        self.max_cached_days = max_cached_days
+        self._days: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+
+    # ----------------------------
+    # Ingest
+    # ----------------------------
+
+    def dates(self) -> List[str]:
+        """Trading dates that have a derivatives folder."""
+        if not self.source_dir.exists():
+            return []
+        return sorted(d.name for d in self.source_dir.iterdir() if d.is_dir() and _is_date(d.name))
+
+    def _partition(self, d: str) -> Path:
+        return self.root / f"date={d}" / "part-0.parquet"
+
+    def _read_manifest(self) -> Dict[str, object]:
+        p = self.root / MANIFEST_FILE
+        try:
+            m = json.loads(p.read_text(encoding="utf-8"))
+            if m.get("version") == WAREHOUSE_VERSION:
+                return m
+        except Exception:
+            pass
+        return {"version": WAREHOUSE_VERSION, "days": {}}
+
+    def sync(self, force: bool = False) -> List[str]:
+        """
+        Writes partitions for new/changed date folders. Returns the dates (re)built.
+        Without pyarrow this is a no-op and queries read the per-date caches directly.
+        """
+        if not HAS_PARQUET:
+            return []
+        man = self._read_manifest()
+        days: Dict[str, object] = man["days"]  # type: ignore[assignment]
+        built: List[str] = []
+        for d in self.dates():
+            fp = _fingerprint(self.source_dir / d)
+            if not fp:
+                continue
+            if not force and days.get(d) == fp and self._partition(d).exists():
+                continue
+            df = day_frame(self.source_dir / d)
+            part = self._partition(d)
+            part.parent.mkdir(parents=True, exist_ok=True)
+            df.drop(columns=["date"]).to_parquet(part, index=False)
+            days[d] = fp
+            self._days.pop(d, None)
+            built.append(d)
+
+        # folders that disappeared
+        for d in [d for d in days if not (self.source_dir / d).exists()]:
+            shutil.rmtree(self._partition(d).parent, ignore_errors=True)
+            days.pop(d)
+            self._days.pop(d, None)
+
+        if built or not (self.root / MANIFEST_FILE).exists():
+            self.root.mkdir(parents=True, exist_ok=True)
+            (self.root / MANIFEST_FILE).write_text(json.dumps(man, indent=2), encoding="utf-8")
+        return built
+
+    # ----------------------------
+    # Queries
+    # ----------------------------
+
+    def day(self, d: str) -> pd.DataFrame:
+        """All warehouse rows for one date (memoized, LRU over max_cached_days)."""
+        df = self._days.get(d)
+        if df is not None:
+            self._days.move_to_end(d)
+            return df
+
+        part = self._partition(d)
+        if HAS_PARQUET and part.exists():
+            df = pd.read_parquet(part, memory_map=True)
+            df.insert(0, "date", d)
+        elif (self.source_dir / d).is_dir():
+            df = day_frame(self.source_dir / d)
+        else:
+            df = pd.DataFrame(columns=COLUMNS)
+
+        self._days[d] = df
+        while len(self._days) > self.max_cached_days:
+            self._days.popitem(last=False)
+        return df
+
+    def query(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        underlying: Optional[str] = None,
+        expiry=None,
+        strike: Optional[float] = None,
+        side: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """Rows for dates in [start, end] (inclusive), optionally narrowed to one contract/underlying."""
+        days = [d for d in self.dates() if (not start or d >= start) and (not end or d <= end)]
+        und = canonical_underlying(normalize_to_nse_symbol(underlying)) if underlying else None
+        exp = _iso(expiry) if expiry is not None else None
+        sd = side.upper() if side else None
+
+        parts = []
+        for d in days:
+            df = self.day(d)
+            if df.empty:
+                continue
+            # partitions are sorted by underlying, so one binary search narrows the slice
+            if und is not None:
+                col = df["underlying"]
+                df = df.iloc[col.searchsorted(und, side="left"):col.searchsorted(und, side="right")]
+            m = np.ones(len(df), dtype=bool)
+            if exp is not None:
+                m &= (df["expiry"] == exp).to_numpy()
+            if strike is not None:
+                m &= np.abs(df["strike"].to_numpy() - float(strike)) < 0.1
+            if sd is not None:
+                m &= (df["side"] == sd).to_numpy()
+            if m.any():
+                parts.append(df[m])
+        if not parts:
+            return pd.DataFrame(columns=COLUMNS)
+        return pd.concat(parts, ignore_index=True)
+
+    def contract(self, d: str, underlying: str, expiry, strike: float, side: str) -> Optional[Dict[str, object]]:
+        """One contract's row on one date, or None."""
+        df = self.query(d, d, underlying, expiry, strike, side)
+        return None if df.empty else df.iloc[0].to_dict()
+
+    def premium_path(
+        self,
+        underlying: str,
+        expiry,
+        strike: float,
+        side: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """Daily ltp/high/low/oi of one contract from start to end (e.g. reco date -> sell_by)."""
+        df = self.query(start, end, underlying, expiry, strike, side)
+        return df[["date", "ltp", "high", "low", "oi", "volume"]].reset_index(drop=True)
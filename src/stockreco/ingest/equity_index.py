@@ -0,0 +1,169 @@
+"""
+Per-date spot index over the equity bhavcopy (data/stocks/<date>/sec_bhavdata_full_<ddmmyyyy>.csv).
+
+The file is read once per date folder (through the ingest job's parquet copy when it's fresh,
+ingest_job.load_table) and turned into symbol -> EquityQuote (close, prev close, delivery %),
+shared by LocalCsvProvider.get_underlying, MarketContextLoader and generate_signals_csv:
+
+    idx = spot_index(repo_root / "data" / "stocks", "2025-12-16")
+    idx.close("RELIANCE")   # 1543.2
+    idx.delivery_stats()    # {"RELIANCE": 52.1, ...}
+
+A symbol traded in several series (EQ + P1, EQ + N3, ...) keeps its EQ row, then BE/BZ/SM/ST,
+then whatever comes first in the file. Indexes are memoized in-process per folder (the most recent
+_INDEXES_MAX of them), and rebuilt when the folder's raw files change.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+import logging
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+from .derivatives.archive import Source, find_sources
+from .ingest_job import load_table
+
+logger = logging.getLogger(__name__)
+
+BHAV_PATTERN = "sec_bhavdata_full*.csv"
+SERIES_PREFERENCE = ("EQ", "BE", "BZ", "SM", "ST")
+
+_INDEXES: "OrderedDict[str, Tuple[tuple, EquitySpotIndex]]" = OrderedDict()
+_INDEXES_MAX = 64
+_RAW_SUFFIXES = (".csv", ".zip")
+
+
+@dataclass(frozen=True)
+class EquityQuote:
+    symbol: str
+    series: str
+    close: float
+    prev_close: Optional[float] = None
+    deliv_per: Optional[float] = None  # 0-100, None when NSE prints "-"
+
+
+def _key(symbol: str) -> str:
+    s = str(symbol).strip().upper()
+    return s[:-3] if s.endswith(".NS") else s
+
+
+def _num(v) -> Optional[float]:
+    return None if v is None or (isinstance(v, float) and math.isnan(v)) else float(v)
+
+
+@dataclass
+class EquitySpotIndex:
+    as_of: str
+    quotes: Dict[str, EquityQuote] = field(default_factory=dict)
+    source: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self.quotes)
+
+    def __contains__(self, symbol: str) -> bool:
+        return _key(symbol) in self.quotes
+
+    def get(self, symbol: str) -> Optional[EquityQuote]:
+        """Quote for RELIANCE / reliance / RELIANCE.NS, or None."""
+        return self.quotes.get(_key(symbol))
+
+    def close(self, symbol: str) -> Optional[float]:
+        q = self.get(symbol)
+        return q.close if q is not None and q.close > 0 else None
+
+    def delivery_stats(self) -> Dict[str, float]:
+        """Symbol -> delivery % for every symbol that has one."""
+        return {s: q.deliv_per for s, q in self.quotes.items() if q.deliv_per is not None}
+
+
+def _find_bhav(stocks_day_dir: Path) -> Optional[Source]:
+    files = find_sources(stocks_day_dir, BHAV_PATTERN)
+    return files[0] if files else None
+
+
+def build_index(src: Union[str, Path, Source], as_of: str) -> EquitySpotIndex:
+    """Reads one sec_bhavdata_full file into an EquitySpotIndex."""
+    src = Path(src) if isinstance(src, str) else src
+    df = load_table(src)
+    df.columns = [str(c).strip().upper() for c in df.columns]
+    if "SYMBOL" not in df.columns or "CLOSE_PRICE" not in df.columns:
+        logger.warning(f"{src}: no SYMBOL/CLOSE_PRICE columns, equity index left empty")
+        return EquitySpotIndex(as_of=as_of, source=str(src))
+
+    sym = df["SYMBOL"].astype("string").str.strip().str.upper().fillna("")
+    series = (
+        df["SERIES"].astype("string").str.strip().str.upper().fillna("")
+        if "SERIES" in df.columns else pd.Series("", index=df.index, dtype="string")
+    )
+
+    def num(col: str) -> np.ndarray:
+        if col not in df.columns:
+            return np.full(len(df), np.nan)
+        return pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=np.float64)
+
+    close, prev, deliv = num("CLOSE_PRICE"), num("PREV_CLOSE"), num("DELIV_PER")
+
+    pref = {s: i for i, s in enumerate(SERIES_PREFERENCE)}
+    rank = np.array([pref.get(s, len(pref)) for s in series.to_numpy(dtype=object)], dtype=np.int64)
+    order = np.lexsort((np.arange(len(df)), rank))  # best series first, file order within a rank
+
+    quotes: Dict[str, EquityQuote] = {}
+    syms, sers = sym.to_numpy(dtype=object), series.to_numpy(dtype=object)
+    for i in order:
+        s = syms[i]
+        if not s or s in quotes or np.isnan(close[i]):
+            continue
+        quotes[s] = EquityQuote(
+            symbol=s, series=sers[i], close=float(close[i]), prev_close=_num(prev[i]), deliv_per=_num(deliv[i]),
+        )
+    return EquitySpotIndex(as_of=as_of, quotes=quotes, source=str(src))
+
+
+def _dir_stamp(day_dir: Path) -> tuple:
+    """(name, size, mtime_ns) of the folder's raw csv/zip files; the ingest job's parquet copies don't count."""
+    try:
+        with os.scandir(day_dir) as it:
+            entries = [e for e in it if e.name.lower().endswith(_RAW_SUFFIXES) and e.is_file()]
+            return tuple(sorted((e.name, e.stat().st_size, e.stat().st_mtime_ns) for e in entries))
+    except OSError:
+        return ()
+
+
+def spot_index(stocks_dir: Union[str, Path], as_of: str) -> EquitySpotIndex:
+    """
+    Memoized index for stocks_dir/<as_of>/ (stocks_dir is usually data/stocks). A missing folder
+    or bhavcopy gives an empty index; a rewritten bhavcopy is picked up on the next call.
+    """
+    day_dir = Path(stocks_dir) / as_of
+    key = str(day_dir.resolve())
+    stamp = _dir_stamp(day_dir)
+    hit = _INDEXES.get(key)
+    if hit is not None and hit[0] == stamp:
+        _INDEXES.move_to_end(key)
+        return hit[1]
+
+    src = _find_bhav(day_dir) if day_dir.is_dir() else None
+    if src is None:
+        idx = EquitySpotIndex(as_of=as_of)
+    else:
+        try:
+            idx = build_index(src, as_of)
+        except Exception as e:
+            logger.warning(f"Failed to load equity bhavcopy {src}: {e}")
+            idx = EquitySpotIndex(as_of=as_of, source=str(src))
+    _INDEXES[key] = (stamp, idx)
+    _INDEXES.move_to_end(key)
+    while len(_INDEXES) > _INDEXES_MAX:
+        _INDEXES.popitem(last=False)
+    return idx
+
+
+def clear_spot_index_cache() -> None:
+    _INDEXES.clear()
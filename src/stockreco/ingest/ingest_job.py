@@ -0,0 +1,251 @@
+"""
+Batch ingest of the daily data folders into their columnar caches.
+
+One task per (folder, file type) fanned out on a process pool:
+
+  data/derivatives/<date>/  bhav     op/fo bhavcopies -> chain.parquet / futures.parquet (bhav_cache)
+                            context  FOVOLT + participant OI + PCR -> context.json (context)
+                            table    FOVOLT, fao_participant_oi/vol, combineoi, ncloi -> parquet/<file>.parquet
+  data/stocks/<date>/       table    sec_bhavdata_full, CMVOLT, bulk, block
+  data/mcx/<date>/          table    BhavCopyDateWise
+
+CSVs inside the folder's zips are read in place when they weren't extracted (archive.list_sources).
+Each folder gets an ingest_manifest.json with a digest of its source files; incremental runs
+skip folders whose digest hasn't changed. Every task reports how long it took to parse.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import hashlib
+import json
+import time
+
+import pandas as pd
+
+from .derivatives.archive import Source, list_sources
+from .derivatives.bhav_cache import CHAIN_FILE, FUTURES_FILE, HAS_PARQUET, MANIFEST_FILE, normalize_day
+from .derivatives.context import CONTEXT_FILE, context_for_dir
+
+INGEST_VERSION = 1
+INGEST_MANIFEST = "ingest_manifest.json"
+TABLE_DIR = "parquet"
+
+SOURCES = ("derivatives", "stocks", "mcx")
+
+# per source: (glob, read_csv kwargs). Globs are matched case-insensitively on the file name.
+TABLE_SPECS: Dict[str, List[Tuple[str, Dict[str, object]]]] = {
+    "derivatives": [
+        ("fovolt_*.csv", {}),
+        ("fao_participant_oi_*.csv", {"skiprows": 1}),  # first line is a title
+        ("fao_participant_vol_*.csv", {"skiprows": 1}),
+        ("combineoi_*.csv", {}),
+        ("ncloi_*.csv", {}),
+    ],
+    "stocks": [
+        ("sec_bhavdata_full_*.csv", {}),
+        ("cmvolt_*.csv", {}),
+        ("bulk.csv", {}),
+        ("block.csv", {}),
+    ],
+    "mcx": [
+        ("bhavcopydatewise_*.csv", {"encoding": "utf-8-sig"}),
+    ],
+}
+
+# files we write into the date folders ourselves; never part of the source digest
+_OUTPUTS = {CHAIN_FILE, FUTURES_FILE, MANIFEST_FILE, CONTEXT_FILE, INGEST_MANIFEST}
+
+
+@dataclass
+class TaskResult:
+    source: str
+    date: str
+    kind: str  # bhav | context | table
+    path: str
+    rows: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+# ----------------------------
+# Table cache
+# ----------------------------
+
+def table_path(src: Source) -> Path:
+    return src.parent / TABLE_DIR / f"{src.stem}.parquet"
+
+
+def read_table(src: Source, **read_kwargs) -> pd.DataFrame:
+    """Raw NSE/MCX CSV with stripped headers and stripped string cells."""
+    with src.open("rb") as f:
+        df = pd.read_csv(f, skipinitialspace=True, **read_kwargs)
+    df.columns = [str(c).strip() for c in df.columns]
+    for c in df.columns:
+        if df[c].dtype == object or pd.api.types.is_string_dtype(df[c]):
+            df[c] = df[c].astype("string").str.strip()
+    return df
+
+
+def normalize_table(src: Source, **read_kwargs) -> int:
+    """CSV -> parquet/<stem>.parquet next to it. Returns the row count."""
+    df = read_table(src, **read_kwargs)
+    if HAS_PARQUET:
+        out = table_path(src)
+        out.parent.mkdir(exist_ok=True)
+        df.to_parquet(out, index=False)
+    return int(len(df))
+
+
+def load_table(src: Union[str, Source], **read_kwargs) -> pd.DataFrame:
+    """Cached parquet copy of src if it's at least as new as the CSV, else the CSV itself."""
+    src = Path(src) if isinstance(src, str) else src
+    out = table_path(src)
+    if HAS_PARQUET and out.exists() and out.stat().st_mtime_ns >= src.stat().st_mtime_ns:
+        return pd.read_parquet(out)
+    return read_table(src, **read_kwargs)
+
+
+# ----------------------------
+# Planning
+# ----------------------------
+
+def _is_date(name: str) -> bool:
+    try:
+        datetime.strptime(name, "%Y-%m-%d")
+        return True
+    except ValueError:
+        return False
+
+
+def date_folders(base: Path, start: Optional[str] = None, end: Optional[str] = None) -> List[Path]:
+    if not base.exists():
+        return []
+    return [
+        d for d in sorted(base.iterdir())
+        if d.is_dir() and _is_date(d.name) and (not start or d.name >= start) and (not end or d.name <= end)
+    ]
+
+
+def folder_digest(folder: Path) -> str:
+    """sha256 over (name, size, mtime_ns) of every source file in the folder."""
+    h = hashlib.sha256()
+    for p in sorted(folder.iterdir()):
+        if not p.is_file() or p.name in _OUTPUTS:
+            continue
+        st = p.stat()
+        h.update(f"{p.name}\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
+    return h.hexdigest()
+
+
+def _read_ingest_manifest(folder: Path) -> Optional[dict]:
+    try:
+        m = json.loads((folder / INGEST_MANIFEST).read_text(encoding="utf-8"))
+        return m if m.get("version") == INGEST_VERSION else None
+    except Exception:
+        return None
+
+
+def _table_files(source: str, folder: Path) -> List[Tuple[Source, Dict[str, object]]]:
+    out = []
+    files = list_sources(folder)
+    for pattern, kwargs in TABLE_SPECS.get(source, []):
+        for p in files:
+            if Path(p.name.lower()).match(pattern):
+                out.append((p, kwargs))
+    return out
+
+
+def plan(
+    repo_root: Union[str, Path] = ".",
+    sources: Iterable[str] = SOURCES,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    incremental: bool = True,
+) -> List[Tuple[str, str, Source, Dict[str, object]]]:
+    """(source, kind, path, opts) for every task that needs to run; opts are read_csv kwargs for tables."""
+    data = Path(repo_root) / "data"
+    tasks = []
+    for source in sources:
+        for folder in date_folders(data / source, start, end):
+            if incremental:
+                man = _read_ingest_manifest(folder)
+                if man and man.get("digest") == folder_digest(folder):
+                    continue
+            if source == "derivatives":
+                tasks.append((source, "bhav", folder, {"force": not incremental}))
+                tasks.append((source, "context", folder, {}))
+            for p, kwargs in _table_files(source, folder):
+                tasks.append((source, "table", p, kwargs))
+    return tasks
+
+
+# ----------------------------
+# Running
+# ----------------------------
+
+def run_task(source: str, kind: str, p: Source, opts: Dict[str, object]) -> TaskResult:
+    """One unit of work; module-level so ProcessPoolExecutor can pickle it."""
+    folder = p if kind != "table" else p.parent
+    res = TaskResult(source=source, date=folder.name, kind=kind, path=str(p))
+    t0 = time.perf_counter()
+    try:
+        if kind == "bhav":
+            normalize_day(p, force=bool(opts.get("force")))
+            man = json.loads((p / MANIFEST_FILE).read_text(encoding="utf-8")) if (p / MANIFEST_FILE).exists() else {}
+            res.rows = int((man.get("rows") or {}).get("chain", 0))
+        elif kind == "context":
+            ctx = context_for_dir(p, p.name, persist=True)
+            res.rows = len(ctx.fovolt) + len(ctx.participant) + len(ctx.pcr)
+        else:
+            res.rows = normalize_table(p, **opts)
+    except Exception as e:
+        res.error = f"{type(e).__name__}: {e}"
+    res.seconds = time.perf_counter() - t0
+    return res
+
+
+def run_ingest(
+    repo_root: Union[str, Path] = ".",
+    sources: Iterable[str] = SOURCES,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    incremental: bool = True,
+    workers: int = 0,
+) -> List[TaskResult]:
+    """
+    Runs every planned task (workers=0 -> one per CPU, 1 -> in-process) and records each
+    folder's digest once all of its tasks succeeded. Results are sorted by path.
+    """
+    tasks = plan(repo_root, sources, start, end, incremental)
+    results: List[TaskResult] = []
+    if workers == 1 or len(tasks) <= 1:
+        results = [run_task(*t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers or None) as ex:
+            futs = [ex.submit(run_task, *t) for t in tasks]
+            for f in as_completed(futs):
+                results.append(f.result())
+    results.sort(key=lambda r: (r.source, r.date, r.kind, r.path))
+
+    by_folder: Dict[Path, List[TaskResult]] = {}
+    for r in results:
+        folder = Path(r.path) if r.kind != "table" else Path(r.path).parent
+        by_folder.setdefault(folder, []).append(r)
+    for folder, rs in by_folder.items():
+        if any(r.error for r in rs):
+            continue
+        man = {
+            "version": INGEST_VERSION,
+            "digest": folder_digest(folder),
+            "tasks": [asdict(r) | {"path": Path(r.path).name} for r in rs],
+        }
+        try:
+            (folder / INGEST_MANIFEST).write_text(json.dumps(man, indent=2), encoding="utf-8")
+        except OSError as e:
+            print(f"[WARN] could not write {INGEST_MANIFEST} in {folder}: {e}")
+    return results
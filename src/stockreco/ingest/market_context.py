@@ -6,6 +6,9 @@ from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass
 import logging
 
+from stockreco.ingest.derivatives.context import context_for_dir
+from stockreco.ingest.equity_index import spot_index
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -98,43 +101,16 @@ class MarketContextLoader:
 
     def _load_participant_oi(self, dir_path: Path, suffix: str) -> Dict[str, Dict[str, Any]]:
         """
-        Loads fao_participant_oi_{suffix}.csv
-        Returns dict: Client Type (FII/DII/Client/Pro) -> Stats
+        fao_participant_oi_{suffix}.csv rows
+        Returns dict: Client Type (FII/DII/Client/Pro/TOTAL) -> Stats
         """
         if not dir_path.exists():
             return {}
-            
-        try:
-            files = list(dir_path.glob(f"fao_participant_oi*{suffix}*"))
-            # Fallback to just fao_participant_oi.csv if suffixed one not found (sometimes they are renamed)
-            if not files:
-                 files = list(dir_path.glob(f"fao_participant_oi.csv"))
-            
-            if not files:
-                return {}
-
-            f = files[0]
-            # This file often has specific structure.
-            # Header line might be line 2 if line 1 is title.
-            # From `head` output earlier: 
-            # ""Participant wise Open Interest...""
-            # Client Type,Future Index Long...
-            
-            # We'll try reading with header=1 (skipping line 0)
-            df = pd.read_csv(f, header=1)
-            
-            # If that failed to get correct columns, try header=0
-            if 'Client Type' not in df.columns:
-                 df = pd.read_csv(f, header=0)
 
-            result = {}
-            if 'Client Type' in df.columns:
-                for _, row in df.iterrows():
-                    ctype = str(row['Client Type']).strip()
-                    # Convert row to dict and strip keys
-                    result[ctype] = {k.strip(): v for k, v in row.to_dict().items()}
-            
-            return result
+        try:
+            as_of = pd.to_datetime(suffix, format="%d%m%Y").strftime("%Y-%m-%d")
+            part = context_for_dir(dir_path, as_of).participant
+            return {ctype: dict(row) for ctype, row in part.items()}
         except Exception as e:
             logger.warning(f"Error loading participant OI: {e}")
             return {}
@@ -178,39 +154,9 @@ class MarketContextLoader:
 
     def _load_delivery_stats(self, dir_path: Path, suffix: str) -> Dict[str, float]:
         """
-        Loads sec_bhavdata_full_{suffix}.csv
+        Delivery % from sec_bhavdata_full_{suffix}.csv, via the shared per-date equity index
         Returns dict: Symbol -> Delivery Percentage (0-100)
         """
         if not dir_path.exists():
             return {}
-            
-        try:
-             files = list(dir_path.glob(f"sec_bhavdata_full*{suffix}*"))
-             if not files:
-                 return {}
-             
-             f = files[0]
-             df = pd.read_csv(f)
-             df.columns = [c.strip() for c in df.columns]
-             
-             # Look for DELIV_PER or similar
-             deliv_col = next((c for c in df.columns if "DELIV_PER" in c), None)
-             sym_col = next((c for c in df.columns if "SYMBOL" in c), 'SYMBOL')
-             
-             if not deliv_col:
-                 return {}
-             
-             result = {}
-             for _, row in df.iterrows():
-                 sym = str(row[sym_col]).strip().upper()
-                 try:
-                     val = float(row[deliv_col])
-                     result[sym] = val
-                 except ValueError:
-                     pass
-             
-             return result
-
-        except Exception as e:
-            logger.warning(f"Error loading delivery stats: {e}")
-            return {}
+        return spot_index(dir_path.parent, dir_path.name).delivery_stats()
@@ -0,0 +1,269 @@
+"""
+One pricing interface for everything that needs option prices, Greeks or IVs.
+
+    eng = get_engine()               # process default ("numpy" unless set_engine was called)
+    eng.price(S, K, T, r, sigma, cp) # arrays in, arrays out, greeks.bs_price_vec argument order
+    eng.greeks(S, K, T, r, sigma, cp) -> GreeksVec
+    eng.implied_vol(premium, S, K, T, r, cp) -> ndarray (NaN where unusable)
+
+    implied_vol_one(...) / greeks_one(...)  # scalar helpers for the agents, any engine
+
+Backends (ENGINES):
+  "scalar"  reference: math.erf closed form and bisection, one contract at a time (slow, obvious)
+  "numpy"   greeks.bs_*_vec + iv_solver.implied_vol_vec with the exact N(x) (default)
+  "lut"     the same with the lookup-table N(x) (greeks.LUT_MAX_ERROR)
+  "tree"    American Leisen-Reimer tree (binomial.py); Greeks by bumping, IV by Newton
+Aliases: "bs" -> "numpy", "binomial" -> "tree". register_engine adds more; set_engine swaps the
+default at runtime. tests/test_pricing_engines.py holds every registered engine to the reference.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Callable, Dict, Optional, Protocol
+
+import numpy as np
+
+from .binomial import DEFAULT_STEPS, tree_price_vec
+from .greeks import ArrayLike, Greeks, GreeksVec, bs_greeks_vec, bs_price_vec, call_mask, norm_backend
+from .iv_solver import IV_HI, IV_LO, OK, implied_vol_vec
+
+
+class PricingEngine(Protocol):
+    name: str
+    european: bool  # False when the engine prices early exercise
+    def price(self, S: ArrayLike, K: ArrayLike, T: ArrayLike, r: ArrayLike, sigma: ArrayLike, cp) -> np.ndarray: ...
+    def greeks(self, S: ArrayLike, K: ArrayLike, T: ArrayLike, r: ArrayLike, sigma: ArrayLike, cp) -> GreeksVec: ...
+    def implied_vol(self, premium: ArrayLike, S: ArrayLike, K: ArrayLike, T: ArrayLike, r: ArrayLike, cp) -> np.ndarray: ...
+
+
+def _greeks_vec(price, sigma, delta, gamma, vega, theta_per_day, rho, valid) -> GreeksVec:
+    nan = np.nan
+    return GreeksVec(
+        price=np.where(valid, price, 0.0),
+        iv=np.where(valid, sigma, nan),
+        delta=np.where(valid, delta, nan),
+        gamma=np.where(valid, gamma, nan),
+        vega=np.where(valid, vega, nan),
+        theta_per_day=np.where(valid, theta_per_day, nan),
+        rho=np.where(valid, rho, nan),
+        valid=valid,
+    )
+
+
+def _broadcast(*vals, cp=None):
+    arrs = [np.asarray(v, dtype=np.float64) for v in vals]
+    extra = () if cp is None or isinstance(cp, str) else np.shape(cp)
+    shape = np.broadcast_shapes(*(a.shape for a in arrs), extra)
+    out = [np.broadcast_to(a, shape) for a in arrs]
+    if cp is not None:
+        out.append(call_mask(cp, shape))
+    return out
+
+
+class ScalarEngine:
+    """Reference implementation: the textbook closed form, contract by contract."""
+
+    name = "scalar"
+    european = True
+
+    @staticmethod
+    def _one(S, K, T, r, sigma, call):
+        N = lambda x: 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
+        sqrt_t = math.sqrt(T)
+        d1 = (math.log(S / K) + (r + 0.5 * sigma * sigma) * T) / (sigma * sqrt_t)
+        d2 = d1 - sigma * sqrt_t
+        pdf = math.exp(-0.5 * d1 * d1) / math.sqrt(2.0 * math.pi)
+        disc_k = K * math.exp(-r * T)
+        if call:
+            price, delta = S * N(d1) - disc_k * N(d2), N(d1)
+            theta = -S * pdf * sigma / (2 * sqrt_t) - r * disc_k * N(d2)
+            rho = disc_k * T * N(d2)
+        else:
+            price, delta = disc_k * N(-d2) - S * N(-d1), N(d1) - 1.0
+            theta = -S * pdf * sigma / (2 * sqrt_t) + r * disc_k * N(-d2)
+            rho = -disc_k * T * N(-d2)
+        return price, delta, pdf / (S * sigma * sqrt_t), S * pdf * sqrt_t, theta / 365.0, rho
+
+    def _rows(self, S, K, T, r, sigma, cp):
+        S, K, T, r, sigma, call = _broadcast(S, K, T, r, sigma, cp=cp)
+        valid = (T > 0) & (sigma > 0) & (S > 0) & (K > 0)
+        out = np.zeros((6,) + S.shape)
+        for i in np.ndindex(S.shape):
+            if valid[i]:
+                out[(slice(None),) + i] = self._one(S[i], K[i], T[i], r[i], sigma[i], bool(call[i]))
+        return out, sigma, valid
+
+    def price(self, S, K, T, r, sigma, cp) -> np.ndarray:
+        return self._rows(S, K, T, r, sigma, cp)[0][0]
+
+    def greeks(self, S, K, T, r, sigma, cp) -> GreeksVec:
+        out, sigma, valid = self._rows(S, K, T, r, sigma, cp)
+        return _greeks_vec(out[0], sigma, *out[1:], valid)
+
+    def implied_vol(self, premium, S, K, T, r, cp) -> np.ndarray:
+        premium, S, K, T, r, call = _broadcast(premium, S, K, T, r, cp=cp)
+        iv = np.full(S.shape, np.nan)
+        for i in np.ndindex(S.shape):
+            if not (premium[i] > 0 and S[i] > 0 and K[i] > 0 and T[i] > 0):
+                continue
+            f = lambda v: self._one(S[i], K[i], T[i], r[i], v, bool(call[i]))[0] - premium[i]
+            lo, hi = IV_LO, IV_HI
+            if f(lo) >= 0:
+                iv[i] = lo
+                continue
+            if f(hi) <= 0:
+                iv[i] = hi
+                continue
+            for _ in range(100):
+                mid = 0.5 * (lo + hi)
+                if f(mid) > 0:
+                    hi = mid
+                else:
+                    lo = mid
+            iv[i] = 0.5 * (lo + hi)
+        return iv
+
+
+class NumpyEngine:
+    name = "numpy"
+    european = True
+
+    def price(self, S, K, T, r, sigma, cp) -> np.ndarray:
+        return bs_price_vec(S, K, T, r, sigma, cp)
+
+    def greeks(self, S, K, T, r, sigma, cp) -> GreeksVec:
+        return bs_greeks_vec(S, K, T, r, sigma, cp)
+
+    def implied_vol(self, premium, S, K, T, r, cp) -> np.ndarray:
+        return implied_vol_vec(premium, S, K, T, r, cp).iv
+
+
+class LutEngine(NumpyEngine):
+    name = "lut"
+
+    def price(self, S, K, T, r, sigma, cp) -> np.ndarray:
+        with norm_backend("lut"):
+            return super().price(S, K, T, r, sigma, cp)
+
+    def greeks(self, S, K, T, r, sigma, cp) -> GreeksVec:
+        with norm_backend("lut"):
+            return super().greeks(S, K, T, r, sigma, cp)
+
+    def implied_vol(self, premium, S, K, T, r, cp) -> np.ndarray:
+        with norm_backend("lut"):
+            return super().implied_vol(premium, S, K, T, r, cp)
+
+
+class TreeEngine:
+    """Binomial tree; every Greek is a bump of one batched tree_price_vec call."""
+
+    name = "tree"
+
+    def __init__(self, steps: int = DEFAULT_STEPS, method: str = "lr", american: bool = True):
+        self.steps, self.method, self.american = steps, method, american
+        self.european = not american
+
+    def price(self, S, K, T, r, sigma, cp) -> np.ndarray:
+        return tree_price_vec(S, K, T, r, sigma, cp, steps=self.steps, method=self.method, american=self.american)
+
+    def greeks(self, S, K, T, r, sigma, cp) -> GreeksVec:
+        S, K, T, r, sigma, call = _broadcast(S, K, T, r, sigma, cp=cp)
+        valid = (T > 0) & (sigma > 0) & (S > 0) & (K > 0)
+        hs, dv, dr = 0.01 * S, 0.01, 0.0025
+        dt = np.minimum(1.0 / 365.0, 0.5 * T)
+        lo_v = np.maximum(sigma - dv, 1e-4)
+        # base, S+-, vol+-, r+-, T-+dt: one batched tree call for every bump
+        bumps = [(S, sigma, r, T), (S + hs, sigma, r, T), (S - hs, sigma, r, T), (S, sigma + dv, r, T),
+                 (S, lo_v, r, T), (S, sigma, r + dr, T), (S, sigma, r - dr, T), (S, sigma, r, T - dt),
+                 (S, sigma, r, T + dt)]
+        st = lambda k: np.stack([np.broadcast_to(b[k], S.shape) for b in bumps])
+        p = self.price(st(0), K[None], st(3), st(2), st(1), call[None])
+        base, up, dn, vu, vd, ru, rd, later, earlier = p
+        with np.errstate(divide="ignore", invalid="ignore"):
+            delta = (up - dn) / (2 * hs)
+            gamma = (up - 2 * base + dn) / (hs * hs)
+            vega = (vu - vd) / (sigma + dv - lo_v)
+            rho = (ru - rd) / (2 * dr)
+            theta = (later - earlier) / (2 * dt * 365.0)
+        return _greeks_vec(base, sigma, delta, gamma, vega, theta, rho, valid)
+
+    def implied_vol(self, premium, S, K, T, r, cp, *, tol: float = 1e-6, max_iter: int = 20) -> np.ndarray:
+        """
+        Newton on the tree price with the Black-Scholes vega as slope, from the European IV.
+        NaN where it doesn't converge (stuck at an IV bound, flat vega, out of iterations).
+        """
+        premium, S, K, T, r, call = _broadcast(premium, S, K, T, r, cp=cp)
+        shape = S.shape
+        premium, S, K, T, r, call = (a.ravel() for a in (premium, S, K, T, r, call))
+        res = implied_vol_vec(premium, S, K, T, r, call)
+        sigma = res.iv.copy()
+        active = res.status == OK
+        solved = np.zeros(sigma.shape, dtype=bool)
+        for _ in range(max_iter):
+            if not active.any():
+                break
+            idx = np.flatnonzero(active)
+            args = (S[idx], K[idx], T[idx], r[idx])
+            diff = self.price(*args, sigma[idx], call[idx]) - premium[idx]
+            vega = bs_greeks_vec(*args, sigma[idx], call[idx]).vega
+            ok = np.abs(diff) < tol
+            solved[idx[ok]] = True
+            step = ~ok & (vega > 1e-8)
+            new = np.clip(sigma[idx] - diff / np.maximum(vega, 1e-8), IV_LO, IV_HI)
+            moved = step & (new != sigma[idx])  # clipped onto the bound it already sits at -> stuck
+            sigma[idx[moved]] = new[moved]
+            active[idx[~moved]] = False
+        sigma[~solved] = np.nan
+        return sigma.reshape(shape)
+
+
+ENGINES: Dict[str, Callable[[], PricingEngine]] = {
+    "scalar": ScalarEngine,
+    "numpy": NumpyEngine,
+    "lut": LutEngine,
+    "tree": TreeEngine,
+}
+ALIASES = {"bs": "numpy", "binomial": "tree"}
+_DEFAULT = "numpy"
+_INSTANCES: Dict[str, PricingEngine] = {}
+
+
+def register_engine(name: str, factory: Callable[[], PricingEngine]) -> None:
+    ENGINES[name] = factory
+    _INSTANCES.pop(name, None)
+
+
+def get_engine(name: Optional[str] = None) -> PricingEngine:
+    """Engine by registry name/alias; None -> the process default."""
+    key = ALIASES.get(name, name) if name else _DEFAULT
+    if key not in ENGINES:
+        raise ValueError(f"unknown pricing engine {name!r} (expected one of {sorted(ENGINES)} or {sorted(ALIASES)})")
+    if key not in _INSTANCES:
+        _INSTANCES[key] = ENGINES[key]()
+    return _INSTANCES[key]
+
+
+def set_engine(name: str) -> PricingEngine:
+    """Make `name` the default engine for everything that calls get_engine() without a name."""
+    global _DEFAULT
+    eng = get_engine(name)
+    _DEFAULT = ALIASES.get(name, name)
+    return eng
+
+
+def default_engine_name() -> str:
+    return _DEFAULT
+
+
+def implied_vol_one(premium: float, S: float, K: float, T: float, r: float, cp: str, engine: Optional[PricingEngine] = None) -> Optional[float]:
+    """Scalar IV through an engine (default one if None); None for unusable inputs."""
+    if premium is None or premium <= 0 or S <= 0 or K <= 0 or T <= 0:
+        return None
+    iv = float((engine or get_engine()).implied_vol(premium, S, K, T, r, cp))
+    return None if iv != iv else iv
+
+
+def greeks_one(S: float, K: float, T: float, r: float, sigma: float, cp: str, engine: Optional[PricingEngine] = None) -> Greeks:
+    """Scalar Greeks through an engine; empty Greeks() for invalid inputs."""
+    return (engine or get_engine()).greeks(S, K, T, r, sigma, cp).at(0)
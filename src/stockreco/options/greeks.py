@@ -1,19 +1,157 @@
 from __future__ import annotations
 
 import math
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
+
+import numpy as np
 
 # --- Black-Scholes helpers (European) ---
 # NOTE: For NSE index/stock options these are not perfectly European, but this is good enough for
 # sizing theta burn / IV sensitivity heuristics at EOD.
+#
+# Everything is priced by the array versions (bs_price_vec / bs_greeks_vec), which take whole
+# chains at once: S, K, T, r, sigma broadcast against each other and cp is a CE/PE flag array
+# (bool is_call, or "C"/"CE"/"CALL" vs anything else). bs_price / bs_greeks / implied_vol are
+# the per-contract scalar API: plain math on floats, since a one-element numpy call costs ~10x
+# more than the arithmetic. They keep their old contract (NaN sigma -> NaN, cp must be a string,
+# IV by bisection to an absolute price tol) and always use the exact N(x).
+#
+# N(x) comes from one of two backends (set_norm_backend for the process, norm_backend(...) for
+# one block of code; the override is a ContextVar, so it stays in its own thread / task):
+#   "exact"  Hart/West rational approximation, ~1e-16 absolute error (default)
+#   "lut"    table lookup: N and n precomputed with math.erfc / math.exp every 1/64 on
+#            [-8.5, 8.5], then a third-order Taylor step from the nearest grid point;
+#            |error| <= LUT_MAX_ERROR; ~20% cheaper per call, ~15% on a full-chain IV + Greeks
+#            solve (scripts/bench_greeks.py)
+# n(x) stays a plain np.exp either way: one ufunc is already cheaper than a table gather.
+
+ArrayLike = Union[float, np.ndarray, "list[float]"]
+
+_CALLS = ("C", "CE", "CALL")
+_SQRT_2PI = math.sqrt(2.0 * math.pi)
+_SQRT2 = math.sqrt(2.0)
+_SMALL = 8  # arrays up to this size use math.erfc in norm_cdf_vec
+
+NORM_BACKENDS = ("exact", "lut")
+_BACKEND = "exact"
+_BACKEND_OVERRIDE: ContextVar[Optional[str]] = ContextVar("norm_backend", default=None)
+
+_LUT_LO, _LUT_HI, _LUT_STEP = -8.5, 8.5, 1.0 / 64
+LUT_MAX_ERROR = 1e-10  # |N_lut - N|; Taylor remainder (step/2)^4 / 24 * max|N''''| ~ 8.5e-11
+_LUT: Optional[Tuple[np.ndarray, ...]] = None  # grid, N, n and the Taylor coefficients
+
 
 def _norm_cdf(x: float) -> float:
-    return 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
+    return 0.5 * math.erfc(-x / _SQRT2)
 
 def _norm_pdf(x: float) -> float:
     return math.exp(-0.5 * x * x) / math.sqrt(2.0 * math.pi)
 
+def _check_backend(name: str) -> None:
+    if name not in NORM_BACKENDS:
+        raise ValueError(f"unknown norm backend {name!r} (expected one of {NORM_BACKENDS})")
+
+def set_norm_backend(name: str) -> None:
+    """Process default for how norm_cdf_vec (and so every Greek) evaluates N(x)."""
+    global _BACKEND
+    _check_backend(name)
+    _BACKEND = name
+
+def get_norm_backend() -> str:
+    return _BACKEND_OVERRIDE.get() or _BACKEND
+
+@contextmanager
+def norm_backend(name: str):
+    """
+    Switch the N(x) backend for the current context only (used by the "lut" pricing engine):
+    other threads / requests keep pricing with their own backend meanwhile.
+    """
+    _check_backend(name)
+    token = _BACKEND_OVERRIDE.set(name)
+    try:
+        yield
+    finally:
+        _BACKEND_OVERRIDE.reset(token)
+
+def _lut_tables() -> Tuple[np.ndarray, ...]:
+    global _LUT
+    if _LUT is None:
+        n = int(round((_LUT_HI - _LUT_LO) / _LUT_STEP)) + 1
+        grid = _LUT_LO + _LUT_STEP * np.arange(n)
+        cdf = np.array([0.5 * math.erfc(-v / _SQRT2) for v in grid.tolist()])
+        pdf = np.exp(-0.5 * grid * grid) / _SQRT_2PI
+        # N(x0 + h) = N(x0) + n(x0) * h * (1 - x0 h / 2 + (x0^2 - 1) h^2 / 6) + O(h^4)
+        _LUT = (grid, cdf, pdf, -0.5 * grid, (grid * grid - 1.0) / 6.0)
+    return _LUT
+
+def _lut_cdf(x: np.ndarray) -> np.ndarray:
+    grid, cdf, pdf, c2, c3 = _lut_tables()
+    xc = np.fmin(np.fmax(x, _LUT_LO), _LUT_HI)  # NaN -> _LUT_LO here, patched below
+    i = np.rint((xc - _LUT_LO) * (1.0 / _LUT_STEP)).astype(np.intp)
+    h = xc - grid.take(i)
+    out = cdf.take(i) + pdf.take(i) * h * (1.0 + h * (c2.take(i) + h * c3.take(i)))
+    nan = np.isnan(x)
+    return np.where(nan, np.nan, out) if nan.any() else out
+
+def norm_cdf_vec(x: ArrayLike) -> np.ndarray:
+    """
+    Standard normal CDF over an array (Hart 1968 as given by West, "Better approximations to
+    cumulative normal functions"; double precision, no scipy needed). A handful of values goes
+    through math.erfc instead - cheaper than a dozen ufunc calls on tiny arrays.
+    With the "lut" backend: table lookup + Taylor step instead.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    if (_BACKEND_OVERRIDE.get() or _BACKEND) == "lut":
+        return _lut_cdf(x)
+    if x.size <= _SMALL:
+        return np.array([0.5 * math.erfc(-v / _SQRT2) for v in x.ravel().tolist()]).reshape(x.shape)
+    a = np.abs(x)
+    e = np.exp(-0.5 * a * a)
+
+    # |x| < 7.07: rational approximation
+    num = 3.52624965998911e-02 * a + 0.700383064443688
+    num = num * a + 6.37396220353165
+    num = num * a + 33.912866078383
+    num = num * a + 112.079291497871
+    num = num * a + 221.213596169931
+    num = num * a + 220.206867912376
+    den = 8.83883476483184e-02 * a + 1.75566716318264
+    den = den * a + 16.064177579207
+    den = den * a + 86.7807322029461
+    den = den * a + 296.564248779674
+    den = den * a + 637.333633378831
+    den = den * a + 793.826512519948
+    den = den * a + 440.413735824752
+    lower = e * num / den
+
+    far = a >= 7.07106781186547
+    if far.any():
+        # tail: continued fraction (0 beyond 37 sd)
+        af = a[far]
+        cf = af + 0.65
+        cf = af + 4.0 / cf
+        cf = af + 3.0 / cf
+        cf = af + 2.0 / cf
+        cf = af + 1.0 / cf
+        lower[far] = np.where(af > 37.0, 0.0, e[far] / cf / _SQRT_2PI)
+    return np.where(x > 0, 1.0 - lower, lower)
+
+def norm_pdf_vec(x: ArrayLike) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float64)
+    return np.exp(-0.5 * x * x) / _SQRT_2PI
+
+def call_mask(cp, shape=()) -> np.ndarray:
+    """CE/PE flags -> bool array (True = call), broadcast to shape."""
+    if isinstance(cp, str):
+        return np.full(shape, cp.upper() in _CALLS, dtype=bool)
+    a = np.asarray(cp)
+    if a.dtype != bool:
+        a = np.isin(np.char.upper(a.astype(str)), _CALLS)
+    return np.broadcast_to(a, shape) if shape != a.shape else a
+
 @dataclass
 class Greeks:
     iv: Optional[float] = None
@@ -23,40 +161,121 @@ class Greeks:
     theta_per_day: Optional[float] = None
     rho: Optional[float] = None
 
+@dataclass
+class GreeksVec:
+    """bs_greeks_vec output; every field has the broadcast shape. Rows with valid=False are NaN."""
+    price: np.ndarray
+    iv: np.ndarray
+    delta: np.ndarray
+    gamma: np.ndarray
+    vega: np.ndarray  # per 1.0 vol
+    theta_per_day: np.ndarray
+    rho: np.ndarray
+    valid: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.price.size)
+
+    def at(self, i: int) -> Greeks:
+        """Scalar Greeks for one (flat) row; empty Greeks() for invalid inputs like bs_greeks."""
+        if not self.valid.flat[i]:
+            return Greeks()
+        return Greeks(
+            iv=float(self.iv.flat[i]),
+            delta=float(self.delta.flat[i]),
+            gamma=float(self.gamma.flat[i]),
+            vega=float(self.vega.flat[i]),
+            theta_per_day=float(self.theta_per_day.flat[i]),
+            rho=float(self.rho.flat[i]),
+        )
+
+def _prep(S, K, T, r, sigma, cp):
+    args = [np.asarray(v, dtype=np.float64) for v in (S, K, T, r, sigma)]
+    shape = np.broadcast_shapes(*(a.shape for a in args))
+    S, K, T, r, sigma = (a if a.shape == shape else np.broadcast_to(a, shape) for a in args)
+    is_call = call_mask(cp, shape)
+    if is_call.shape != shape:  # cp carried extra dimensions
+        shape = is_call.shape
+        S, K, T, r, sigma = (np.broadcast_to(a, shape) for a in (S, K, T, r, sigma))
+    valid = (T > 0) & (sigma > 0) & (S > 0) & (K > 0)
+    if not valid.all():
+        # harmless placeholders so the math below stays warning-free; masked out afterwards
+        S, K, T, sigma = (np.where(valid, v, 1.0) for v in (S, K, T, sigma))
+    sqrt_t = np.sqrt(T)
+    vol_t = sigma * sqrt_t
+    d1 = (np.log(S / K) + (r + 0.5 * sigma * sigma) * T) / vol_t
+    d2 = d1 - vol_t
+    sign = np.where(is_call, 1.0, -1.0)
+    return S, K, T, r, sigma, sign, valid, sqrt_t, d1, d2
+
+def _cdf_pair(sign, d1, d2):
+    """N(sign*d1), N(sign*d2) with one norm_cdf_vec call."""
+    n = norm_cdf_vec(np.stack([sign * d1, sign * d2]))
+    return n[0], n[1]
+
+def bs_price_vec(S: ArrayLike, K: ArrayLike, T: ArrayLike, r: ArrayLike, sigma: ArrayLike, cp) -> np.ndarray:
+    """Black-Scholes premiums for every row; 0.0 where T, sigma, S or K is not positive."""
+    S, K, T, r, sigma, sign, valid, _, d1, d2 = _prep(S, K, T, r, sigma, cp)
+    nd1, nd2 = _cdf_pair(sign, d1, d2)
+    price = sign * (S * nd1 - K * np.exp(-r * T) * nd2)
+    return np.where(valid, price, 0.0)
+
+def bs_greeks_vec(S: ArrayLike, K: ArrayLike, T: ArrayLike, r: ArrayLike, sigma: ArrayLike, cp) -> GreeksVec:
+    """Price, delta, gamma, vega, theta/day and rho for every row in one pass."""
+    S, K, T, r, sigma, sign, valid, sqrt_t, d1, d2 = _prep(S, K, T, r, sigma, cp)
+    pdf = norm_pdf_vec(d1)
+    nd1, nd2 = _cdf_pair(sign, d1, d2)
+    disc_k = K * np.exp(-r * T)
+
+    price = sign * (S * nd1 - disc_k * nd2)
+    delta = sign * nd1
+    theta = -S * pdf * sigma / (2 * sqrt_t) - sign * r * disc_k * nd2
+    gamma = pdf / (S * sigma * sqrt_t)
+    vega = S * pdf * sqrt_t
+    rho = sign * disc_k * T * nd2
+
+    nan = np.nan
+    return GreeksVec(
+        price=np.where(valid, price, 0.0),
+        iv=np.where(valid, sigma, nan),
+        delta=np.where(valid, delta, nan),
+        gamma=np.where(valid, gamma, nan),
+        vega=np.where(valid, vega, nan),
+        theta_per_day=np.where(valid, theta / 365.0, nan),
+        rho=np.where(valid, rho, nan),
+        valid=valid,
+    )
+
+def _d1_d2(S: float, K: float, T: float, r: float, sigma: float) -> Tuple[float, float]:
+    vol_t = sigma * math.sqrt(T)
+    d1 = (math.log(S / K) + (r + 0.5 * sigma * sigma) * T) / vol_t
+    return d1, d1 - vol_t
+
 def bs_price(S: float, K: float, T: float, r: float, sigma: float, cp: str) -> float:
     if T <= 0 or sigma <= 0 or S <= 0 or K <= 0:
         return 0.0
-    cp = cp.upper()
-    d1 = (math.log(S / K) + (r + 0.5 * sigma * sigma) * T) / (sigma * math.sqrt(T))
-    d2 = d1 - sigma * math.sqrt(T)
-    if cp in ("C", "CE", "CALL"):
+    d1, d2 = _d1_d2(S, K, T, r, sigma)
+    if cp.upper() in _CALLS:
         return S * _norm_cdf(d1) - K * math.exp(-r * T) * _norm_cdf(d2)
-    else:
-        return K * math.exp(-r * T) * _norm_cdf(-d2) - S * _norm_cdf(-d1)
+    return K * math.exp(-r * T) * _norm_cdf(-d2) - S * _norm_cdf(-d1)
 
 def bs_greeks(S: float, K: float, T: float, r: float, sigma: float, cp: str) -> Greeks:
     if T <= 0 or sigma <= 0 or S <= 0 or K <= 0:
         return Greeks()
-    cp = cp.upper()
-    d1 = (math.log(S / K) + (r + 0.5 * sigma * sigma) * T) / (sigma * math.sqrt(T))
-    d2 = d1 - sigma * math.sqrt(T)
+    d1, d2 = _d1_d2(S, K, T, r, sigma)
+    sqrt_t = math.sqrt(T)
     pdf = _norm_pdf(d1)
-    if cp in ("C", "CE", "CALL"):
-        delta = _norm_cdf(d1)
-        theta = (-S * pdf * sigma / (2 * math.sqrt(T)) - r * K * math.exp(-r * T) * _norm_cdf(d2))
-    else:
-        delta = _norm_cdf(d1) - 1
-        theta = (-S * pdf * sigma / (2 * math.sqrt(T)) + r * K * math.exp(-r * T) * _norm_cdf(-d2))
-    gamma = pdf / (S * sigma * math.sqrt(T))
-    vega = S * pdf * math.sqrt(T)  # per 1.0 vol
-    rho = K * T * math.exp(-r * T) * (_norm_cdf(d2) if cp in ("C", "CE", "CALL") else -_norm_cdf(-d2))
+    disc_k = K * math.exp(-r * T)
+    sign = 1.0 if cp.upper() in _CALLS else -1.0
+    nd1, nd2 = _norm_cdf(sign * d1), _norm_cdf(sign * d2)
+    theta = -S * pdf * sigma / (2 * sqrt_t) - sign * r * disc_k * nd2
     return Greeks(
         iv=sigma,
-        delta=delta,
-        gamma=gamma,
-        vega=vega,
+        delta=sign * nd1,
+        gamma=pdf / (S * sigma * sqrt_t),
+        vega=S * pdf * sqrt_t,  # per 1.0 vol
         theta_per_day=theta / 365.0,
-        rho=rho,
+        rho=sign * disc_k * T * nd2,
     )
 
 def implied_vol(
@@ -70,11 +289,14 @@ def implied_vol(
     max_iter: int = 60,
     tol: float = 1e-6,
 ) -> Optional[float]:
+    """
+    Bisection on bs_price over [1e-4, 5.0] until |price - premium| < tol (absolute, in premium
+    units); 5.0 when even that can't reach the premium, None for unusable inputs. Whole chains
+    should go through iv_solver.implied_vol_vec instead.
+    """
     if premium is None or premium <= 0 or S <= 0 or K <= 0 or T <= 0:
         return None
-    # Safe bounds
     lo, hi = 1e-4, 5.0  # 0.01% to 500% annualized
-    # If premium is above hi vol price, return hi (rare)
     try:
         if bs_price(S, K, T, r, hi, cp) < premium:
             return hi
@@ -0,0 +1,106 @@
+"""
+Incremental Greeks for polled quotes: remembers each contract's last (spot, ltp, as_of) and only
+re-solves IV + Greeks for contracts whose inputs moved, in one engine call per poll.
+
+    cache = GreeksCache(r=0.07)
+    g = cache.update(keys, spot, strike, T, cp, ltp, as_of="2025-12-18")
+    g["NIFTY30DEC2526000CE"]   # {"iv", "delta", "gamma", "theta", "vega"}
+    cache.last_recomputed       # how many contracts this poll actually re-priced
+
+T is calendar DTE/365 like the agents (its as_of is part of the key, so a new day re-prices
+everything). theta is per calendar day, vega per 1 vol point. Contracts without a usable
+premium / spot, or whose premium has no IV inside the solver bounds (e.g. below intrinsic),
+come back as None values. Each update is one full snapshot: contracts missing from it
+(expired, delisted) are dropped from the cache.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .engine import PricingEngine, get_engine
+from .greeks import ArrayLike
+from .iv_solver import IV_HI, IV_LO
+
+
+def _nan_to_none(a: np.ndarray) -> List[Optional[float]]:
+    return [None if v != v else v for v in a.tolist()]
+
+
+class GreeksCache:
+    def __init__(self, r: float = 0.07, engine: Optional[PricingEngine] = None):
+        self.r = r
+        self.engine = engine
+        self._sig: Dict[str, Tuple[Optional[float], Optional[float], str]] = {}
+        self._out: Dict[str, Dict[str, Optional[float]]] = {}
+        self.last_recomputed = 0
+
+    def __len__(self) -> int:
+        return len(self._out)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._out
+
+    def get(self, key: str) -> Optional[Dict[str, Optional[float]]]:
+        return self._out.get(key)
+
+    def clear(self) -> None:
+        self._sig.clear()
+        self._out.clear()
+
+    def update(
+        self,
+        keys: Sequence[str],
+        spot: ArrayLike,
+        strike: ArrayLike,
+        T: ArrayLike,
+        cp,
+        ltp: ArrayLike,
+        as_of: str = "",
+    ) -> Dict[str, Dict[str, Optional[float]]]:
+        """Greeks for every key (aligned inputs); only changed contracts hit the engine."""
+        n = len(keys)
+        spot, strike, T, ltp = (np.broadcast_to(np.asarray(v, dtype=np.float64), (n,)) for v in (spot, strike, T, ltp))
+        cp = np.broadcast_to(np.asarray(cp), (n,))
+
+        # NaN -> None: nan != nan would make a spot-less row stale on every poll
+        sigs = list(zip(_nan_to_none(spot), _nan_to_none(ltp), [as_of] * n))
+        stale = np.fromiter((self._sig.get(k) != s for k, s in zip(keys, sigs)), dtype=bool, count=n)
+        self.last_recomputed = int(stale.sum())
+        if self.last_recomputed:
+            self._recompute([k for k, s in zip(keys, stale) if s], spot[stale], strike[stale], T[stale], cp[stale], ltp[stale])
+            for i in np.flatnonzero(stale):
+                self._sig[keys[i]] = sigs[i]
+        if len(self._out) > n:
+            live = set(keys)
+            for k in [k for k in self._out if k not in live]:
+                del self._out[k]
+                self._sig.pop(k, None)
+        return {k: self._out[k] for k in keys}
+
+    def _recompute(self, keys: List[str], S, K, T, cp, ltp) -> None:
+        eng = self.engine or get_engine()
+        with np.errstate(invalid="ignore"):
+            ok = (ltp > 0) & (S > 0) & (K > 0) & (T > 0)
+        iv = np.full(S.shape, np.nan)
+        if ok.any():
+            iv[ok] = eng.implied_vol(ltp[ok], S[ok], K[ok], T[ok], self.r, cp[ok])
+        # an IV pinned at a solver bound (premium below intrinsic / above the IV_HI price) is no solve
+        with np.errstate(invalid="ignore"):
+            iv[~((iv > IV_LO) & (iv < IV_HI))] = np.nan
+        g = eng.greeks(S, K, T, self.r, np.where(np.isfinite(iv), iv, 0.0), cp)
+
+        def col(a, nd):
+            return [None if not np.isfinite(v) else round(float(v), nd) for v in a]
+
+        cols = {
+            "iv": col(iv, 4),
+            "delta": col(g.delta, 4),
+            "gamma": col(g.gamma, 6),
+            "theta": col(g.theta_per_day, 4),
+            "vega": col(g.vega / 100.0, 4),
+        }
+        for i, k in enumerate(keys):
+            self._out[k] = {name: vals[i] for name, vals in cols.items()}
@@ -0,0 +1,178 @@
+"""
+Vectorized implied volatility: every strike/expiry of a chain in one call.
+
+    res = implied_vol_vec(premium, S, K, T, r, cp)
+    res.iv, res.converged, res.iterations, res.status
+
+Per row: a Corrado-Miller rational first guess, then Halley steps (Newton with the volga
+correction) on the Black-Scholes price from greeks.bs_greeks_vec. Each row keeps a [lo, hi]
+bracket; whenever vega is too small or a step would leave the bracket, that row bisects instead,
+so deep ITM/OTM strikes can't blow up. Typically 3-5 iterations to 1e-8 in price.
+
+greeks.implied_vol stays the per-contract scalar API (plain-float bisection); use this for chains.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict
+
+import numpy as np
+
+from .greeks import ArrayLike, _cdf_pair, _prep, call_mask, norm_pdf_vec
+
+IV_LO = 1e-4  # 0.01% annualized
+IV_HI = 5.0   # 500%
+
+# status codes
+OK = 0
+NOT_CONVERGED = 1
+BELOW_INTRINSIC = 2  # premium under the zero-vol price -> iv pinned at IV_LO
+ABOVE_MAX = 3        # premium over the IV_HI price -> iv pinned at IV_HI
+INVALID = 4          # missing/non-positive premium, S, K or T -> NaN
+
+STATUS_NAMES = {OK: "ok", NOT_CONVERGED: "not_converged", BELOW_INTRINSIC: "below_intrinsic", ABOVE_MAX: "above_max", INVALID: "invalid"}
+
+
+@dataclass
+class IVResult:
+    iv: np.ndarray          # NaN for INVALID rows
+    converged: np.ndarray   # bool
+    iterations: np.ndarray  # Halley/bisection steps taken per row
+    residual: np.ndarray    # model price - premium at iv
+    status: np.ndarray      # int8 codes above
+
+    def __len__(self) -> int:
+        return int(self.iv.size)
+
+    def summary(self) -> Dict[str, object]:
+        """Counts per status plus iteration stats, for logging."""
+        out: Dict[str, object] = {name: int((self.status == code).sum()) for code, name in STATUS_NAMES.items()}
+        solved = self.status != INVALID
+        out["max_iterations"] = int(self.iterations[solved].max()) if solved.any() else 0
+        out["mean_iterations"] = float(self.iterations[solved].mean()) if solved.any() else 0.0
+        return out
+
+
+def _price_vega(S, K, T, r, sigma, sign):
+    """Price, vega and d1*d2 (for volga = vega*d1*d2/sigma) of the active rows."""
+    S, K, T, r, sigma, sign, _, sqrt_t, d1, d2 = _prep(S, K, T, r, sigma, sign > 0)
+    nd1, nd2 = _cdf_pair(sign, d1, d2)
+    price = sign * (S * nd1 - K * np.exp(-r * T) * nd2)
+    vega = S * norm_pdf_vec(d1) * sqrt_t
+    return price, vega, d1 * d2
+
+
+def _initial_guess(P, S, K, T, r, sign):
+    """Corrado-Miller (1996) on the call-equivalent premium; 0.3 where it has no real root."""
+    X = K * np.exp(-r * T)
+    C = np.where(sign > 0, P, P + S - X)  # put -> call via parity
+    a = C - 0.5 * (S - X)
+    disc = a * a - (S - X) ** 2 / np.pi
+    with np.errstate(invalid="ignore"):
+        g = np.sqrt(2.0 * np.pi / T) / (S + X) * (a + np.sqrt(np.maximum(disc, 0.0)))
+    g = np.where(np.isfinite(g) & (g > IV_LO), g, 0.3)
+    return np.clip(g, 2 * IV_LO, 0.5 * IV_HI)
+
+
+def implied_vol_vec(
+    premium: ArrayLike,
+    S: ArrayLike,
+    K: ArrayLike,
+    T: ArrayLike,
+    r: ArrayLike,
+    cp,
+    *,
+    tol: float = 1e-8,
+    max_iter: int = 50,
+) -> IVResult:
+    """
+    Implied vols for arrays of premiums (everything broadcasts; cp as in bs_price_vec).
+    A row converges once |model - premium| < tol * max(1, premium) or the bracket collapses.
+    """
+    P, S, K, T, r = np.broadcast_arrays(*(np.asarray(v, dtype=np.float64) for v in (premium, S, K, T, r)))
+    shape = P.shape
+    is_call = call_mask(cp, shape)
+    if is_call.shape != shape:
+        P, S, K, T, r, is_call = np.broadcast_arrays(P, S, K, T, r, is_call)
+        shape = P.shape
+    P, S, K, T, r, is_call = (a.ravel() for a in (P, S, K, T, r, is_call))
+    n = P.size
+    sign = np.where(is_call, 1.0, -1.0)
+
+    iv = np.full(n, np.nan)
+    converged = np.zeros(n, dtype=bool)
+    iters = np.zeros(n, dtype=np.int32)
+    resid = np.full(n, np.nan)
+    status = np.full(n, INVALID, dtype=np.int8)
+
+    with np.errstate(invalid="ignore"):
+        valid = (P > 0) & (S > 0) & (K > 0) & (T > 0) & np.isfinite(P + S + K + T + r)
+    idx = np.flatnonzero(valid)
+    if idx.size:
+        p, s, k, t, rr, sg = P[idx], S[idx], K[idx], T[idx], r[idx], sign[idx]
+
+        # no-arbitrage bounds: the IV_LO / IV_HI prices
+        p_lo, _, _ = _price_vega(s, k, t, rr, np.full(idx.size, IV_LO), sg)
+        p_hi, _, _ = _price_vega(s, k, t, rr, np.full(idx.size, IV_HI), sg)
+        below, above = p <= p_lo, p >= p_hi
+        iv[idx[below]], status[idx[below]], resid[idx[below]] = IV_LO, BELOW_INTRINSIC, (p_lo - p)[below]
+        iv[idx[above]], status[idx[above]], resid[idx[above]] = IV_HI, ABOVE_MAX, (p_hi - p)[above]
+
+        keep = ~(below | above)
+        idx, p, s, k, t, rr, sg = idx[keep], p[keep], s[keep], k[keep], t[keep], rr[keep], sg[keep]
+        lo, hi = np.full(idx.size, IV_LO), np.full(idx.size, IV_HI)
+        sig = _initial_guess(p, s, k, t, rr, sg)
+        thr = tol * np.maximum(1.0, p)
+        act = np.arange(idx.size)
+
+        for it in range(1, max_iter + 1):
+            if not act.size:
+                break
+            a_s = sig[act]
+            price, vega, d1d2 = _price_vega(s[act], k[act], t[act], rr[act], a_s, sg[act])
+            f = price - p[act]
+            iters[idx[act]] = it
+            resid[idx[act]] = f
+
+            done = (np.abs(f) < thr[act]) | (hi[act] - lo[act] < 1e-12)
+            # tighten the bracket around the root
+            lo[act] = np.where(f < 0, a_s, lo[act])
+            hi[act] = np.where(f > 0, a_s, hi[act])
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                newton = f / vega
+                volga_ratio = d1d2 / a_s  # volga / vega
+                step = newton / (1.0 - 0.5 * newton * volga_ratio)
+                nxt = a_s - step
+            bad = ~np.isfinite(nxt) | (vega < 1e-10 * np.maximum(1.0, s[act])) | (nxt <= lo[act]) | (nxt >= hi[act])
+            nxt = np.where(bad, 0.5 * (lo[act] + hi[act]), nxt)
+            sig[act] = np.where(done, a_s, nxt)
+
+            converged[idx[act[done]]] = True
+            act = act[~done]
+
+        iv[idx] = sig
+        status[idx] = np.where(converged[idx], OK, NOT_CONVERGED)
+
+    converged &= status == OK
+    return IVResult(
+        iv=iv.reshape(shape),
+        converged=converged.reshape(shape),
+        iterations=iters.reshape(shape),
+        residual=resid.reshape(shape),
+        status=status.reshape(shape),
+    )
+
+
+def chain_iv(chain, spot: float, as_of: str, r: float = 0.07, *, min_t: float = 1e-6, **kw) -> IVResult:
+    """
+    IV for every row of an OptionChain (ltp as the premium), aligned with the chain's rows.
+    T is calendar DTE/365 from as_of (YYYY-MM-DD), floored at min_t like the agents do;
+    rows without a parseable expiry come back INVALID.
+    """
+    if isinstance(as_of, datetime):
+        as_of = as_of.strftime("%Y-%m-%d")
+    T = np.maximum(chain.days_to_expiry(as_of) / 365.0, min_t)  # NaN stays NaN
+    return implied_vol_vec(chain.ltp, float(spot), chain.strike, T, r, chain.is_call, **kw)
@@ -0,0 +1,173 @@
+"""
+Monte Carlo target-before-stop odds for long option trades, batched over every candidate at once.
+
+    res = simulate_hits(spot, strike, T, r, iv, cp, entry, t1, t2, sl, horizon_days, n_paths=2000, seed=7)
+    res.p_t1, res.p_t2, res.p_sl, res.hold_days, res.expected_pnl   # one entry per candidate
+
+Underlying paths are GBM (optionally Merton jumps), seeded, and the option is re-priced at every
+step by a pricing engine (options/engine.py default unless one is passed) at its implied vol
+(sticky strike). The first step where the premium reaches T1 / T2 / SL decides the path; whatever
+survives is closed at the horizon (sell_by). simulate_recos does the same for a list of OptionReco,
+solving their IVs in one engine call. scripts/bench_montecarlo.py times it for a 52-underlying
+EOD run.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .engine import PricingEngine, get_engine
+from .greeks import ArrayLike, call_mask
+from .reco_inputs import reco_inputs
+
+MIN_T = 1e-6
+MAX_CELLS = 2_000_000  # candidates x paths x steps priced per chunk (bounds memory)
+
+
+@dataclass
+class MCResult:
+    p_t1: np.ndarray          # P(T1 before SL)
+    p_t2: np.ndarray          # P(T2 before SL)
+    p_sl: np.ndarray          # P(SL before T1)
+    hold_days: np.ndarray     # expected days held: exit at T1 / SL, else the horizon
+    expected_pnl: np.ndarray  # per unit, same exit rule
+    se: np.ndarray            # standard error of p_t1
+    n_paths: int
+
+    def __len__(self) -> int:
+        return int(self.p_t1.size)
+
+    def at(self, i: int) -> Dict[str, Any]:
+        r = lambda a: round(float(a[i]), 4)
+        return {
+            "p_t1": r(self.p_t1),
+            "p_t2": r(self.p_t2),
+            "p_sl": r(self.p_sl),
+            "hold_days": r(self.hold_days),
+            "expected_pnl": r(self.expected_pnl),
+            "se": r(self.se),
+            "n_paths": self.n_paths,
+        }
+
+
+def _paths(rng, spot, sigma, n_paths, n_steps, dt, drift, jump_lambda, jump_mu, jump_sd):
+    """(n, n_paths, n_steps) underlying levels after each step (step 0 = first close)."""
+    n = spot.size
+    z = rng.standard_normal((n, n_paths, n_steps))
+    k = np.exp(jump_mu + 0.5 * jump_sd * jump_sd) - 1.0
+    mu = (drift - jump_lambda * k - 0.5 * sigma * sigma) * dt
+    logret = mu[:, None, None] + (sigma * np.sqrt(dt))[:, None, None] * z
+    if jump_lambda > 0:
+        nj = rng.poisson(jump_lambda * dt, size=z.shape)
+        logret += nj * jump_mu + np.sqrt(nj) * jump_sd * rng.standard_normal(z.shape)
+    return spot[:, None, None] * np.exp(np.cumsum(logret, axis=2))
+
+
+def _first(mask: np.ndarray) -> np.ndarray:
+    """Index of the first True along the step axis; n_steps where there is none."""
+    n_steps = mask.shape[-1]
+    return np.where(mask.any(-1), mask.argmax(-1), n_steps)
+
+
+def simulate_hits(
+    spot: ArrayLike,
+    strike: ArrayLike,
+    T: ArrayLike,
+    r: float,
+    iv: ArrayLike,
+    cp,
+    entry: ArrayLike,
+    t1: ArrayLike,
+    t2: ArrayLike,
+    sl: ArrayLike,
+    horizon_days: ArrayLike,
+    *,
+    n_paths: int = 2000,
+    steps_per_day: int = 1,
+    seed: Optional[int] = 0,
+    drift: float = 0.0,
+    jump_lambda: float = 0.0,
+    jump_mu: float = 0.0,
+    jump_sd: float = 0.0,
+    engine: Optional[PricingEngine] = None,
+) -> MCResult:
+    """
+    One row per candidate (all inputs broadcast to the same length). Days are calendar days like
+    T (dte / 365); a horizon of 0 (intraday) still simulates one session. jump_lambda is jumps
+    per year, jump_mu / jump_sd the mean / sd of the log jump size.
+    """
+    spot, strike, T, iv, entry, t1, t2, sl, horizon = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(v, dtype=np.float64)) for v in (spot, strike, T, iv, entry, t1, t2, sl, horizon_days))
+    )
+    n = spot.size
+    is_call = call_mask(cp, (n,))
+    days = np.maximum(np.minimum(horizon, np.floor(T * 365.0)), 0.0)
+    steps = (np.maximum(days, 1.0) * steps_per_day).astype(np.intp)
+    n_steps = int(steps.max()) if n else 0
+    dt = 1.0 / (365.0 * steps_per_day)
+    rng = np.random.default_rng(seed)
+    eng = engine or get_engine()
+
+    out = {k: np.full(n, np.nan) for k in ("p_t1", "p_t2", "p_sl", "hold", "pnl")}
+    chunk = max(1, MAX_CELLS // max(1, n_paths * n_steps))
+    for lo in range(0, n, chunk):
+        sl_ = slice(lo, min(n, lo + chunk))
+        S = _paths(rng, spot[sl_], iv[sl_], n_paths, n_steps, dt, drift, jump_lambda, jump_mu, jump_sd)
+        # days elapsed at each step; an intraday hold stays on day 0
+        elapsed = np.arange(1, n_steps + 1) / steps_per_day
+        elapsed = np.minimum(elapsed[None, :], days[sl_, None])
+        t_left = np.maximum(T[sl_, None] - elapsed / 365.0, MIN_T)
+        c = lambda a: a[sl_, None, None]
+        prem = eng.price(S, c(strike), t_left[:, None, :], r, c(iv), c(is_call))
+
+        live = np.arange(n_steps)[None, None, :] < steps[sl_, None, None]
+        f1 = _first((prem >= c(t1)) & live)
+        f2 = _first((prem >= c(t2)) & live)
+        fs = _first((prem <= c(sl)) & live)
+        last = steps[sl_, None] - 1
+
+        won1, won2, lost = f1 < fs, f2 < fs, fs < f1
+        exit_step = np.minimum(np.minimum(f1, fs), last)
+        final = np.take_along_axis(prem, last[..., None].repeat(n_paths, 1), 2)[..., 0]
+        pnl = np.where(won1, c(t1)[..., 0], np.where(lost, c(sl)[..., 0], final)) - c(entry)[..., 0]
+
+        out["p_t1"][sl_] = won1.mean(1)
+        out["p_t2"][sl_] = won2.mean(1)
+        out["p_sl"][sl_] = lost.mean(1)
+        out["hold"][sl_] = ((exit_step + 1) / steps_per_day).mean(1)
+        out["pnl"][sl_] = pnl.mean(1)
+
+    p = out["p_t1"]
+    return MCResult(
+        p_t1=p, p_t2=out["p_t2"], p_sl=out["p_sl"], hold_days=out["hold"], expected_pnl=out["pnl"],
+        se=np.sqrt(p * (1.0 - p) / max(1, n_paths)), n_paths=int(n_paths),
+    )
+
+
+def simulate_recos(recos: List[Any], r: float = 0.07, **kw) -> List[Optional[Dict[str, Any]]]:
+    """
+    MC odds for every BUY OptionReco in one batch (list aligned with recos, None for HOLDs or
+    incomplete rows). IVs are re-solved from the reco's ltp; the reco's own iv is the fallback.
+    """
+    rows, idx = [], []
+    for i, reco in enumerate(recos):
+        x = reco_inputs(reco)
+        if x is None:
+            continue
+        rows.append((x.spot, x.strike, x.T, x.iv, x.ltp, x.side, x.entry, x.t1, x.t2, x.sl, x.horizon_days))
+        idx.append(i)
+
+    out: List[Optional[Dict[str, Any]]] = [None] * len(recos)
+    if not rows:
+        return out
+    spot, strike, T, iv, ltp, side, entry, t1, t2, sl, horizon = (np.array(c) for c in zip(*rows))
+    solved = (kw.get("engine") or get_engine()).implied_vol(ltp.astype(float), spot, strike, T, r, side)
+    iv = np.where(np.isfinite(solved) & (ltp > 0), solved, iv.astype(float))
+    ok = iv > 0
+    res = simulate_hits(spot[ok], strike[ok], T[ok], r, iv[ok], side[ok], entry[ok], t1[ok], t2[ok], sl[ok], horizon[ok], **kw)
+    for j, i in enumerate(np.asarray(idx)[ok]):
+        out[i] = res.at(j)
+    return out
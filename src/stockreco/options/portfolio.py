@@ -0,0 +1,163 @@
+"""
+Portfolio Greeks for a day's approved option recos: one engine.greeks call over every position,
+then sums per underlying and in total.
+
+    pf = aggregate(approved, betas=betas_from_ohlcv(repo / "data" / "ohlcv.parquet"))
+    pf.total["beta_delta"], pf.by_underlying, pf.to_dict()
+
+Each reco is sized as budget_per_trade of premium (qty = budget / entry) unless quantities are
+passed. Exposures are in rupees:
+  delta       delta * spot * qty                      (delta-equivalent notional in the underlying)
+  beta_delta  beta * delta notional                   (NIFTY-equivalent notional; indices beta 1)
+  gamma_1pct  gamma * spot^2 * qty / 100              (change in delta notional per 1% move)
+  vega_1pt    vega / 100 * qty                        (P&L per +1 vol point)
+  theta_day   theta_per_day * qty                     (P&L per calendar day)
+Recos without spot/strike/iv/dte/entry (HOLDs, stale rows) are left out and counted in `skipped`.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .engine import PricingEngine, get_engine
+from .reco_inputs import iv_fraction
+
+EXPOSURES = ("premium", "delta", "beta_delta", "gamma_1pct", "vega_1pt", "theta_day")
+NIFTY_TICKER = "^NSEI"
+_INDICES = {"NIFTY", "BANKNIFTY", "FINNIFTY", "MIDCPNIFTY", "SENSEX", "BANKEX"}
+
+
+def betas_from_ohlcv(path: Path, lookback: int = 252, min_obs: int = 60) -> Dict[str, float]:
+    """Beta of each stock's daily returns to ^NSEI over the last `lookback` sessions, keyed by NSE symbol."""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    df = pd.read_parquet(path, columns=["date", "ticker", "adj_close"])
+    px = df.pivot_table(index="date", columns="ticker", values="adj_close").sort_index()
+    if NIFTY_TICKER not in px.columns:
+        return {}
+    ret = px.pct_change(fill_method=None).iloc[-lookback:]
+    mkt = ret.pop(NIFTY_TICKER)
+    ok = ret.notna() & mkt.notna().to_numpy()[:, None]
+    x = np.where(ok, ret.to_numpy(), 0.0)
+    m = np.where(ok, mkt.to_numpy()[:, None], 0.0)
+    n = ok.sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mx, mm = x.sum(0) / n, m.sum(0) / n
+        cov = (x * m).sum(0) / n - mx * mm
+        var = (m * m).sum(0) / n - mm * mm
+        beta = cov / var
+    out = {}
+    for t, b, k in zip(ret.columns, beta, n):
+        if k >= min_obs and np.isfinite(b):
+            out[t.replace(".NS", "").replace(".BO", "").upper()] = float(b)
+    out["NIFTY"] = 1.0
+    return out
+
+
+@dataclass
+class PortfolioGreeks:
+    positions: pd.DataFrame             # one row per priced reco (idx = position in the input list)
+    by_underlying: pd.DataFrame         # EXPOSURES summed per underlying
+    total: Dict[str, float] = field(default_factory=dict)
+    skipped: int = 0
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def without(self, idx) -> "PortfolioGreeks":
+        """
+        The same book minus the recos at input positions idx, without re-pricing anything; idx of
+        the remaining rows is renumbered to their position in the shortened input list.
+        """
+        drop = sorted(set(int(i) for i in idx))
+        if not drop or self.positions.empty:
+            return self
+        pos = self.positions[~self.positions["idx"].isin(drop)].reset_index(drop=True)
+        pos["idx"] = pos["idx"] - np.searchsorted(np.asarray(drop), pos["idx"].to_numpy())
+        return _summarise(pos, self.skipped)
+
+    def to_dict(self) -> Dict[str, Any]:
+        r = lambda v: round(float(v), 2)
+        return {
+            "total": {k: r(v) for k, v in self.total.items()},
+            "by_underlying": [
+                {"symbol": sym, **{k: r(row[k]) for k in EXPOSURES}, "beta": round(float(row["beta"]), 3)}
+                for sym, row in self.by_underlying.iterrows()
+            ],
+            "positions": len(self.positions),
+            "skipped": self.skipped,
+        }
+
+
+def _get(reco, key):
+    return reco.get(key) if isinstance(reco, dict) else getattr(reco, key, None)
+
+
+def aggregate(
+    recos: List[Any],
+    *,
+    betas: Optional[Dict[str, float]] = None,
+    qty: Optional[Dict[str, float]] = None,
+    budget_per_trade: float = 100000.0,
+    r: float = 0.07,
+    engine: Optional[PricingEngine] = None,
+) -> PortfolioGreeks:
+    """
+    Net Greeks of long positions in every BUY reco (OptionReco or its to_dict()). qty maps symbol
+    -> units held; otherwise budget_per_trade of premium per reco. Missing betas count as 1.0.
+    """
+    betas = betas or {}
+    rows = []
+    skipped = 0
+    for i, x in enumerate(recos):
+        vals = [_get(x, k) for k in ("symbol", "side", "spot", "strike", "iv", "dte", "entry_price")]
+        if _get(x, "action") != "BUY" or any(v in (None, 0, "") for v in vals):
+            skipped += 1
+            continue
+        rows.append([i] + vals)
+
+    cols = ["idx", "symbol", "side", "spot", "strike", "iv", "dte", "entry"]
+    pos = pd.DataFrame(rows, columns=cols)
+    if pos.empty:
+        empty = pd.DataFrame(columns=list(EXPOSURES) + ["beta"])
+        return PortfolioGreeks(pos, empty, {k: 0.0 for k in EXPOSURES}, skipped)
+
+    spot = pos["spot"].to_numpy(float)
+    iv = pos["iv"].to_numpy(float)
+    iv = iv_fraction(iv)  # some rows carry IV in percent
+    g = (engine or get_engine()).greeks(spot, pos["strike"].to_numpy(float), pos["dte"].to_numpy(float) / 365.0, r, iv, pos["side"].to_numpy())
+
+    sym = pos["symbol"].str.upper()
+    entry = pos["entry"].to_numpy(float)
+    if qty:
+        units = sym.map(lambda s: qty.get(s, 0.0)).to_numpy(float)
+    else:
+        units = budget_per_trade / entry
+    beta = sym.map(lambda s: 1.0 if s in _INDICES and s not in betas else betas.get(s, 1.0)).to_numpy(float)
+
+    pos = pos.assign(
+        qty=units, beta=beta,
+        unit_delta=g.delta, unit_gamma=g.gamma, unit_vega=g.vega, unit_theta=g.theta_per_day,
+        premium=entry * units,
+        delta=g.delta * spot * units,
+        gamma_1pct=g.gamma * spot * spot * units / 100.0,
+        vega_1pt=g.vega / 100.0 * units,
+        theta_day=g.theta_per_day * units,
+    )
+    pos["beta_delta"] = pos["beta"] * pos["delta"]
+    pos = pos[g.valid].reset_index(drop=True)
+    skipped += int((~g.valid).sum())
+
+    return _summarise(pos, skipped)
+
+
+def _summarise(pos: pd.DataFrame, skipped: int) -> PortfolioGreeks:
+    by = pos.groupby(pos["symbol"].str.upper()).agg({**{k: "sum" for k in EXPOSURES}, "beta": "first"})
+    total = {k: float(pos[k].sum()) for k in EXPOSURES}
+    return PortfolioGreeks(pos, by, total, skipped)
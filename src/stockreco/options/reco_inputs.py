@@ -0,0 +1,91 @@
+"""
+Trade inputs of a BUY OptionReco, unpacked the same way for every model that prices one
+(montecarlo.simulate_recos, scenarios.evaluate_reco, the reco agent's scenario grid).
+
+    x = reco_inputs(reco)        # None for HOLDs / incomplete recos
+    x.t1, x.t2, x.sl, x.iv, x.horizon_days
+
+Targets are dicts carrying the premium under "price" (older recos: "premium"). IVs above 5.0
+are percentages (14.2 -> 0.142). The horizon is calendar days from as_of to sell_by, 0 without
+a sell_by (intraday).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+import numpy as np
+
+IV_PERCENT_ABOVE = 5.0  # no real IV is 500%+, so anything larger was stored in percent
+
+
+def iv_fraction(iv):
+    """IV as a fraction (scalar or array): values above IV_PERCENT_ABOVE are divided by 100."""
+    a = np.asarray(iv, dtype=np.float64)
+    out = np.where(a > IV_PERCENT_ABOVE, a / 100.0, a)
+    return float(out) if out.ndim == 0 else out
+
+
+def horizon_days(as_of: str, sell_by: Optional[str]) -> int:
+    """Calendar days from as_of to sell_by (both YYYY-MM-DD), 0 without a sell_by."""
+    if not sell_by:
+        return 0
+    return max(0, (datetime.strptime(sell_by, "%Y-%m-%d") - datetime.strptime(as_of, "%Y-%m-%d")).days)
+
+
+def target_premiums(targets) -> Optional[Tuple[float, float]]:
+    """(T1, T2) premiums of a reco's targets list, None unless both are set."""
+    if not targets or len(targets) < 2:
+        return None
+    t1, t2 = (t.get("price", t.get("premium")) for t in targets[:2])
+    if t1 is None or t2 is None:
+        return None
+    return float(t1), float(t2)
+
+
+@dataclass
+class RecoInputs:
+    spot: float
+    strike: float
+    dte: int
+    iv: float            # fraction; 0.0 when the reco has none
+    ltp: float           # 0.0 when the reco has none
+    side: str
+    entry: float
+    t1: float
+    t2: float
+    sl: float
+    horizon_days: int    # as_of -> sell_by, calendar days
+
+    @property
+    def T(self) -> float:
+        return max(self.dte, 0) / 365.0
+
+
+def reco_inputs(reco: Any) -> Optional[RecoInputs]:
+    """
+    RecoInputs of a BUY reco with spot, strike, dte, entry, SL and two targets; None otherwise.
+    The IV is optional here (callers that need one check x.iv > 0).
+    """
+    if reco.action != "BUY":
+        return None
+    if not all([reco.spot, reco.strike, reco.dte, reco.entry_price, reco.sl_premium]):
+        return None
+    t = target_premiums(reco.targets)
+    if t is None:
+        return None
+    return RecoInputs(
+        spot=float(reco.spot),
+        strike=float(reco.strike),
+        dte=int(reco.dte),
+        iv=iv_fraction(reco.iv or 0.0),
+        ltp=float(reco.ltp or 0.0),
+        side=reco.side,
+        entry=float(reco.entry_price),
+        t1=t[0],
+        t2=t[1],
+        sl=float(reco.sl_premium),
+        horizon_days=horizon_days(reco.as_of, reco.sell_by),
+    )
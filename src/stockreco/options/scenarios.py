@@ -0,0 +1,187 @@
+"""
+Scenario grid for a long option position: premium and P&L over spot moves (ATR units) x IV
+shifts x calendar days elapsed, priced with one engine.price call over the whole grid
+(options/engine.py default unless one is passed).
+
+    grid = build_grid(spot, strike, T, r, iv, "CE", entry, atr_points, horizon_days)
+    s = analyze(grid, t1=t1, t2=t2, sl=sl)
+    s.p_t1, s.p_t2, s.p_sl, s.expected_pnl, s.breakeven
+
+Hit odds ("T1 before SL") come from a Markov chain on the spot axis: spot takes one Gaussian step
+per day (sd = spot * iv / sqrt(365), no drift) and the T1/T2/SL premium levels of each day are
+absorbing. Exits are checked once a day, like the EOD workflow does, so intraday touches are not
+counted. Spot beyond the +-3 ATR edges piles up on the edge nodes.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from .engine import PricingEngine, get_engine
+from .greeks import call_mask, norm_cdf_vec
+from .reco_inputs import reco_inputs
+
+SPOT_ATR = np.linspace(-3.0, 3.0, 49)  # 1/8 ATR steps
+IV_SHIFTS = np.array([-0.05, -0.025, 0.0, 0.025, 0.05])  # absolute vol points
+MIN_T = 1e-6  # remaining time floor: premium -> intrinsic at expiry
+
+
+@dataclass
+class ScenarioGrid:
+    spot: np.ndarray       # (n_spot,) underlying levels
+    spot_atr: np.ndarray   # (n_spot,) the same, as ATR multiples from today's spot
+    iv_shifts: np.ndarray  # (n_iv,)
+    days: np.ndarray       # (n_days,) 0 .. horizon
+    premium: np.ndarray    # (n_days, n_iv, n_spot)
+    entry: float
+    iv: float
+    is_call: bool
+
+    @property
+    def pnl(self) -> np.ndarray:
+        return self.premium - self.entry
+
+    def breakeven(self) -> np.ndarray:
+        """(n_days, n_iv) underlying level where P&L crosses 0; NaN when it doesn't on the grid."""
+        pnl = self.pnl
+        n = pnl.shape[-1]
+        # premium is monotone in spot: count the nodes on the losing side of the crossing
+        k = (pnl < 0).sum(-1) if self.is_call else (pnl >= 0).sum(-1)
+        ok = (k > 0) & (k < n)
+        k = np.clip(k, 1, n - 1)[..., None]
+        p0 = np.take_along_axis(pnl, k - 1, -1)[..., 0]
+        p1 = np.take_along_axis(pnl, k, -1)[..., 0]
+        s0, s1 = self.spot[k[..., 0] - 1], self.spot[k[..., 0]]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            be = s0 + (s1 - s0) * (0.0 - p0) / (p1 - p0)
+        return np.where(ok, be, np.nan)
+
+
+@dataclass
+class ScenarioSummary:
+    horizon_days: int
+    expected_pnl: float       # managed: exit at T1 / SL when hit, else at the horizon
+    expected_pnl_hold: float  # just holding to the horizon
+    p_t1: float               # T1 before SL
+    p_t2: float               # T2 before SL
+    p_sl: float               # SL before T1
+    breakeven: Optional[float]  # underlying level at the horizon, IV unchanged
+    pnl_range: tuple            # (worst, best) grid P&L at the horizon
+
+    def to_dict(self) -> Dict[str, Any]:
+        r = lambda v: None if v is None else round(float(v), 4)
+        return {
+            "horizon_days": self.horizon_days,
+            "expected_pnl": r(self.expected_pnl),
+            "expected_pnl_hold": r(self.expected_pnl_hold),
+            "p_t1": r(self.p_t1),
+            "p_t2": r(self.p_t2),
+            "p_sl": r(self.p_sl),
+            "breakeven": r(self.breakeven),
+            "pnl_worst": r(self.pnl_range[0]),
+            "pnl_best": r(self.pnl_range[1]),
+        }
+
+
+def build_grid(
+    spot: float,
+    strike: float,
+    T: float,
+    r: float,
+    iv: float,
+    cp,
+    entry: float,
+    atr_points: float,
+    horizon_days: int,
+    *,
+    spot_atr: np.ndarray = SPOT_ATR,
+    iv_shifts: np.ndarray = IV_SHIFTS,
+    engine: Optional[PricingEngine] = None,
+) -> ScenarioGrid:
+    """Premium for every (day elapsed, IV shift, spot move) in one call."""
+    is_call = bool(call_mask(cp))
+    spot_atr = np.asarray(spot_atr, dtype=np.float64)
+    iv_shifts = np.asarray(iv_shifts, dtype=np.float64)
+    days = np.arange(max(0, int(horizon_days)) + 1, dtype=np.float64)
+
+    S = np.maximum(spot + spot_atr * atr_points, 0.01)
+    t_left = np.maximum(T - days / 365.0, MIN_T)
+    sig = np.maximum(iv + iv_shifts, 1e-4)
+    prem = (engine or get_engine()).price(S[None, None, :], strike, t_left[:, None, None], r, sig[None, :, None], is_call)
+    return ScenarioGrid(
+        spot=S, spot_atr=spot_atr, iv_shifts=iv_shifts, days=days, premium=prem,
+        entry=float(entry), iv=float(iv), is_call=is_call,
+    )
+
+
+def _transition(spot: np.ndarray, sd: float) -> np.ndarray:
+    """One day of spot moves between grid nodes; row i sums to 1 (tails land on the edges)."""
+    edges = 0.5 * (spot[1:] + spot[:-1])
+    z = (edges[None, :] - spot[:, None]) / max(sd, 1e-12)
+    c = norm_cdf_vec(z)
+    n = spot.size
+    cdf = np.concatenate([np.zeros((n, 1)), c, np.ones((n, 1))], axis=1)
+    return np.diff(cdf, axis=1)
+
+
+def analyze(grid: ScenarioGrid, *, t1: float, t2: float, sl: float) -> ScenarioSummary:
+    """Expected P&L, T1/T2-before-SL odds and breakeven from a ScenarioGrid (IV shift 0 slice)."""
+    i0 = int(np.argmin(np.abs(grid.iv_shifts)))
+    prem = grid.premium[:, i0, :]  # (n_days, n_spot)
+    pnl = prem - grid.entry
+    horizon = int(grid.days[-1])
+    n = grid.spot.size
+
+    start = np.zeros(n)
+    start[int(np.argmin(np.abs(grid.spot_atr)))] = 1.0
+    spot0 = float(grid.spot[int(np.argmin(np.abs(grid.spot_atr)))])
+    K = _transition(grid.spot, spot0 * grid.iv / math.sqrt(365.0))
+
+    # two absorbing chains side by side: row 0 stops at T1/SL, row 1 at T2/SL
+    p = np.stack([start, start])
+    free = start.copy()
+    hit = np.zeros(2)
+    stopped = np.zeros(2)
+    exit_pnl = np.zeros(2)
+    levels = np.array([[t1], [t2]])
+    for d in range(1, max(horizon, 1) + 1):  # an intraday hold (horizon 0) still gets one session
+        p = p @ K
+        free = free @ K
+        row = prem[min(d, horizon)]
+        up = row[None, :] >= levels
+        down = (row <= sl)[None, :] & ~up
+        hit += (p * up).sum(1)
+        stopped += (p * down).sum(1)
+        exit_pnl += (p * up).sum(1) * (levels[:, 0] - grid.entry) + (p * down).sum(1) * (sl - grid.entry)
+        p = np.where(up | down, 0.0, p)
+
+    expected = float(exit_pnl[0] + (p[0] * pnl[-1]).sum())
+    be = grid.breakeven()[-1, i0]
+    return ScenarioSummary(
+        horizon_days=horizon,
+        expected_pnl=expected,
+        expected_pnl_hold=float((free * pnl[-1]).sum()),
+        p_t1=float(hit[0]),
+        p_t2=float(hit[1]),
+        p_sl=float(stopped[0]),
+        breakeven=None if np.isnan(be) else float(be),
+        pnl_range=(float(pnl[-1].min()), float(pnl[-1].max())),
+    )
+
+
+def evaluate_reco(reco, atr_points: float, r: float = 0.07, **grid_kw) -> Optional[ScenarioSummary]:
+    """
+    Scenario summary for a BUY OptionReco (needs spot, strike, iv, dte, entry, SL and targets);
+    the horizon runs to sell_by. None for HOLDs or recos missing any of those.
+    """
+    x = reco_inputs(reco)
+    if x is None or x.iv <= 0 or atr_points <= 0:
+        return None
+    grid = build_grid(
+        x.spot, x.strike, x.T, r, x.iv, x.side, x.entry, atr_points, min(x.horizon_days, x.dte), **grid_kw,
+    )
+    return analyze(grid, t1=x.t1, t2=x.t2, sl=x.sl)
@@ -7,6 +7,7 @@ from datetime import datetime, timedelta
 import pandas as pd
 import yfinance as yf
 from stockreco.ingest.market_context import MarketContextLoader
+from stockreco.ingest.equity_index import spot_index
 
 @dataclass
 class SignalConfig:
@@ -74,6 +75,8 @@ def generate_signals_csv(
     ctx_loader = MarketContextLoader(repo_root / "data")
     ctx = ctx_loader.load_context(as_of)
     print(f"[INFO] Loaded context for {as_of}: {len(ctx.volatility)} vols, {len(ctx.delivery_stats)} delivs, {len(ctx.bulk_deals)} bulk deals")
+    # same per-date equity bhavcopy index the context's delivery stats came from
+    eq = spot_index(repo_root / "data" / "stocks", as_of)
     
     # Analyze participant OI (FII) for crude market sentiment
     fii_stats = ctx.participant_oi.get("FII")
@@ -130,6 +133,9 @@ def generate_signals_csv(
         buy_win = 1 if (ret_oc > 0 and exp_oh >= buy_thr) else 0
         sell_win = 1 if (ret_oc < 0 and abs(dd_ol) >= sell_thr) else 0
 
+        q = eq.get(sym)
+        deliv = q.deliv_per if q is not None and q.deliv_per is not None else 0.0
+
         rows.append(
             dict(
                 target_date=as_of,
@@ -152,8 +158,8 @@ def generate_signals_csv(
                 strength=strength,
                 # New Context Fields (Lookup using symbol without .NS suffix for Indian stocks)
                 volatility_annualized=ctx.volatility.get(sym.replace(".NS", ""), 0.0),
-                delivery_per=ctx.delivery_stats.get(sym.replace(".NS", ""), 0.0),
-                delivery_spike=1 if ctx.delivery_stats.get(sym.replace(".NS", ""), 0.0) > 50.0 else 0, # Simple threshold for now
+                delivery_per=deliv,
+                delivery_spike=1 if deliv > 50.0 else 0, # Simple threshold for now
                 has_bulk_deal=1 if sym.replace(".NS", "") in ctx.bulk_deals else 0,
                 fii_sentiment=fii_sentiment,
             )
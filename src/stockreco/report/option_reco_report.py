@@ -50,6 +50,8 @@ def write_option_recos(out_dir: Path, as_of: str, recos: Any) -> Dict[str, str]:
             },
             "final": _serialize_recos(approved_recos)
         }
+        if recos.get("portfolio") is not None:
+            full_structure["portfolio"] = recos["portfolio"]
         json_path.write_text(json.dumps(full_structure, indent=2, default=str))
         csv_recos = approved_recos
     else:
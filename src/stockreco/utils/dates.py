@@ -1,6 +1,8 @@
 from __future__ import annotations
 import datetime as dt
 
+from stockreco.utils import market_calendar
+
 def parse_date(s: str) -> dt.date:
     return dt.date.fromisoformat(s)
 
@@ -9,13 +11,5 @@ def today_ist() -> dt.date:
     return dt.date.today()
 
 def previous_business_day(d: dt.date) -> dt.date:
-    # NSE trading calendar has holidays; this is a simple fallback.
-    # For accuracy, later replace with an NSE holiday calendar.
-    wd = d.weekday()
-    if wd == 0:  # Monday -> Friday
-        return d - dt.timedelta(days=3)
-    if wd == 6:  # Sunday -> Friday
-        return d - dt.timedelta(days=2)
-    if wd == 5:  # Saturday -> Friday
-        return d - dt.timedelta(days=1)
-    return d - dt.timedelta(days=1)
+    # last NSE session before d (weekends + exchange holidays, see utils/market_calendar.py)
+    return market_calendar.previous_business_day(d)
@@ -0,0 +1,203 @@
+"""
+Expiry parsing and the NSE trading calendar, shared by the option agents, OptionChain and the CLI.
+
+    expiry_date("30-Dec-2025")            # date, memoized per distinct string (any EXPIRY_FMTS)
+    days_to_expiry("2025-12-18", exp)     # calendar DTE, clipped at 0 (None if unparseable)
+    dte_table("2025-12-18").trading(exp)  # trading sessions after as_of up to and incl. expiry
+    previous_business_day(d)              # last NSE session before d (weekends + NSE_HOLIDAYS)
+
+Chains carry a handful of distinct expiry strings across thousands of rows, so parsing goes
+through a dict keyed on the raw string and DTEs through one small table per as_of. The trading
+calendar is an ordinal-indexed array of cumulative session counts, so trading DTE and
+previous/next session lookups are O(1) (vectorized for ordinal arrays).
+
+NSE_HOLIDAYS is the exchange's published trading-holiday list (equity / F&O segment); extend it
+each year when the circular is out. Years without entries fall back to weekends only.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Union
+
+import numpy as np
+
+EXPIRY_FMTS = ("%d-%b-%Y", "%Y-%m-%d", "%d/%m/%Y")
+
+NSE_HOLIDAYS = frozenset(dt.date.fromisoformat(d) for d in (
+    # 2024
+    "2024-01-22", "2024-01-26", "2024-03-08", "2024-03-25", "2024-03-29", "2024-04-11", "2024-04-17",
+    "2024-05-01", "2024-05-20", "2024-06-17", "2024-07-17", "2024-08-15", "2024-10-02", "2024-11-01",
+    "2024-11-15", "2024-11-20", "2024-12-25",
+    # 2025
+    "2025-02-26", "2025-03-14", "2025-03-31", "2025-04-10", "2025-04-14", "2025-04-18", "2025-05-01",
+    "2025-08-15", "2025-08-27", "2025-10-02", "2025-10-21", "2025-10-22", "2025-11-05", "2025-12-25",
+    # 2026
+    "2026-01-15", "2026-01-26", "2026-03-03", "2026-03-26", "2026-03-31", "2026-04-03", "2026-04-14",
+    "2026-05-01", "2026-05-28", "2026-06-26", "2026-09-14", "2026-10-02", "2026-10-20", "2026-11-10",
+    "2026-11-24", "2026-12-25",
+))
+
+DateLike = Union[str, dt.date, dt.datetime]
+
+_EXPIRY_CACHE: Dict[str, Optional[dt.date]] = {}
+
+
+def expiry_date(exp) -> Optional[dt.date]:
+    """Expiry string (DD-MMM-YYYY, YYYY-MM-DD or DD/MM/YYYY) -> date; None when unparseable."""
+    if exp is None:
+        return None
+    if isinstance(exp, dt.datetime):
+        return exp.date()
+    if isinstance(exp, dt.date):
+        return exp
+    try:
+        return _EXPIRY_CACHE[exp]
+    except KeyError:
+        pass
+    s = str(exp).strip()
+    out = None
+    if s:
+        for fmt in EXPIRY_FMTS:
+            try:
+                out = dt.datetime.strptime(s, fmt).date()
+                break
+            except ValueError:
+                pass
+    _EXPIRY_CACHE[exp] = out
+    return out
+
+
+def _as_date(d: DateLike) -> dt.date:
+    if isinstance(d, dt.datetime):
+        return d.date()
+    if isinstance(d, dt.date):
+        return d
+    return _iso_date(d)
+
+
+@lru_cache(maxsize=1024)
+def _iso_date(s: str) -> dt.date:
+    return dt.date.fromisoformat(s)
+
+
+def days_to_expiry(as_of: DateLike, expiry) -> Optional[int]:
+    """Calendar days from as_of to expiry, clipped at 0; None when the expiry can't be parsed."""
+    e = expiry_date(expiry)
+    if e is None:
+        return None
+    return max(0, (e - _as_date(as_of)).days)
+
+
+class TradingCalendar:
+    """
+    NSE sessions between start and end (extended on demand): cum[i] = sessions on or before
+    start + i days. Weekends and `holidays` are closed.
+    """
+
+    def __init__(self, holidays: Iterable[dt.date] = NSE_HOLIDAYS, start: dt.date = dt.date(2015, 1, 1), end: dt.date = dt.date(2030, 12, 31)):
+        self.holidays = frozenset(holidays)
+        self._build(start, end)
+
+    def _build(self, start: dt.date, end: dt.date) -> None:
+        self.start, self.end = start, end
+        self._base = start.toordinal()
+        n = end.toordinal() - self._base + 1
+        days = np.arange(n) + self._base
+        # date.fromordinal(1) is a Monday -> weekday = (ordinal - 1) % 7
+        is_open = (days - 1) % 7 < 5
+        for h in self.holidays:
+            i = h.toordinal() - self._base
+            if 0 <= i < n:
+                is_open[i] = False
+        self._open = is_open
+        self._cum = np.cumsum(is_open)
+        # index of the last session on or before each day (-1 before the first)
+        idx = np.where(is_open, np.arange(n), -1)
+        self._last = np.maximum.accumulate(idx)
+
+    def _idx(self, d: DateLike) -> int:
+        d = _as_date(d)
+        if d < self.start or d > self.end:
+            self._build(min(d, self.start), max(d, self.end))
+        return d.toordinal() - self._base
+
+    def is_trading_day(self, d: DateLike) -> bool:
+        return bool(self._open[self._idx(d)])
+
+    def previous_business_day(self, d: DateLike) -> dt.date:
+        """Last session strictly before d."""
+        i = self._idx(d)
+        if i == 0:
+            self._build(self.start - dt.timedelta(days=30), self.end)
+            i = self._idx(d)
+        j = int(self._last[i - 1])
+        return dt.date.fromordinal(self._base + j)
+
+    def sessions_between(self, a: DateLike, b: DateLike) -> int:
+        """Sessions in (a, b]; 0 when b <= a."""
+        i, j = self._idx(a), self._idx(b)
+        return max(0, int(self._cum[j] - self._cum[i]))
+
+    def sessions_between_ord(self, as_of: DateLike, ords: np.ndarray) -> np.ndarray:
+        """sessions_between(as_of, date.fromordinal(o)) for an array of ordinals (NaN where o < 0)."""
+        ords = np.asarray(ords, dtype=np.int64)
+        ok = ords > 0
+        if ok.any():
+            self._idx(dt.date.fromordinal(int(ords[ok].min())))
+            self._idx(dt.date.fromordinal(int(ords[ok].max())))
+        i = self._idx(as_of)
+        j = np.clip(ords - self._base, 0, len(self._cum) - 1)
+        out = np.maximum(self._cum[j] - self._cum[i], 0).astype(np.float64)
+        out[~ok] = np.nan
+        return out
+
+
+_CALENDAR: Optional[TradingCalendar] = None
+
+
+def nse_calendar() -> TradingCalendar:
+    global _CALENDAR
+    if _CALENDAR is None:
+        _CALENDAR = TradingCalendar()
+    return _CALENDAR
+
+
+def previous_business_day(d: DateLike) -> dt.date:
+    return nse_calendar().previous_business_day(d)
+
+
+def trading_days_to_expiry(as_of: DateLike, expiry) -> Optional[int]:
+    e = expiry_date(expiry)
+    if e is None:
+        return None
+    return nse_calendar().sessions_between(as_of, e)
+
+
+class DTETable:
+    """Calendar and trading DTE per expiry string for one as_of (each expiry computed once)."""
+
+    def __init__(self, as_of: DateLike):
+        self.as_of = _as_date(as_of)
+        self._cal: Dict[str, Optional[int]] = {}
+        self._trd: Dict[str, Optional[int]] = {}
+
+    def calendar(self, expiry) -> Optional[int]:
+        try:
+            return self._cal[expiry]
+        except KeyError:
+            v = self._cal[expiry] = days_to_expiry(self.as_of, expiry)
+            return v
+
+    def trading(self, expiry) -> Optional[int]:
+        try:
+            return self._trd[expiry]
+        except KeyError:
+            v = self._trd[expiry] = trading_days_to_expiry(self.as_of, expiry)
+            return v
+
+
+@lru_cache(maxsize=64)
+def dte_table(as_of: str) -> DTETable:
+    return DTETable(as_of)
@@ -0,0 +1,101 @@
+import sys
+import os
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from stockreco.ingest.derivatives import bhav_cache
+from stockreco.ingest.derivatives.local_csv_provider import LocalCsvProvider
+from stockreco.ingest.derivatives.provider_base import chain_size
+
+OP_CSV = """INSTRUMENT,SYMBOL    ,EXP_DATE  ,STR_PRICE  ,OPT_TYPE,OPEN_PRICE ,HI_PRICE   ,LO_PRICE   ,CLOSE_PRICE,OPEN_INT*      ,TRD_QTY
+OPTIDX    ,NIFTY     ,30/12/2025,00026000.00,PE      ,90.00      ,100.00     ,80.00      ,95.00      ,2000           ,10
+OPTIDX    ,NIFTY     ,30/12/2025,00026000.00,CE      ,110.00     ,130.00     ,100.00     ,120.00     ,1000           ,20
+OPTSTK    ,INFY      ,30/12/2025,00001600.00,CE      ,20.00      ,25.00      ,18.00      ,22.00      ,300            ,5
+"""
+
+FO_CSV = """CONTRACT_D,PREVIOUS_S,OPEN_PRICE,HIGH_PRICE,LOW_PRICE,CLOSE_PRIC,SETTLEMENT,NET_CHANGE,OI_NO_CON,TRADED_QUA,TRD_NO_CON,TRADED_VAL
+FUTIDXNIFTY30-DEC-2025,26000,26010,26150,25990,26100,26100,0.4,500,1000,10,1
+OPTSTKTCS30-DEC-2025CE3200,0,0,0,0,0,41.5,0,70,0,0,0
+"""
+
+
+@unittest.skipUnless(bhav_cache.HAS_PARQUET, "pyarrow not installed")
+class TestBhavCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.day = self.root / "data" / "derivatives" / "2025-12-16"
+        self.day.mkdir(parents=True)
+        (self.day / "op16122025.csv").write_text(OP_CSV)
+        (self.day / "fo161225.csv").write_text(FO_CSV)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_normalize_writes_sorted_chain_and_futures(self):
+        self.assertTrue(bhav_cache.normalize_day(self.day))
+        self.assertFalse(bhav_cache.normalize_day(self.day))  # manifest says fresh
+
+        chain = bhav_cache.load_chain(self.day)
+        # op rows + fo rows only for underlyings missing from op (TCS)
+        self.assertEqual(list(chain["underlying"]), ["INFY", "NIFTY", "NIFTY", "TCS"])
+        self.assertEqual(list(chain["is_call"])[1:3], [True, False])
+        self.assertEqual(float(chain["ltp"].iloc[3]), 41.5)  # settle fallback
+
+        fut = bhav_cache.load_futures(self.day)
+        self.assertEqual(list(fut["underlying"]), ["NIFTY"])
+        self.assertEqual(float(fut["close"].iloc[0]), 26100.0)
+
+        man = json.loads((self.day / bhav_cache.MANIFEST_FILE).read_text())
+        self.assertEqual(man["rows"], {"chain": 4, "futures": 1})
+
+    def test_touch_keeps_cache_and_edit_rebuilds(self):
+        bhav_cache.normalize_day(self.day)
+        op = self.day / "op16122025.csv"
+
+        st = op.stat()
+        os.utime(op, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        self.assertFalse(bhav_cache.normalize_day(self.day))  # same bytes -> still fresh
+
+        op.write_text(OP_CSV.replace("120.00     ,1000", "125.00     ,1000"))
+        self.assertTrue(bhav_cache.normalize_day(self.day))
+        chain = bhav_cache.load_chain(self.day)
+        self.assertIn(125.0, list(chain["ltp"]))
+
+    def test_upper_case_fo_name_feeds_futures(self):
+        (self.day / "fo161225.csv").rename(self.day / "FO161225.CSV")
+        src = bhav_cache.day_sources(self.day)
+        self.assertEqual(src["fo"].name, "FO161225.CSV")
+        self.assertIn("fut:FO161225.CSV", src)
+
+    def test_op_rows_take_fo_spot(self):
+        # UDiFF-style fo file with UNDRLNG_ST; the op file carries NIFTY but no spot column
+        (self.day / "fo161225.csv").write_text(
+            "CONTRACT_D,CLOSE_PRIC,SETTLEMENT,OI_NO_CON,TRADED_QUA,UNDRLNG_ST\n"
+            "OPTIDXNIFTY30-DEC-2025CE26000,118,118,900,10,25950.5\n"
+            "OPTSTKTCS30-DEC-2025CE3200,41.5,41.5,70,0,3180\n"
+        )
+        chain = bhav_cache.build_chain_frame(bhav_cache.day_sources(self.day))
+        self.assertEqual(list(chain["underlying"]), ["INFY", "NIFTY", "NIFTY", "TCS"])
+        self.assertEqual(list(chain["ltp"])[1:3], [120.0, 95.0])  # op premiums kept
+        self.assertEqual(list(chain["spot"])[1:], [25950.5, 25950.5, 3180.0])
+        self.assertTrue(chain["spot"].isna().iloc[0])  # INFY: no spot anywhere
+
+        p = LocalCsvProvider(self.root, "2025-12-16")
+        self.assertEqual(p.get_underlying("NIFTY").spot, 25950.5)
+
+    def test_provider_reads_cache(self):
+        p = LocalCsvProvider(self.root, "2025-12-16")
+        self.assertEqual(p.underlyings(), ["INFY", "NIFTY", "TCS"])
+        self.assertEqual([r.option_type for r in p.get_option_chain("NIFTY")], ["CE", "PE"])
+        self.assertEqual(chain_size(p, "NIFTY"), 2)
+        self.assertEqual(chain_size(p, "NOPE"), 0)
+        self.assertTrue((self.day / bhav_cache.CHAIN_FILE).exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import sys
+import os
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from stockreco.agents.option_reco_agent import OptionRecoAgent, OptionRecoConfig
+from stockreco.ingest.derivatives.provider_base import OptionChainRow, UnderlyingSnapshot
+from stockreco.options.binomial import tree_price_vec
+from stockreco.options.engine import get_engine
+from stockreco.options.greeks import bs_price_vec
+
+K = np.arange(80.0, 121.0, 5.0)
+
+
+class TestBinomial(unittest.TestCase):
+    def test_european_matches_black_scholes(self):
+        for side in ("CE", "PE"):
+            bs = bs_price_vec(100.0, K, 0.5, 0.07, 0.25, side)
+            lr = tree_price_vec(100.0, K, 0.5, 0.07, 0.25, side, american=False)
+            crr = tree_price_vec(100.0, K, 0.5, 0.07, 0.25, side, method="crr", american=False)
+            np.testing.assert_allclose(lr, bs, atol=1e-4)
+            np.testing.assert_allclose(crr, bs, atol=0.03)
+
+    def test_early_exercise(self):
+        eu = tree_price_vec(100.0, K, 0.5, 0.07, 0.25, "PE", american=False)
+        am = tree_price_vec(100.0, K, 0.5, 0.07, 0.25, "PE")
+        self.assertTrue((am > eu).all())
+        self.assertTrue((am >= np.maximum(K - 100.0, 0.0)).all())
+        # no dividends: calls are never exercised early
+        np.testing.assert_allclose(tree_price_vec(100.0, K, 0.5, 0.07, 0.25, "CE"), bs_price_vec(100.0, K, 0.5, 0.07, 0.25, "CE"), atol=1e-4)
+
+    def test_dedupe_and_invalid_rows(self):
+        px = tree_price_vec([100.0, 100.0, 100.0, 100.0], [95.0, 95.0, 95.0, 95.0], [0.5, 0.5, 0.0, 0.5], 0.07, 0.25, ["PE", "PE", "PE", "CE"])
+        self.assertEqual(px[0], px[1])
+        self.assertEqual(px[2], 0.0)
+        self.assertGreater(px[3], px[0])
+        with self.assertRaises(ValueError):
+            tree_price_vec(100.0, 95.0, 0.5, 0.07, 0.25, "PE", method="jr")
+
+    def test_degenerate_lr_rows(self):
+        # low vol + deep ITM/OTM: the LR up-probability rounds to 0/1
+        k, cp = [50.0, 100.0, 200.0, 150.0], ["CE", "CE", "PE", "CE"]
+        am = tree_price_vec(100.0, k, 0.1, 0.07, 0.02, cp)
+        eu = tree_price_vec(100.0, k, 0.1, 0.07, 0.02, cp, american=False)
+        self.assertTrue(np.isfinite(am).all() and np.isfinite(eu).all())
+        np.testing.assert_allclose(eu, bs_price_vec(100.0, np.array(k), 0.1, 0.07, 0.02, np.array(cp)), atol=1e-4)
+        self.assertEqual(am[2], 100.0)  # deep ITM American put: exercise now
+
+    def test_iv_not_converged(self):
+        # below the American put's intrinsic (20) but above the European bound: no tree IV exists
+        eng = get_engine("tree")
+        iv = eng.implied_vol([19.5, float(eng.price(100.0, 105.0, 0.5, 0.07, 0.3, "PE"))], 100.0, [120.0, 105.0], 0.5, 0.07, "PE")
+        self.assertTrue(np.isnan(iv[0]))
+        self.assertAlmostEqual(iv[1], 0.3, places=5)
+
+    def test_agent_engine(self):
+        chain = []
+        for k in range(950, 1051, 10):
+            for side in ("CE", "PE"):
+                ltp = float(bs_price_vec(1000.0, k, 8 / 365, 0.07, 0.3, side))
+                chain.append(OptionChainRow(strike=float(k), expiry="2025-12-25", option_type=side, volume=5000.0, ltp=ltp, oi=10000.0))
+        under = UnderlyingSnapshot(symbol="TEST", spot=1000.0, as_of_iso="2025-12-17")
+        row = {"buy_win": 0, "sell_win": 1, "direction_score": -0.5}
+        bs = OptionRecoAgent(OptionRecoConfig(mode="strict")).recommend("2025-12-17", "TEST", row, under, chain)
+        tree = OptionRecoAgent(OptionRecoConfig(mode="strict", pricing_engine="binomial")).recommend("2025-12-17", "TEST", row, under, chain)
+        self.assertEqual((bs.side, tree.side, bs.strike), ("PE", "PE", tree.strike))
+        # the early-exercise premium is part of the quote, so the American IV comes out lower
+        self.assertLess(tree.iv, bs.iv)
+        self.assertAlmostEqual(tree.iv, bs.iv, delta=0.01)
+
+        idx = OptionRecoAgent(OptionRecoConfig(mode="strict", pricing_engine="binomial")).recommend("2025-12-17", "NIFTY", row, under, chain)
+        self.assertEqual(idx.iv, OptionRecoAgent(OptionRecoConfig(mode="strict")).recommend("2025-12-17", "NIFTY", row, under, chain).iv)
+
+
+if __name__ == "__main__":
+    unittest.main()
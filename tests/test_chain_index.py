@@ -0,0 +1,70 @@
+import sys
+import os
+import unittest
+
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from stockreco.ingest.derivatives.chain_index import ChainIndex
+
+
+class TestChainIndex(unittest.TestCase):
+    def test_split_columns_layout(self):
+        # op<date>.csv layout (headers already stripped/upper-cased)
+        df = pd.DataFrame({
+            "INSTRUMENT": ["OPTIDX", "OPTIDX", "OPTSTK", "OPTSTK", "OPTSTK", None],
+            "SYMBOL": ["NIFTY ", "NIFTY 50", "INFY", "INFY", "INFY", None],
+            "EXP_DATE": ["30/12/2025", "23/12/2025", "30/12/2025", "30/12/2025", "30/12/2025", None],
+            "STR_PRICE": ["00026000.00", "00026000.00", "1600", "1580", "1620", None],
+            "OPT_TYPE": ["CE", "PE", "PE", "CE", "CE", None],
+            "CLOSE_PRICE": [120.5, 80.0, 22.0, 40.0, 0.0, None],
+            "HI_PRICE": [130.0, 90.0, 25.0, 41.0, 1.0, None],
+            "LO_PRICE": [100.0, 70.0, 20.0, 35.0, 0.5, None],
+            "OPEN_INT*": [1000, 2000, 300, 400, 500, None],
+        })
+        ix = ChainIndex.from_frame(df)
+
+        self.assertEqual(ix.symbols(), ["INFY", "NIFTY", "NIFTY 50"])
+        # zero premium row dropped
+        self.assertEqual(ix.size("INFY"), 2)
+
+        rows = ix.chain("INFY")
+        # sorted by expiry, strike, then CE before PE
+        self.assertEqual([(r.strike, r.option_type) for r in rows], [(1580.0, "CE"), (1600.0, "PE")])
+        self.assertEqual(rows[0].expiry, "30/12/2025")
+        self.assertEqual(rows[0].oi, 400.0)
+        self.assertIsNone(rows[0].volume)  # no recognised volume column
+
+        # aliases are merged into one chain
+        nifty = ix.chain("NIFTY")
+        self.assertEqual([r.expiry for r in nifty], ["23/12/2025", "30/12/2025"])
+        self.assertEqual(ix.chain("TCS"), [])
+
+    def test_contract_d_layout(self):
+        df = pd.DataFrame({
+            "CONTRACT_D": [
+                "FUTIDXNIFTY30-DEC-2025",
+                "OPTIDXNIFTY30-DEC-2025CE26000",
+                "OPTIDXNIFTY30-DEC-2025PE26000",
+                "OPTSTKBHEL30-DEC-2025PE272.5",
+            ],
+            "CLOSE_PRIC": [26100.0, 0.0, 95.0, 4.5],
+            "SETTLEMENT": [26100.0, 110.0, 95.0, 4.5],
+            "OI_NO_CON": [1.0, 10.0, 20.0, 30.0],
+            "TRADED_QUA": [5.0, 6.0, 7.0, 8.0],
+            "UNDRLNG_ST": [None, 26050.0, 26070.0, 270.0],
+        })
+        ix = ChainIndex.from_frame(df)
+
+        rows = ix.chain("NIFTY")
+        self.assertEqual(len(rows), 2)
+        # settlement used when close is missing / zero
+        self.assertEqual([r.ltp for r in rows], [110.0, 95.0])
+        self.assertEqual(ix.spot("BHEL"), 270.0)
+        self.assertEqual(ix.chain("BHEL")[0].strike, 272.5)
+        self.assertEqual(ix.chain("BHEL")[0].volume, 8.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import sys
+import os
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from stockreco.ingest.derivatives import context as dctx
+from stockreco.ingest.derivatives.store import DerivativesDataStore
+from stockreco.ingest.derivatives.market_stats_loader import load_fovolt_volatility, load_fii_sentiment
+
+FOVOLT = """Date, Symbol, Underlying Close Price (A), Applicable Daily Volatility (M) = Max (E or K), Applicable Annualised Volatility (N) = Max (F or L)
+16-Dec-25,NIFTY,25860.1,  0.0061,  0.1165
+16-Dec-25,INFY,1600.0,  0.0170,  0.3250
+"""
+
+PARTICIPANT = """""Participant wise Open Interest (no. of contracts) in Equity Derivatives as on Dec 16, 2025"",,,,,,,,,
+Client Type,Future Index Long,Future Index Short,Future Stock Long,Future Stock Short       ,Option Index Call Long,Option Index Put Long,Option Index Call Short,Option Index Put Short,Total Long Contracts      
+Client,185127,81585,2995240,340347,2016000,1369341,1860856,1770365,10092019
+FII,17353,174198,3615421,2285804,417734,588565,445117,297351,4869996
+"""
+
+
+class TestDerivativesContext(unittest.TestCase):
+    def setUp(self):
+        dctx.clear_context_cache()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.base = Path(self._tmp.name)
+        self.day = self.base / "2025-12-16"
+        self.day.mkdir()
+        (self.day / "FOVOLT_16122025.csv").write_text(FOVOLT)
+        (self.day / "fao_participant_oi_16122025.csv").write_text(PARTICIPANT)
+
+    def tearDown(self):
+        dctx.clear_context_cache()
+        self._tmp.cleanup()
+
+    def test_loaders_share_one_context(self):
+        store = DerivativesDataStore(str(self.base))
+        ctx = store.context("2025-12-16")
+        self.assertIs(store.context("16-12-2025"), ctx)
+        self.assertIs(dctx.context_for_dir(self.day, "2025-12-16"), ctx)
+
+        self.assertAlmostEqual(store.get_market_volatility("2025-12-16")["INFY"], 32.5)
+        self.assertEqual(load_fovolt_volatility(self.day, "2025-12-16")["NIFTY"], 0.1165)
+
+        oi = store.get_participant_oi("2025-12-16")
+        self.assertEqual(oi["FII"]["Future Index Short"], 174198)
+        self.assertEqual(oi["smart_money_score"], -0.8)  # FII net short, retail net long
+        self.assertAlmostEqual(load_fii_sentiment(self.day, "2025-12-16"), (17353 - 174198) / (17353 + 174198))
+        self.assertEqual(ctx.participant["Client"]["Total Long Contracts"], 10092019)
+
+        # no op/fo files -> no PCR
+        self.assertEqual(store.get_bhavcopy_stats("2025-12-16"), {})
+
+    def test_flat_directory_fallback(self):
+        flat = self.base / "flat"
+        flat.mkdir()
+        (flat / "FOVOLT_16122025.csv").write_text(FOVOLT)
+        store = DerivativesDataStore(str(flat))
+        self.assertAlmostEqual(store.get_market_volatility("16-12-2025")["INFY"], 32.5)
+
+    def test_persisted_context_reused_until_source_changes(self):
+        ctx = dctx.context_for_dir(self.day, "2025-12-16", persist=True)
+        saved = json.loads((self.day / dctx.CONTEXT_FILE).read_text())
+        self.assertEqual(saved["fovolt"], ctx.fovolt)
+
+        dctx.clear_context_cache()
+        again = dctx.context_for_dir(self.day, "2025-12-16", persist=True)
+        self.assertEqual(again, ctx)
+
+        (self.day / "FOVOLT_16122025.csv").write_text(FOVOLT.replace("0.3250", "0.4000"))
+        dctx.clear_context_cache()
+        rebuilt = dctx.context_for_dir(self.day, "2025-12-16", persist=True)
+        self.assertEqual(rebuilt.fovolt["INFY"], 0.4)
+
+    def test_memo_follows_source_files_and_is_bounded(self):
+        ctx = dctx.context_for_dir(self.day, "2025-12-16")
+        self.assertIs(dctx.context_for_dir(self.day, "2025-12-16"), ctx)
+
+        (self.day / "FOVOLT_16122025.csv").write_text(FOVOLT.replace("0.3250", "0.40001"))
+        rebuilt = dctx.context_for_dir(self.day, "2025-12-16")
+        self.assertIsNot(rebuilt, ctx)
+        self.assertEqual(rebuilt.fovolt["INFY"], 0.40001)
+
+        for i in range(dctx._CONTEXTS_MAX + 5):
+            dctx.context_for_dir(self.base / f"missing-{i}", "2025-12-16")
+        self.assertEqual(len(dctx._CONTEXTS), dctx._CONTEXTS_MAX)
+        self.assertNotIn((str(self.day.resolve()), "2025-12-16"), dctx._CONTEXTS)
+
+
+if __name__ == "__main__":
+    unittest.main()
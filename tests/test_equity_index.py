@@ -0,0 +1,77 @@
+import sys
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from stockreco.ingest import equity_index
+from stockreco.ingest.equity_index import spot_index
+from stockreco.ingest.market_context import MarketContextLoader
+
+BHAV = """SYMBOL, SERIES, DATE1, PREV_CLOSE, OPEN_PRICE, HIGH_PRICE, LOW_PRICE, LAST_PRICE, CLOSE_PRICE, AVG_PRICE, TTL_TRD_QNTY, TURNOVER_LACS, NO_OF_TRADES, DELIV_QTY, DELIV_PER
+AAATECH, BE, 16-Dec-2025, 99.31, 99.02, 101.90, 99.02, 101.40, 100.43, 100.54, 19776, 19.88, 214, -, -
+AARTISURF, EQ, 16-Dec-2025, 406.60, 410.00, 410.70, 403.00, 403.90, 404.15, 405.06, 3029, 12.27, 263, 2185, 72.14
+AARTISURF, P1, 16-Dec-2025, 158.00, 158.00, 158.00, 128.20, 128.20, 143.10, 143.46, 41, 0.06, 4, 21, 51.22
+RELIANCE, EQ, 16-Dec-2025, 1540.00, 1541.00, 1550.00, 1535.00, 1542.00, 1542.30, 1543.00, 100000, 1543.00, 5000, 52100, 52.10
+"""
+
+
+class TestEquitySpotIndex(unittest.TestCase):
+    def setUp(self):
+        equity_index.clear_spot_index_cache()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.data = Path(self._tmp.name)
+        self.day = self.data / "stocks" / "2025-12-16"
+        self.day.mkdir(parents=True)
+        (self.day / "sec_bhavdata_full_16122025.csv").write_text(BHAV)
+
+    def tearDown(self):
+        equity_index.clear_spot_index_cache()
+        self._tmp.cleanup()
+
+    def test_quotes(self):
+        idx = spot_index(self.data / "stocks", "2025-12-16")
+        self.assertEqual(len(idx), 3)
+        self.assertEqual(idx.close("RELIANCE.NS"), 1542.3)
+        self.assertEqual(idx.get("reliance").prev_close, 1540.0)
+
+        # EQ wins over the partly-paid line regardless of file order
+        q = idx.get("AARTISURF")
+        self.assertEqual((q.series, q.close, q.deliv_per), ("EQ", 404.15, 72.14))
+
+        # "-" delivery -> None, and left out of delivery_stats
+        self.assertIsNone(idx.get("AAATECH").deliv_per)
+        self.assertEqual(idx.delivery_stats(), {"AARTISURF": 72.14, "RELIANCE": 52.1})
+        self.assertIsNone(idx.close("MISSING"))
+
+    def test_built_once_and_shared(self):
+        idx = spot_index(self.data / "stocks", "2025-12-16")
+        self.assertIs(spot_index(self.data / "stocks", "2025-12-16"), idx)
+
+        ctx = MarketContextLoader(self.data).load_context("2025-12-16")
+        self.assertEqual(ctx.delivery_stats, idx.delivery_stats())
+
+    def test_rewritten_bhavcopy_rebuilds(self):
+        idx = spot_index(self.data / "stocks", "2025-12-16")
+        f = self.day / "sec_bhavdata_full_16122025.csv"
+        f.write_text(BHAV.replace("1542.30", "1600.00"))
+        os.utime(f, ns=(f.stat().st_atime_ns, f.stat().st_mtime_ns + 1_000_000_000))
+        fresh = spot_index(self.data / "stocks", "2025-12-16")
+        self.assertIsNot(fresh, idx)
+        self.assertEqual(fresh.close("RELIANCE"), 1600.0)
+
+    def test_memo_is_bounded(self):
+        for i in range(equity_index._INDEXES_MAX + 5):
+            spot_index(self.data / "stocks", f"2026-01-{i:02d}")
+        self.assertEqual(len(equity_index._INDEXES), equity_index._INDEXES_MAX)
+
+    def test_missing_folder_is_empty(self):
+        idx = spot_index(self.data / "stocks", "2025-12-17")
+        self.assertEqual(len(idx), 0)
+        self.assertIsNone(idx.close("RELIANCE"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import sys
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from stockreco.options.greeks import bs_greeks, bs_price
+from stockreco.options.greeks_cache import GreeksCache
+
+try:
+    from stockreco.api.routes.options_ltp import _row_spots
+except ImportError:  # fastapi not installed
+    _row_spots = None
+
+R = 0.07
+
+
+class TestGreeksCache(unittest.TestCase):
+    def setUp(self):
+        self.K = np.array([25800.0, 26000.0, 26200.0, 26000.0])
+        self.cp = np.array(["CE", "CE", "CE", "PE"])
+        self.keys = [f"NIFTY{int(k)}{c}" for k, c in zip(self.K, self.cp)]
+        self.T = 12 / 365
+        self.ltp = np.array([bs_price(26000.0, k, self.T, R, 0.14, c) for k, c in zip(self.K, self.cp)])
+
+    def test_values_match_scalar(self):
+        cache = GreeksCache(r=R)
+        out = cache.update(self.keys, 26000.0, self.K, self.T, self.cp, self.ltp, as_of="2025-12-18")
+        self.assertEqual(cache.last_recomputed, 4)
+        for key, k, c in zip(self.keys, self.K, self.cp):
+            g = bs_greeks(26000.0, k, self.T, R, 0.14, c)
+            self.assertAlmostEqual(out[key]["iv"], 0.14, places=4)
+            self.assertAlmostEqual(out[key]["delta"], g.delta, places=3)
+            self.assertAlmostEqual(out[key]["theta"], g.theta_per_day, places=3)
+            self.assertAlmostEqual(out[key]["vega"], g.vega / 100, places=3)
+
+    def test_only_changed_contracts_recompute(self):
+        cache = GreeksCache(r=R)
+        first = cache.update(self.keys, 26000.0, self.K, self.T, self.cp, self.ltp, as_of="2025-12-18")
+        cache.update(self.keys, 26000.0, self.K, self.T, self.cp, self.ltp, as_of="2025-12-18")
+        self.assertEqual(cache.last_recomputed, 0)
+
+        ltp = self.ltp.copy()
+        ltp[1] += 5.0
+        out = cache.update(self.keys, 26000.0, self.K, self.T, self.cp, ltp, as_of="2025-12-18")
+        self.assertEqual(cache.last_recomputed, 1)
+        self.assertGreater(out[self.keys[1]]["iv"], first[self.keys[1]]["iv"])
+        self.assertEqual(out[self.keys[0]], first[self.keys[0]])
+
+        cache.update(self.keys, 26050.0, self.K, self.T, self.cp, ltp, as_of="2025-12-18")
+        self.assertEqual(cache.last_recomputed, 4)
+        cache.update(self.keys, 26050.0, self.K, self.T - 1 / 365, self.cp, ltp, as_of="2025-12-19")
+        self.assertEqual(cache.last_recomputed, 4)
+
+    def test_unpriceable_rows(self):
+        cache = GreeksCache(r=R)
+        out = cache.update(["A", "B"], [26000.0, np.nan], 26000.0, self.T, "CE", [0.0, 100.0])
+        self.assertIsNone(out["A"]["iv"])
+        self.assertIsNone(out["B"]["delta"])
+        self.assertEqual(len(cache), 2)
+        cache.update(["A", "B"], [26000.0, np.nan], 26000.0, self.T, "CE", [0.0, 100.0])
+        self.assertEqual(cache.last_recomputed, 0)  # NaN spot/ltp is not "changed"
+
+    def test_below_intrinsic_premium_has_no_greeks(self):
+        cache = GreeksCache(r=R)
+        # 24000 CE with spot 26000 is worth at least ~2000; 1834.9 is under intrinsic
+        out = cache.update(["ITM", "OK"], 26000.0, [24000.0, 26000.0], self.T, "CE", [1834.9, self.ltp[1]])
+        self.assertEqual(out["ITM"], {k: None for k in ("iv", "delta", "gamma", "theta", "vega")})
+        self.assertAlmostEqual(out["OK"]["iv"], 0.14, places=4)
+
+    def test_missing_contracts_are_evicted(self):
+        cache = GreeksCache(r=R)
+        cache.update(self.keys, 26000.0, self.K, self.T, self.cp, self.ltp, as_of="2025-12-18")
+        out = cache.update(self.keys[1:], 26000.0, self.K[1:], self.T, self.cp[1:], self.ltp[1:], as_of="2025-12-18")
+        self.assertEqual(cache.last_recomputed, 0)
+        self.assertEqual(len(cache), 3)
+        self.assertNotIn(self.keys[0], cache)
+        self.assertEqual(list(out), self.keys[1:])
+
+
+@unittest.skipIf(_row_spots is None, "fastapi not installed")
+class TestQuoteSpots(unittest.TestCase):
+    def test_index_spot_from_expiry_forward(self):
+        # no chain spot, no equity close, no futures: spot = parity forward of each expiry, discounted
+        S0, rows = 26000.0, []
+        for dte, ords in ((12, 739615), (40, 739643)):
+            T = dte / 365
+            for k in (25800.0, 26000.0, 26200.0):
+                for cp in ("CE", "PE"):
+                    rows.append({"underlying": "NIFTY", "expiry_ord": ords, "strike": k, "is_call": cp == "CE",
+                                 "ltp": bs_price(S0, k, T, R, 0.14, cp), "spot": np.nan, "_T": T})
+        chain = pd.DataFrame(rows)
+        with tempfile.TemporaryDirectory() as tmp:
+            day = Path(tmp) / "derivatives" / "2025-12-18"
+            day.mkdir(parents=True)
+            S = _row_spots(day, chain, chain["_T"].to_numpy(), R)
+        np.testing.assert_allclose(S, S0, rtol=1e-6)
+
+        cache = GreeksCache(r=R)
+        out = cache.update([str(i) for i in range(len(chain))], S, chain["strike"], chain["_T"], np.where(chain["is_call"], "CE", "PE"), chain["ltp"])
+        for g in out.values():
+            self.assertAlmostEqual(g["iv"], 0.14, places=3)
+
+
+if __name__ == "__main__":
+    unittest.main()
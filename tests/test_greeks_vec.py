@@ -0,0 +1,102 @@
+import sys
+import os
+import inspect
+import math
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from stockreco.options.greeks import bs_greeks, bs_greeks_vec, bs_price, bs_price_vec, implied_vol, norm_cdf_vec
+from stockreco.agents import bs_pricing
+
+
+def _ref(S, K, T, r, sigma, call):
+    """The old math.erf closed form, contract by contract."""
+    N = lambda x: 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
+    d1 = (math.log(S / K) + (r + 0.5 * sigma * sigma) * T) / (sigma * math.sqrt(T))
+    d2 = d1 - sigma * math.sqrt(T)
+    pdf = math.exp(-0.5 * d1 * d1) / math.sqrt(2.0 * math.pi)
+    if call:
+        price = S * N(d1) - K * math.exp(-r * T) * N(d2)
+        delta = N(d1)
+        theta = -S * pdf * sigma / (2 * math.sqrt(T)) - r * K * math.exp(-r * T) * N(d2)
+    else:
+        price = K * math.exp(-r * T) * N(-d2) - S * N(-d1)
+        delta = N(d1) - 1
+        theta = -S * pdf * sigma / (2 * math.sqrt(T)) + r * K * math.exp(-r * T) * N(-d2)
+    return price, delta, pdf / (S * sigma * math.sqrt(T)), S * pdf * math.sqrt(T), theta / 365.0
+
+
+class TestBlackScholesVec(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        n = 500
+        self.S = np.full(n, 25860.0)
+        self.K = np.round(rng.uniform(20000, 32000, n) / 50) * 50
+        self.T = rng.uniform(1 / 365, 1.0, n)
+        self.sigma = rng.uniform(0.05, 0.9, n)
+        self.call = rng.random(n) < 0.5
+
+    def test_norm_cdf(self):
+        x = np.linspace(-12, 12, 4001)
+        ref = np.array([0.5 * math.erfc(-v / math.sqrt(2.0)) for v in x])
+        self.assertLess(np.max(np.abs(norm_cdf_vec(x) - ref)), 1e-15)
+        self.assertEqual(norm_cdf_vec([-50.0, 50.0]).tolist(), [0.0, 1.0])
+
+    def test_matches_closed_form(self):
+        g = bs_greeks_vec(self.S, self.K, self.T, 0.07, self.sigma, self.call)
+        self.assertTrue(g.valid.all())
+        for i in range(len(g)):
+            price, delta, gamma, vega, theta = _ref(self.S[i], self.K[i], self.T[i], 0.07, self.sigma[i], self.call[i])
+            self.assertAlmostEqual(g.price[i], price, delta=1e-7 * max(1.0, price))
+            self.assertAlmostEqual(g.delta[i], delta, places=10)
+            self.assertAlmostEqual(g.gamma[i], gamma, places=12)
+            self.assertAlmostEqual(g.vega[i], vega, delta=1e-8 * max(1.0, vega))
+            self.assertAlmostEqual(g.theta_per_day[i], theta, delta=1e-8 * max(1.0, abs(theta)))
+        np.testing.assert_allclose(bs_price_vec(self.S, self.K, self.T, 0.07, self.sigma, self.call), g.price)
+
+    def test_put_call_parity(self):
+        c = bs_price_vec(self.S, self.K, self.T, 0.07, self.sigma, "CE")
+        p = bs_price_vec(self.S, self.K, self.T, 0.07, self.sigma, np.full(len(self.S), "PE"))
+        np.testing.assert_allclose(c - p, self.S - self.K * np.exp(-0.07 * self.T), atol=1e-6)
+
+    def test_scalar_wrappers(self):
+        self.assertAlmostEqual(bs_price(100, 100, 0.5, 0.07, 0.2, "CE"), _ref(100, 100, 0.5, 0.07, 0.2, True)[0], places=10)
+        g = bs_greeks(100, 100, 0.5, 0.07, 0.2, "put")
+        self.assertEqual(g.iv, 0.2)
+        self.assertAlmostEqual(g.delta, _ref(100, 100, 0.5, 0.07, 0.2, False)[1], places=12)
+
+        # invalid inputs keep the old scalar behaviour
+        self.assertEqual(bs_price(100, 100, 0.0, 0.07, 0.2, "CE"), 0.0)
+        self.assertIsNone(bs_greeks(100, 100, 0.5, 0.07, 0.0, "CE").delta)
+        g = bs_greeks_vec([100, 100], 100, [0.5, -1.0], 0.07, 0.2, "CE")
+        self.assertEqual(g.valid.tolist(), [True, False])
+        self.assertTrue(np.isnan(g.delta[1]))
+        self.assertEqual(g.price[1], 0.0)
+
+    def test_scalar_contract(self):
+        self.assertTrue(math.isnan(bs_price(100, 100, 0.5, 0.07, float("nan"), "CE")))
+        with self.assertRaises(AttributeError):
+            bs_price(100, 100, 0.5, 0.07, 0.2, None)
+        self.assertIsNone(implied_vol(7.0, 100, 100, 0.5, 0.07, None))
+        self.assertEqual(inspect.signature(implied_vol).parameters["max_iter"].default, 60)
+        # tol is absolute, in premium units: a loose tol stops within tol of the premium
+        premium = bs_price(100, 100, 0.5, 0.07, 0.2, "CE")
+        iv = implied_vol(premium, 100, 100, 0.5, 0.07, "CE", tol=0.5)
+        self.assertLess(abs(bs_price(100, 100, 0.5, 0.07, iv, "CE") - premium), 0.5)
+        self.assertGreater(abs(iv - 0.2), 1e-3)
+        # scalar and vector paths agree
+        for i in range(len(self.S)):
+            cp = "CE" if self.call[i] else "PE"
+            self.assertAlmostEqual(bs_price(self.S[i], self.K[i], self.T[i], 0.07, self.sigma[i], cp),
+                                   float(bs_price_vec(self.S[i], self.K[i], self.T[i], 0.07, self.sigma[i], cp)), places=8)
+
+    def test_bs_pricing_module(self):
+        self.assertAlmostEqual(bs_pricing.bs_price(100, 100, 0.07, 0.5, 0.2, "PE"), _ref(100, 100, 0.5, 0.07, 0.2, False)[0], places=10)
+        self.assertEqual(bs_pricing.bs_price(110, 100, 0.07, 0.0, 0.2, "CE"), 10.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import sys
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from stockreco.ingest.derivatives.bhav_cache import HAS_PARQUET
+from stockreco.ingest.ingest_job import INGEST_MANIFEST, load_table, plan, run_ingest, table_path
+
+OP_CSV = """INSTRUMENT,SYMBOL    ,EXP_DATE  ,STR_PRICE  ,OPT_TYPE,CLOSE_PRICE,OPEN_INT*      ,TRD_QTY
+OPTIDX    ,NIFTY     ,30/12/2025,00026000.00,CE      ,00000120.00,000000000001000,10
+OPTIDX    ,NIFTY     ,30/12/2025,00026000.00,PE      ,00000095.00,000000000002000,10
+* - OPEN_INT as available in the trading system at the end of trading hours.
+"""
+
+FOVOLT_CSV = """Date, Symbol, Underlying Close Price (A), Applicable Annualised Volatility (N) = Max (F or L)
+16-Dec-25,NIFTY,26000,  0.1200
+16-Dec-25,INFY,1600,  0.2500
+"""
+
+BULK_CSV = """Date,Symbol,Security Name,Client Name,Buy/Sell,Quantity Traded,Trade Price / Wght. Avg. Price,Remarks
+16-DEC-2025,AAREYDRUGS,Aarey Drugs & Pharm Ltd,SOME CLIENT  ,BUY,152500,67.74,-
+"""
+
+
+class TestIngestJob(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.deriv = self.root / "data" / "derivatives" / "2025-12-16"
+        self.stocks = self.root / "data" / "stocks" / "2025-12-16"
+        self.deriv.mkdir(parents=True)
+        self.stocks.mkdir(parents=True)
+        (self.deriv / "op16122025.csv").write_text(OP_CSV)
+        (self.deriv / "FOVOLT_16122025.csv").write_text(FOVOLT_CSV)
+        (self.stocks / "bulk.csv").write_text(BULK_CSV)
+        (self.stocks / "readme.txt").write_text("not a table")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_plan_covers_dates_and_file_types(self):
+        kinds = sorted((s, k, Path(p).name) for s, k, p, _ in plan(self.root))
+        self.assertEqual(kinds, [
+            ("derivatives", "bhav", "2025-12-16"),
+            ("derivatives", "context", "2025-12-16"),
+            ("derivatives", "table", "FOVOLT_16122025.csv"),
+            ("stocks", "table", "bulk.csv"),
+        ])
+        self.assertEqual(plan(self.root, sources=["mcx"]), [])
+        self.assertEqual(plan(self.root, start="2025-12-17"), [])
+
+    def test_run_reports_timings_and_is_incremental(self):
+        results = run_ingest(self.root, workers=2)
+        self.assertEqual(len(results), 4)
+        self.assertFalse([r.error for r in results if r.error])
+        self.assertTrue(all(r.seconds >= 0 for r in results))
+        fovolt = next(r for r in results if r.path.endswith("FOVOLT_16122025.csv"))
+        self.assertEqual(fovolt.rows, 2)
+        self.assertTrue((self.deriv / INGEST_MANIFEST).exists())
+
+        # nothing changed -> nothing to do; touching one folder only re-plans that folder
+        self.assertEqual(run_ingest(self.root, workers=1), [])
+        (self.stocks / "block.csv").write_text(BULK_CSV)
+        again = run_ingest(self.root, workers=1)
+        self.assertEqual({r.source for r in again}, {"stocks"})
+        self.assertEqual(len(run_ingest(self.root, incremental=False, workers=1)), 5)
+
+    @unittest.skipUnless(HAS_PARQUET, "pyarrow not installed")
+    def test_table_cache_round_trip(self):
+        run_ingest(self.root, sources=["stocks"], workers=1)
+        src = self.stocks / "bulk.csv"
+        self.assertTrue(table_path(src).exists())
+        df = load_table(src)
+        self.assertEqual(df.loc[0, "Client Name"], "SOME CLIENT")
+        self.assertEqual(int(df.loc[0, "Quantity Traded"]), 152500)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import sys
+import os
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from stockreco.ingest.derivatives.option_chain import OptionChain
+from stockreco.options import iv_solver
+from stockreco.options.greeks import bs_price_vec, implied_vol
+from stockreco.options.iv_solver import chain_iv, implied_vol_vec
+
+
+class TestIVSolver(unittest.TestCase):
+    def test_round_trip_grid(self):
+        # every strike/expiry/vol combination of a NIFTY-like chain at once
+        K, T, sig = np.meshgrid(np.arange(22000, 30001, 250.0), [2 / 365, 7 / 365, 30 / 365, 0.25, 1.0], [0.08, 0.15, 0.4, 1.2], indexing="ij")
+        call = K >= 25860
+        P = bs_price_vec(25860.0, K, T, 0.07, sig, call)
+
+        res = implied_vol_vec(P, 25860.0, K, T, 0.07, call)
+        self.assertEqual(res.iv.shape, K.shape)
+        # OTM options with a price worth quoting (>= 0.05) must round-trip
+        quoted = P >= 0.05
+        self.assertTrue(res.converged[quoted].all(), res.summary())
+        np.testing.assert_allclose(res.iv[quoted], sig[quoted], rtol=1e-5)
+        self.assertLessEqual(res.iterations[quoted].max(), 12)
+
+    def test_status_codes(self):
+        # below intrinsic, above the 500% price, missing premium, fine
+        res = implied_vol_vec([5.0, 99.9, np.nan, 7.4285], 100.0, [90.0, 100.0, 100.0, 100.0], 0.5, 0.07, "CE")
+        self.assertEqual(res.status.tolist(), [iv_solver.BELOW_INTRINSIC, iv_solver.ABOVE_MAX, iv_solver.INVALID, iv_solver.OK])
+        self.assertEqual(res.iv[0], iv_solver.IV_LO)
+        self.assertEqual(res.iv[1], iv_solver.IV_HI)
+        self.assertTrue(np.isnan(res.iv[2]))
+        self.assertAlmostEqual(res.iv[3], 0.2, places=4)
+        self.assertEqual(res.summary()["ok"], 1)
+
+    def test_chain_iv(self):
+        strikes = np.array([25500.0, 26000.0, 26500.0, 26000.0])
+        is_call = np.array([True, True, True, False])
+        T = (np.array([14, 14, 14, 42]) / 365.0)
+        ltp = bs_price_vec(25860.0, strikes, T, 0.07, 0.12, is_call)
+        chain = OptionChain(
+            strike=strikes,
+            expiry=["30-Dec-2025", "30-Dec-2025", "30-Dec-2025", "27-Jan-2026"],
+            is_call=is_call,
+            ltp=ltp,
+        )
+        res = chain_iv(chain, 25860.0, "2025-12-16")
+        np.testing.assert_allclose(res.iv, 0.12, rtol=1e-6)
+
+    def test_scalar_wrapper(self):
+        self.assertAlmostEqual(implied_vol(7.428489286378529, 100, 100, 0.5, 0.07, "CE"), 0.2, places=6)
+        self.assertEqual(implied_vol(150.0, 100, 100, 0.5, 0.07, "CE"), 5.0)
+        self.assertIsNone(implied_vol(0.0, 100, 100, 0.5, 0.07, "CE"))
+        self.assertIsNone(implied_vol(5.0, 100, 100, 0.0, 0.07, "PE"))
+
+
+if __name__ == "__main__":
+    unittest.main()
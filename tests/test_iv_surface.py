@@ -0,0 +1,101 @@
+import sys
+import os
+import math
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from stockreco.features.derivatives.iv_surface import IVSurfaceStore, fit_day
+from stockreco.ingest.derivatives.bhav_cache import HAS_PARQUET
+from stockreco.options.greeks import bs_price_vec
+
+HEADER = "INSTRUMENT,SYMBOL    ,EXP_DATE  ,STR_PRICE  ,OPT_TYPE,OPEN_PRICE,HI_PRICE,LO_PRICE,CLOSE_PRICE,OPEN_INT*      ,TRD_QTY\n"
+SPOT = 26000.0
+
+
+def _op(as_of_ord, atm_vol, slope=0.0):
+    """NIFTY 30-Dec-2025 chain priced off iv(x) = atm_vol - slope * ln(K/S), rounded to the tick."""
+    T = (date_ord("2025-12-30") - as_of_ord) / 365.0
+    K = np.arange(24000.0, 28001.0, 100.0)
+    vol = atm_vol - slope * np.log(K / SPOT)
+    lines = [HEADER]
+    for side, call in (("CE", True), ("PE", False)):
+        px = np.round(bs_price_vec(SPOT, K, T, 0.07, vol, call) / 0.05) * 0.05
+        for k, p in zip(K, px):
+            if p > 0:
+                lines.append(f"OPTIDX    ,NIFTY     ,30/12/2025,{k:011.2f},{side}      ,{p},{p},{p},{p},000000000001000,10\n")
+    return "".join(lines)
+
+
+def date_ord(d):
+    from datetime import date
+    return date.fromisoformat(d).toordinal()
+
+
+class TestIVSurface(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.base = self.root / "data" / "derivatives"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _day(self, d, atm_vol, slope=0.0):
+        (self.base / d).mkdir(parents=True)
+        (self.base / d / f"op{d[8:10]}{d[5:7]}{d[:4]}.csv").write_text(_op(date_ord(d), atm_vol, slope))
+
+    def test_fit_recovers_atm_and_skew(self):
+        self._day("2025-12-16", 0.15, slope=0.5)
+        surface, summary = fit_day(self.base / "2025-12-16")
+
+        row = summary.iloc[0]
+        self.assertEqual((row["underlying"], row["expiry"], row["dte"]), ("NIFTY", "2025-12-30", 14))
+        # forward from put-call parity
+        self.assertAlmostEqual(row["forward"], SPOT * math.exp(0.07 * 14 / 365), delta=1.0)
+        self.assertAlmostEqual(row["atm_iv"], 0.15 - 0.5 * math.log(row["forward"] / SPOT), delta=2e-3)
+        self.assertGreater(row["skew_25d"], 0.005)  # downside richer
+
+        smile = surface[surface["expiry"] == "2025-12-30"].sort_values("bucket")
+        # contiguous buckets around the money; far wings only where quotes reach them
+        b = smile["bucket"].tolist()
+        self.assertEqual(b, list(range(b[0], b[-1] + 1)))
+        self.assertTrue(set(range(-3, 4)) <= set(b))
+        self.assertTrue((np.diff(smile["iv"].to_numpy()) < 0).all())
+        self.assertTrue((np.diff(smile["delta"].to_numpy()) < 0).all())
+
+    def test_percentile_and_rank(self):
+        for d, v in (("2025-12-15", 0.15), ("2025-12-16", 0.12), ("2025-12-17", 0.18)):
+            self._day(d, v)
+        store = IVSurfaceStore(self.root, min_history=2)
+        store.sync()
+
+        self.assertIsNone(store.stats("2025-12-15", "NIFTY").iv_percentile)  # not enough history
+        st = store.stats("2025-12-16", "NIFTY 50")
+        self.assertEqual((st.iv_percentile, st.iv_rank, st.n_history), (50.0, 0.0, 2))
+        st = store.stats("2025-12-17", "NIFTY")
+        self.assertEqual((st.iv_percentile, st.iv_rank), (100.0, 100.0))
+        self.assertAlmostEqual(st.atm_iv, 0.18, delta=2e-3)
+
+        hist = store.iv_history("NIFTY", end="2025-12-16")
+        self.assertEqual(len(hist), 2)
+        self.assertIsNone(store.stats("2025-12-17", "INFY"))
+
+    @unittest.skipUnless(HAS_PARQUET, "pyarrow not installed")
+    def test_sync_persists_and_is_incremental(self):
+        self._day("2025-12-16", 0.15)
+        store = IVSurfaceStore(self.root)
+        self.assertEqual(store.sync(), ["2025-12-16"])
+        self.assertTrue((store.root / "date=2025-12-16" / "summary.parquet").exists())
+        self.assertEqual(store.sync(), [])
+
+        fresh = IVSurfaceStore(self.root)
+        self.assertAlmostEqual(fresh.stats("2025-12-16", "NIFTY").atm_iv, store.stats("2025-12-16", "NIFTY").atm_iv)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import sys
+import os
+import datetime as dt
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from stockreco.ingest.derivatives.option_chain import OptionChain
+from stockreco.utils.dates import previous_business_day
+from stockreco.utils.market_calendar import (
+    TradingCalendar,
+    days_to_expiry,
+    dte_table,
+    expiry_date,
+    trading_days_to_expiry,
+)
+
+D = dt.date
+
+
+class TestMarketCalendar(unittest.TestCase):
+    def test_expiry_formats(self):
+        for s in ("30-Dec-2025", "30-DEC-2025", "2025-12-30", "30/12/2025", " 30/12/2025 "):
+            self.assertEqual(expiry_date(s), D(2025, 12, 30), s)
+        self.assertIsNone(expiry_date("garbage"))
+        self.assertIsNone(expiry_date(""))
+        self.assertEqual(days_to_expiry("2025-12-18", "30/12/2025"), 12)
+        self.assertEqual(days_to_expiry("2026-01-05", "30-Dec-2025"), 0)
+        self.assertIsNone(days_to_expiry("2025-12-18", None))
+
+    def test_previous_business_day(self):
+        self.assertEqual(previous_business_day(D(2025, 12, 22)), D(2025, 12, 19))  # Mon -> Fri
+        self.assertEqual(previous_business_day(D(2025, 12, 20)), D(2025, 12, 19))  # Sat -> Fri
+        self.assertEqual(previous_business_day(D(2025, 12, 17)), D(2025, 12, 16))
+        self.assertEqual(previous_business_day(D(2025, 12, 26)), D(2025, 12, 24))  # Christmas
+        self.assertEqual(previous_business_day(D(2025, 10, 23)), D(2025, 10, 20))  # Diwali 21-22 Oct
+        self.assertEqual(previous_business_day(D(2010, 3, 2)), D(2010, 3, 1))  # outside the built range
+
+    def test_trading_dte(self):
+        # 18 Dec 2025 (Thu) -> 30 Dec 2025 (Tue): 19, 22, 23, 24, 26, 29, 30 (25th closed)
+        self.assertEqual(trading_days_to_expiry("2025-12-18", "30-Dec-2025"), 7)
+        self.assertEqual(trading_days_to_expiry("2025-12-30", "30-Dec-2025"), 0)
+        self.assertEqual(trading_days_to_expiry("2026-01-05", "30-Dec-2025"), 0)
+        t = dte_table("2025-12-18")
+        self.assertEqual((t.calendar("30/12/2025"), t.trading("30/12/2025")), (12, 7))
+        self.assertIs(dte_table("2025-12-18"), t)
+
+    def test_weekends_only_without_holidays(self):
+        cal = TradingCalendar(holidays=())
+        self.assertEqual(cal.sessions_between(D(2025, 12, 18), D(2025, 12, 30)), 8)
+        self.assertTrue(cal.is_trading_day(D(2025, 12, 25)))
+        self.assertFalse(cal.is_trading_day(D(2025, 12, 27)))
+
+    def test_chain_trading_dte(self):
+        oc = OptionChain(strike=[100, 100, 100], expiry=["30-Dec-2025", "27/01/2026", "??"], is_call=[True] * 3, ltp=[1, 1, 1])
+        np.testing.assert_array_equal(oc.days_to_expiry("2025-12-18"), [12, 40, np.nan])
+        got = oc.trading_days_to_expiry("2025-12-18")
+        self.assertEqual(got[0], 7)
+        self.assertEqual(got[1], trading_days_to_expiry("2025-12-18", "2026-01-27"))
+        self.assertTrue(np.isnan(got[2]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import sys
+import os
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from stockreco.agents.option_reco_agent import OptionReco
+from stockreco.options.greeks import bs_price
+from stockreco.options.montecarlo import simulate_hits, simulate_recos
+from stockreco.options.scenarios import analyze, build_grid
+
+SPOT, K, T, IV = 26000.0, 26000.0, 14 / 365, 0.13
+
+
+class TestMonteCarlo(unittest.TestCase):
+    def setUp(self):
+        self.e = bs_price(SPOT, K, T, 0.07, IV, "CE")
+
+    def _run(self, **kw):
+        e = self.e
+        args = dict(n_paths=20000, seed=3)
+        args.update(kw)
+        return simulate_hits(SPOT, K, T, 0.07, IV, "CE", e, 1.5 * e, 2.0 * e, 0.65 * e, 5, **args)
+
+    def test_seeded_and_consistent(self):
+        a, b = self._run(), self._run()
+        np.testing.assert_array_equal(a.p_t1, b.p_t1)
+        self.assertTrue(0 < a.p_t2[0] < a.p_t1[0] < 1)
+        self.assertLessEqual(a.p_t1[0] + a.p_sl[0], 1.0)
+        self.assertTrue(1.0 <= a.hold_days[0] <= 5.0)
+
+        # agrees with the scenario-grid Markov chain within a few points
+        s = analyze(build_grid(SPOT, K, T, 0.07, IV, "CE", self.e, 250.0, 5), t1=1.5 * self.e, t2=2.0 * self.e, sl=0.65 * self.e)
+        self.assertAlmostEqual(a.p_t1[0], s.p_t1, delta=0.04)
+        self.assertAlmostEqual(a.p_sl[0], s.p_sl, delta=0.04)
+
+    def test_batch_matches_and_jumps(self):
+        e = self.e
+        # a PE alongside the CE: rows are independent of each other
+        pe = bs_price(SPOT, K, T, 0.07, IV, "PE")
+        res = simulate_hits(SPOT, K, T, 0.07, IV, ["CE", "PE"], [e, pe], [1.5 * e, 1.5 * pe], [2 * e, 2 * pe], [0.65 * e, 0.65 * pe], [5, 2], n_paths=20000, seed=3)
+        self.assertEqual(len(res), 2)
+        self.assertAlmostEqual(res.p_t1[0], self._run().p_t1[0], delta=4 * res.se[0])
+        self.assertLess(res.hold_days[1], 2.0 + 1e-9)
+
+        # jumps fatten the tails: the far target gets more likely
+        jumpy = self._run(jump_lambda=20.0, jump_sd=0.03)
+        self.assertGreater(jumpy.p_t2[0], self._run().p_t2[0] + 4 * jumpy.se[0])
+
+    def test_simulate_recos(self):
+        e = self.e
+        buy = OptionReco(
+            as_of="2025-12-16", symbol="NIFTY", bias="BULLISH", instrument="OPTION", action="BUY", side="CE",
+            expiry="30-Dec-2025", strike=K, entry_price=e, sl_premium=0.65 * e,
+            targets=[{"price": 1.5 * e}, {"price": 2.0 * e}], spot=SPOT, ltp=e, iv=IV * 100, dte=14, sell_by="2025-12-21",
+        )
+        hold = OptionReco("2025-12-16", "INFY", "NEUTRAL", "NONE", "HOLD")
+        out = simulate_recos([hold, buy], n_paths=20000, seed=3)
+        self.assertIsNone(out[0])
+        self.assertAlmostEqual(out[1]["p_t1"], round(float(self._run().p_t1[0]), 4))
+        self.assertEqual(out[1]["n_paths"], 20000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import sys
+import os
+import math
+import threading
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from stockreco.options import greeks
+from stockreco.options.greeks import LUT_MAX_ERROR, bs_greeks_vec, norm_cdf_vec, set_norm_backend
+from stockreco.options.iv_solver import implied_vol_vec
+
+
+class TestNormLUT(unittest.TestCase):
+    def tearDown(self):
+        set_norm_backend("exact")
+
+    def test_cdf_error_bound(self):
+        set_norm_backend("lut")
+        x = np.concatenate([np.linspace(-12.0, 12.0, 100001), [-40.0, 40.0, np.nan]])
+        got = norm_cdf_vec(x)
+        ref = np.array([0.5 * math.erfc(-v / math.sqrt(2.0)) for v in x[:-1]])
+        self.assertLessEqual(np.abs(got[:-1] - ref).max(), LUT_MAX_ERROR)
+        self.assertTrue(np.isnan(got[-1]))
+        self.assertTrue(((got[:-1] >= 0.0) & (got[:-1] <= 1.0)).all())
+
+    def test_backend_selection(self):
+        self.assertEqual(greeks.get_norm_backend(), "exact")
+        with self.assertRaises(ValueError):
+            set_norm_backend("scipy")
+        set_norm_backend("lut")
+        self.assertEqual(greeks.get_norm_backend(), "lut")
+
+    def test_scoped_backend_does_not_leak_across_threads(self):
+        # the API prices on a thread pool: a "lut" request must not switch a concurrent exact one
+        inside, seen = threading.Event(), {}
+
+        def lut_request():
+            with greeks.norm_backend("lut"):
+                seen["lut"] = greeks.get_norm_backend()
+                inside.set()
+                done.wait(5)
+
+        done = threading.Event()
+        t = threading.Thread(target=lut_request)
+        t.start()
+        inside.wait(5)
+        x = np.linspace(-3.0, 3.0, 101) + 1e-3
+        exact = norm_cdf_vec(x)
+        self.assertEqual(greeks.get_norm_backend(), "exact")
+        done.set()
+        t.join()
+        self.assertEqual(seen["lut"], "lut")
+        ref = np.array([0.5 * math.erfc(-v / math.sqrt(2.0)) for v in x])
+        self.assertLess(np.abs(exact - ref).max(), 1e-14)
+        with greeks.norm_backend("lut"):
+            self.assertGreater(np.abs(norm_cdf_vec(x) - ref).max(), 1e-14)
+        self.assertEqual(greeks.get_norm_backend(), "exact")
+
+    def test_greeks_and_iv_agree(self):
+        K, T = np.meshgrid(np.arange(22000, 30001, 250.0), [2 / 365, 30 / 365, 1.0], indexing="ij")
+        call = K >= 25860
+        exact = bs_greeks_vec(25860.0, K, T, 0.07, 0.15, call)
+        iv_exact = implied_vol_vec(exact.price, 25860.0, K, T, 0.07, call)
+
+        set_norm_backend("lut")
+        lut = bs_greeks_vec(25860.0, K, T, 0.07, 0.15, call)
+        iv_lut = implied_vol_vec(exact.price, 25860.0, K, T, 0.07, call)
+
+        np.testing.assert_allclose(lut.price, exact.price, atol=30000 * LUT_MAX_ERROR * 2)
+        np.testing.assert_allclose(lut.delta, exact.delta, atol=2 * LUT_MAX_ERROR)
+        np.testing.assert_array_equal(lut.gamma, exact.gamma)  # n(x) is not tabulated
+        quoted = exact.price >= 0.05
+        np.testing.assert_array_equal(iv_lut.status[quoted], iv_exact.status[quoted])
+        np.testing.assert_allclose(iv_lut.iv[quoted], iv_exact.iv[quoted], rtol=1e-5)
+
+
+if __name__ == "__main__":
+    unittest.main()
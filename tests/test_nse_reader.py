@@ -0,0 +1,84 @@
+import sys
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from stockreco.ingest.derivatives.bhav_cache import _read_csv_any
+from stockreco.ingest.derivatives.chain_index import ChainIndex
+from stockreco.ingest.derivatives.nse_reader import HAS_ARROW, read_bhavcopy
+
+OP_CSV = """INSTRUMENT,SYMBOL    ,EXP_DATE  ,STR_PRICE  ,OPT_TYPE,OPEN_PRICE ,HI_PRICE   ,LO_PRICE   ,CLOSE_PRICE,OPEN_INT*      ,TRD_QTY          ,NOTION_VAL
+OPTIDX    ,BANKNIFTY ,30/12/2025,00043500.00,PE      ,00000003.70,00000004.20,00000002.70,00000003.10,000000000020450,             8890,      386744102.50
+OPTIDX    ,NIFTY 50  ,30/12/2025,00026000.00,ce      ,00000140.00,00000150.00,00000110.00,00000120.00,000000000001000,               10,           1000.00
+OPTSTK    ,INFY      ,30/12/2025,00001600.00,CE      ,00000000.00,00000000.00,00000000.00,00000000.00,000000000000000,                0,              0.00
+* - OPEN_INT as available in the trading system at the end of trading hours.
+"""
+
+FO_CSV = """CONTRACT_D,PREVIOUS_S,OPEN_PRICE,HIGH_PRICE,LOW_PRICE,CLOSE_PRIC,SETTLEMENT,NET_CHANGE,OI_NO_CON,TRADED_QUA,TRD_NO_CON,TRADED_VAL
+FUTIDXNIFTY30-DEC-2025,26000.0000000,26010.0000000,26100.0000000,25990.0000000,26050.0000000,26050.0000000,0.1900000,500.0000000,1000.0000000,10.0000000,26050000.0000000
+OPTIDXNIFTY30-DEC-2025CE26000,110.0000000,115.0000000,130.0000000,100.0000000,120.0000000,120.0000000,9.0000000,999.0000000,1.0000000,1.0000000,120.0000000
+"""
+
+
+class TestNseReader(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+        self.op = self.dir / "op16122025.csv"
+        self.fo = self.dir / "fo161225.csv"
+        self.op.write_text(OP_CSV)
+        self.fo.write_text(FO_CSV)
+        self.engines = (["pyarrow"] if HAS_ARROW else []) + ["pandas"]
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_split_layout_schema_and_footer(self):
+        for engine in self.engines:
+            with self.subTest(engine=engine):
+                df = read_bhavcopy(self.op, engine=engine)
+                self.assertEqual(len(df), 3)  # footer dropped
+                self.assertNotIn("NOTION_VAL", df.columns)  # not in the schema -> never parsed
+                self.assertEqual(df["OPEN_INT*"].dtype, np.float64)
+                self.assertEqual(df["OPEN_INT*"].tolist(), [20450.0, 1000.0, 0.0])
+                self.assertEqual(df["STR_PRICE"].tolist(), [43500.0, 26000.0, 1600.0])
+                self.assertEqual(list(df["SYMBOL"].astype(str)), ["BANKNIFTY", "NIFTY 50", "INFY"])
+                self.assertEqual(list(df["OPT_TYPE"].astype(str)), ["PE", "CE", "CE"])
+                self.assertEqual(list(df["EXP_DATE"].astype(str)), ["30/12/2025"] * 3)
+
+                sub = read_bhavcopy(self.op, columns=["SYMBOL", "OPEN_INT*", "NOPE"], engine=engine)
+                self.assertEqual(list(sub.columns), ["SYMBOL", "OPEN_INT*"])
+
+    def test_chain_index_matches_generic_read(self):
+        for path in (self.op, self.fo):
+            want = ChainIndex.from_frame(_read_csv_any(path)).to_frame()
+            for engine in self.engines:
+                with self.subTest(path=path.name, engine=engine):
+                    got = ChainIndex.from_frame(read_bhavcopy(path, engine=engine)).to_frame()
+                    self.assertTrue(got.equals(want))
+
+    def test_junk_numeric_cell_is_nan(self):
+        p = self.dir / "op17122025.csv"
+        p.write_text(OP_CSV.replace("000000000001000,", "-              ,"))
+        for engine in self.engines:
+            with self.subTest(engine=engine):
+                df = read_bhavcopy(p, engine=engine)
+                self.assertEqual(len(df), 3)
+                self.assertEqual(df["OPEN_INT*"].dtype, np.float64)
+                self.assertEqual(df["OPEN_INT*"].tolist()[::2], [20450.0, 0.0])
+                self.assertTrue(np.isnan(df["OPEN_INT*"].iloc[1]))
+                self.assertEqual(df["STR_PRICE"].tolist(), [43500.0, 26000.0, 1600.0])
+
+    def test_unknown_layout_is_empty(self):
+        p = self.dir / "other.csv"
+        p.write_text("A,B\n1,2\n")
+        self.assertTrue(read_bhavcopy(p).empty)
+
+
+if __name__ == "__main__":
+    unittest.main()
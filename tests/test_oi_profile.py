@@ -0,0 +1,114 @@
+import sys
+import os
+import random
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from stockreco.agents.option_analyst_agent import OptionAnalystAgent
+from stockreco.agents.option_reco_agent import OptionReco
+from stockreco.features.derivatives import oi_profile as oip
+from stockreco.ingest.derivatives.option_chain import OptionChain
+from stockreco.ingest.derivatives.provider_base import OptionChainRow
+
+EXP = "30-Dec-2025"
+
+
+def _chain(ce_oi, pe_oi, strikes, ce_chg=None):
+    rows = []
+    for i, k in enumerate(strikes):
+        if ce_oi[i] is not None:
+            rows.append(OptionChainRow(strike=k, expiry=EXP, option_type="CE", ltp=1.0, oi=ce_oi[i],
+                                       oi_change=None if ce_chg is None else ce_chg[i]))
+        if pe_oi[i] is not None:
+            rows.append(OptionChainRow(strike=k, expiry=EXP, option_type="PE", ltp=1.0, oi=pe_oi[i]))
+    rows.append(OptionChainRow(strike=strikes[0], expiry="27-Jan-2026", option_type="CE", ltp=1.0, oi=1e9))
+    random.Random(5).shuffle(rows)
+    return OptionChain.from_rows(rows)
+
+
+def _brute_peaks(oi, window, ratio):
+    out = []
+    for i, v in enumerate(oi):
+        if v is None or v <= 0:
+            continue
+        nb = [oi[j] or 0.0 for j in range(max(0, i - window), min(len(oi), i + window + 1)) if j != i and oi[j] is not None]
+        if v >= max(nb, default=0.0) and v >= ratio * (sum(nb) / max(len(nb), 1)):
+            out.append(i)
+    return out
+
+
+class TestOiProfile(unittest.TestCase):
+    def setUp(self):
+        oip.clear_cache()
+        self.strikes = [1400.0 + 20 * i for i in range(11)]
+        self.ce = [100.0, 200.0, 300.0, 900.0, 400.0, 500.0, 2000.0, 600.0, None, 700.0, 50.0]
+        self.pe = [800.0, 300.0, 2500.0, 400.0, 600.0, 700.0, 100.0, 50.0, 20.0, 10.0, 0.0]
+        self.chg = [0.0, -50.0, 0.0, 300.0, 0.0, 0.0, 300.0, 0.0, None, 0.0, 0.0]
+        self.oc = _chain(self.ce, self.pe, self.strikes, self.chg)
+
+    def test_matches_brute_force(self):
+        for window, ratio in ((1, 1.0), (2, 1.5), (3, 2.0)):
+            prof = oip.compute_oi_profile(self.oc, EXP, window, ratio)
+            for side, oi in (("CE", self.ce), ("PE", self.pe)):
+                want = [self.strikes[i] for i in _brute_peaks(oi, window, ratio)]
+                self.assertEqual(prof.peaks(side).tolist(), want, (side, window))
+
+        prof = oip.compute_oi_profile(self.oc, EXP)
+        pain = [
+            sum((c or 0) * max(K - k, 0) + (p or 0) * max(k - K, 0) for k, c, p in zip(self.strikes, self.ce, self.pe))
+            for K in self.strikes
+        ]
+        self.assertEqual(prof.max_pain, self.strikes[int(np.argmin(pain))])
+        self.assertEqual((prof.call_wall, prof.put_wall), (1520.0, 1440.0))
+        # tie on fresh call writing -> lowest strike
+        self.assertEqual((prof.call_chg_wall, prof.max_ce_chg), (1460.0, 300.0))
+        self.assertIsNone(prof.put_chg_wall)
+        self.assertEqual(prof.chg_at(1520.0, "CE"), 300.0)
+        self.assertEqual(prof.chg_at(1510.0, "CE"), 0.0)
+
+    def test_walls_and_lookups(self):
+        prof = oip.compute_oi_profile(self.oc, EXP)
+        self.assertTrue(prof.is_peak(1520.0, "CE"))
+        self.assertFalse(prof.is_peak(1500.0, "CE"))
+        self.assertFalse(prof.is_peak(1510.0, "CE"))
+        self.assertEqual(prof.walls_above(1465.0, "CE").tolist(), [1520.0, 1580.0])  # 1580 is 3 rungs from 1520
+        self.assertEqual(prof.walls_below(1500.0, "PE")[0], 1440.0)
+        self.assertEqual(prof.oi_at(1520.0, "CE"), 2000.0)
+        d = prof.to_dict()
+        self.assertEqual(d["call_wall"], 1520.0)
+        self.assertEqual(d["ce_peaks"], prof.peaks("CE").tolist())
+
+        empty = oip.compute_oi_profile(self.oc, "nope")
+        self.assertIsNone(empty.max_pain)
+        self.assertEqual(empty.to_dict()["ce_peaks"], [])
+
+    def test_cache_per_key_and_chain(self):
+        a = oip.oi_profile("2025-12-18", "X", self.oc, EXP)
+        self.assertIs(oip.oi_profile("2025-12-18", "X", self.oc, EXP), a)
+        self.assertIsNot(oip.oi_profile("2025-12-19", "X", self.oc, EXP), a)
+        # same key, different chain (e.g. an intraday re-poll) -> recomputed
+        ce = list(self.ce)
+        ce[2] = 5000.0
+        b = oip.oi_profile("2025-12-18", "X", _chain(ce, self.pe, self.strikes), EXP)
+        self.assertIsNot(b, a)
+        self.assertEqual(b.call_wall, 1440.0)
+
+
+class TestAnalystOiRule(unittest.TestCase):
+    def test_wall_and_max_pain_against(self):
+        reco = OptionReco(
+            as_of="2025-12-18", symbol="X", bias="BULLISH", instrument="OPTION", action="BUY", side="CE",
+            strike=1500.0, confidence=0.9, spot=1500.0,
+            diagnostics={"oi_profile": {"max_pain": 1460.0, "ce_peaks": [1440.0, 1520.0], "pe_peaks": []}},
+        )
+        res = OptionAnalystAgent().analyze([reco], "2025-12-18")[0]
+        self.assertEqual(res.final_verdict, "BUY")
+        self.assertIn("OI wall at 1520", res.analysis_summary)
+        self.assertIn("Max pain 1460", res.analysis_summary)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import sys
+import os
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from stockreco.ingest.derivatives.option_chain import OptionChain
+from stockreco.ingest.derivatives.provider_base import OptionChainRow
+
+
+def _rows():
+    return [
+        OptionChainRow(strike=100.0, expiry="30-DEC-2025", option_type="CE", ltp=5.0, oi=2000.0, volume=10.0),
+        OptionChainRow(strike=100.0, expiry="30-DEC-2025", option_type="PE", ltp=4.0, oi=None, volume=900.0),
+        OptionChainRow(strike=110.0, expiry="27/01/2026", option_type="CE", ltp=1.5, oi=500.0, oi_change=-20.0),
+        OptionChainRow(strike=120.0, expiry="bad", option_type="pe", ltp=0.5, oi=50.0),
+    ]
+
+
+class TestOptionChain(unittest.TestCase):
+    def test_list_compat(self):
+        rows = _rows()
+        oc = OptionChain.from_rows(rows)
+        self.assertEqual(len(oc), 4)
+        self.assertTrue(oc)
+        self.assertFalse(OptionChain.empty())
+        # round trip back to rows (lower-case side normalised)
+        rows[3].option_type = "PE"
+        self.assertEqual(list(oc), rows)
+        self.assertEqual(oc, rows)
+        self.assertEqual(oc[1].oi, None)
+        self.assertIs(OptionChain.from_rows(oc), oc)
+
+    def test_masks(self):
+        oc = OptionChain.from_rows(_rows())
+        np.testing.assert_array_equal(oc.by_side("ce"), [True, False, True, False])
+        np.testing.assert_array_equal(oc.by_expiry("30-dec-2025"), [True, True, False, False])
+        np.testing.assert_array_equal(oc.strike_band(100, 110), [True, True, True, False])
+        np.testing.assert_array_equal(oc.min_liquidity(min_oi=500), [True, False, True, False])
+        np.testing.assert_array_equal(oc.min_liquidity(min_oi=500, min_volume=5), [True, False, False, False])
+        np.testing.assert_array_equal(oc.min_liquidity(), [True] * 4)
+
+        dte = oc.days_to_expiry("2025-12-28")
+        self.assertEqual(dte[:3].tolist(), [2.0, 2.0, 30.0])
+        self.assertTrue(np.isnan(dte[3]))
+
+        sub = oc[oc.by_side("CE") & oc.min_liquidity(min_oi=1000)]
+        self.assertEqual([(r.strike, r.option_type) for r in sub], [(100.0, "CE")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import sys
+import os
+import random
+import unittest
+
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from stockreco.agents.option_reco_agent import OptionRecoAgent, OptionRecoConfig, OptionReco
+from stockreco.ingest.derivatives.option_chain import OptionChain
+from stockreco.ingest.derivatives.provider_base import OptionChainRow, UnderlyingSnapshot
+from stockreco.options.greeks import bs_price
+
+AS_OF = "2025-12-17"
+EXPIRIES = ("2025-12-19", "2025-12-30", "2026-01-27")  # 2 / 13 / 41 DTE
+
+
+def _chain(spot: float, step: float, rng: random.Random):
+    rows = []
+    for exp, dte in zip(EXPIRIES, (2, 13, 41)):
+        for j in range(-8, 9):
+            k = round(spot / step) * step + j * step
+            for cp in ("CE", "PE"):
+                ltp = max(0.05, round(bs_price(spot, k, dte / 365, 0.07, 0.25, cp), 2))
+                oi = rng.choice([None, 500.0, 20000.0, 150000.0, 900000.0])
+                rows.append(OptionChainRow(strike=k, expiry=exp, option_type=cp, ltp=ltp, oi=oi,
+                                           volume=rng.choice([None, 800.0, 50000.0])))
+    return rows
+
+
+class TestRecommendBatch(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(11)
+        self.symbols = ["NIFTY", "RELIANCE", "TCS", "SBIN", "ITC", "INFY"]
+        spots = {"NIFTY": 25800.0, "RELIANCE": 1544.0, "TCS": 3210.0, "SBIN": 960.0, "ITC": 402.0, "INFY": 1650.0}
+        steps = {"NIFTY": 50.0, "RELIANCE": 10.0, "TCS": 20.0, "SBIN": 5.0, "ITC": 2.5, "INFY": 10.0}
+        self.und = {s: UnderlyingSnapshot(symbol=s, spot=spots[s], as_of_iso=AS_OF) for s in self.symbols}
+        self.chains = {s: _chain(spots[s], steps[s], rng) for s in self.symbols}
+        self.chains["ITC"] = OptionChain.from_rows(self.chains["ITC"])  # either chain type works
+        self.signals = {
+            "NIFTY": {"buy_win": 1, "sell_win": 0, "direction_score": 0.4, "atr_points": 220.0},
+            "RELIANCE": {"buy_win": 0, "sell_win": 1, "direction_score": -0.3, "atr_points": 25.0, "pcr": 0.4},
+            "TCS": {"buy_win": 0, "sell_win": 0, "direction_score": 0.01},  # no edge -> HOLD
+            "SBIN": {"buy_win": 1, "sell_win": 0, "direction_score": 0.2, "atr_points": 14.0, "smart_money_score": -0.5},
+            "ITC": {"buy_win": 0, "sell_win": 1, "direction_score": -0.6, "atr_points": 6.0},
+            "INFY": {"buy_win": 1, "sell_win": 1, "direction_score": 0.02, "buy_soft": 0.3, "sell_soft": 0.25, "atr_pct": 0.02},
+        }
+
+    def _check(self, cfg: OptionRecoConfig):
+        agent = OptionRecoAgent(cfg)
+        single = [agent.recommend(AS_OF, s, dict(self.signals[s]), self.und[s], self.chains[s]) for s in self.symbols]
+        batch = agent.recommend_batch(AS_OF, {s: dict(self.signals[s]) for s in self.symbols}, self.und, self.chains)
+        self.assertEqual(len(batch), len(single))
+        for a, b in zip(single, batch):
+            self.assertEqual(a.to_dict(), b.to_dict(), a.symbol)
+        return batch
+
+    def test_matches_per_symbol(self):
+        for mode in ("strict", "opportunistic", "speculative"):
+            batch = self._check(OptionRecoConfig(mode=mode, scenario_grid=False))
+            self.assertGreaterEqual(sum(r.action == "BUY" for r in batch), 3)
+        # relaxed-liquidity fallback and "no suitable options" paths
+        self._check(OptionRecoConfig(min_oi=200000.0, scenario_grid=False))
+        self._check(OptionRecoConfig(min_oi=5e6, scenario_grid=False))
+
+    def test_dataframe_signals_and_errors(self):
+        agent = OptionRecoAgent(OptionRecoConfig(scenario_grid=False))
+        df = pd.DataFrame([dict(symbol=s, **self.signals[s]) for s in self.symbols]).fillna(0)
+        und = dict(self.und, SBIN=UnderlyingSnapshot(symbol="SBIN", spot=0.0, as_of_iso=AS_OF))
+        with self.assertRaises(RuntimeError):
+            agent.recommend_batch(AS_OF, df, und, self.chains)
+
+        hold = lambda sym, e: OptionReco(as_of=AS_OF, symbol=sym, bias="NEUTRAL", instrument="NONE", action="HOLD", rationale=[str(e)])
+        out = agent.recommend_batch(AS_OF, df, und, self.chains, on_error=hold)
+        self.assertEqual([r.symbol for r in out], self.symbols)
+        self.assertEqual(out[3].rationale, ["Underlying spot missing/invalid"])
+        ref = agent.recommend(AS_OF, "NIFTY", self.signals["NIFTY"], self.und["NIFTY"], self.chains["NIFTY"])
+        self.assertEqual(out[0].to_dict(), ref.to_dict())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import sys
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from stockreco.ingest.derivatives.bhav_cache import build_chain_frame
+from stockreco.ingest.derivatives.chain_index import canonical_underlying
+from stockreco.ingest.derivatives.pcr import stream_pcr, pcr_history
+
+OP_CSV = """INSTRUMENT,SYMBOL    ,EXP_DATE  ,STR_PRICE  ,OPT_TYPE,CLOSE_PRICE,OPEN_INT*      ,TRD_QTY
+OPTIDX    ,NIFTY     ,23/12/2025,00026000.00,CE      ,00000120.00,000000000001000,10
+OPTIDX    ,NIFTY     ,23/12/2025,00026000.00,PE      ,00000095.00,000000000002000,10
+OPTIDX    ,NIFTY 50  ,30/12/2025,00026000.00,CE      ,00000150.00,000000000000500,10
+OPTIDX    ,NIFTY     ,30/12/2025,00026000.00,PE      ,00000130.00,000000000000250,10
+OPTSTK    ,INFY      ,30/12/2025,00001600.00,PE      ,00000022.00,000000000000300,5
+* - OPEN_INT as available in the trading system at the end of trading hours.
+"""
+
+FO_CSV = """CONTRACT_D,CLOSE_PRIC,SETTLEMENT,OI_NO_CON,TRADED_QUA
+FUTIDXNIFTY30-DEC-2025,26100,26100,500,1000
+OPTIDXNIFTY30-DEC-2025CE26000,120,120,999,1
+OPTSTKTCS30-DEC-2025CE3200,0,41.5,70,0
+OPTSTKTCS30-DEC-2025PE3200,0,20,35,0
+"""
+
+
+class TestPcrStream(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.base = Path(self._tmp.name)
+        self.day = self.base / "2025-12-16"
+        self.day.mkdir()
+        self.op = self.day / "op16122025.csv"
+        self.fo = self.day / "fo161225.csv"
+        self.op.write_text(OP_CSV)
+        self.fo.write_text(FO_CSV)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_chunk_size_does_not_change_result(self):
+        # chunks of 2 rows force codes to be carried across chunks
+        small = stream_pcr(self.op, self.fo, chunksize=2)
+        big = stream_pcr(self.op, self.fo, chunksize=10_000)
+        self.assertEqual(small, big)
+
+        # NIFTY from op only (fo NIFTY ignored), NIFTY 50 folded in; TCS only in fo
+        self.assertEqual(small.pcr(), {"INFY": 0.0, "NIFTY": 1.5, "TCS": 0.5})
+        self.assertEqual(small.pcr_by_expiry()["NIFTY"], {"2025-12-23": 2.0, "2025-12-30": 0.5})
+
+    def test_unpriced_rows_skipped_like_the_chain(self):
+        # untraded strikes: zero close and no settle -> not in the chain, so not in the PCR
+        self.op.write_text(OP_CSV.replace(
+            "OPTSTK    ,INFY ",
+            "OPTIDX    ,NIFTY     ,30/12/2025,00027000.00,CE      ,00000000.00,000000000009000,0\n"
+            "OPTSTK    ,INFY      ,30/12/2025,00001700.00,CE      ,00000000.00,000000000000900,0\n"
+            "OPTSTK    ,INFY ",
+        ))
+        self.fo.write_text(FO_CSV + "OPTSTKTCS30-DEC-2025PE3300,0,0,5000,0\n")
+        st = stream_pcr(self.op, self.fo)
+        self.assertEqual(st.pcr(), {"INFY": 0.0, "NIFTY": 1.5, "TCS": 0.5})
+
+        chain = build_chain_frame({"op": self.op, "fo": self.fo})
+        und = chain["underlying"].map(canonical_underlying)
+        calls = chain["oi"][chain["is_call"]].groupby(und).sum()
+        puts = chain["oi"][~chain["is_call"]].groupby(und).sum()
+        c, p = st.totals()
+        self.assertEqual(c, {u: calls.get(u, 0.0) for u in c})
+        self.assertEqual({u: puts.get(u, 0.0) for u in p}, p)
+
+    def test_history(self):
+        h = pcr_history(self.base, chunksize=3)
+        self.assertEqual(list(h["underlying"]), ["INFY", "NIFTY", "TCS"])
+        self.assertEqual(h.loc[h["underlying"] == "NIFTY", "put_oi"].item(), 2250.0)
+        self.assertTrue(pcr_history(self.base, start="2025-12-17").empty)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import sys
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from stockreco.agents import option_reviewer
+from stockreco.agents.option_reviewer import OptionReviewer, ReviewerConfig, review_option_recommendations
+from stockreco.options.greeks import bs_greeks
+from stockreco.options.portfolio import aggregate, betas_from_ohlcv
+
+
+def _reco(symbol, side, spot, strike, entry, confidence=0.5, iv=0.25, dte=10):
+    return {
+        "symbol": symbol, "action": "BUY", "side": side, "spot": spot, "strike": strike,
+        "iv": iv, "dte": dte, "entry_price": entry, "confidence": confidence,
+        "theta_per_day": 0.0, "expiry": "2025-12-30",
+    }
+
+
+class TestPortfolioGreeks(unittest.TestCase):
+    def test_matches_scalar_greeks(self):
+        recos = [
+            _reco("RELIANCE", "CE", 1500.0, 1520.0, 20.0),
+            _reco("RELIANCE", "PE", 1500.0, 1480.0, 18.0, iv=25.0),  # percent IV is normalised
+            _reco("TCS", "CE", 3200.0, 3250.0, 40.0),
+            {"symbol": "INFY", "action": "HOLD"},
+        ]
+        pf = aggregate(recos, betas={"RELIANCE": 1.2}, budget_per_trade=100000.0)
+        self.assertEqual(len(pf), 3)
+        self.assertEqual(pf.skipped, 1)
+
+        want = {"delta": 0.0, "beta_delta": 0.0, "vega_1pt": 0.0, "theta_day": 0.0}
+        for x, beta in zip(recos[:3], (1.2, 1.2, 1.0)):
+            g = bs_greeks(x["spot"], x["strike"], x["dte"] / 365, 0.07, 0.25, x["side"])
+            q = 100000.0 / x["entry_price"]
+            want["delta"] += g.delta * x["spot"] * q
+            want["beta_delta"] += beta * g.delta * x["spot"] * q
+            want["vega_1pt"] += g.vega / 100 * q
+            want["theta_day"] += g.theta_per_day * q
+        for k, v in want.items():
+            self.assertAlmostEqual(pf.total[k], v, delta=1e-6 * abs(v) + 1e-6, msg=k)
+
+        by = pf.by_underlying
+        self.assertEqual(sorted(by.index), ["RELIANCE", "TCS"])
+        self.assertAlmostEqual(by["premium"].sum(), 300000.0)
+        self.assertAlmostEqual(by.loc["RELIANCE", "beta"], 1.2)
+        d = pf.to_dict()
+        self.assertEqual(d["positions"], 3)
+        self.assertEqual({r["symbol"] for r in d["by_underlying"]}, {"RELIANCE", "TCS"})
+
+    def test_explicit_qty_and_empty(self):
+        recos = [_reco("TCS", "CE", 3200.0, 3250.0, 40.0)]
+        a = aggregate(recos, qty={"TCS": 175})
+        b = aggregate(recos, budget_per_trade=175 * 40.0)
+        self.assertAlmostEqual(a.total["delta"], b.total["delta"])
+        empty = aggregate([{"symbol": "X", "action": "HOLD"}])
+        self.assertEqual(len(empty), 0)
+        self.assertEqual(empty.total["delta"], 0.0)
+        self.assertEqual(empty.to_dict()["by_underlying"], [])
+
+    def test_betas_from_ohlcv(self):
+        rng = np.random.default_rng(3)
+        dates = pd.date_range("2025-01-01", periods=200).strftime("%Y-%m-%d")
+        mkt = rng.normal(0, 0.01, 200)
+        rows = []
+        for tk, ret in (("^NSEI", mkt), ("AAA.NS", 1.5 * mkt + rng.normal(0, 0.002, 200))):
+            px = 100 * np.cumprod(1 + ret)
+            rows += [{"date": d, "ticker": tk, "adj_close": p} for d, p in zip(dates, px)]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ohlcv.parquet")
+            pd.DataFrame(rows).to_parquet(path)
+            betas = betas_from_ohlcv(path)
+        self.assertAlmostEqual(betas["AAA"], 1.5, delta=0.05)
+        self.assertEqual(betas["NIFTY"], 1.0)
+        self.assertEqual(betas_from_ohlcv("/nonexistent.parquet"), {})
+
+
+class TestReviewerPortfolioCaps(unittest.TestCase):
+    def test_default_config_has_no_caps(self):
+        # a big BUY day: the default reviewer approves exactly what the per-reco rules approve
+        recos = [_reco(f"S{i}", "CE", 1000.0, 1000.0, 20.0, confidence=0.4 + i / 1000) for i in range(120)]
+        for mode in ("strict", "opportunistic", "speculative"):
+            with self.subTest(mode=mode):
+                approved, rejected = OptionReviewer(ReviewerConfig(mode=mode)).review(recos)
+                self.assertEqual(approved, recos)
+                self.assertEqual(rejected, [])
+                out = review_option_recommendations(recos, mode=mode)
+                self.assertEqual(out["final"], recos)
+                self.assertEqual(out["portfolio"]["positions"], 120)
+
+    def test_cap_drops_lowest_confidence(self):
+        recos = [_reco(f"S{i}", "CE", 1000.0, 1000.0, 20.0, confidence=0.4 + i / 100) for i in range(5)]
+        one = aggregate(recos[:1]).total["vega_1pt"]
+        cfg = ReviewerConfig(mode="strict", max_net_beta_delta=None, max_net_theta=None, max_net_vega=3.5 * one)
+        approved, rejected = OptionReviewer(cfg).review(recos)
+        self.assertEqual([r["symbol"] for r in approved], ["S2", "S3", "S4"])
+        self.assertEqual({r["symbol"] for r in rejected}, {"S0", "S1"})
+        self.assertTrue(all(r["reason"].startswith("Portfolio cap: net vega_1pt") for r in rejected))
+
+    def test_hedge_is_not_capped(self):
+        recos = [
+            _reco("A", "CE", 1000.0, 1000.0, 20.0, confidence=0.6),
+            _reco("B", "PE", 1000.0, 1000.0, 20.0, confidence=0.5),
+        ]
+        one = abs(aggregate(recos[:1]).total["delta"])
+        cfg = ReviewerConfig(mode="strict", max_net_vega=None, max_net_theta=None, max_net_beta_delta=1.1 * one)
+        approved, _ = OptionReviewer(cfg).review(recos)
+        self.assertEqual(len(approved), 2)
+
+    def test_report_portfolio_priced_once(self):
+        recos = [_reco(f"S{i}", "CE", 1000.0, 1000.0, 20.0, confidence=0.4 + i / 100) for i in range(5)]
+        one = aggregate(recos[:1]).total["vega_1pt"]
+        cfg = ReviewerConfig(mode="strict", max_net_beta_delta=None, max_net_theta=None, max_net_vega=3.5 * one)
+        approved, rejected, pf = OptionReviewer(cfg)._review(recos, None, None)
+        want = aggregate(approved)
+        self.assertEqual(pf.to_dict(), want.to_dict())
+        self.assertEqual(pf.positions["idx"].tolist(), want.positions["idx"].tolist())
+
+        with mock.patch.object(option_reviewer, "aggregate", wraps=aggregate) as agg:
+            out = review_option_recommendations(recos)
+        self.assertEqual(agg.call_count, 1)
+        self.assertEqual(out["portfolio"], aggregate(out["final"]).to_dict())
+
+    def test_unpriceable_recos_untouched(self):
+        reco = _reco("NIFTY", "CE", None, 24000.0, 100.0)
+        approved, rejected = OptionReviewer(ReviewerConfig(max_net_vega=1.0)).review([reco])
+        self.assertEqual(len(approved), 1)
+        out = review_option_recommendations([reco])
+        self.assertEqual(out["portfolio"]["positions"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
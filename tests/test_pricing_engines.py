@@ -0,0 +1,97 @@
+import sys
+import os
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from stockreco.agents import bs_pricing
+from stockreco.options import engine
+from stockreco.options.engine import ENGINES, get_engine, greeks_one, implied_vol_one, set_engine
+
+# per engine: abs tolerance on price, relative on Greeks, abs on IV
+TOL = {
+    "scalar": (1e-12, 1e-12, 1e-9),
+    "numpy": (1e-9, 1e-9, 1e-7),
+    "lut": (1e-6, 1e-6, 1e-6),
+    "tree": (2e-3, 3e-2, 1e-4),
+}
+
+S = 25860.0
+K, T = np.meshgrid(np.arange(23000.0, 29001.0, 500.0), [7 / 365, 30 / 365, 0.5], indexing="ij")
+SIGMA = 0.16
+
+
+class TestPricingEngines(unittest.TestCase):
+    def setUp(self):
+        self.ref = get_engine("scalar")
+
+    def tearDown(self):
+        set_engine("numpy")
+
+    def test_consistent_with_reference(self):
+        for name in ENGINES:
+            eng = get_engine(name)
+            p_tol, g_tol, iv_tol = TOL.get(name, (1e-3, 5e-2, 1e-3))
+            # calls only: no dividends, so early exercise never pays and every engine is comparable
+            with self.subTest(engine=name):
+                ref = self.ref.greeks(S, K, T, 0.07, SIGMA, "CE")
+                got = eng.greeks(S, K, T, 0.07, SIGMA, "CE")
+                np.testing.assert_allclose(eng.price(S, K, T, 0.07, SIGMA, "CE"), ref.price, atol=p_tol * S)
+                np.testing.assert_allclose(got.price, ref.price, atol=p_tol * S)
+                for f in ("delta", "vega", "theta_per_day", "rho"):
+                    scale = np.abs(getattr(ref, f)).max()
+                    np.testing.assert_allclose(getattr(got, f), getattr(ref, f), atol=g_tol * scale, err_msg=f)
+
+                # OTM with a price worth quoting; deep ITM IVs are ill-conditioned for everyone
+                quoted = (ref.price >= 0.05) & (K >= S)
+                iv = eng.implied_vol(ref.price, S, K, T, 0.07, "CE")
+                np.testing.assert_allclose(iv[quoted], SIGMA, atol=iv_tol)
+
+    def test_invalid_rows(self):
+        for name in ENGINES:
+            eng = get_engine(name)
+            with self.subTest(engine=name):
+                px = eng.price(100.0, 100.0, [0.5, 0.0, 0.5], 0.07, [0.2, 0.2, 0.0], "PE")
+                self.assertEqual(px[1:].tolist(), [0.0, 0.0])
+                g = eng.greeks(100.0, 100.0, [0.5, 0.0], 0.07, 0.2, "PE")
+                self.assertEqual(g.valid.tolist(), [True, False])
+                self.assertTrue(np.isnan(g.delta[1]))
+                self.assertTrue(np.isnan(eng.implied_vol([np.nan, 5.0], 100.0, 100.0, [0.5, 0.0], 0.07, "PE")).all())
+
+    def test_puts_early_exercise(self):
+        eu = get_engine("numpy").price(100.0, 110.0, 0.5, 0.07, 0.25, "PE")
+        self.assertGreater(get_engine("tree").price(100.0, 110.0, 0.5, 0.07, 0.25, "PE"), eu)
+        self.assertFalse(get_engine("binomial").european)
+
+    def test_registry_and_default(self):
+        self.assertIs(get_engine("bs"), get_engine("numpy"))
+        with self.assertRaises(ValueError):
+            get_engine("quantlib")
+
+        set_engine("lut")
+        self.assertEqual(engine.default_engine_name(), "lut")
+        self.assertIs(get_engine(), get_engine("lut"))
+        self.assertAlmostEqual(implied_vol_one(7.428489286378529, 100, 100, 0.5, 0.07, "CE"), 0.2, places=6)
+        self.assertIsNone(implied_vol_one(0.0, 100, 100, 0.5, 0.07, "CE"))
+        self.assertAlmostEqual(bs_pricing.bs_price(100, 100, 0.07, 0.5, 0.2, "CE"), 7.428489286378529, places=6)
+        self.assertIsNone(greeks_one(100, 100, 0.0, 0.07, 0.2, "CE").delta)
+
+        class Flat:
+            name, european = "flat", True
+            def price(self, S, K, T, r, sigma, cp):
+                return np.full(np.broadcast_shapes(np.shape(S), np.shape(K)), 1.0)
+            greeks = implied_vol = None
+
+        engine.register_engine("flat", Flat)
+        try:
+            set_engine("flat")
+            self.assertEqual(bs_pricing.bs_price(100, 90, 0.07, 0.5, 0.2, "CE"), 1.0)
+        finally:
+            ENGINES.pop("flat")
+            engine._INSTANCES.pop("flat", None)
+
+
+if __name__ == "__main__":
+    unittest.main()
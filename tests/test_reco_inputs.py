@@ -0,0 +1,47 @@
+import sys
+import os
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from stockreco.agents.option_reco_agent import OptionReco
+from stockreco.options.reco_inputs import horizon_days, iv_fraction, reco_inputs, target_premiums
+
+
+def _buy(**kw):
+    base = dict(
+        as_of="2025-12-16", symbol="NIFTY", bias="BULLISH", instrument="OPTION", action="BUY", side="CE",
+        expiry="30-Dec-2025", strike=26000.0, entry_price=200.0, sl_premium=130.0,
+        targets=[{"price": 300.0}, {"premium": 400.0}], spot=26000.0, ltp=200.0, iv=13.0, dte=14,
+        sell_by="2025-12-21",
+    )
+    base.update(kw)
+    return OptionReco(**base)
+
+
+class TestRecoInputs(unittest.TestCase):
+    def test_helpers(self):
+        self.assertEqual(iv_fraction(13.0), 0.13)
+        self.assertEqual(iv_fraction(0.13), 0.13)
+        np.testing.assert_allclose(iv_fraction(np.array([0.2, 25.0])), [0.2, 0.25])
+        self.assertEqual(horizon_days("2025-12-16", "2025-12-21"), 5)
+        self.assertEqual(horizon_days("2025-12-16", "2025-12-10"), 0)
+        self.assertEqual(horizon_days("2025-12-16", None), 0)
+        self.assertEqual(target_premiums([{"price": 1.0}, {"premium": 2.0}]), (1.0, 2.0))
+        self.assertIsNone(target_premiums([{"price": 1.0}, {}]))
+        self.assertIsNone(target_premiums([{"price": 1.0}]))
+
+    def test_reco_inputs(self):
+        x = reco_inputs(_buy())
+        self.assertEqual((x.t1, x.t2, x.sl, x.iv, x.horizon_days), (300.0, 400.0, 130.0, 0.13, 5))
+        self.assertAlmostEqual(x.T, 14 / 365)
+        self.assertEqual(reco_inputs(_buy(iv=None, ltp=None)).iv, 0.0)
+        self.assertIsNone(reco_inputs(_buy(action="HOLD")))
+        self.assertIsNone(reco_inputs(_buy(sl_premium=None)))
+        self.assertIsNone(reco_inputs(_buy(targets=[{"price": 300.0}])))
+
+
+if __name__ == "__main__":
+    unittest.main()
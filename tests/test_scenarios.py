@@ -0,0 +1,67 @@
+import sys
+import os
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from stockreco.agents.option_reco_agent import OptionReco
+from stockreco.options.greeks import bs_price
+from stockreco.options.scenarios import analyze, build_grid, evaluate_reco
+
+SPOT, K, T, IV, ATR = 26000.0, 26000.0, 14 / 365, 0.13, 250.0
+
+
+class TestScenarios(unittest.TestCase):
+    def setUp(self):
+        self.entry = bs_price(SPOT, K, T, 0.07, IV, "CE")
+
+    def test_grid_prices(self):
+        g = build_grid(SPOT, K, T, 0.07, IV, "CE", self.entry, ATR, 5)
+        self.assertEqual(g.premium.shape, (6, 5, 49))
+        self.assertAlmostEqual(g.premium[0, 2, 24], self.entry, places=8)
+        self.assertAlmostEqual(g.pnl[0, 2, 24], 0.0, places=8)
+        # calls gain with spot and IV, lose with time
+        self.assertTrue((np.diff(g.premium, axis=2) > 0).all())
+        self.assertTrue((np.diff(g.premium, axis=1) > 0).all())
+        self.assertTrue((np.diff(g.premium[:, 2, 24]) < 0).all())
+
+    def test_breakeven_at_expiry(self):
+        for side, be in (("CE", K + self.entry), ("PE", K - self.entry)):
+            g = build_grid(SPOT, K, T, 0.07, IV, side, self.entry, ATR, 14)
+            self.assertAlmostEqual(g.breakeven()[-1, 2], be, delta=0.5)
+
+    def test_hit_odds(self):
+        e = self.entry
+        g = build_grid(SPOT, K, T, 0.07, IV, "CE", e, ATR, 5)
+        s = analyze(g, t1=1.5 * e, t2=2.0 * e, sl=0.65 * e)
+        self.assertEqual(s.horizon_days, 5)
+        self.assertTrue(0 < s.p_t2 < s.p_t1 < 1)
+        self.assertLessEqual(s.p_t1 + s.p_sl, 1.0 + 1e-12)
+        # holding a fairly priced option loses theta on average; exits cut the tail
+        self.assertLess(s.expected_pnl_hold, 0)
+        self.assertGreater(s.breakeven, SPOT)
+
+        # a wider stop is hit less often
+        wide = analyze(g, t1=1.5 * e, t2=2.0 * e, sl=0.4 * e)
+        self.assertLess(wide.p_sl, s.p_sl)
+
+        intraday = analyze(build_grid(SPOT, K, T, 0.07, IV, "CE", e, ATR, 0), t1=1.5 * e, t2=2.0 * e, sl=0.65 * e)
+        self.assertLess(intraday.p_t1, s.p_t1)
+
+    def test_evaluate_reco(self):
+        reco = OptionReco(
+            as_of="2025-12-16", symbol="NIFTY", bias="BULLISH", instrument="OPTION", action="BUY", side="CE",
+            expiry="30-Dec-2025", strike=K, entry_price=self.entry, sl_premium=0.65 * self.entry,
+            targets=[{"price": 1.5 * self.entry}, {"price": 2.0 * self.entry}],
+            spot=SPOT, iv=IV, dte=14, sell_by="2025-12-19",
+        )
+        s = evaluate_reco(reco, ATR)
+        self.assertEqual(s.horizon_days, 3)
+        self.assertEqual(set(s.to_dict()), {"horizon_days", "expected_pnl", "expected_pnl_hold", "p_t1", "p_t2", "p_sl", "breakeven", "pnl_worst", "pnl_best"})
+        self.assertIsNone(evaluate_reco(OptionReco("2025-12-16", "NIFTY", "NEUTRAL", "NONE", "HOLD"), ATR))
+
+
+if __name__ == "__main__":
+    unittest.main()
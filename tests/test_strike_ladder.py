@@ -0,0 +1,72 @@
+import sys
+import os
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from stockreco.ingest.derivatives.option_chain import OptionChain
+from stockreco.ingest.derivatives.provider_base import OptionChainRow
+from stockreco.ingest.derivatives.strike_ladder import StrikeLadder
+
+
+def _rows():
+    rows = []
+    # shuffled strike order, an extra far strike, and one CE-only rung
+    for k in (1520.0, 1480.0, 1500.0, 1460.0, 1540.0, 1600.0):
+        rows.append(OptionChainRow(strike=k, expiry="30-Dec-2025", option_type="CE", ltp=1.0, oi=k, oi_change=k - 1500.0))
+        if k != 1600.0:
+            rows.append(OptionChainRow(strike=k, expiry="30-Dec-2025", option_type="PE", ltp=1.0, oi=-k, oi_change=1500.0 - k))
+    rows.append(OptionChainRow(strike=1500.0, expiry="27-Jan-2026", option_type="CE", ltp=2.0))
+    return rows
+
+
+class TestStrikeLadder(unittest.TestCase):
+    def setUp(self):
+        self.oc = OptionChain.from_rows(_rows())
+        self.lad = self.oc.ladder("30-Dec-2025")
+
+    def test_sorted_step_and_cache(self):
+        np.testing.assert_array_equal(self.lad.strikes, [1460, 1480, 1500, 1520, 1540, 1600])
+        self.assertEqual(self.lad.step, 20.0)
+        self.assertIs(self.oc.ladder("30-Dec-2025"), self.lad)
+        self.assertEqual(len(self.oc.ladder("27-Jan-2026")), 1)
+        self.assertEqual(self.oc.ladder("27-Jan-2026").step, 1.0)
+        self.assertEqual(len(self.oc.ladder("nope")), 0)
+
+    def test_atm_matches_linear_scan(self):
+        ks = self.lad.strikes.tolist()
+        for spot in (1400.0, 1459.9, 1490.0, 1491.0, 1509.99, 1570.0, 1571.0, 1700.0):
+            want = min(ks, key=lambda k: abs(k - spot))  # first (lower) strike wins a tie
+            self.assertEqual(self.lad.atm(spot), want, spot)
+        self.assertIsNone(StrikeLadder.from_strikes([]).atm(100.0))
+        self.assertIsNone(self.lad.atm(float("nan")))
+
+    def test_index_neighbors_and_pairs(self):
+        self.assertEqual(self.lad.index(1500.0000001), 2)
+        self.assertIsNone(self.lad.index(1510.0))
+        below, above = self.lad.neighbors(1500.0, 2)
+        self.assertEqual(below.tolist(), [1460.0, 1480.0])
+        self.assertEqual(above.tolist(), [1520.0, 1540.0])
+        below, above = self.lad.neighbors(1510.0)
+        self.assertEqual((below.tolist(), above.tolist()), ([1500.0], [1520.0]))
+
+        ce, pe = self.lad.pair(1520.0)
+        self.assertTrue(self.oc.is_call[ce] and not self.oc.is_call[pe])
+        self.assertEqual((self.oc.strike[ce], self.oc.strike[pe]), (1520.0, 1520.0))
+        self.assertEqual(self.lad.pair(1600.0)[1], None)
+        self.assertIsNone(self.lad.row(1510.0, "CE"))
+
+        oi = self.lad.column(self.oc.oi, "PE")
+        self.assertTrue(np.isnan(oi[-1]))
+        np.testing.assert_array_equal(oi[:-1], -self.lad.strikes[:-1])
+
+    def test_duplicate_strike_keeps_first_row(self):
+        lad = StrikeLadder.build([100.0, 100.0, 105.0], [True, True, False])
+        self.assertEqual(lad.row(100.0, "CE"), 0)
+        self.assertEqual(lad.row(105.0, "PE"), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import sys
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from stockreco.ingest.derivatives.bhav_cache import HAS_PARQUET
+from stockreco.ingest.derivatives.warehouse import DerivativesWarehouse
+
+HEADER = "INSTRUMENT,SYMBOL    ,EXP_DATE  ,STR_PRICE  ,OPT_TYPE,OPEN_PRICE,HI_PRICE,LO_PRICE,CLOSE_PRICE,OPEN_INT*      ,TRD_QTY\n"
+
+
+def _op(ce_close, pe_close):
+    return HEADER + (
+        f"OPTIDX    ,NIFTY     ,30/12/2025,00026000.00,CE      ,100,{ce_close + 10},{ce_close - 10},{ce_close},000000000001000,10\n"
+        f"OPTIDX    ,NIFTY 50  ,30/12/2025,00026000.00,PE      ,100,{pe_close + 10},{pe_close - 10},{pe_close},000000000002000,10\n"
+        "OPTSTK    ,INFY      ,30/12/2025,00001600.00,CE      ,20,25,18,22,000000000000300,5\n"
+        "* - OPEN_INT as available in the trading system at the end of trading hours.\n"
+    )
+
+
+class TestDerivativesWarehouse(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        base = self.root / "data" / "derivatives"
+        for d, ce, pe in (("2025-12-15", 120, 90), ("2025-12-16", 150, 70), ("2025-12-17", 130, 80)):
+            (base / d).mkdir(parents=True)
+            (base / d / f"op{d[8:10]}{d[5:7]}{d[:4]}.csv").write_text(_op(ce, pe))
+        self.wh = DerivativesWarehouse(self.root)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_premium_path_over_date_range(self):
+        self.wh.sync()
+        path = self.wh.premium_path("NIFTY", "30-DEC-2025", 26000, "CE", start="2025-12-16", end="2025-12-17")
+        self.assertEqual(path["date"].tolist(), ["2025-12-16", "2025-12-17"])
+        self.assertEqual(path["ltp"].tolist(), [150.0, 130.0])
+        self.assertEqual(path["high"].tolist(), [160.0, 140.0])
+
+    def test_contract_accepts_any_expiry_spelling_and_index_alias(self):
+        row = self.wh.contract("2025-12-15", "NIFTY50", "30/12/2025", 26000, "pe")
+        self.assertIsNotNone(row)
+        self.assertEqual(row["underlying"], "NIFTY")
+        self.assertEqual(row["expiry"], "2025-12-30")
+        self.assertEqual(row["ltp"], 90.0)
+        self.assertIsNone(self.wh.contract("2025-12-15", "NIFTY", "2025-12-30", 26100, "PE"))
+
+    @unittest.skipUnless(HAS_PARQUET, "pyarrow not installed")
+    def test_sync_is_incremental(self):
+        self.assertEqual(self.wh.sync(), ["2025-12-15", "2025-12-16", "2025-12-17"])
+        self.assertTrue((self.wh.root / "date=2025-12-16" / "part-0.parquet").exists())
+        self.assertEqual(self.wh.sync(), [])
+
+        day = self.root / "data" / "derivatives" / "2025-12-16"
+        (day / "op16122025.csv").write_text(_op(155, 70))
+        self.assertEqual(self.wh.sync(), ["2025-12-16"])
+        self.assertEqual(self.wh.contract("2025-12-16", "NIFTY", "2025-12-30", 26000, "CE")["ltp"], 155.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import sys
+import os
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from stockreco.ingest.derivatives import context as dctx
+from stockreco.ingest.derivatives.archive import ZipMember, list_sources
+from stockreco.ingest.derivatives.bhav_cache import build_chain_frame, day_sources
+from stockreco.ingest.derivatives.pcr import day_pcr
+from stockreco.ingest.derivatives.store import DerivativesDataStore
+
+OP_CSV = """INSTRUMENT,SYMBOL    ,EXP_DATE  ,STR_PRICE  ,OPT_TYPE,CLOSE_PRICE,OPEN_INT*      ,TRD_QTY
+OPTIDX    ,NIFTY     ,30/12/2025,00026000.00,CE      ,00000120.00,000000000001000,10
+OPTIDX    ,NIFTY     ,30/12/2025,00026000.00,PE      ,00000095.00,000000000002000,10
+* - OPEN_INT as available in the trading system at the end of trading hours.
+"""
+
+COMBINEOI = """Date, ISIN, Scrip Name, NSE Symbol, MWPL, Open Interest, Future Equivalent Open Interest, Limit for Next Day
+16-DEC-2025,INE545U01014,BANDHAN BANK LIMITED,BANDHANBNK,142752962,183837600,115245392.959952,No Fresh Positions
+16-DEC-2025,INE117A01022,ABB INDIA LIMITED,ABB,7946564,4001375,2386331.6259625,5162904
+"""
+
+NCLOI = """Date, ISIN, Scrip Name, NSE Symbol, MWPL, NCL Open Interest ,NCL FutEq OI
+16-DEC-2025,INE117A01022,ABB INDIA LIMITED,ABB,7946564,3932125,2264727.8559625
+"""
+
+CLI_LIMIT = """SYMBOL,CLIENT_LIMIT,EXCHANGE
+ABB,794625,BSE
+ABB,794625,NSE
+ZYDUSLIFE,3261600,NSE
+"""
+
+
+def _zip(path: Path, members: dict):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, text in members.items():
+            zf.writestr(name, text)
+
+
+class TestZipSources(unittest.TestCase):
+    def setUp(self):
+        dctx.clear_context_cache()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.base = Path(self._tmp.name)
+        self.day = self.base / "2025-12-16"
+        self.day.mkdir()
+        _zip(self.day / "fo16122025.zip", {"op16122025.csv": OP_CSV, "fohelp.txt": "help"})
+        _zip(self.day / "combineoi_16122025.zip", {"combineoi_16122025.csv": COMBINEOI})
+        _zip(self.day / "ncloi_16122025.zip", {"ncloi_16122025.csv": NCLOI})
+        (self.day / "oi_cli_limit_16-DEC-2025.lst").write_text(CLI_LIMIT)
+
+    def tearDown(self):
+        dctx.clear_context_cache()
+        self._tmp.cleanup()
+
+    def test_bhavcopy_read_from_archive_matches_extracted(self):
+        src = day_sources(self.day)
+        self.assertIsInstance(src["op"], ZipMember)
+        from_zip = build_chain_frame(src)
+        self.assertEqual(len(from_zip), 2)
+
+        (self.day / "op16122025.csv").write_text(OP_CSV)
+        src = day_sources(self.day)
+        self.assertEqual(src["op"], self.day / "op16122025.csv")  # extracted copy wins, no duplicate
+        self.assertEqual([s.name for s in list_sources(self.day)].count("op16122025.csv"), 1)
+        self.assertTrue(build_chain_frame(src).equals(from_zip))
+        self.assertEqual(day_pcr(self.day).pcr(), {"NIFTY": 2.0})
+
+    def test_member_handle_closes_archive(self):
+        m = ZipMember(self.day / "combineoi_16122025.zip", "combineoi_16122025.csv")
+        with m.open("rb") as f:
+            self.assertEqual(f.readline().split(b",")[0], b"Date")
+            zf = f._zf
+            self.assertIsNotNone(zf.fp)
+        self.assertTrue(f.closed)
+        self.assertIsNone(zf.fp)  # archive fd released with the member handle
+        with self.assertRaises(KeyError):
+            ZipMember(m.archive, "missing.csv").open()
+
+    def test_store_exposes_combined_oi_and_client_limits(self):
+        store = DerivativesDataStore(str(self.base))
+        oi = store.get_combined_oi("2025-12-16")
+        self.assertTrue(oi["BANDHANBNK"]["no_fresh_positions"])
+        self.assertIsNone(oi["BANDHANBNK"]["limit_next_day"])
+        self.assertEqual(oi["ABB"]["limit_next_day"], 5162904)
+        self.assertAlmostEqual(oi["ABB"]["mwpl_used_pct"], 30.03)
+        self.assertEqual(oi["ABB"]["ncl_oi"], 3932125)
+        self.assertNotIn("ncl_oi", oi["BANDHANBNK"])
+        self.assertEqual(store.get_client_limits("2025-12-16"), {"ABB": 794625, "ZYDUSLIFE": 3261600})
+        self.assertEqual(store.get_bhavcopy_stats("2025-12-16")["pcr"], {"NIFTY": 2.0})
+
+
+if __name__ == "__main__":
+    unittest.main()